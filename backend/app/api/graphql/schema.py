@@ -2,7 +2,7 @@
 
 import strawberry
 
-from app.core.database import execute_query_df
+from app.core.database import execute_query_df, run_db
 from app.core.logging import get_logger
 from app.utils.dataframe import df_to_records
 
@@ -57,7 +57,7 @@ class Query:
     """GraphQL Query root."""
 
     @strawberry.field
-    def teams(self, active_only: bool = True) -> list[Team]:
+    async def teams(self, active_only: bool = True) -> list[Team]:
         """Get all teams."""
         logger.info("GraphQL: Fetching all teams")
         query = """
@@ -68,12 +68,12 @@ class Query:
         if active_only:
             query += " WHERE is_active = TRUE AND league = 'NBA'"
         query += " ORDER BY full_name"
-        df = execute_query_df(query)
+        df = await run_db(execute_query_df, query)
         records = df_to_records(df)
         return [Team(**row) for row in records]
 
     @strawberry.field
-    def team(self, team_id: str) -> Team | None:
+    async def team(self, team_id: str) -> Team | None:
         """Get team by ID."""
         logger.info(f"GraphQL: Fetching team {team_id}")
         query = """
@@ -82,14 +82,14 @@ class Query:
             FROM teams
             WHERE team_id = ? OR abbreviation = ?
         """
-        df = execute_query_df(query, [team_id, team_id])
+        df = await run_db(execute_query_df, query, [team_id, team_id])
         if df.empty:
             return None
         records = df_to_records(df)
         return Team(**records[0])
 
     @strawberry.field
-    def players(self, limit: int = 50, offset: int = 0) -> list[Player]:
+    async def players(self, limit: int = 50, offset: int = 0) -> list[Player]:
         """Get all players with pagination."""
         logger.info(f"GraphQL: Fetching players (limit={limit}, offset={offset})")
         query = """
@@ -98,12 +98,12 @@ class Query:
             FROM players
             LIMIT ? OFFSET ?
         """
-        df = execute_query_df(query, [limit, offset])
+        df = await run_db(execute_query_df, query, [limit, offset])
         records = df_to_records(df)
         return [Player(**row) for row in records]
 
     @strawberry.field
-    def player(self, player_id: str) -> Player | None:
+    async def player(self, player_id: str) -> Player | None:
         """Get player by ID."""
         logger.info(f"GraphQL: Fetching player {player_id}")
         query = """
@@ -112,14 +112,14 @@ class Query:
             FROM players
             WHERE player_id = ?
         """
-        df = execute_query_df(query, [player_id])
+        df = await run_db(execute_query_df, query, [player_id])
         if df.empty:
             return None
         records = df_to_records(df)
         return Player(**records[0])
 
     @strawberry.field
-    def games(self, limit: int = 20) -> list[Game]:
+    async def games(self, limit: int = 20) -> list[Game]:
         """Get recent games."""
         logger.info(f"GraphQL: Fetching games (limit={limit})")
         query = """
@@ -129,7 +129,7 @@ class Query:
             ORDER BY game_date DESC
             LIMIT ?
         """
-        df = execute_query_df(query, [limit])
+        df = await run_db(execute_query_df, query, [limit])
         records = df_to_records(df)
         return [Game(**row) for row in records]
 
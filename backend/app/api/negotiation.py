@@ -0,0 +1,183 @@
+"""Content negotiation for v1 list endpoints.
+
+List endpoints answer ``Accept: application/vnd.apache.arrow.stream`` with an
+Arrow IPC stream and ``Accept: application/msgpack`` with a msgpack array of
+records, alongside the default JSON. Columnar responses are read straight
+from DuckDB (record batches for Arrow, raw rows for msgpack) without
+building Pydantic models.
+
+Arrow needs pyarrow and msgpack needs msgpack; both are optional
+(``pip install -e ".[arrow,msgpack]"``). A format that isn't installed is
+never offered: clients that accept nothing else get 406, everyone else JSON.
+"""
+
+import datetime as dt
+import decimal
+import io
+import math
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.core.database import run_db
+from app.core.exceptions import NotAcceptableError
+from app.repositories.base import BaseRepository, ListQuery
+from app.utils.export import arrow_available
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+JSON = "application/json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/msgpack"
+
+# Other names clients use for the same formats
+_ALIASES = {"application/x-msgpack": MSGPACK}
+
+# Negotiated responses differ by Accept, so shared caches must key on it
+VARY = {"Vary": "Accept"}
+
+
+def msgpack_available() -> bool:
+    try:
+        import msgpack  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_media_types() -> list[str]:
+    """Media types this process can produce, in order of server preference."""
+    types = [JSON]
+    if arrow_available():
+        types.append(ARROW_STREAM)
+    if msgpack_available():
+        types.append(MSGPACK)
+    return types
+
+
+def _parse_accept(accept: str) -> list[tuple[str, float]]:
+    ranges: list[tuple[str, float]] = []
+    for part in accept.split(","):
+        media_range, *params = (item.strip() for item in part.split(";"))
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((_ALIASES.get(media_range.lower(), media_range.lower()), quality))
+    return ranges
+
+
+def _quality(media_type: str, ranges: list[tuple[str, float]]) -> float:
+    """Quality of the most specific range matching ``media_type``."""
+    main_type = media_type.split("/")[0]
+    best: tuple[int, float] | None = None
+    for media_range, quality in ranges:
+        if media_range == media_type:
+            specificity = 2
+        elif media_range == f"{main_type}/*":
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+        if best is None or specificity > best[0]:
+            best = (specificity, quality)
+    return best[1] if best else 0.0
+
+
+def select_media_type(accept: str | None, available: Sequence[str]) -> str | None:
+    """Pick the best of ``available`` for an Accept header.
+
+    Highest quality wins and ties go to the earlier entry in ``available``.
+    A missing or empty header accepts anything.
+
+    Returns:
+        The chosen media type, or None if nothing available is acceptable
+
+    """
+    if not accept or not accept.strip():
+        return available[0] if available else None
+    ranges = _parse_accept(accept)
+    chosen, chosen_quality = None, 0.0
+    for media_type in available:
+        quality = _quality(media_type, ranges)
+        if quality > chosen_quality:
+            chosen, chosen_quality = media_type, quality
+    return chosen
+
+
+def negotiate(request: Request, response: Response) -> str:
+    """Dependency returning the response media type for a list endpoint.
+
+    Raises:
+        NotAcceptableError: If the client accepts none of the available types
+
+    """
+    available = available_media_types()
+    media_type = select_media_type(request.headers.get("accept"), available)
+    if media_type is None:
+        raise NotAcceptableError(available)
+    response.headers.update(VARY)
+    return media_type
+
+
+def _plain(value: object) -> object:
+    """msgpack-safe value: non-finite floats become None, dates ISO strings."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, (dt.date, dt.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return value
+
+
+def _msgpack(records: list[dict[str, Any]]) -> bytes:
+    import msgpack
+
+    return bytes(msgpack.packb(records, default=_plain))
+
+
+def _arrow_ipc(table: "pa.Table") -> bytes:
+    import pyarrow as pa
+
+    buffer = io.BytesIO()
+    with pa.ipc.new_stream(buffer, table.schema) as writer:
+        writer.write_table(table)
+    return buffer.getvalue()
+
+
+async def query_response(
+    media_type: str, repo: BaseRepository[Any], query: ListQuery, model: type[BaseModel],
+) -> Response:
+    """Encode a list query as Arrow or msgpack without building models.
+
+    Only ``model``'s fields are returned, so the columns match the JSON
+    response.
+    """
+    if media_type == ARROW_STREAM:
+        table = await run_db(repo.fetch_arrow, query, model)
+        return Response(_arrow_ipc(table), media_type=ARROW_STREAM, headers=VARY)
+
+    columns, rows = await run_db(repo.fetch_rows, query, model)
+    records = [{column: _plain(value) for column, value in zip(columns, row, strict=True)} for row in rows]
+    return Response(_msgpack(records), media_type=MSGPACK, headers=VARY)
+
+
+def models_response(media_type: str, models: Sequence[BaseModel]) -> Response:
+    """Encode already-built models, for endpoints whose rows are computed in Python."""
+    records = [item.model_dump() for item in models]
+    if media_type == ARROW_STREAM:
+        import pyarrow as pa
+
+        return Response(_arrow_ipc(pa.Table.from_pylist(records)), media_type=ARROW_STREAM, headers=VARY)
+    return Response(_msgpack(records), media_type=MSGPACK, headers=VARY)
@@ -2,15 +2,17 @@
 
 from fastapi import APIRouter, Depends, Query
 
+from app.core.database import run_db
+from app.core.profiling import ProfilingRoute
 from app.dependencies import get_contract_repository
 from app.models import Contract
 from app.repositories.contract_repository import ContractRepository
 
-router = APIRouter()
+router = APIRouter(route_class=ProfilingRoute)
 
 
 @router.get("", response_model=list[Contract])
-def get_contracts(
+async def get_contracts(
     player_id: str | None = None,
     team_id: str | None = None,
     is_active: bool | None = None,
@@ -19,7 +21,8 @@ def get_contracts(
     repo: ContractRepository = Depends(get_contract_repository),
 ) -> list[Contract]:
     """Get contracts with optional filtering."""
-    return repo.get_all(
+    return await run_db(
+        repo.get_all,
         player_id=player_id,
         team_id=team_id,
         is_active=is_active,
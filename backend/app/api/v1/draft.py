@@ -2,15 +2,17 @@
 
 from fastapi import APIRouter, Depends, Query
 
+from app.core.database import run_db
+from app.core.profiling import ProfilingRoute
 from app.dependencies import get_draft_repository
 from app.models import DraftPick
 from app.repositories.draft_repository import DraftRepository
 
-router = APIRouter()
+router = APIRouter(route_class=ProfilingRoute)
 
 
 @router.get("/picks", response_model=list[DraftPick])
-def get_draft_picks(
+async def get_draft_picks(
     year: int | None = None,
     team_id: str | None = None,
     limit: int = Query(100, ge=1, le=1000),
@@ -18,7 +20,8 @@ def get_draft_picks(
     repo: DraftRepository = Depends(get_draft_repository),
 ) -> list[DraftPick]:
     """Get draft picks with optional filtering."""
-    return repo.get_all(
+    return await run_db(
+        repo.get_all,
         year=year,
         team_id=team_id,
         limit=limit,
@@ -0,0 +1,138 @@
+"""Bulk export endpoints.
+
+``GET /api/v1/export/{table}`` streams a filtered serving table in one
+response instead of thousands of paginated calls. Rows are read from DuckDB
+in chunks of EXPORT_CHUNK_ROWS and encoded as they arrive, so memory use doesn't grow with the export.
+Parquet is written by DuckDB to a temporary file and then streamed.
+
+Chunk fetches run on anyio worker threads rather than the database executor:
+exports already hold one of EXPORT_MAX_CONCURRENT slots, and a busy executor
+must not cut off a download that has started.
+"""
+
+import os
+import tempfile
+from collections.abc import AsyncIterator, Callable
+from typing import Literal
+
+import anyio.to_thread
+
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import run_db
+from app.core.exceptions import ValidationError
+from app.core.profiling import ProfilingRoute
+from app.dependencies import get_export_repository
+from app.repositories.export_repository import ExportCursor, ExportRepository
+from app.utils.export import ArrowStreamEncoder, arrow_available, csv_header, csv_rows, ndjson_rows
+
+router = APIRouter(route_class=ProfilingRoute)
+
+ExportFormat = Literal["csv", "ndjson", "parquet", "arrow"]
+
+# Format -> (media type, file extension)
+EXPORT_FORMATS: dict[str, tuple[str, str]] = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+class _CleanupResponse(StreamingResponse):
+    """Streaming response that runs ``cleanup`` however the transfer ends."""
+
+    def __init__(
+        self,
+        content: AsyncIterator[bytes],
+        cleanup: Callable[[], None],
+        media_type: str,
+        headers: dict[str, str],
+    ) -> None:
+        super().__init__(content, media_type=media_type, headers=headers)
+        self.cleanup = cleanup
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.cleanup()
+
+
+class _TempFileResponse(FileResponse):
+    """File response that deletes the file afterwards, even if the client disconnects."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            os.unlink(self.path)
+
+
+async def _rows(export: ExportCursor, fmt: str) -> AsyncIterator[bytes]:
+    chunk_rows = settings.EXPORT_CHUNK_ROWS
+    if fmt == "arrow":
+        encoder = ArrowStreamEncoder(await anyio.to_thread.run_sync(export.arrow_schema, chunk_rows))
+        while (batch := await anyio.to_thread.run_sync(export.fetch_batch)) is not None:
+            yield encoder.write(batch)
+        yield encoder.close()
+        return
+
+    if fmt == "csv":
+        yield csv_header(export.columns)
+    while rows := await anyio.to_thread.run_sync(export.fetch, chunk_rows):
+        yield csv_rows(rows) if fmt == "csv" else ndjson_rows(export.columns, rows)
+
+
+@router.get("/{table}")
+async def export_table(
+    table: str,
+    fmt: ExportFormat = Query("csv", alias="format"),
+    columns: str | None = Query(None, description="Comma-separated columns (default: all)"),
+    season_id: str | None = None,
+    player_id: str | None = None,
+    team_id: str | None = None,
+    game_id: str | None = None,
+    season_type: str | None = None,
+    game_type: str | None = None,
+    repo: ExportRepository = Depends(get_export_repository),
+) -> Response:
+    """Stream a serving table (box_scores, player_season_stats, team_game_stats, games).
+
+    Filters a table doesn't have are rejected with 400. Each format is
+    streamed as a download named after the table.
+    """
+    if fmt == "arrow" and not arrow_available():
+        raise ValidationError("format", "Arrow IPC export requires pyarrow")
+
+    query = await run_db(
+        repo.build_query,
+        table,
+        [c.strip() for c in columns.split(",") if c.strip()] if columns else None,
+        {
+            "season_id": season_id,
+            "player_id": player_id,
+            "team_id": team_id,
+            "game_id": game_id,
+            "season_type": season_type,
+            "game_type": game_type,
+        },
+    )
+    media_type, extension = EXPORT_FORMATS[fmt]
+    headers = {"Content-Disposition": f'attachment; filename="{table}.{extension}"'}
+
+    if fmt == "parquet":
+        fd, path = tempfile.mkstemp(prefix=f"export-{table}-", suffix=".parquet")
+        os.close(fd)
+        try:
+            await run_db(repo.copy_parquet, query, path)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return _TempFileResponse(path, media_type=media_type, headers=headers)
+
+    export = await run_db(repo.open_export, query)
+    return _CleanupResponse(_rows(export, fmt), export.close, media_type=media_type, headers=headers)
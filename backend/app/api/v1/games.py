@@ -2,15 +2,17 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 
+from app.core.database import run_db
+from app.core.profiling import ProfilingRoute
 from app.dependencies import get_game_repository
-from app.models import Game, TeamGameStats
+from app.models import Game, GameLineups, TeamGameStats
 from app.repositories.game_repository import GameRepository
 
-router = APIRouter()
+router = APIRouter(route_class=ProfilingRoute)
 
 
 @router.get("", response_model=list[Game])
-def get_games(
+async def get_games(
     date: str | None = None,
     team_id: str | None = None,
     season_id: str | None = None,
@@ -19,7 +21,8 @@ def get_games(
     repo: GameRepository = Depends(get_game_repository),
 ) -> list[Game]:
     """Get games with optional filtering."""
-    return repo.get_games(
+    return await run_db(
+        repo.get_games,
         date=date,
         team_id=team_id,
         season_id=season_id,
@@ -29,21 +32,33 @@ def get_games(
 
 
 @router.get("/{game_id}", response_model=Game)
-def get_game(
+async def get_game(
     game_id: str,
     repo: GameRepository = Depends(get_game_repository),
 ) -> Game:
     """Get a game by ID."""
-    game = repo.get_by_id(game_id)
+    game = await run_db(repo.get_by_id, game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
     return game
 
 
 @router.get("/{game_id}/stats", response_model=list[TeamGameStats])
-def get_game_stats(
+async def get_game_stats(
     game_id: str,
     repo: GameRepository = Depends(get_game_repository),
 ) -> list[TeamGameStats]:
     """Get team statistics for a game."""
-    return repo.get_game_stats(game_id)
+    return await run_db(repo.get_game_stats, game_id)
+
+
+@router.get("/{game_id}/lineups", response_model=GameLineups)
+async def get_game_lineups(
+    game_id: str,
+    repo: GameRepository = Depends(get_game_repository),
+) -> GameLineups:
+    """Get five-man lineups and player on/off numbers for a game."""
+    lineups = await run_db(repo.get_lineups, game_id)
+    if lineups is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return lineups
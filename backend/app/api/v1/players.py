@@ -1,7 +1,12 @@
 """Player API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
 
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from app.api.negotiation import JSON, negotiate, query_response
+from app.core.database import run_db
+from app.core.profiling import ProfilingRoute
 from app.dependencies import get_player_repository
 from app.models import (
     Award,
@@ -14,14 +19,17 @@ from app.models import (
     PlayerSeasonStats,
     PlayerShootingStats,
     PlayerSplits,
+    RollingStats,
+    SimilarPlayers,
+    StreakSummary,
 )
 from app.repositories.player_repository import PlayerRepository
 
-router = APIRouter()
+router = APIRouter(route_class=ProfilingRoute)
 
 
 @router.get("", response_model=list[Player])
-def get_players(
+async def get_players(
     search: str | None = None,
     letter: str | None = None,
     limit: int = 50,
@@ -29,109 +37,169 @@ def get_players(
     repo: PlayerRepository = Depends(get_player_repository),
 ) -> list[Player]:
     """Get all players with optional filtering."""
-    return repo.get_players(search=search, letter=letter, limit=limit, offset=offset)
+    return await run_db(repo.get_players, search=search, letter=letter, limit=limit, offset=offset)
 
 
 @router.get("/{player_id}", response_model=Player)
-def get_player(
+async def get_player(
     player_id: str,
     repo: PlayerRepository = Depends(get_player_repository),
 ) -> Player:
     """Get a player by ID."""
-    player = repo.get_by_id(player_id)
+    player = await run_db(repo.get_by_id, player_id)
     if not player:
         raise HTTPException(status_code=404, detail="Player not found")
     return player
 
 
 @router.get("/{player_id}/stats", response_model=list[PlayerSeasonStats])
-def get_player_stats(
+async def get_player_stats(
     player_id: str,
+    media_type: str = Depends(negotiate),
     repo: PlayerRepository = Depends(get_player_repository),
-) -> list[PlayerSeasonStats]:
+) -> list[PlayerSeasonStats] | Response:
     """Get season statistics for a player."""
-    return repo.get_stats(player_id)
+    if media_type != JSON:
+        return await query_response(media_type, repo, repo.stats_query(player_id), PlayerSeasonStats)
+    return await run_db(repo.get_stats, player_id)
 
 
 @router.get("/{player_id}/gamelog", response_model=list[PlayerGameLog])
-def get_player_gamelog(
+async def get_player_gamelog(
     player_id: str,
     season_id: str | None = None,
+    media_type: str = Depends(negotiate),
     repo: PlayerRepository = Depends(get_player_repository),
-) -> list[PlayerGameLog]:
+) -> list[PlayerGameLog] | Response:
     """Get game log for a player."""
-    return repo.get_gamelog(player_id, season_id)
+    if media_type != JSON:
+        return await query_response(media_type, repo, repo.gamelog_query(player_id, season_id), PlayerGameLog)
+    return await run_db(repo.get_gamelog, player_id, season_id)
+
+
+@router.get("/{player_id}/rolling", response_model=RollingStats)
+async def get_player_rolling(
+    player_id: str,
+    stat: str = "pts",
+    window: int = Query(10, ge=1, le=82),
+    season_id: str | None = None,
+    repo: PlayerRepository = Depends(get_player_repository),
+) -> RollingStats:
+    """Get a rolling N-game average of one stat, with hot/cold form."""
+    rolling = await run_db(repo.get_rolling, player_id, stat, window, season_id)
+    if rolling is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return rolling
+
+
+@router.get("/{player_id}/streaks", response_model=StreakSummary)
+async def get_player_streaks(
+    player_id: str,
+    season_id: str | None = None,
+    repo: PlayerRepository = Depends(get_player_repository),
+) -> StreakSummary:
+    """Get current and longest game streaks for a player."""
+    streaks = await run_db(repo.get_streaks, player_id, season_id)
+    if streaks is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return streaks
+
+
+@router.get("/{player_id}/similar", response_model=SimilarPlayers)
+async def get_similar_players(
+    player_id: str,
+    season_id: str | None = None,
+    k: int = Query(10, ge=1, le=100),
+    metric: Literal["cosine", "euclidean"] = "cosine",
+    era_from: int | None = None,
+    era_to: int | None = None,
+    repo: PlayerRepository = Depends(get_player_repository),
+) -> SimilarPlayers:
+    """Get the players whose career (or, with season_id, season) is most similar."""
+    result = await run_db(repo.get_similar, player_id, season_id, k, metric, era_from, era_to)
+    if result is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Similarity vectors not built; run scripts/etl/build_similarity_vectors.py",
+        )
+    return result
 
 
 @router.get("/{player_id}/splits", response_model=list[PlayerSplits])
-def get_player_splits(
+async def get_player_splits(
     player_id: str,
     season_id: str | None = None,
+    media_type: str = Depends(negotiate),
     repo: PlayerRepository = Depends(get_player_repository),
-) -> list[PlayerSplits]:
+) -> list[PlayerSplits] | Response:
     """Get split statistics for a player."""
-    return repo.get_splits(player_id, season_id)
+    if media_type != JSON:
+        return await query_response(media_type, repo, repo.splits_query(player_id, season_id), PlayerSplits)
+    return await run_db(repo.get_splits, player_id, season_id)
 
 
 @router.get("/{player_id}/advanced", response_model=list[PlayerAdvancedStats])
-def get_player_advanced_stats(
+async def get_player_advanced_stats(
     player_id: str,
     season_id: str | None = None,
+    media_type: str = Depends(negotiate),
     repo: PlayerRepository = Depends(get_player_repository),
-) -> list[PlayerAdvancedStats]:
+) -> list[PlayerAdvancedStats] | Response:
     """Get advanced statistics for a player."""
-    return repo.get_advanced_stats(player_id, season_id)
+    if media_type != JSON:
+        return await query_response(media_type, repo, repo.advanced_stats_query(player_id, season_id), PlayerAdvancedStats)
+    return await run_db(repo.get_advanced_stats, player_id, season_id)
 
 
 @router.get("/{player_id}/contracts", response_model=list[Contract])
-def get_player_contracts(
+async def get_player_contracts(
     player_id: str,
     repo: PlayerRepository = Depends(get_player_repository),
 ) -> list[Contract]:
     """Get contracts for a player."""
-    return repo.get_contracts(player_id)
+    return await run_db(repo.get_contracts, player_id)
 
 
 @router.get("/{player_id}/shooting", response_model=list[PlayerShootingStats])
-def get_player_shooting_stats(
+async def get_player_shooting_stats(
     player_id: str,
     repo: PlayerRepository = Depends(get_player_repository),
 ) -> list[PlayerShootingStats]:
     """Get shooting statistics for a player."""
-    return repo.get_shooting_stats(player_id)
+    return await run_db(repo.get_shooting_stats, player_id)
 
 
 @router.get("/{player_id}/adjusted_shooting", response_model=list[PlayerAdjustedShooting])
-def get_player_adjusted_shooting_stats(
+async def get_player_adjusted_shooting_stats(
     player_id: str,
     repo: PlayerRepository = Depends(get_player_repository),
 ) -> list[PlayerAdjustedShooting]:
     """Get adjusted shooting statistics for a player."""
-    return repo.get_adjusted_shooting(player_id)
+    return await run_db(repo.get_adjusted_shooting, player_id)
 
 
 @router.get("/{player_id}/playbyplay", response_model=list[PlayerPlayByPlayStats])
-def get_player_play_by_play_stats(
+async def get_player_play_by_play_stats(
     player_id: str,
     repo: PlayerRepository = Depends(get_player_repository),
 ) -> list[PlayerPlayByPlayStats]:
     """Get play-by-play statistics for a player."""
-    return repo.get_play_by_play_stats(player_id)
+    return await run_db(repo.get_play_by_play_stats, player_id)
 
 
 @router.get("/{player_id}/awards", response_model=list[Award])
-def get_player_awards(
+async def get_player_awards(
     player_id: str,
     repo: PlayerRepository = Depends(get_player_repository),
 ) -> list[Award]:
     """Get awards for a player."""
-    return repo.get_awards(player_id)
+    return await run_db(repo.get_awards, player_id)
 
 
 @router.get("/{player_id}/seasons", response_model=list[str])
-def get_player_seasons(
+async def get_player_seasons(
     player_id: str,
     repo: PlayerRepository = Depends(get_player_repository),
 ) -> list[str]:
     """Get list of seasons a player has statistics for."""
-    return repo.get_seasons(player_id)
+    return await run_db(repo.get_seasons, player_id)
@@ -0,0 +1,41 @@
+"""Multi-criteria query endpoints.
+
+``POST /api/v1/query/{dataset}`` answers "Stathead"-style questions, e.g.
+seasons with at least 25 ppg, 50% shooting and 8 apg since 1990::
+
+    {"filters": [{"field": "points_per_game", "op": "gte", "value": 25},
+                 {"field": "field_goal_pct", "op": "gte", "value": 0.5},
+                 {"field": "assists_per_game", "op": "gte", "value": 8},
+                 {"field": "season_id", "op": "gte", "value": "1990"}],
+     "sort": ["-points_per_game"], "limit": 50}
+
+``GET /api/v1/query`` lists the datasets, their fields and operators.
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.core.database import run_db
+from app.core.profiling import ProfilingRoute
+from app.dependencies import get_query_repository
+from app.models import QueryDataset, QueryRequest, QueryResult
+from app.repositories.query_repository import QueryRepository
+
+router = APIRouter(route_class=ProfilingRoute)
+
+
+@router.get("", response_model=list[QueryDataset])
+async def list_query_datasets(
+    repo: QueryRepository = Depends(get_query_repository),
+) -> list[QueryDataset]:
+    """List queryable datasets with their fields and operators."""
+    return await run_db(repo.describe)
+
+
+@router.post("/{dataset}", response_model=QueryResult)
+async def run_query(
+    dataset: str,
+    request: QueryRequest,
+    repo: QueryRepository = Depends(get_query_repository),
+) -> QueryResult:
+    """Run a filtered, sorted query against a dataset."""
+    return await run_db(repo.run, dataset, request)
@@ -10,9 +10,11 @@ from app.api.v1 import (
     boxscores,
     contracts,
     draft,
+    export,
     franchises,
     games,
     players,
+    query,
     seasons,
     teams,
 )
@@ -28,3 +30,5 @@ router.include_router(boxscores.router, prefix="/boxscores", tags=["Box Scores"]
 router.include_router(contracts.router, prefix="/contracts", tags=["Contracts"])
 router.include_router(draft.router, prefix="/draft", tags=["Draft"])
 router.include_router(franchises.router, prefix="/franchises", tags=["Franchises"])
+router.include_router(export.router, prefix="/export", tags=["Export"])
+router.include_router(query.router, prefix="/query", tags=["Query"])
@@ -1,51 +1,91 @@
 """Season API endpoints."""
 
-from typing import Any
+from datetime import date
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
+from app.api.negotiation import JSON, models_response, negotiate
+from app.core.config import settings
+from app.core.database import run_db
 from app.core.logging import get_logger
+from app.core.profiling import ProfilingRoute
 from app.dependencies import get_season_repository
-from app.models import Season, StandingsItem
+from app.models import PlayoffOdds, PowerRanking, Season, StandingsItem
 from app.repositories.season_repository import SeasonRepository
 
 logger = get_logger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ProfilingRoute)
 
 
 @router.get("", response_model=list[Season])
-def get_seasons(
+async def get_seasons(
     repo: SeasonRepository = Depends(get_season_repository),
 ) -> list[Season]:
     """Get all seasons."""
-    return repo.get_all()
+    return await run_db(repo.get_all)
 
 
 @router.get("/{season_id}", response_model=Season)
-def get_season(
+async def get_season(
     season_id: str,
     repo: SeasonRepository = Depends(get_season_repository),
 ) -> Season:
     """Get a season by ID."""
-    season = repo.get_by_id(season_id)
+    season = await run_db(repo.get_by_id, season_id)
     if not season:
         raise HTTPException(status_code=404, detail="Season not found")
     return season
 
 
 @router.get("/{season_id}/standings", response_model=list[StandingsItem])
-def get_season_standings(
+async def get_season_standings(
     season_id: str,
     conference: str | None = None,
+    media_type: str = Depends(negotiate),
     repo: SeasonRepository = Depends(get_season_repository),
-) -> list[StandingsItem]:
-    """Get standings for a specific season."""
-    return repo.get_standings(season_id, conference)
+) -> list[StandingsItem] | Response:
+    """Get standings for a specific season.
+
+    Standings are derived in Python (pythagorean wins), so Arrow and
+    msgpack are encoded from the models rather than read from DuckDB.
+    """
+    standings = await run_db(repo.get_standings, season_id, conference)
+    if media_type != JSON:
+        return models_response(media_type, standings)
+    return standings
+
+
+@router.get("/{season_id}/power-rankings", response_model=list[PowerRanking])
+async def get_season_power_rankings(
+    season_id: str,
+    as_of: date | None = None,
+    by: Literal["elo", "srs"] = "elo",
+    repo: SeasonRepository = Depends(get_season_repository),
+) -> list[PowerRanking]:
+    """Get teams ranked by their latest Elo or SRS, optionally as of a date."""
+    return await run_db(repo.get_power_rankings, season_id, as_of, by)
+
+
+@router.get("/{season_id}/odds", response_model=PlayoffOdds)
+async def get_season_odds(
+    season_id: str,
+    simulations: int = Query(settings.ODDS_SIMULATIONS, ge=100, le=settings.ODDS_MAX_SIMULATIONS),
+    repo: SeasonRepository = Depends(get_season_repository),
+) -> PlayoffOdds:
+    """Get Monte Carlo seeding, playoff and title probabilities for a season.
+
+    ``simulations`` is rounded up to a multiple of 2000.
+    """
+    odds = await repo.get_odds(season_id, simulations)
+    if odds is None:
+        raise HTTPException(status_code=404, detail="Season not found")
+    return odds
 
 
 @router.get("/{season_id}/leaders", response_model=dict[str, list[dict[str, Any]]])
-def get_season_all_leaders(
+async def get_season_all_leaders(
     season_id: str,
     limit: int = 5,
     repo: SeasonRepository = Depends(get_season_repository),
@@ -54,11 +94,11 @@ def get_season_all_leaders(
 
     Returns leaders in categories: pts, trb, ast, ws, per
     """
-    return repo.get_all_leaders(season_id, limit)
+    return await run_db(repo.get_all_leaders, season_id, limit)
 
 
 @router.get("/{season_id}/leaders/{stat_category}", response_model=list[dict[str, Any]])
-def get_season_leaders(
+async def get_season_leaders(
     season_id: str,
     stat_category: str,
     limit: int = 10,
@@ -69,22 +109,22 @@ def get_season_leaders(
     Valid stat categories: points_per_game, rebounds_per_game, assists_per_game,
     steals_per_game, blocks_per_game, field_goal_pct, three_point_pct, free_throw_pct
     """
-    return repo.get_leaders(season_id, stat_category, limit)
+    return await run_db(repo.get_leaders, season_id, stat_category, limit)
 
 
 @router.get("/{season_id}/awards", response_model=list[dict[str, Any]])
-def get_season_awards(
+async def get_season_awards(
     season_id: str,
     repo: SeasonRepository = Depends(get_season_repository),
 ) -> list[dict[str, Any]]:
     """Get awards for a specific season."""
-    return repo.get_awards(season_id)
+    return await run_db(repo.get_awards, season_id)
 
 
 @router.get("/{season_id}/playoffs", response_model=list[dict[str, Any]])
-def get_season_playoffs(
+async def get_season_playoffs(
     season_id: str,
     repo: SeasonRepository = Depends(get_season_repository),
 ) -> list[dict[str, Any]]:
     """Get playoff series for a season."""
-    return repo.get_playoffs(season_id)
+    return await run_db(repo.get_playoffs, season_id)
@@ -1,14 +1,19 @@
 """Team API endpoints."""
 
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
+from app.api.negotiation import JSON, negotiate, query_response
+from app.core.database import run_db
 from app.core.logging import get_logger
+from app.core.profiling import ProfilingRoute
 from app.dependencies import get_team_repository
 from app.models import (
     RosterRow,
+    StreakSummary,
     Team,
     TeamGameLogRow,
+    TeamRating,
     TeamScheduleRow,
     TeamSeasonStats,
 )
@@ -17,41 +22,46 @@ from app.utils.dates import get_current_season
 
 logger = get_logger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ProfilingRoute)
 
 
 @router.get("", response_model=list[Team])
-def get_teams(
+async def get_teams(
     active_only: bool = True,
     repo: TeamRepository = Depends(get_team_repository),
 ) -> list[Team]:
     """Get all teams, optionally filtered to active NBA teams only."""
-    return repo.get_teams(active_only=active_only)
+    return await run_db(repo.get_teams, active_only=active_only)
 
 
 @router.get("/{team_id}", response_model=Team)
-def get_team(
+async def get_team(
     team_id: str,
     repo: TeamRepository = Depends(get_team_repository),
 ) -> Team:
     """Get a team by ID or abbreviation."""
-    team = repo.get_by_id(team_id)
+    team = await run_db(repo.get_by_id, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     return team
 
 
 @router.get("/{team_id}/stats", response_model=list[TeamSeasonStats])
-def get_team_stats(
+async def get_team_stats(
     team_id: str,
+    media_type: str = Depends(negotiate),
     repo: TeamRepository = Depends(get_team_repository),
-) -> list[TeamSeasonStats]:
+) -> list[TeamSeasonStats] | Response:
     """Get season statistics for a team."""
-    return repo.get_stats(team_id)
+    if media_type != JSON:
+        # Resolving the team may load aliases from the database
+        query = await run_db(repo.stats_query, team_id)
+        return await query_response(media_type, repo, query, TeamSeasonStats)
+    return await run_db(repo.get_stats, team_id)
 
 
 @router.get("/{team_id}/roster", response_model=list[RosterRow])
-def get_team_roster(
+async def get_team_roster(
     team_id: str,
     season_id: str | None = None,
     repo: TeamRepository = Depends(get_team_repository),
@@ -62,20 +72,61 @@ def get_team_roster(
         season_id = get_current_season()
         logger.info(f"Using current season: {season_id}")
 
-    return repo.get_roster(team_id)
+    return await run_db(repo.get_roster, team_id)
 
 @router.get("/{team_id}/gamelog", response_model=list[TeamGameLogRow])
-def get_team_game_log(
+async def get_team_game_log(
     team_id: str,
+    media_type: str = Depends(negotiate),
     repo: TeamRepository = Depends(get_team_repository),
-) -> list[TeamGameLogRow]:
+) -> list[TeamGameLogRow] | Response:
     """Get team game log for all seasons."""
-    return repo.get_team_game_log(team_id)
+    if media_type != JSON:
+        # Resolving the team may load aliases from the database
+        query = await run_db(repo.game_log_query, team_id)
+        return await query_response(media_type, repo, query, TeamGameLogRow)
+    return await run_db(repo.get_team_game_log, team_id)
 
 @router.get("/{team_id}/schedule", response_model=list[TeamScheduleRow])
-def get_team_schedule(
+async def get_team_schedule(
     team_id: str,
     repo: TeamRepository = Depends(get_team_repository),
 ) -> list[TeamScheduleRow]:
     """Get team schedule/results for all seasons."""
-    return repo.get_team_schedule(team_id)
+    return await run_db(repo.get_team_schedule, team_id)
+
+
+@router.get("/{team_id}/schedule/{season_id}", response_model=list[TeamScheduleRow])
+async def get_team_season_schedule(
+    team_id: str,
+    season_id: str,
+    repo: TeamRepository = Depends(get_team_repository),
+) -> list[TeamScheduleRow]:
+    """Get team schedule/results for one season."""
+    return await run_db(repo.get_team_schedule, team_id, season_id)
+
+
+@router.get("/{team_id}/ratings", response_model=list[TeamRating])
+async def get_team_ratings(
+    team_id: str,
+    season_id: str | None = None,
+    repo: TeamRepository = Depends(get_team_repository),
+) -> list[TeamRating]:
+    """Get a team's Elo and SRS after each game."""
+    ratings = await run_db(repo.get_ratings, team_id, season_id)
+    if ratings is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return ratings
+
+
+@router.get("/{team_id}/streaks", response_model=StreakSummary)
+async def get_team_streaks(
+    team_id: str,
+    season_id: str | None = None,
+    repo: TeamRepository = Depends(get_team_repository),
+) -> StreakSummary:
+    """Get current and longest win and loss streaks for a team."""
+    streaks = await run_db(repo.get_streaks, team_id, season_id)
+    if streaks is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return streaks
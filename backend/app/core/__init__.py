@@ -13,18 +13,24 @@ Usage:
 """
 
 from app.core.config import Settings, settings
-from app.core.database import execute_query, execute_query_df, get_db_connection
+from app.core.database import execute_query, execute_query_df, get_db_connection, run_db
 from app.core.logging import configure_logging, get_logger
 from app.core.rate_limit import limiter
 from app.core.exceptions import (
     EntityNotFoundError,
     DatabaseError,
+    DatabaseOverloadedError,
+    NotAcceptableError,
+    QueryTimeoutError,
     ValidationError,
 )
 
 __all__ = [
     "DatabaseError",
+    "DatabaseOverloadedError",
     "EntityNotFoundError",
+    "NotAcceptableError",
+    "QueryTimeoutError",
     "Settings",
     "ValidationError",
     "configure_logging",
@@ -33,5 +39,6 @@ __all__ = [
     "get_db_connection",
     "get_logger",
     "limiter",
+    "run_db",
     "settings",
 ]
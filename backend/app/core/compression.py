@@ -0,0 +1,283 @@
+"""Response compression.
+
+CompressionMiddleware encodes responses with the best of brotli, zstd and
+gzip that the client's Accept-Encoding allows. Bodies under
+COMPRESSION_MIN_SIZE are sent as-is (the framing would outweigh the
+saving), as are responses that already have a Content-Encoding or a type
+that doesn't compress (Parquet, images, ...).
+
+Complete bodies are compressed in one go and remembered in a byte-bounded
+LRU keyed by encoding and a digest of the uncompressed body, so hot
+payloads such as historical career stats are compressed once rather than
+on every request. Streaming responses (exports) are compressed chunk by
+chunk and flushed as they go.
+
+brotli and zstandard are optional (``pip install -e ".[compression]"``);
+gzip is always available.
+"""
+
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import record_cache
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+# Bodies at least this large are compressed on a worker thread
+OFFLOAD_SIZE = 256 * 1024
+
+# Already compressed, or not worth compressing
+_INCOMPRESSIBLE_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/zstd",
+    "application/vnd.apache.parquet",
+    "text/event-stream",
+)
+
+
+class _Stream:
+    """Incremental compressor; ``compress`` output is flushed so it can be sent."""
+
+    def __init__(self, compress: Callable[[bytes], bytes], finish: Callable[[], bytes]) -> None:
+        self.compress = compress
+        self.finish = finish
+
+
+def _gzip(data: bytes) -> bytes:
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _gzip_stream() -> _Stream:
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return _Stream(
+        lambda data: compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+def _brotli_codecs() -> tuple[Callable[[bytes], bytes], Callable[[], _Stream]] | None:
+    try:
+        import brotli
+    except ImportError:
+        return None
+
+    def stream() -> _Stream:
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return _Stream(lambda data: compressor.process(data) + compressor.flush(), compressor.finish)
+
+    return (lambda data: brotli.compress(data, quality=BROTLI_QUALITY)), stream
+
+
+def _zstd_codecs() -> tuple[Callable[[bytes], bytes], Callable[[], _Stream]] | None:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+
+    def stream() -> _Stream:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+        return _Stream(
+            lambda data: compressor.compress(data) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            compressor.flush,
+        )
+
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress, stream
+
+
+def available_encodings() -> dict[str, tuple[Callable[[bytes], bytes], Callable[[], _Stream]]]:
+    """Return encoding -> (one-shot, streaming) compressors, in order of server preference."""
+    encodings: dict[str, tuple[Callable[[bytes], bytes], Callable[[], _Stream]]] = {}
+    for name, codecs in (("br", _brotli_codecs()), ("zstd", _zstd_codecs())):
+        if codecs is not None:
+            encodings[name] = codecs
+    encodings["gzip"] = (_gzip, _gzip_stream)
+    return encodings
+
+
+def select_encoding(accept_encoding: str, available: list[str]) -> str | None:
+    """Pick the best of ``available`` for an Accept-Encoding header.
+
+    Highest quality wins and ties go to the earlier entry in ``available``;
+    ``*`` covers encodings not listed. None means send the body uncompressed.
+    """
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = (item.strip() for item in part.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    chosen, chosen_quality = None, 0.0
+    for encoding in available:
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if quality > chosen_quality:
+            chosen, chosen_quality = encoding, quality
+    return chosen
+
+
+class CompressedBodyCache:
+    """Byte-bounded LRU of compressed bodies keyed by encoding and body digest."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(encoding: str, body: bytes) -> tuple[str, bytes]:
+        return encoding, hashlib.blake2b(body, digest_size=16).digest()
+
+    def get(self, key: tuple[str, bytes]) -> bytes | None:
+        with self._lock:
+            compressed = self._entries.get(key)
+            if compressed is not None:
+                self._entries.move_to_end(key)
+        record_cache("compressed_bodies", hit=compressed is not None)
+        return compressed
+
+    def put(self, key: tuple[str, bytes], compressed: bytes) -> None:
+        if len(compressed) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = compressed
+            self.size += len(compressed)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", ""):
+        return False
+    content_type = headers.get("content-type", "")
+    return not content_type.startswith(_INCOMPRESSIBLE_TYPES)
+
+
+def _vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if vary is None:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses per Accept-Encoding."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, cache: CompressedBodyCache | None = None) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = select_encoding(Headers(scope=scope).get("accept-encoding", ""), list(self.encodings))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        stream: _Stream | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, stream, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                passthrough = not _compressible(Headers(raw=message["headers"]))
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            assert start is not None
+            body: bytes = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if stream is None and not more_body:
+                passthrough = True
+                await self._send_whole(send, start, encoding, body)
+                return
+            if stream is None:
+                stream = await self._start_stream(send, start, encoding)
+            await self._send_chunk(send, stream, body, more_body)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_whole(self, send: Send, start: Message, encoding: str, body: bytes) -> None:
+        """Send a response whose body arrived in one message, compressed if large enough."""
+        headers = MutableHeaders(raw=start["headers"])
+        _vary(headers)
+        if len(body) >= self.minimum_size:
+            body = await self._compress(encoding, body)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+        await send(start)
+        await send({"type": "http.response.body", "body": body})
+
+    async def _start_stream(self, send: Send, start: Message, encoding: str) -> _Stream:
+        """Send the headers of a streamed response and return its compressor."""
+        headers = MutableHeaders(raw=start["headers"])
+        _vary(headers)
+        headers["Content-Encoding"] = encoding
+        if "content-length" in headers:
+            del headers["content-length"]
+        await send(start)
+        return self.encodings[encoding][1]()
+
+    @staticmethod
+    async def _send_chunk(send: Send, stream: _Stream, body: bytes, more_body: bool) -> None:
+        chunk = stream.compress(body) if body else b""
+        if not more_body:
+            chunk += stream.finish()
+        if chunk or not more_body:
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _compress(self, encoding: str, body: bytes) -> bytes:
+        compress = self.encodings[encoding][0]
+        if self.cache is None:
+            return await _run_compress(compress, body)
+        key = self.cache.key(encoding, body)
+        compressed = self.cache.get(key)
+        if compressed is None:
+            compressed = await _run_compress(compress, body)
+            self.cache.put(key, compressed)
+        return compressed
+
+
+async def _run_compress(compress: Callable[[bytes], bytes], body: bytes) -> bytes:
+    if len(body) >= OFFLOAD_SIZE:
+        return bytes(await anyio.to_thread.run_sync(compress, body))
+    return bytes(compress(body))
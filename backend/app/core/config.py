@@ -1,6 +1,7 @@
 """Application configuration using Pydantic Settings."""
 
 import os
+import tempfile
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -12,6 +13,15 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     LOG_LEVEL: str = "INFO"
 
+    # Logging: LOG_ASYNC formats and writes records on a background thread,
+    # dropping new records once LOG_QUEUE_SIZE are pending. LOG_SAMPLING maps
+    # logger prefixes to the fraction of INFO/DEBUG records kept, e.g.
+    # {"app.api.graphql": 0.01}. ACCESS_LOG logs one app.access record per request.
+    LOG_ASYNC: bool = True
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_SAMPLING: dict[str, float] = {}
+    ACCESS_LOG: bool = False
+
     # Database
     # Defaulting to the relative path we had before, but making it configurable
     # Note: this file lives at backend/app/core/config.py, so we need to traverse
@@ -24,6 +34,103 @@ class Settings(BaseSettings):
         "nba.duckdb",
     )
 
+    # "duckdb" serves from DB_PATH; "parquet" serves read-only views over the
+    # season-partitioned export written by scripts/etl/export_parquet.py
+    DATA_BACKEND: str = "duckdb"
+    PARQUET_DIR: str = os.path.join(
+        os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        ),
+        "data",
+        "parquet",
+    )
+
+    # Concurrent read cursors on the shared read-only connection
+    DB_READ_CURSORS: int = 8
+
+    # Threads running database calls for async endpoints (0: DB_READ_CURSORS)
+    # and how many more calls may wait before requests get 503
+    DB_EXECUTOR_WORKERS: int = 0
+    DB_EXECUTOR_QUEUE: int = 64
+
+    # Bulk exports (/api/v1/export): rows fetched per chunk, and how many
+    # exports may hold a cursor at once before further ones get 503
+    EXPORT_CHUNK_ROWS: int = 10_000
+    EXPORT_MAX_CONCURRENT: int = 2
+
+    # Response compression (br/zstd/gzip per Accept-Encoding) for bodies of at
+    # least COMPRESSION_MIN_SIZE bytes; compressed bodies are kept in an LRU of
+    # COMPRESSION_CACHE_MB (0 disables the cache)
+    COMPRESSION: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_CACHE_MB: int = 64
+
+    # Multi-criteria queries (POST /api/v1/query/{dataset}): most rows one
+    # query may return, its time budget, and how many results are cached
+    QUERY_MAX_ROWS: int = 1000
+    QUERY_TIMEOUT_MS: int = 2000
+    QUERY_CACHE_ENTRIES: int = 512
+
+    # Players and teams whose per-game arrays (rolling averages, streaks) are
+    # kept in memory
+    GAME_ARRAY_CACHE_ENTITIES: int = 1024
+
+    # Player similarity vectors written by scripts/etl/build_similarity_vectors.py
+    # and memory-mapped by /players/{id}/similar
+    SIMILARITY_DIR: str = os.path.join(
+        os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        ),
+        "data",
+        "similarity",
+    )
+
+    # Playoff odds (/seasons/{id}/odds): default and largest simulation
+    # counts, playoff teams (split evenly between conferences), simulation
+    # processes (0: cores divided by WEB_WORKERS; 1: in-process) and how
+    # many results are cached until the data changes
+    ODDS_SIMULATIONS: int = 20_000
+    ODDS_MAX_SIMULATIONS: int = 200_000
+    ODDS_PLAYOFF_TEAMS: int = 16
+    ODDS_WORKERS: int = 0
+    ODDS_CACHE_ENTRIES: int = 64
+
+    # Pre-rendered historical responses written by scripts/snapshot.py and
+    # served by StaticSnapshotMiddleware while they match the data (empty: off)
+    SNAPSHOT_DIR: str = ""
+
+    # Serving processes (scripts/serve.py; 0: one per core) and the DuckDB
+    # resources each gets: 0 splits the host's cores and ~75% of its memory
+    # between workers
+    WEB_WORKERS: int = 1
+    DUCKDB_THREADS: int = 0
+    DUCKDB_MEMORY_LIMIT: str = ""
+
+    # Query instrumentation: per-fingerprint timings and a slow-query log.
+    # SLOW_QUERY_LOG is a file path for JSON slow-query records; empty sends
+    # them to the application log.
+    QUERY_INSTRUMENTATION: bool = True
+    QUERY_STATS_SAMPLES: int = 1000
+    QUERY_STATS_MAX_FINGERPRINTS: int = 1000
+    SLOW_QUERY_MS: float = 250.0
+    SLOW_QUERY_EXPLAIN: bool = False
+    SLOW_QUERY_LOG: str = ""
+
+    # Rate limiting: "memory" keeps SlowAPI's per-process counters; "shared"
+    # uses token buckets in RATE_LIMIT_FILE shared by all workers on the host,
+    # charging RATE_LIMIT_COSTS (route template -> tokens) per request
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_FILE: str = os.path.join(tempfile.gettempdir(), "api-rate-limit.bin")
+    RATE_LIMIT_PER_MINUTE: float = 100.0
+    RATE_LIMIT_BURST: float = 0.0  # 0: one minute's worth
+    RATE_LIMIT_LEASE: float = 2.0
+    RATE_LIMIT_COSTS: dict[str, float] = {}
+
+    # Request profiling (?profile=1): always allowed when DEBUG, otherwise
+    # only for requests sending X-Profile-Token equal to PROFILE_TOKEN
+    PROFILE_TOKEN: str = ""
+    PROFILE_DIR: str = os.path.join(tempfile.gettempdir(), "api-profiles")
+
     # CORS
     CORS_ORIGINS: list[str] = [
         "http://localhost:3000",
@@ -1,22 +1,153 @@
 """DuckDB database connection management."""
 
-from typing import Any, cast
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar, cast
 
 import duckdb
 import pandas as pd
 
 from app.core.config import settings
+from app.core.exceptions import DatabaseOverloadedError
+from app.core.instrumentation import find_caller, query_recorder
+from app.core.metrics import db_executor_pending, db_executor_rejected, db_pool_wait
+from app.core.profiling import current_collector, run_profiled
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 DB_PATH = settings.DB_PATH
 
+T = TypeVar("T")
+P = ParamSpec("P")
+
 _shared_connection: duckdb.DuckDBPyConnection | None = None
 
+PARQUET_MANIFEST = "manifest.json"
+
+# Share of physical memory divided between workers when DUCKDB_MEMORY_LIMIT is unset
+MEMORY_FRACTION = 0.75
+
+
+def _physical_memory() -> int | None:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+DuckDBConfig = dict[str, str | bool | int | float | list[str]]
+
+
+def duckdb_config(workers: int | None = None) -> DuckDBConfig:
+    """DuckDB settings for one serving process's read connection.
+
+    Without explicit DUCKDB_THREADS / DUCKDB_MEMORY_LIMIT, the host's cores
+    and memory are split evenly between WEB_WORKERS processes so they don't
+    oversubscribe the machine. A single worker keeps DuckDB's own defaults.
+
+    Args:
+        workers: Number of serving processes (default: WEB_WORKERS; 0 means
+                 one per core)
+
+    Returns:
+        Config mapping for ``duckdb.connect``
+
+    """
+    workers = settings.WEB_WORKERS if workers is None else workers
+    workers = workers or os.cpu_count() or 1
+    config: DuckDBConfig = {}
+    if settings.DUCKDB_THREADS > 0:
+        config["threads"] = str(settings.DUCKDB_THREADS)
+    elif workers > 1:
+        config["threads"] = str(max(1, (os.cpu_count() or 1) // workers))
+
+    if settings.DUCKDB_MEMORY_LIMIT:
+        config["memory_limit"] = settings.DUCKDB_MEMORY_LIMIT
+    elif workers > 1:
+        memory = _physical_memory()
+        if memory:
+            config["memory_limit"] = f"{int(memory * MEMORY_FRACTION / workers) // 2**20}MB"
+    return config
+
+
+def connect_parquet(parquet_dir: str) -> duckdb.DuckDBPyConnection:
+    """Open an in-memory connection with one view per exported Parquet table.
+
+    Views restore each table's original column order and types from the
+    export manifest, so queries written against the DuckDB file run unchanged.
+    Tables with their own ``season_id`` are hive-partitioned on it and prune
+    on filters against it; the rest are single files.
+
+    Args:
+        parquet_dir: Directory written by scripts/etl/export_parquet.py
+
+    Returns:
+        DuckDB connection exposing the exported tables as views
+
+    """
+    with open(os.path.join(parquet_dir, PARQUET_MANIFEST)) as f:
+        manifest = json.load(f)
+
+    conn = duckdb.connect(":memory:", config=duckdb_config())
+    partition_column = manifest.get("partition_column", "season_id")
+    for table, spec in manifest["tables"].items():
+        columns = [(name, dtype) for name, dtype in spec["columns"]]
+        table_dir = os.path.join(parquet_dir, table)
+        select_list = ", ".join(f'CAST("{name}" AS {dtype}) AS "{name}"' for name, dtype in columns)
+        if spec["partitioned"]:
+            source = (
+                f"read_parquet('{table_dir}/**/*.parquet', hive_partitioning = true, "
+                f"hive_types = {{'{partition_column}': VARCHAR}})"
+            )
+        else:
+            source = f"read_parquet('{table_dir}/*.parquet')"
+        if not any(files for _, _, files in os.walk(table_dir)):
+            # Empty partitioned tables write no files; keep the view queryable
+            select_list = ", ".join(f'CAST(NULL AS {dtype}) AS "{name}"' for name, dtype in columns)
+            source = "(SELECT 1) WHERE false"
+        # Names and types come from the export manifest, not from requests
+        conn.execute(f'CREATE VIEW "{table}" AS SELECT {select_list} FROM {source}')  # noqa: S608
+    return conn
+
+
+def get_data_version() -> str:
+    """Identify the data currently being served.
+
+    Derived from the modification time and size of the DuckDB file (or the
+    Parquet export manifest), so it changes whenever the ETL rewrites the
+    data. Results cached or shared in memory should be keyed on it.
+
+    Returns:
+        Opaque version string ("0" if the data file is missing)
+
+    """
+    if settings.DATA_BACKEND == "parquet":
+        path = os.path.join(settings.PARQUET_DIR, PARQUET_MANIFEST)
+    else:
+        path = DB_PATH
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "0"
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
 
 def get_db_connection(read_only: bool = False) -> duckdb.DuckDBPyConnection:
     """Get a database connection.
 
     Args:
-        read_only: If True, returns a shared read-only connection.
+        read_only: If True, returns a shared read-only connection (backed by
+                  Parquet views when DATA_BACKEND is "parquet").
                   If False, creates a new connection for write operations.
 
     Returns:
@@ -26,35 +157,243 @@ def get_db_connection(read_only: bool = False) -> duckdb.DuckDBPyConnection:
     global _shared_connection
     if read_only:
         if _shared_connection is None:
-            _shared_connection = duckdb.connect(DB_PATH, read_only=True)
+            if settings.DATA_BACKEND == "parquet":
+                _shared_connection = connect_parquet(settings.PARQUET_DIR)
+            else:
+                _shared_connection = duckdb.connect(DB_PATH, read_only=True, config=duckdb_config())
         return _shared_connection
     # For write operations, create a new connection
     conn = duckdb.connect(DB_PATH, read_only=read_only)
     return conn
 
 
+class CursorPool:
+    """Bounded pool of cursors on the shared read-only connection.
+
+    A DuckDB connection runs one query at a time, so request threads sharing
+    it queue up on its internal lock. Cursors are independent connections to
+    the same database and run concurrently. Checkout waits are recorded in
+    the db_pool_checkout_wait_seconds metric.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._idle: queue.LifoQueue[duckdb.DuckDBPyConnection] = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def checkout(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        started = time.perf_counter()
+        try:
+            cursor = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    cursor = get_db_connection(read_only=True).cursor()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                cursor = self._idle.get()
+        db_pool_wait.observe(time.perf_counter() - started)
+        try:
+            yield cursor
+        finally:
+            self._idle.put(cursor)
+
+    def reset(self) -> None:
+        """Close idle cursors, e.g. after the shared connection is replaced."""
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._created = 0
+
+
+read_pool = CursorPool(settings.DB_READ_CURSORS)
+
+
+def close_connections() -> None:
+    """Close the shared read-only connection and its pooled cursors.
+
+    The next read reopens them. Pre-forking servers call this in the parent
+    so each worker opens its own handle instead of inheriting one.
+    """
+    global _shared_connection
+    read_pool.reset()
+    if _shared_connection is not None:
+        _shared_connection.close()
+        _shared_connection = None
+
+
+class QueryExecutor:
+    """Dedicated threads for blocking data access from async endpoints.
+
+    Sized like the read cursor pool, so queries never queue on a cursor
+    inside a thread; they queue here instead, where the backlog is bounded.
+    Once ``workers + max_queued`` calls are pending, further calls fail
+    immediately with DatabaseOverloadedError (HTTP 503) rather than piling up.
+    Endpoints that don't touch the database stay on the event loop and are
+    not held up by slow scans.
+    """
+
+    def __init__(self, workers: int, max_queued: int) -> None:
+        self.workers = workers
+        self.max_queued = max_queued
+        self._pending = 0
+        self._lock = threading.Lock()
+        # Started lazily so a pre-forking server doesn't fork the threads
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def pending(self) -> int:
+        """Calls running or waiting for a thread."""
+        return self._pending
+
+    def _submit(self, fn: Callable[[], T]) -> "Future[T]":
+        with self._lock:
+            if self._pending >= self.workers + self.max_queued:
+                db_executor_rejected.inc()
+                raise DatabaseOverloadedError(self._pending)
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="db")
+            executor = self._executor
+        try:
+            future = executor.submit(fn)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the call finishes, even if the awaiting request is cancelled
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        """Run ``fn(*args, **kwargs)`` on an executor thread and await its result.
+
+        Context variables (e.g. the request's profiling collector) are copied
+        into the thread, and the call is profiled there if the request asked
+        for it.
+
+        Raises:
+            DatabaseOverloadedError: If too many calls are already pending
+
+        """
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, run_profiled, functools.partial(fn, *args, **kwargs))
+        return await asyncio.wrap_future(self._submit(call))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+db_executor = QueryExecutor(settings.DB_EXECUTOR_WORKERS or settings.DB_READ_CURSORS, settings.DB_EXECUTOR_QUEUE)
+db_executor_pending.function = lambda: db_executor.pending
+
+
+async def run_db(fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Await a blocking data-access call (e.g. a repository method) on the DB executor.
+
+    Methods decorated with app.core.singleflight.coalesce join an identical
+    in-flight call instead, without taking an executor slot.
+
+    Usage:
+        teams = await run_db(repo.get_teams, active_only=True)
+
+    """
+    coalesced = getattr(fn, "__coalesced__", None)
+    if coalesced is not None and hasattr(fn, "__self__"):
+        return cast(T, await coalesced.run_async(fn.__self__, args, kwargs, db_executor.run))
+    return await db_executor.run(fn, *args, **kwargs)
+
+
+@contextmanager
+def _connection(read_only: bool) -> Iterator[duckdb.DuckDBPyConnection]:
+    """Yield a pooled read cursor, or a fresh write connection closed afterwards."""
+    if read_only:
+        with read_pool.checkout() as cursor:
+            yield cursor
+        return
+    conn = get_db_connection(read_only=False)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _run_query(
+    query: str,
+    params: list[Any] | None,
+    read_only: bool,
+    fetch: Callable[[duckdb.DuckDBPyConnection], T],
+    row_count: Callable[[T], int],
+    timeout: float | None = None,
+    fingerprint: str | None = None,
+) -> T:
+    """Execute ``query`` and ``fetch`` its result, reporting timings.
+
+    Execution and fetch times go to the query recorder (unless
+    QUERY_INSTRUMENTATION is disabled) and the total to the request profiler.
+    With ``timeout`` (seconds) the connection is interrupted once it runs
+    out, and DuckDB raises ``duckdb.InterruptException``. ``fingerprint``
+    replaces the SQL's own in the recorder and metrics.
+    """
+    with _connection(read_only) as conn:
+        timer = threading.Timer(timeout, conn.interrupt) if timeout else None
+        started = time.perf_counter()
+        if timer is not None:
+            timer.start()
+        try:
+            result = conn.execute(query, params) if params else conn.execute(query)
+            executed = time.perf_counter()
+            fetched = fetch(result)
+        finally:
+            if timer is not None:
+                timer.cancel()
+        finished = time.perf_counter()
+        if settings.QUERY_INSTRUMENTATION:
+            query_recorder.observe(
+                query, params, row_count(fetched), executed - started, finished - executed, conn, fingerprint,
+            )
+        collector = current_collector()
+        if collector is not None:
+            collector.add("db", (finished - started) * 1000, find_caller())
+        return fetched
+
+
 def execute_query(
     query: str, params: list[Any] | None = None, read_only: bool = True,
 ) -> list[Any]:
     """Execute a query and return results as a list.
 
+    Timings are reported to the query recorder (see app.core.instrumentation)
+    unless QUERY_INSTRUMENTATION is disabled.
+
     Args:
         query: SQL query string
         params: Query parameters
-        read_only: Whether to use a read-only connection
+        read_only: Whether to use a pooled read-only cursor
 
     Returns:
         List of query results
 
     """
-    conn = get_db_connection(read_only=read_only)
-    try:
-        if params:
-            return cast(list[Any], conn.execute(query, params).fetchall())
-        return cast(list[Any], conn.execute(query).fetchall())
-    finally:
-        if not read_only:
-            conn.close()
+    return _run_query(query, params, read_only, lambda result: cast(list[Any], result.fetchall()), len)
 
 
 def execute_query_df(
@@ -64,20 +403,56 @@ def execute_query_df(
 ) -> pd.DataFrame:
     """Execute a query and return results as a DataFrame.
 
+    Timings are reported to the query recorder like execute_query; the
+    DataFrame conversion counts as fetch time.
+
     Args:
         query: SQL query string
         params: Query parameters
-        read_only: Whether to use a read-only connection
+        read_only: Whether to use a pooled read-only cursor
 
     Returns:
         DataFrame with query results
 
     """
-    conn = get_db_connection(read_only=read_only)
-    try:
-        if params:
-            return conn.execute(query, params).df()
-        return conn.execute(query).df()
-    finally:
-        if not read_only:
-            conn.close()
+    return _run_query(query, params, read_only, lambda result: result.df(), len)
+
+
+def execute_query_rows(
+    query: str, params: list[Any] | None = None, timeout: float | None = None, fingerprint: str | None = None,
+) -> tuple[list[str], list[tuple[Any, ...]]]:
+    """Execute a read query and return its column names and raw rows.
+
+    Args:
+        query: SQL query string
+        params: Query parameters
+        timeout: Seconds before the query is interrupted
+            (``duckdb.InterruptException``); None waits indefinitely
+        fingerprint: Record the query under this fingerprint, for generated
+            SQL that would otherwise create a fingerprint per shape
+
+    Returns:
+        Column names and row tuples, in result order
+
+    """
+
+    def fetch(result: duckdb.DuckDBPyConnection) -> tuple[list[str], list[tuple[Any, ...]]]:
+        columns = [str(column[0]) for column in result.description or []]
+        return columns, result.fetchall()
+
+    return _run_query(query, params, True, fetch, lambda fetched: len(fetched[1]), timeout, fingerprint)
+
+
+def execute_query_arrow(query: str, params: list[Any] | None = None) -> "pa.Table":
+    """Execute a read query and return its result as a pyarrow Table.
+
+    The table is assembled from DuckDB's record batches (``fetch_record_batch``)
+    without going through Python objects. Requires pyarrow.
+    """
+    return _run_query(
+        query,
+        params,
+        True,
+        lambda result: result.fetch_record_batch(settings.EXPORT_CHUNK_ROWS).read_all(),
+        lambda table: int(table.num_rows),
+    )
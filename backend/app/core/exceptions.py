@@ -43,6 +43,14 @@ class DatabaseError(AppError):
         self.operation = operation
 
 
+class DatabaseOverloadedError(AppError):
+    """Raised when too many database calls are already queued."""
+
+    def __init__(self, pending: int, details: dict[str, Any] | None = None) -> None:
+        super().__init__("Database is busy, please retry shortly", details)
+        self.pending = pending
+
+
 class ValidationError(AppError):
     """Raised when input validation fails."""
 
@@ -55,3 +63,19 @@ class ValidationError(AppError):
         msg = f"Validation error for '{field}': {message}"
         super().__init__(msg, details)
         self.field = field
+
+
+class QueryTimeoutError(AppError):
+    """Raised when a user-defined query runs past its time budget."""
+
+    def __init__(self, timeout_ms: int, details: dict[str, Any] | None = None) -> None:
+        super().__init__(f"Query exceeded its {timeout_ms} ms time budget; narrow the filters", details)
+        self.timeout_ms = timeout_ms
+
+
+class NotAcceptableError(AppError):
+    """Raised when no response format the client accepts can be produced."""
+
+    def __init__(self, available: list[str], details: dict[str, Any] | None = None) -> None:
+        super().__init__(f"Acceptable formats: {', '.join(available)}", details)
+        self.available = available
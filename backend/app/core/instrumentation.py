@@ -0,0 +1,251 @@
+"""Per-query instrumentation and slow-query logging.
+
+execute_query and execute_query_df report every query here with its time
+split into execution (DuckDB running the statement) and fetch (materializing
+rows and converting them to Python objects or a DataFrame). Queries are
+grouped by fingerprint, the SQL with literals replaced and whitespace
+collapsed, so the same repository query with different parameters aggregates
+into one entry. Generated queries, whose SQL varies with the request, pass a
+fixed fingerprint instead (``/query`` uses ``query:<dataset>``). At most
+QUERY_STATS_MAX_FINGERPRINTS are kept, least recently seen evicted first:
+
+    from app.core.instrumentation import query_recorder
+
+    for stats in query_recorder.snapshot():
+        print(stats["caller"], stats["p95_ms"], stats["sql"])
+
+Queries slower than SLOW_QUERY_MS are written as JSON records to the
+``app.slow_queries`` logger (a separate file when SLOW_QUERY_LOG is set),
+optionally with the EXPLAIN ANALYZE plan of a re-run.
+"""
+
+import hashlib
+import logging
+import math
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any
+
+import duckdb
+from pythonjsonlogger.json import JsonFormatter
+
+from app.core.config import settings
+from app.core.metrics import db_query_duration
+
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Minimum seconds between EXPLAIN ANALYZE captures of the same fingerprint
+EXPLAIN_INTERVAL_SECONDS = 300.0
+
+
+def normalize_sql(sql: str) -> str:
+    """Replace literals with placeholders and collapse whitespace."""
+    normalized = _STRING_LITERAL.sub("?", sql)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("(?...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def _short_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=6).hexdigest()
+
+
+def fingerprint(sql: str) -> str:
+    """Short stable identifier for a query shape."""
+    return _short_hash(normalize_sql(sql))
+
+
+def params_hash(params: list[Any] | None) -> str | None:
+    """Short hash of the parameter values, so slow calls can be correlated without logging them."""
+    if not params:
+        return None
+    return _short_hash(repr(params))
+
+
+def find_caller(max_depth: int = 12) -> str:
+    """Name the first frame outside app.core, e.g. ``GameRepository.get_games``."""
+    frame = sys._getframe(1)
+    for _ in range(max_depth):
+        if frame is None:
+            break
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith("app.core"):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            return f"{type(owner).__name__}.{name}" if owner is not None else f"{module}.{name}"
+        frame = frame.f_back  # type: ignore[assignment]
+    return "unknown"
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    # Nearest-rank percentile
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class QueryStats:
+    """Running totals and a bounded sample of timings for one fingerprint."""
+
+    def __init__(self, sql: str, caller: str, sample_size: int) -> None:
+        self.sql = sql
+        self.callers: set[str] = {caller}
+        self.count = 0
+        self.rows = 0
+        self.exec_ms = 0.0
+        self.fetch_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: deque[float] = deque(maxlen=sample_size)
+        self.last_explain = 0.0
+
+    def add(self, caller: str, rows: int, exec_ms: float, fetch_ms: float) -> None:
+        total_ms = exec_ms + fetch_ms
+        self.callers.add(caller)
+        self.count += 1
+        self.rows += rows
+        self.exec_ms += exec_ms
+        self.fetch_ms += fetch_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        self.samples.append(total_ms)
+
+    def to_dict(self, key: str) -> dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            "fingerprint": key,
+            "sql": self.sql,
+            "caller": ", ".join(sorted(self.callers)),
+            "count": self.count,
+            "rows": self.rows,
+            "total_ms": round(self.exec_ms + self.fetch_ms, 3),
+            "exec_ms": round(self.exec_ms, 3),
+            "fetch_ms": round(self.fetch_ms, 3),
+            "p50_ms": round(_percentile(ordered, 50), 3),
+            "p95_ms": round(_percentile(ordered, 95), 3),
+            "p99_ms": round(_percentile(ordered, 99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class QueryRecorder:
+    """Thread-safe per-fingerprint query statistics and slow-query logging."""
+
+    def __init__(self, sample_size: int = 1000, max_fingerprints: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self._stats: OrderedDict[str, QueryStats] = OrderedDict()
+        self.sample_size = sample_size
+        self.max_fingerprints = max_fingerprints
+
+    def observe(
+        self,
+        sql: str,
+        params: list[Any] | None,
+        rows: int,
+        exec_seconds: float,
+        fetch_seconds: float,
+        conn: duckdb.DuckDBPyConnection | None = None,
+        key: str | None = None,
+    ) -> None:
+        """Record one query execution and log it if slow.
+
+        Args:
+            sql: Query text as executed
+            params: Query parameters
+            rows: Rows returned
+            exec_seconds: Time spent in execute()
+            fetch_seconds: Time spent fetching and converting the result
+            conn: Connection the query ran on, used for EXPLAIN ANALYZE
+            key: Fingerprint to group under instead of the SQL's own
+
+        """
+        normalized = normalize_sql(sql)
+        if key is None:
+            key = _short_hash(normalized)
+        caller = find_caller()
+        exec_ms = exec_seconds * 1000
+        fetch_ms = fetch_seconds * 1000
+        db_query_duration.observe(exec_seconds + fetch_seconds, (key,))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats(normalized, caller, self.sample_size)
+                while len(self._stats) > self.max_fingerprints:
+                    self._stats.popitem(last=False)
+            else:
+                self._stats.move_to_end(key)
+            stats.add(caller, rows, exec_ms, fetch_ms)
+
+            explain = False
+            now = time.monotonic()
+            if (
+                settings.SLOW_QUERY_EXPLAIN
+                and exec_ms + fetch_ms >= settings.SLOW_QUERY_MS
+                and now - stats.last_explain >= EXPLAIN_INTERVAL_SECONDS
+            ):
+                stats.last_explain = now
+                explain = True
+
+        if exec_ms + fetch_ms >= settings.SLOW_QUERY_MS:
+            record: dict[str, Any] = {
+                "fingerprint": key,
+                "sql": normalized,
+                "params_hash": params_hash(params),
+                "caller": caller,
+                "rows": rows,
+                "exec_ms": round(exec_ms, 3),
+                "fetch_ms": round(fetch_ms, 3),
+                "total_ms": round(exec_ms + fetch_ms, 3),
+            }
+            if explain and conn is not None:
+                record["plan"] = explain_analyze(conn, sql, params)
+            slow_query_logger.warning("Slow query", extra=record)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Per-fingerprint statistics, by total time descending."""
+        with self._lock:
+            entries = [stats.to_dict(key) for key, stats in self._stats.items()]
+        return sorted(entries, key=lambda entry: entry["total_ms"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def explain_analyze(conn: duckdb.DuckDBPyConnection, sql: str, params: list[Any] | None) -> str | None:
+    """Re-run a read query under EXPLAIN ANALYZE and return the plan text."""
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return None
+    try:
+        rows = conn.execute(f"EXPLAIN ANALYZE {sql}", params or []).fetchall()
+    except duckdb.Error as e:
+        return f"EXPLAIN ANALYZE failed: {e}"
+    return str(rows[0][1]) if rows else None
+
+
+def configure_slow_query_log(path: str | None = None) -> None:
+    """Send slow-query records to their own JSON lines file.
+
+    Without a path the records go through the application log handlers.
+    Calling this again replaces the file handler rather than adding another.
+    """
+    for handler in list(slow_query_logger.handlers):
+        slow_query_logger.removeHandler(handler)
+        handler.close()
+    slow_query_logger.propagate = not path
+    if path:
+        handler = logging.FileHandler(path)
+        handler.setFormatter(JsonFormatter("%(asctime)s %(name)s %(levelname)s %(message)s", timestamp=True))
+        slow_query_logger.addHandler(handler)
+
+
+query_recorder = QueryRecorder(
+    sample_size=settings.QUERY_STATS_SAMPLES, max_fingerprints=settings.QUERY_STATS_MAX_FINGERPRINTS,
+)
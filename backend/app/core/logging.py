@@ -1,34 +1,165 @@
-"""Structured logging configuration for the application."""
+"""Structured logging configuration for the application.
 
+By default (LOG_ASYNC) records are handed to a bounded queue and formatted
+as JSON and written to stdout by a background listener thread, so request
+threads never wait on log I/O. When the queue is full new records are
+dropped rather than blocking; the number dropped is counted in the
+``log_records_dropped_total`` metric and reported in the log once the
+queue drains.
+
+High-volume INFO logs can be sampled per logger prefix with LOG_SAMPLING,
+e.g. ``{"app.api.graphql": 0.01}`` keeps 1% of that package's INFO and
+DEBUG records; warnings and errors are always kept.
+"""
+
+import atexit
 import logging
+import queue
+import random
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 from pythonjsonlogger.json import JsonFormatter
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import Counter, registry
+
+logs_dropped = registry.register(
+    Counter("log_records_dropped_total", "Log records dropped because the log queue was full."),
+)
+access_logger = logging.getLogger("app.access")
+
+_handlers: list[logging.Handler] = []
+_listener: QueueListener | None = None
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of INFO-and-below records from matching loggers."""
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        super().__init__()
+        # Longest prefix first so the most specific rate wins
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                return random.random() < rate
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full.
+
+    Only the message is interpolated on the calling thread; JSON formatting
+    is left to the listener.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._reported = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve args and exceptions now: they may change or be freed before
+        # the listener gets to the record
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.dropped != self._reported:
+                self._report_dropped()
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            logs_dropped.inc()
+
+    def _report_dropped(self) -> None:
+        count = self.dropped - self._reported
+        notice = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0, f"Dropped {count} log records (log queue full)", None, None,
+        )
+        self.queue.put_nowait(notice)
+        self._reported = self.dropped
+
+
+def _json_formatter() -> JsonFormatter:
+    return JsonFormatter(
+        "%(asctime)s %(name)s %(levelname)s %(message)s %(pathname)s %(lineno)d",
+        timestamp=True,
+    )
 
 
-def configure_logging(level: str = "INFO") -> None:
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread, if running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    async_mode: bool | None = None,
+    queue_size: int | None = None,
+    sampling: dict[str, float] | None = None,
+) -> None:
     """Configure structured JSON logging for the application.
 
+    Safe to call more than once: handlers installed by a previous call are
+    replaced rather than duplicated.
+
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        async_mode: Write through a queue and listener thread (default: LOG_ASYNC)
+        queue_size: Maximum queued records before dropping (default: LOG_QUEUE_SIZE)
+        sampling: Logger prefix to fraction of INFO records kept (default: LOG_SAMPLING)
 
     """
+    global _listener
+    async_mode = settings.LOG_ASYNC if async_mode is None else async_mode
+    queue_size = settings.LOG_QUEUE_SIZE if queue_size is None else queue_size
+    sampling = settings.LOG_SAMPLING if sampling is None else sampling
+
     log_level = getattr(logging, level.upper(), logging.INFO)
+    root_logger = logging.getLogger()
 
-    # Create JSON formatter
-    formatter = JsonFormatter(
-        "%(asctime)s %(name)s %(levelname)s %(message)s %(pathname)s %(lineno)d",
-        timestamp=True,
-    )
+    stop_logging()
+    for installed in _handlers:
+        root_logger.removeHandler(installed)
+        installed.close()
+    _handlers.clear()
 
     # Configure handler
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(_json_formatter())
+
+    handler: logging.Handler = stream_handler
+    if async_mode:
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=queue_size)
+        handler = DroppingQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=False)
+        _listener.start()
+    if sampling:
+        handler.addFilter(SamplingFilter(sampling))
 
     # Configure root logger
-    root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     root_logger.addHandler(handler)
+    _handlers.append(handler)
+
+
+atexit.register(stop_logging)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -42,3 +173,44 @@ def get_logger(name: str) -> logging.Logger:
 
     """
     return logging.getLogger(name)
+
+
+class AccessLogMiddleware:
+    """ASGI middleware logging one ``app.access`` record per HTTP request.
+
+    The record carries the fields as attributes and is formatted by the log
+    listener, so the request thread only builds a LogRecord. Sampling for
+    ``app.access`` applies like any other logger.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not access_logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            client = scope.get("client")
+            access_logger.info(
+                "request",
+                extra={
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                    "client": client[0] if client else None,
+                },
+            )
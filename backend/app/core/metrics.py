@@ -0,0 +1,267 @@
+"""Prometheus-style metrics with thread-sharded counters.
+
+Metrics are recorded on every request and query, so updates must not
+contend: each thread increments its own shard without taking a lock, and
+shards are only summed when ``/metrics`` is scraped. A lock is taken once
+per thread (to register its shard) and once per scrape.
+
+    from app.core.metrics import record_cache
+
+    record_cache("team_aliases", hit=True)
+
+``MetricsMiddleware`` records request latency per route template (e.g.
+``/api/v1/players/{player_id}``, never the raw path) and in-flight requests.
+``render_metrics`` produces the text exposition format.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+Labels = tuple[str, ...]
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Sharded:
+    """Per-thread dicts of label values to lists of floats.
+
+    Only the owning thread writes a shard, so updates need no lock; readers
+    sum across shards and tolerate seeing an update half a scrape late.
+    """
+
+    def __init__(self, width: int) -> None:
+        self._width = width
+        self._local = threading.local()
+        self._shards: list[dict[Labels, list[float]]] = []
+        self._lock = threading.Lock()
+
+    def slot(self, labels: Labels) -> list[float]:
+        shard: dict[Labels, list[float]] | None = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        values = shard.get(labels)
+        if values is None:
+            values = shard[labels] = [0.0] * self._width
+        return values
+
+    def totals(self) -> dict[Labels, list[float]]:
+        with self._lock:
+            shards = list(self._shards)
+        merged: dict[Labels, list[float]] = {}
+        for shard in shards:
+            for labels, values in list(shard.items()):
+                total = merged.setdefault(labels, [0.0] * self._width)
+                for i, value in enumerate(values):
+                    total[i] += value
+        return merged
+
+
+class Counter:
+    """Monotonic counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = _Sharded(1)
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self._values.slot(labels)[0] += amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.totals().get(labels, [0.0])[0]
+
+    def samples(self) -> Iterable[str]:
+        for labels, (value,) in sorted(self._values.totals().items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """Value that goes up and down; increments are sharded like Counter.
+
+    A gauge built with ``function`` reports that callable's value instead.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        function: Callable[[], float] | None = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self._values.slot(labels)[0] -= amount
+
+    def samples(self) -> Iterable[str]:
+        if self.function is not None:
+            yield f"{self.name} {_format_value(self.function())}"
+        else:
+            yield from super().samples()
+
+
+class Histogram:
+    """Cumulative-bucket histogram with sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # One slot per bucket, then +Inf, sum
+        self._values = _Sharded(len(buckets) + 2)
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        values = self._values.slot(labels)
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def samples(self) -> Iterable[str]:
+        for labels, values in sorted(self._values.totals().items()):
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float("inf")), values[:-1], strict=True):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {_format_value(cumulative)}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(values[-1])}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {_format_value(cumulative)}"
+
+
+Metric = TypeVar("Metric", Counter, Gauge, Histogram)
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: list[Counter | Histogram] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.register(
+    Counter("http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")),
+)
+http_request_duration = registry.register(
+    Histogram("http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route")),
+)
+http_in_flight = registry.register(Gauge("http_requests_in_flight", "HTTP requests currently being served."))
+db_query_duration = registry.register(
+    Histogram("db_query_duration_seconds", "Query latency (execute plus fetch) by SQL fingerprint.", ("fingerprint",)),
+)
+db_pool_wait = registry.register(
+    Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a read cursor from the pool.",
+        buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+    ),
+)
+db_executor_pending = registry.register(
+    Gauge("db_executor_pending", "Database calls from async endpoints running or queued."),
+)
+db_executor_rejected = registry.register(
+    Counter("db_executor_rejected_total", "Database calls rejected with 503 because the queue was full."),
+)
+cache_requests = registry.register(
+    Counter("cache_requests_total", "Cache lookups by cache and result (hit or miss).", ("cache", "result")),
+)
+threadpool_busy = registry.register(Gauge("threadpool_threads_busy", "Worker threads currently running sync handlers."))
+threadpool_limit = registry.register(Gauge("threadpool_threads_limit", "Maximum worker threads for sync handlers."))
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup; hit ratios are derived from cache_requests_total."""
+    cache_requests.inc((cache, "hit" if hit else "miss"))
+
+
+def render_metrics() -> str:
+    """Render all metrics; call from the event loop so threadpool gauges can read the limiter."""
+    from anyio.to_thread import current_default_thread_limiter
+
+    limiter = current_default_thread_limiter()
+    threadpool_busy.function = lambda: limiter.borrowed_tokens
+    threadpool_limit.function = lambda: limiter.total_tokens
+    return registry.render()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, status and in-flight requests."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            # The router stores the matched route in the scope; unmatched paths
+            # share one label so arbitrary URLs can't grow the label set
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_request_duration.observe(time.perf_counter() - started, (method, template))
+            http_requests.inc((method, template, str(status)))
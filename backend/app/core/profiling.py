@@ -0,0 +1,251 @@
+"""Per-request profiling with ``?profile=1``.
+
+Routes built with ``ProfilingRoute`` accept a ``profile`` query parameter
+when profiling is allowed (DEBUG, or an ``X-Profile-Token`` header matching
+PROFILE_TOKEN). The response then carries a ``Server-Timing`` header, which
+browser devtools display as a waterfall:
+
+    dependencies     request parsing and dependency resolution
+    endpoint         the endpoint function, containing:
+      db             each execute_query/execute_query_df call (desc = caller)
+      df_cleanup     NaN-to-None conversion of query results
+      models         Pydantic model construction
+    serialization    response validation and JSON rendering
+
+``?profile=cprofile`` also profiles the request under cProfile (or
+``?profile=pyinstrument`` under pyinstrument, if installed) and writes the
+result to PROFILE_DIR, named in the ``X-Profile-Artifact`` header. For
+async endpoints that covers each ``run_db`` call on the DB executor, where
+queries and DataFrame work run; the event loop isn't profiled, since it
+also runs other requests.
+
+Spans are collected through a context variable, so code outside a profiled
+request pays only for one ``ContextVar.get``.
+"""
+
+import cProfile
+import functools
+import inspect
+import os
+import pstats
+import re
+import secrets
+import time
+from collections.abc import Callable, Coroutine, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+import anyio.to_thread
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.config import settings
+
+PROFILE_MODES = ("1", "cprofile", "pyinstrument")
+
+T = TypeVar("T")
+
+
+@dataclass
+class Span:
+    name: str
+    duration_ms: float
+    description: str | None = None
+
+
+@dataclass
+class ProfileCollector:
+    """Spans recorded during one profiled request."""
+
+    mode: str
+    spans: list[Span] = field(default_factory=list)
+    endpoint_started: float | None = None
+    endpoint_finished: float | None = None
+    # cProfile.Profile objects or pyinstrument sessions, one per profiled call
+    profiles: list[Any] = field(default_factory=list)
+    artifact: str | None = None
+
+    def add(self, name: str, duration_ms: float, description: str | None = None) -> None:
+        self.spans.append(Span(name, duration_ms, description))
+
+    def server_timing(self) -> str:
+        """Render spans as a Server-Timing header value."""
+        entries = []
+        for span in self.spans:
+            entry = f"{span.name};dur={span.duration_ms:.2f}"
+            if span.description:
+                entry += f';desc="{_header_safe(span.description)}"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+
+_collector: ContextVar[ProfileCollector | None] = ContextVar("profile_collector", default=None)
+
+
+def _header_safe(text: str) -> str:
+    return re.sub(r'["\\\r\n]', "", text)[:200]
+
+
+def current_collector() -> ProfileCollector | None:
+    return _collector.get()
+
+
+@contextmanager
+def span(name: str, description: str | None = None) -> Iterator[None]:
+    """Time a block as a named span when the current request is profiled."""
+    collector = _collector.get()
+    if collector is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        collector.add(name, (time.perf_counter() - started) * 1000, description)
+
+
+def profiling_allowed(request: Request) -> bool:
+    if settings.DEBUG:
+        return True
+    token = request.headers.get("X-Profile-Token")
+    return bool(settings.PROFILE_TOKEN and token and secrets.compare_digest(token, settings.PROFILE_TOKEN))
+
+
+def _write_artifact(collector: ProfileCollector, route_name: str) -> None:
+    """Merge the request's profiles into one file in PROFILE_DIR."""
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    stem = os.path.join(settings.PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{route_name}-{secrets.token_hex(3)}")
+    if collector.mode == "cprofile":
+        path = f"{stem}.prof"
+        pstats.Stats(*collector.profiles).dump_stats(path)
+    else:
+        from pyinstrument.renderers import HTMLRenderer
+        from pyinstrument.session import Session
+
+        path = f"{stem}.html"
+        with open(path, "w") as f:
+            f.write(HTMLRenderer().render(functools.reduce(Session.combine, collector.profiles)))
+    collector.artifact = path
+
+
+def _profile_cprofile(collector: ProfileCollector, fn: Callable[[], T]) -> T:
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Another profiler is already active (one per process from Python 3.12)
+        return fn()
+    try:
+        return fn()
+    finally:
+        profile.disable()
+        collector.profiles.append(profile)
+
+
+def _profile_pyinstrument(collector: ProfileCollector, fn: Callable[[], T]) -> T:
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        return fn()
+    profiler = Profiler(async_mode="disabled")
+    profiler.start()
+    try:
+        return fn()
+    finally:
+        collector.profiles.append(profiler.stop())
+
+
+def run_profiled(fn: Callable[[], T]) -> T:
+    """Call ``fn`` under the current request's profiler, if it asked for one.
+
+    Profilers only see the thread they run on, so this runs where the work
+    happens: in the DB executor thread for ``run_db`` calls (the collector
+    travels there through the copied context) and in the threadpool for
+    sync endpoints. The event loop itself is never profiled, since it
+    interleaves other requests.
+    """
+    collector = _collector.get()
+    if collector is None or collector.mode == "1":
+        return fn()
+    if collector.mode == "cprofile":
+        return _profile_cprofile(collector, fn)
+    return _profile_pyinstrument(collector, fn)
+
+
+def _timed_call(call: Callable[..., object], route_name: str) -> Callable[..., object]:
+    """Wrap an endpoint so a profiled request records its span and profiles."""
+    if inspect.iscoroutinefunction(call):
+
+        @functools.wraps(call)
+        async def async_wrapper(*args: object, **kwargs: object) -> object:
+            collector = _collector.get()
+            if collector is None:
+                return await call(*args, **kwargs)
+            collector.endpoint_started = time.perf_counter()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                collector.endpoint_finished = time.perf_counter()
+                if collector.profiles:
+                    await anyio.to_thread.run_sync(_write_artifact, collector, route_name)
+
+        return async_wrapper
+
+    @functools.wraps(call)
+    def wrapper(*args: object, **kwargs: object) -> object:
+        collector = _collector.get()
+        if collector is None:
+            return call(*args, **kwargs)
+        collector.endpoint_started = time.perf_counter()
+        try:
+            return run_profiled(functools.partial(call, *args, **kwargs))
+        finally:
+            collector.endpoint_finished = time.perf_counter()
+            # Sync endpoints already run in the threadpool
+            if collector.profiles:
+                _write_artifact(collector, route_name)
+
+    return wrapper
+
+
+class ProfilingRoute(APIRoute):
+    """APIRoute that honours ``?profile=`` for allowed requests."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        # Wrap the call after FastAPI has analysed the original endpoint's signature
+        self.dependant.call = _timed_call(self.endpoint, self.name)
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request) -> Response:
+            mode = request.query_params.get("profile")
+            if mode not in PROFILE_MODES or not profiling_allowed(request):
+                return await handler(request)
+
+            collector = ProfileCollector(mode=mode)
+            token = _collector.set(collector)
+            started = time.perf_counter()
+            try:
+                response = await handler(request)
+            finally:
+                _collector.reset(token)
+            finished = time.perf_counter()
+
+            # Nested spans were recorded as they happened; add the outer phases
+            inner = collector.spans
+            endpoint_started = collector.endpoint_started or started
+            endpoint_finished = collector.endpoint_finished or finished
+            collector.spans = [
+                Span("dependencies", (endpoint_started - started) * 1000),
+                Span("endpoint", (endpoint_finished - endpoint_started) * 1000),
+                *inner,
+                Span("serialization", (finished - endpoint_finished) * 1000),
+                Span("total", (finished - started) * 1000),
+            ]
+            response.headers["Server-Timing"] = collector.server_timing()
+            if collector.artifact:
+                response.headers["X-Profile-Artifact"] = collector.artifact
+            return response
+
+        return profiled_handler
@@ -1,7 +1,322 @@
-"""Rate limiting configuration using SlowAPI."""
+"""Rate limiting.
+
+Two backends, selected by RATE_LIMIT_BACKEND:
+
+``memory`` (default)
+    SlowAPI's in-process storage with fixed-window limits. Each worker
+    process counts separately.
+
+``shared``
+    A token bucket per client stored in a memory-mapped file that every
+    worker process on the host opens, so limits hold however many workers
+    run. Requests are charged per route (``RATE_LIMIT_COSTS``): a game log
+    costs more than ``/health``, which is free.
+
+The shared table is split into stripes of ``SLOTS_PER_STRIPE`` slots. A
+client hashes to one stripe and is stored in any free slot of it; updating a
+bucket takes that stripe's thread lock and an fcntl byte-range lock, so
+workers contend only when their clients share a stripe. To keep most
+requests off even that path, a process leases a few tokens at a time
+(``RATE_LIMIT_LEASE``) and spends them locally without locking. Leased
+tokens are already deducted from the shared bucket, so leasing can only make
+the limit stricter, never looser, and an unused lease lapses after
+``LEASE_SECONDS``.
+
+A bucket idle long enough to have refilled completely is indistinguishable
+from a new one, so its slot is free for reuse; a periodic sweep clears such
+slots and expired local leases.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any
 
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: the shared backend is unavailable
+    fcntl = None  # type: ignore[assignment]
+
+logger = get_logger(__name__)
 
 # Create limiter instance
 limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute", "1000/hour"])
+
+RATE_LIMIT_MESSAGE = "Rate limit exceeded. Please try again later."
+
+# Route template -> tokens charged per request; unlisted routes cost 1
+DEFAULT_ROUTE_COSTS: dict[str, float] = {
+    "/": 0,
+    "/health": 0,
+    "/metrics": 0,
+    "/api/v1/players/{player_id}/gamelog": 5,
+    "/api/v1/players/{player_id}/splits": 3,
+    "/api/v1/teams/{team_id}/gamelog": 3,
+    "/api/v1/games": 2,
+    "/api/v1/seasons/{season_id}/leaders": 3,
+    "/api/v1/seasons/{season_id}/odds": 20,
+    "/graphql": 2,
+    "/api/v1/query/{dataset}": 10,
+    "/api/v1/export/{table}": 20,
+}
+
+_MAGIC = b"NBARL001"
+_HEADER = struct.Struct("<8sIId")  # magic, stripes, slots per stripe, last sweep
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<Qdd")  # key hash (0 = empty), tokens, last update
+SLOTS_PER_STRIPE = 32
+LEASE_SECONDS = 1.0
+SWEEP_INTERVAL_SECONDS = 60.0
+
+
+def _key_hash(key: str) -> int:
+    value = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+    return value or 1
+
+
+class SharedTokenBucket:
+    """Token buckets keyed by client, shared between processes through a mmap'd file."""
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        burst: float,
+        stripes: int = 1024,
+        lease: float = 0.0,
+    ) -> None:
+        if fcntl is None:
+            msg = "The shared rate limit backend requires fcntl (POSIX)"
+            raise RuntimeError(msg)
+        self.rate = rate
+        self.burst = burst
+        self.lease = lease
+        # Seconds after which an untouched bucket is full again
+        self.idle_after = burst / rate if rate > 0 else math.inf
+        self._leases: dict[str, list[float]] = {}
+        self._sweep_lock = threading.Lock()
+        self._last_local_sweep = time.time()
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, _HEADER_SIZE, 0)
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header[:8] == _MAGIC:
+                _, stripes, slots, _ = _HEADER.unpack(header)
+            else:
+                slots = SLOTS_PER_STRIPE
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, _HEADER_SIZE + stripes * slots * _SLOT.size)
+                os.pwrite(self._fd, _HEADER.pack(_MAGIC, stripes, slots, time.time()), 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, _HEADER_SIZE, 0)
+
+        self.stripes = stripes
+        self.slots_per_stripe = slots
+        self._stripe_bytes = slots * _SLOT.size
+        self._mm = mmap.mmap(self._fd, _HEADER_SIZE + stripes * self._stripe_bytes)
+        # fcntl locks are per process, so threads also need their own
+        self._thread_locks = [threading.Lock() for _ in range(min(stripes, 64))]
+
+    def close(self) -> None:
+        self._mm.close()
+        os.close(self._fd)
+
+    def _locked(self, stripe: int) -> "_StripeLock":
+        return _StripeLock(self, stripe)
+
+    def take(self, key: str, cost: float = 1.0, now: float | None = None) -> tuple[bool, float]:
+        """Charge ``cost`` tokens to ``key``.
+
+        Returns:
+            (allowed, seconds until the request would be allowed)
+
+        """
+        if cost <= 0:
+            return True, 0.0
+        now = time.time() if now is None else now
+
+        # Fast path: spend from this process's lease without locking
+        lease = self._leases.get(key)
+        if lease is not None and lease[1] > now and lease[0] >= cost:
+            lease[0] -= cost
+            return True, 0.0
+
+        allowed, granted, retry_after = self._take_shared(key, cost + self.lease, cost, now)
+        if allowed and granted > cost:
+            self._leases[key] = [granted - cost, now + LEASE_SECONDS]
+        elif lease is not None:
+            self._leases.pop(key, None)
+
+        if now - self._last_local_sweep >= SWEEP_INTERVAL_SECONDS:
+            self.sweep(now)
+        return allowed, retry_after
+
+    def _take_shared(self, key: str, want: float, need: float, now: float) -> tuple[bool, float, float]:
+        key_hash = _key_hash(key)
+        stripe = key_hash % self.stripes
+        base = _HEADER_SIZE + stripe * self._stripe_bytes
+        with self._locked(stripe):
+            slot_offset = None
+            reusable = None
+            stalest, stalest_updated = base, math.inf
+            for i in range(self.slots_per_stripe):
+                offset = base + i * _SLOT.size
+                slot_hash, tokens, updated = _SLOT.unpack_from(self._mm, offset)
+                if slot_hash == key_hash:
+                    slot_offset = offset
+                    break
+                if reusable is None and (slot_hash == 0 or now - updated >= self.idle_after):
+                    reusable = offset
+                if updated < stalest_updated:
+                    stalest, stalest_updated = offset, updated
+
+            if slot_offset is None:
+                # New client: a full bucket in a free slot, or evict the stalest one
+                slot_offset = reusable if reusable is not None else stalest
+                tokens, updated = self.burst, now
+
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+            if tokens < need:
+                _SLOT.pack_into(self._mm, slot_offset, key_hash, tokens, now)
+                return False, 0.0, (need - tokens) / self.rate if self.rate > 0 else math.inf
+            granted = min(tokens, want)
+            _SLOT.pack_into(self._mm, slot_offset, key_hash, tokens - granted, now)
+            return True, granted, 0.0
+
+    def sweep(self, now: float | None = None) -> int:
+        """Drop expired leases, and clear idle slots if no process has lately.
+
+        Returns:
+            Number of shared slots cleared
+
+        """
+        now = time.time() if now is None else now
+        if not self._sweep_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._last_local_sweep = now
+            for key, lease in list(self._leases.items()):
+                if lease[1] <= now:
+                    self._leases.pop(key, None)
+
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, _HEADER_SIZE, 0)
+            try:
+                magic, stripes, slots, last_sweep = _HEADER.unpack_from(self._mm, 0)
+                if now - last_sweep < SWEEP_INTERVAL_SECONDS:
+                    return 0
+                _HEADER.pack_into(self._mm, 0, magic, stripes, slots, now)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, _HEADER_SIZE, 0)
+
+            cleared = 0
+            empty = _SLOT.pack(0, 0.0, 0.0)
+            for stripe in range(self.stripes):
+                base = _HEADER_SIZE + stripe * self._stripe_bytes
+                with self._locked(stripe):
+                    for i in range(self.slots_per_stripe):
+                        offset = base + i * _SLOT.size
+                        slot_hash, _, updated = _SLOT.unpack_from(self._mm, offset)
+                        if slot_hash and now - updated >= self.idle_after:
+                            self._mm[offset : offset + _SLOT.size] = empty
+                            cleared += 1
+            return cleared
+        finally:
+            self._sweep_lock.release()
+
+
+class _StripeLock:
+    """Thread lock plus fcntl byte-range lock over one stripe of the table."""
+
+    def __init__(self, bucket: SharedTokenBucket, stripe: int) -> None:
+        self.bucket = bucket
+        self.stripe = stripe
+        self.start = _HEADER_SIZE + stripe * bucket._stripe_bytes
+
+    def __enter__(self) -> None:
+        self.thread_lock = self.bucket._thread_locks[self.stripe % len(self.bucket._thread_locks)]
+        self.thread_lock.acquire()
+        fcntl.lockf(self.bucket._fd, fcntl.LOCK_EX, self.bucket._stripe_bytes, self.start)
+
+    def __exit__(self, *exc: object) -> None:
+        fcntl.lockf(self.bucket._fd, fcntl.LOCK_UN, self.bucket._stripe_bytes, self.start)
+        self.thread_lock.release()
+
+
+class RateLimitMiddleware:
+    """ASGI middleware charging each request's route cost to its client's bucket."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        bucket: SharedTokenBucket,
+        costs: dict[str, float] | None = None,
+        default_cost: float = 1.0,
+    ) -> None:
+        self.app = app
+        self.bucket = bucket
+        self.costs = {**DEFAULT_ROUTE_COSTS, **(costs or {})}
+        self.default_cost = default_cost
+        # Raw path -> cost; bounded since paths embed arbitrary IDs
+        self._path_costs: dict[tuple[str, str], float] = {}
+
+    def route_cost(self, scope: Scope) -> float:
+        cache_key = (scope.get("method", ""), scope["path"])
+        cost = self._path_costs.get(cache_key)
+        if cost is not None:
+            return cost
+
+        cost = self.default_cost
+        router: Any = getattr(scope.get("app"), "router", None)
+        for route in getattr(router, "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                cost = self.costs.get(getattr(route, "path", ""), self.default_cost)
+                break
+        if len(self._path_costs) >= 10_000:
+            self._path_costs.clear()
+        self._path_costs[cache_key] = cost
+        return cost
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        key = client[0] if client else "unknown"
+        allowed, retry_after = self.bucket.take(key, self.route_cost(scope))
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        logger.warning("Rate limit exceeded", extra={"ip": key, "path": scope["path"]})
+        response = JSONResponse(
+            status_code=429,
+            content={"error": RATE_LIMIT_MESSAGE},
+            headers={"Retry-After": str(max(1, math.ceil(min(retry_after, 3600.0))))},
+        )
+        await response(scope, receive, send)
+
+
+def create_shared_bucket() -> SharedTokenBucket:
+    """Open the shared bucket file configured in settings."""
+    return SharedTokenBucket(
+        settings.RATE_LIMIT_FILE,
+        rate=settings.RATE_LIMIT_PER_MINUTE / 60,
+        burst=settings.RATE_LIMIT_BURST or settings.RATE_LIMIT_PER_MINUTE,
+        lease=settings.RATE_LIMIT_LEASE,
+    )
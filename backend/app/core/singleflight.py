@@ -0,0 +1,159 @@
+"""Request coalescing ("single flight") for identical concurrent calls.
+
+When many clients ask for the same thing at once (a game that just ended),
+only the first call runs; callers arriving while it is in flight wait for it
+and receive the same result or exception. Nothing is kept once the call
+completes, so this flattens thundering herds without becoming a cache.
+
+Repository methods opt in with ``@coalesce``; calls are keyed on the method,
+its arguments and the data version (app.core.database.get_data_version), so
+a call never joins one started against older data:
+
+    class GameRepository(BaseRepository[Game]):
+        @coalesce
+        def get_by_id(self, game_id: str) -> Game | None: ...
+
+Sync callers (threadpool, scripts) block on the leader's result. Async
+endpoints calling ``await run_db(repo.get_by_id, game_id)`` await it without
+occupying a database executor thread. Shared results must be treated as
+read-only by every caller.
+"""
+
+import asyncio
+import functools
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from typing import Any, Generic, TypeVar
+
+from app.core.database import get_data_version
+from app.core.metrics import record_cache
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Group of in-flight calls, one per key."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future[Any]] = {}
+
+    def join(self, key: Hashable) -> tuple["Future[Any]", bool]:
+        """Return the in-flight call for ``key`` and whether the caller must run it."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            # A running future can't be cancelled, so one waiter giving up
+            # (asyncio.wrap_future propagates cancellation) can't cancel it for all
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            return future, True
+
+    def lead(self, key: Hashable, future: "Future[Any]", fn: Callable[[], Any]) -> None:
+        """Run ``fn`` and publish its outcome to everyone waiting on ``future``."""
+        try:
+            result = fn()
+        except BaseException as exc:
+            self.fail(key, future, exc)
+        else:
+            self.finish(key, future, result)
+
+    def finish(self, key: Hashable, future: "Future[Any]", result: object) -> None:
+        """Publish ``result`` to everyone waiting on ``future``."""
+        self._forget(key, future)
+        future.set_result(result)
+
+    def fail(self, key: Hashable, future: "Future[Any]", exc: BaseException) -> None:
+        """Publish ``exc`` to waiters unless the call already completed."""
+        self._forget(key, future)
+        if not future.done():
+            future.set_exception(exc)
+
+    def _forget(self, key: Hashable, future: "Future[Any]") -> None:
+        # Later callers start a new call rather than reading a finished one
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run ``fn``, or wait for the identical call already in flight."""
+        future, leader = self.join(key)
+        if leader:
+            self.lead(key, future, fn)
+        return future.result()  # type: ignore[no-any-return]
+
+
+class Coalesced(Generic[T]):
+    """A method whose concurrent identical calls share one execution."""
+
+    def __init__(self, method: Callable[..., T], flight: SingleFlight) -> None:
+        self.method = method
+        self.flight = flight
+        self.name = method.__qualname__
+        # Keeps leader tasks alive if the request that started them is cancelled
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def key(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable | None:
+        key = (self.name, args, tuple(sorted(kwargs.items())), get_data_version())
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def call(self, instance: object, args: tuple[Any, ...], kwargs: dict[str, Any]) -> T:
+        key = self.key(args, kwargs)
+        if key is None:
+            return self.method(instance, *args, **kwargs)
+        future, leader = self.flight.join(key)
+        record_cache(f"singleflight:{self.name}", hit=not leader)
+        if leader:
+            self.flight.lead(key, future, functools.partial(self.method, instance, *args, **kwargs))
+        return future.result()  # type: ignore[no-any-return]
+
+    async def run_async(
+        self,
+        instance: object,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        runner: Callable[..., Awaitable[Any]],
+    ) -> T:
+        """Await the call, running it through ``runner`` (e.g. the DB executor) if leading."""
+        key = self.key(args, kwargs)
+        fn = functools.partial(self.method, instance, *args, **kwargs)
+        if key is None:
+            return await runner(fn)  # type: ignore[no-any-return]
+        future, leader = self.flight.join(key)
+        record_cache(f"singleflight:{self.name}", hit=not leader)
+        if leader:
+
+            async def lead() -> None:
+                try:
+                    await runner(self.flight.lead, key, future, fn)
+                except BaseException as exc:
+                    # The runner refused the call (e.g. executor overloaded)
+                    self.flight.fail(key, future, exc)
+
+            task = asyncio.ensure_future(lead())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.wrap_future(future)
+
+
+def coalesce(method: Callable[..., T]) -> Callable[..., T]:
+    """Coalesce concurrent identical calls to a repository method.
+
+    Arguments must be hashable for calls to be shared; calls with
+    unhashable arguments run normally.
+    """
+    coalesced = Coalesced(method, SingleFlight())
+
+    @functools.wraps(method)
+    def wrapper(self: object, *args: object, **kwargs: object) -> T:
+        return coalesced.call(self, args, kwargs)
+
+    wrapper.__coalesced__ = coalesced  # type: ignore[attr-defined]
+    return wrapper
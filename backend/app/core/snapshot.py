@@ -0,0 +1,131 @@
+"""Serving pre-rendered snapshots of historical responses.
+
+``scripts/snapshot.py`` renders the v1 JSON for finished seasons (season
+pages, team schedules, games and box scores) into a static tree that
+mirrors the URL space::
+
+    <SNAPSHOT_DIR>/api/v1/seasons/2023/standings.json
+    <SNAPSHOT_DIR>/api/v1/seasons/2023/standings.json.gz   (and .br, .zst)
+    <SNAPSHOT_DIR>/manifest.json
+
+nginx can serve the tree directly (see nginx.snapshot.conf.example). Without
+a front proxy, StaticSnapshotMiddleware serves matching GETs from it before
+routing, rate limiting or any database work. The manifest records the data
+version the snapshot was rendered from; the middleware ignores a snapshot
+that no longer matches the database, so a stale tree is never served after
+an ETL run.
+"""
+
+import json
+import os
+import time
+from typing import Any
+
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.compression import select_encoding
+from app.core.database import get_data_version
+from app.core.metrics import record_cache
+
+MANIFEST_NAME = "manifest.json"
+
+# Content-Encoding -> file suffix, in order of server preference
+ENCODING_SUFFIXES = {"br": ".br", "zstd": ".zst", "gzip": ".gz"}
+
+# Only these paths are ever snapshotted
+SNAPSHOT_PREFIX = "/api/v1/"
+
+
+def snapshot_path(root: str, path: str) -> str | None:
+    """File holding the snapshot of URL ``path``, or None if it can't have one."""
+    if not path.startswith(SNAPSHOT_PREFIX) or path.endswith("/"):
+        return None
+    parts = path.strip("/").split("/")
+    if any(part in ("", ".", "..") or "\\" in part or "\x00" in part for part in parts):
+        return None
+    return os.path.join(root, *parts) + ".json"
+
+
+def read_manifest(root: str) -> dict[str, Any] | None:
+    try:
+        with open(os.path.join(root, MANIFEST_NAME)) as f:
+            manifest: dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest
+
+
+def _accepts_json(accept: str) -> bool:
+    if not accept:
+        return True
+    ranges = {part.split(";")[0].strip().lower() for part in accept.split(",")}
+    return bool(ranges & {"application/json", "application/*", "*/*"})
+
+
+def _find_file(file: str, encoding: str | None) -> tuple[str, str | None] | None:
+    """Return the file to send and its Content-Encoding, or None if ``file`` wasn't rendered."""
+    if not os.path.isfile(file):
+        return None
+    if encoding is not None and os.path.isfile(file + ENCODING_SUFFIXES[encoding]):
+        return file + ENCODING_SUFFIXES[encoding], encoding
+    return file, None
+
+
+class StaticSnapshotMiddleware:
+    """ASGI middleware answering snapshotted GETs straight from disk.
+
+    Requests with a query string, or that don't accept JSON (Arrow/msgpack
+    negotiation), always go to the app. The manifest is re-checked at most
+    every ``check_interval`` seconds.
+    """
+
+    def __init__(self, app: ASGIApp, directory: str, check_interval: float = 1.0) -> None:
+        self.app = app
+        self.directory = directory
+        self.check_interval = check_interval
+        self._checked_at = float("-inf")
+        self._encodings: list[str] | None = None
+
+    async def _current_encodings(self) -> list[str] | None:
+        """Return the encodings the snapshot has, or None when there's no usable snapshot."""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            manifest = await anyio.to_thread.run_sync(read_manifest, self.directory)
+            if manifest is None or manifest.get("data_version") != get_data_version():
+                self._encodings = None
+            else:
+                available = manifest.get("encodings", [])
+                self._encodings = [encoding for encoding in ENCODING_SUFFIXES if encoding in available]
+        return self._encodings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or scope["query_string"]:
+            await self.app(scope, receive, send)
+            return
+        file = snapshot_path(self.directory, scope["path"])
+        encodings = await self._current_encodings() if file is not None else None
+        if file is None or encodings is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        found = None
+        if _accepts_json(headers.get("accept", "")):
+            encoding = select_encoding(headers.get("accept-encoding", ""), encodings)
+            found = await anyio.to_thread.run_sync(_find_file, file, encoding)
+        if found is None:
+            record_cache("snapshot", hit=False)
+            await self.app(scope, receive, send)
+            return
+
+        record_cache("snapshot", hit=True)
+        file, encoding = found
+        response_headers = {"Vary": "Accept, Accept-Encoding"}
+        if encoding is not None:
+            response_headers["Content-Encoding"] = encoding
+        response = FileResponse(file, media_type="application/json", headers=response_headers)
+        await response(scope, receive, send)
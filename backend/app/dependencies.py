@@ -20,9 +20,11 @@ from functools import lru_cache
 from app.repositories.boxscore_repository import BoxscoreRepository
 from app.repositories.contract_repository import ContractRepository
 from app.repositories.draft_repository import DraftRepository
+from app.repositories.export_repository import ExportRepository
 from app.repositories.franchise_repository import FranchiseRepository
 from app.repositories.game_repository import GameRepository
 from app.repositories.player_repository import PlayerRepository
+from app.repositories.query_repository import QueryRepository
 from app.repositories.season_repository import SeasonRepository
 from app.repositories.team_repository import TeamRepository
 
@@ -73,3 +75,15 @@ def get_draft_repository() -> DraftRepository:
 def get_franchise_repository() -> FranchiseRepository:
     """Get a cached FranchiseRepository instance."""
     return FranchiseRepository()
+
+
+@lru_cache
+def get_export_repository() -> ExportRepository:
+    """Get a cached ExportRepository instance."""
+    return ExportRepository()
+
+
+@lru_cache
+def get_query_repository() -> QueryRepository:
+    """Get a cached QueryRepository instance."""
+    return QueryRepository()
@@ -8,19 +8,32 @@ from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
 from typing import Any
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from strawberry.fastapi import GraphQLRouter
 
 from app.api.graphql.schema import schema
 from app.api.v1.router import router as v1_router
+from app.core.compression import CompressedBodyCache, CompressionMiddleware
 from app.core.config import settings
-from app.core.logging import configure_logging, get_logger
-from app.core.rate_limit import limiter
-from app.core.exceptions import EntityNotFoundError, ValidationError
+from app.core.database import db_executor
+from app.core.instrumentation import configure_slow_query_log, query_recorder
+from app.core.logging import AccessLogMiddleware, configure_logging, get_logger
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.profiling import ProfilingRoute, profiling_allowed
+from app.core.snapshot import StaticSnapshotMiddleware
+from app.core.rate_limit import RATE_LIMIT_MESSAGE, RateLimitMiddleware, create_shared_bucket, limiter
+from app.core.exceptions import (
+    DatabaseOverloadedError,
+    EntityNotFoundError,
+    NotAcceptableError,
+    QueryTimeoutError,
+    ValidationError,
+)
+from app.repositories.playoff_odds import odds_simulator
 
 logger = get_logger(__name__)
 
@@ -29,8 +42,11 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan handler."""
     configure_logging(settings.LOG_LEVEL)
+    configure_slow_query_log(settings.SLOW_QUERY_LOG or None)
     logger.info("Application started", extra={"app_name": settings.APP_NAME})
     yield
+    db_executor.shutdown()
+    odds_simulator.shutdown()
 
 
 app = FastAPI(
@@ -40,22 +56,37 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Innermost, so whole bodies arrive in one message (BaseHTTPMiddleware
+# re-chunks them) and can be served from the compressed-body cache
+if settings.COMPRESSION:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        cache=CompressedBodyCache(settings.COMPRESSION_CACHE_MB * 1024 * 1024) if settings.COMPRESSION_CACHE_MB else None,
+    )
+
 # Add rate limiting
 app.state.limiter = limiter
-app.add_middleware(SlowAPIMiddleware)
+if settings.RATE_LIMIT_BACKEND == "shared":
+    app.add_middleware(RateLimitMiddleware, bucket=create_shared_bucket(), costs=settings.RATE_LIMIT_COSTS)
+else:
+    app.add_middleware(SlowAPIMiddleware)
 
 
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_handler(
     request: Request,
     exc: RateLimitExceeded,
-) -> dict[str, str]:
+) -> JSONResponse:
     """Handle rate limit exceeded errors."""
     logger.warning(
         "Rate limit exceeded",
         extra={"ip": request.client.host if request.client else "unknown"},
     )
-    return {"error": "Rate limit exceeded. Please try again later."}
+    return JSONResponse(
+        status_code=429,
+        content={"error": RATE_LIMIT_MESSAGE},
+    )
 
 
 @app.exception_handler(EntityNotFoundError)
@@ -70,6 +101,46 @@ async def entity_not_found_handler(
     )
 
 
+@app.exception_handler(DatabaseOverloadedError)
+async def database_overloaded_handler(
+    request: Request,
+    exc: DatabaseOverloadedError,
+) -> JSONResponse:
+    """Shed load when the database executor's queue is full."""
+    logger.warning("Database executor overloaded", extra={"pending": exc.pending, "path": request.url.path})
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(NotAcceptableError)
+async def not_acceptable_handler(
+    request: Request,
+    exc: NotAcceptableError,
+) -> JSONResponse:
+    """Handle Accept headers that match no available response format."""
+    return JSONResponse(
+        status_code=406,
+        content={"detail": str(exc), "available": exc.available},
+        headers={"Vary": "Accept"},
+    )
+
+
+@app.exception_handler(QueryTimeoutError)
+async def query_timeout_handler(
+    request: Request,
+    exc: QueryTimeoutError,
+) -> JSONResponse:
+    """Handle user-defined queries interrupted at their time budget."""
+    logger.warning("Query time budget exceeded", extra={"timeout_ms": exc.timeout_ms, "path": request.url.path})
+    return JSONResponse(
+        status_code=422,
+        content={"detail": str(exc)},
+    )
+
+
 @app.exception_handler(ValidationError)
 async def validation_error_handler(
     request: Request,
@@ -99,6 +170,10 @@ async def global_exception_handler(
     )
 
 
+# Inside CORS, outside rate limiting: snapshot hits skip everything else
+if settings.SNAPSHOT_DIR:
+    app.add_middleware(StaticSnapshotMiddleware, directory=settings.SNAPSHOT_DIR)
+
 # CORS Setup
 app.add_middleware(
     CORSMiddleware,
@@ -108,16 +183,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.ACCESS_LOG:
+    app.add_middleware(AccessLogMiddleware)
+
+# Outermost, so latency includes the other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Include the v1 API router
 app.include_router(v1_router)
 
 # Add GraphQL endpoint
-graphql_app: GraphQLRouter[Any, Any] = GraphQLRouter(schema)
+graphql_app: GraphQLRouter[Any, Any] = GraphQLRouter(schema, route_class=ProfilingRoute)
 app.include_router(graphql_app, prefix="/graphql")
 
 
 @app.get("/")
-def read_root() -> dict[str, str]:
+async def read_root() -> dict[str, str]:
     """Root endpoint with API information."""
     return {
         "message": "Welcome to the Basketball Reference Clone API",
@@ -128,6 +209,27 @@ def read_root() -> dict[str, str]:
 
 
 @app.get("/health")
-def health_check() -> dict[str, str]:
+async def health_check() -> dict[str, str]:
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text-format metrics.
+
+    Async so it runs on the event loop, where the threadpool limiter is read.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/debug/queries")
+async def query_stats(request: Request, limit: int = Query(50, ge=1, le=1000)) -> list[dict[str, Any]]:
+    """Per-query-fingerprint timings and percentiles, slowest total first.
+
+    Gated like profiling (DEBUG or a matching X-Profile-Token), since it
+    exposes SQL and caller locations; otherwise it does not exist.
+    """
+    if not profiling_allowed(request):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return query_recorder.snapshot()[:limit]
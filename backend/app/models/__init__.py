@@ -37,6 +37,21 @@ from app.models.team import (
 # Standings models
 from app.models.standings import StandingsItem
 
+# Multi-criteria query models
+from app.models.query import QueryDataset, QueryField, QueryFilter, QueryRequest, QueryResult
+
+# Player similarity models
+from app.models.similarity import SimilarPlayer, SimilarPlayers
+
+# Playoff odds models
+from app.models.odds import PlayoffOdds, TeamOdds
+
+# Team rating models
+from app.models.ratings import PowerRanking, TeamRating
+
+# Rolling-average and streak models
+from app.models.streaks import RollingGame, RollingStats, Streak, StreakSummary
+
 # Game models
 from app.models.game import (
     Game,
@@ -47,6 +62,9 @@ from app.models.game import (
     ShotChartData,
     LineScore,
     FourFactors,
+    GameLineups,
+    LineupStats,
+    PlayerOnOff,
 )
 
 # Season models
@@ -75,27 +93,45 @@ __all__ = [
     "FourFactors",
     "Franchise",
     "Game",
+    "GameLineups",
     "GamePlayByPlay",
     "GameStats",
     "LeagueSeasonAverage",
     "LineScore",
+    "LineupStats",
     "Player",
     "PlayerAdjustedShooting",
     "PlayerAdvancedStats",
     "PlayerGameLog",
+    "PlayerOnOff",
     "PlayerPlayByPlayStats",
     "PlayerSeasonStats",
     "PlayerShootingStats",
     "PlayerSplits",
+    "PlayoffOdds",
     "PlayoffSeries",
+    "PowerRanking",
+    "QueryDataset",
+    "QueryField",
+    "QueryFilter",
+    "QueryRequest",
+    "QueryResult",
+    "RollingGame",
+    "RollingStats",
     "RosterRow",
     "Season",
     "ShotChartData",
+    "SimilarPlayer",
+    "SimilarPlayers",
     "Standings",
     "StandingsItem",
+    "Streak",
+    "StreakSummary",
     "Team",
     "TeamGameLogRow",
     "TeamGameStats",
+    "TeamOdds",
+    "TeamRating",
     "TeamRoster",
     "TeamScheduleRow",
     "TeamSeasonStats",
@@ -175,5 +175,46 @@ class FourFactors(BaseModel):
     ortg: float | None = None
 
 
+class LineupStats(BaseModel):
+    """Five-man lineup totals for one team in a game."""
+
+    team_id: str
+    lineup_key: str
+    player_ids: list[str | None] = []
+    player_names: list[str | None] = []
+    stints: int | None = None
+    seconds: int | None = None
+    minutes: float | None = None
+    possessions: float | None = None
+    points_for: int | None = None
+    points_against: int | None = None
+    plus_minus: int | None = None
+    net_rating: float | None = None
+
+
+class PlayerOnOff(BaseModel):
+    """Player on-court and off-court totals in a game."""
+
+    team_id: str
+    nba_person_id: str
+    player_id: str | None = None
+    full_name: str | None = None
+    seconds_on: int | None = None
+    minutes_on: float | None = None
+    possessions_on: float | None = None
+    plus_minus_on: int | None = None
+    plus_minus_off: int | None = None
+    net_rating_on: float | None = None
+    net_rating_off: float | None = None
+
+
+class GameLineups(BaseModel):
+    """Lineup and on/off data reconstructed from play-by-play."""
+
+    game_id: str
+    lineups: list[LineupStats] = []
+    players: list[PlayerOnOff] = []
+
+
 # Alias for backward compatibility
 GameStats = TeamGameStats
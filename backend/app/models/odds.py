@@ -0,0 +1,29 @@
+"""Playoff odds Pydantic models."""
+
+from pydantic import BaseModel
+
+
+class TeamOdds(BaseModel):
+    """One team's simulated season and playoff outcomes."""
+
+    team_id: str
+    team_name: str | None = None
+    conference: str | None = None
+    wins: int  # so far
+    losses: int
+    projected_wins: float
+    seed_probabilities: list[float]  # P(seed 1), P(seed 2), ... within the conference
+    round_probabilities: list[float]  # P(reaching each round); first = playoffs, last = title
+    playoffs: float
+    finals: float
+    champion: float
+
+
+class PlayoffOdds(BaseModel):
+    """Monte Carlo seeding, playoff and title probabilities for a season."""
+
+    season_id: str
+    simulations: int
+    remaining_games: int
+    playoff_teams: int  # per conference
+    teams: list[TeamOdds]
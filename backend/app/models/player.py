@@ -321,3 +321,10 @@ class PlayerGameLog(BaseModel):
     is_home: bool | None = None
     is_win: bool | None = None
     game_result: str | None = None  # e.g. "W (+10)"
+    # From player_game_logs: days off before this game and season-to-date averages through it
+    season_id: str | None = None
+    days_rest: int | None = None
+    avg_points: float | None = None
+    avg_rebounds: float | None = None
+    avg_assists: float | None = None
+    avg_minutes: float | None = None
@@ -0,0 +1,51 @@
+"""Multi-criteria query Pydantic models."""
+
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+QueryOperator = Literal["eq", "ne", "gt", "gte", "lt", "lte", "in", "between"]
+
+
+class QueryFilter(BaseModel):
+    """One typed comparison, e.g. ``points_per_game >= 25``."""
+
+    field: str
+    op: QueryOperator = "eq"
+    value: Any  # a list for "in" and a [low, high] pair for "between"
+
+
+class QueryRequest(BaseModel):
+    """Filters (ANDed together), output fields, sort order and page."""
+
+    filters: list[QueryFilter] = Field(default_factory=list, max_length=20)
+    fields: list[str] | None = Field(default=None, max_length=50)  # default: the dataset's summary fields
+    sort: list[str] = Field(default_factory=list, max_length=3)  # "-field" sorts descending
+    limit: int = Field(default=100, ge=1)
+    offset: int = Field(default=0, ge=0, le=10_000)  # deep pages still scan every skipped row
+
+
+class QueryResult(BaseModel):
+    """Matching rows, in the order of ``fields``."""
+
+    dataset: str
+    fields: list[str]
+    rows: list[dict[str, Any]]
+    count: int
+    has_more: bool
+
+
+class QueryField(BaseModel):
+    """A queryable field and the operators it supports."""
+
+    name: str
+    type: str  # "number", "string", "boolean" or "date"
+    operators: list[str]
+
+
+class QueryDataset(BaseModel):
+    """A queryable dataset."""
+
+    name: str
+    description: str
+    fields: list[QueryField]
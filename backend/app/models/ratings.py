@@ -0,0 +1,36 @@
+"""Team rating (Elo / SRS) Pydantic models."""
+
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class TeamRating(BaseModel):
+    """A team's ratings around one game."""
+
+    team_id: str
+    season_id: str | None = None
+    game_date: date | None = None
+    game_id: str
+    opponent_team_id: str | None = None
+    is_home: bool | None = None
+    is_playoff: bool | None = None
+    win_probability: float | None = None  # pre-game, from Elo with home advantage
+    elo_pre: float | None = None
+    elo: float | None = None
+    srs: float | None = None  # fitted to the season's regular-season games through this date
+
+
+class PowerRanking(BaseModel):
+    """A team's latest ratings in a season, ranked."""
+
+    rank: int
+    team_id: str
+    team_name: str | None = None
+    abbreviation: str | None = None
+    elo: float | None = None
+    srs: float | None = None
+    elo_rank: int
+    srs_rank: int | None = None
+    games: int
+    last_game_date: date | None = None
@@ -0,0 +1,24 @@
+"""Player similarity Pydantic models."""
+
+from pydantic import BaseModel
+
+
+class SimilarPlayer(BaseModel):
+    """A player (or player season) close to the one searched for."""
+
+    player_id: str
+    player_name: str | None = None
+    season_id: str | None = None  # set when searching by season
+    first_season: int | None = None  # career span, set when searching careers
+    last_season: int | None = None
+    score: float  # cosine similarity, or Euclidean distance
+
+
+class SimilarPlayers(BaseModel):
+    """Nearest neighbours of a player's career, or of one of their seasons."""
+
+    player_id: str
+    season_id: str | None = None
+    metric: str
+    features: list[str]
+    results: list[SimilarPlayer]
@@ -0,0 +1,50 @@
+"""Rolling-average and streak Pydantic models."""
+
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class RollingGame(BaseModel):
+    """One game's value and the trailing-window average through it."""
+
+    game_id: str
+    game_date: date | None = None
+    season_id: str | None = None
+    value: float | None = None
+    rolling: float | None = None  # None until the window has filled
+
+
+class RollingStats(BaseModel):
+    """Rolling N-game average of one stat, with hot/cold form over the last window."""
+
+    entity_id: str
+    stat: str
+    window: int
+    season_id: str | None = None
+    games: int
+    average: float | None = None
+    form: str  # "hot", "cold" or "neutral"
+    z_score: float | None = None
+    values: list[RollingGame]
+
+
+class Streak(BaseModel):
+    """Current and longest run of consecutive games meeting a condition."""
+
+    kind: str  # e.g. "wins", "20_point_games", "double_doubles"
+    current: int
+    longest: int
+    longest_start_game_id: str | None = None
+    longest_start_date: date | None = None
+    longest_end_game_id: str | None = None
+    longest_end_date: date | None = None
+
+
+class StreakSummary(BaseModel):
+    """Streaks for a player or team, over one season or all games."""
+
+    entity_id: str
+    season_id: str | None = None
+    games: int
+    streaks: list[Streak]
@@ -4,6 +4,7 @@ from app.repositories.base import BaseRepository
 from app.repositories.boxscore_repository import BoxscoreRepository
 from app.repositories.contract_repository import ContractRepository
 from app.repositories.draft_repository import DraftRepository
+from app.repositories.export_repository import ExportRepository
 from app.repositories.franchise_repository import FranchiseRepository
 from app.repositories.game_repository import GameRepository
 from app.repositories.player_repository import PlayerRepository
@@ -15,6 +16,7 @@ __all__ = [
     "BoxscoreRepository",
     "ContractRepository",
     "DraftRepository",
+    "ExportRepository",
     "FranchiseRepository",
     "GameRepository",
     "PlayerRepository",
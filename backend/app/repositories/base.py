@@ -1,10 +1,25 @@
-from typing import Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 import pandas as pd
 from pydantic import BaseModel
 
+from app.core.database import execute_query_arrow, execute_query_rows
+from app.core.profiling import span
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 T = TypeVar("T", bound=BaseModel)
 
+# SQL and parameters for a list endpoint, shared by model and columnar reads
+ListQuery = tuple[str, list[Any]]
+
+
+def _project(query: str, model: type[BaseModel]) -> str:
+    """Wrap ``query`` so it only returns columns the model exposes."""
+    fields = ", ".join("'" + name.replace("'", "''") + "'" for name in model.model_fields)
+    return f"SELECT COLUMNS(c -> c IN ({fields})) FROM ({query}) AS q"  # noqa: S608 - field names are quoted literals
+
 
 class BaseRepository(Generic[T]):
     def __init__(self, model: type[T]) -> None:
@@ -13,11 +28,26 @@ class BaseRepository(Generic[T]):
     def _to_models(self, df: pd.DataFrame) -> list[T]:
         if df.empty:
             return []
-        # Replace NaN with None for Pydantic compatibility
-        df = df.where(pd.notnull(df), None)
-        records: list[dict[str, Any]] = df.to_dict(orient="records")  # type: ignore[assignment]
-        return [self.model(**record) for record in records]
+        with span("df_cleanup", self.model.__name__):
+            # Replace NaN with None for Pydantic compatibility
+            df = df.where(pd.notnull(df), None)
+            records: list[dict[str, Any]] = df.to_dict(orient="records")  # type: ignore[assignment]
+        with span("models", self.model.__name__):
+            return [self.model(**record) for record in records]
 
     def _to_model(self, df: pd.DataFrame) -> T | None:
         models = self._to_models(df)
         return models[0] if models else None
+
+    def fetch_arrow(self, query: ListQuery, model: type[BaseModel]) -> "pa.Table":
+        """Run a list query straight into a pyarrow Table, skipping models.
+
+        Only columns that ``model`` declares are returned, in query order.
+        """
+        sql, params = query
+        return execute_query_arrow(_project(sql, model), params)
+
+    def fetch_rows(self, query: ListQuery, model: type[BaseModel]) -> tuple[list[str], list[tuple[Any, ...]]]:
+        """Run a list query and return column names and raw rows, skipping models."""
+        sql, params = query
+        return execute_query_rows(_project(sql, model), params)
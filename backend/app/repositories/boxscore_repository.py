@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any
 import pandas as pd
 
 from app.core.database import execute_query_df
+from app.core.singleflight import coalesce
 from app.models import BoxScore
 from app.repositories.base import BaseRepository
 from app.utils.dataframe import clean_nan, df_to_records
@@ -20,6 +21,7 @@ class BoxscoreRepository(BaseRepository[BoxScore]):
     def __init__(self) -> None:
         super().__init__(BoxScore)
 
+    @coalesce
     def get_by_game_id(self, game_id: str) -> list[dict[str, Any]]:
         """Get box scores for a specific game with player and team info.
 
@@ -83,6 +85,7 @@ class BoxscoreRepository(BaseRepository[BoxScore]):
         df = execute_query_df(query, [team_id, game_id])
         return self._to_models(df)
 
+    @coalesce
     def get_line_score(self, game_id: str) -> list[LineScore]:
         """Return line score rows (home/away) for a game."""
         query = """
@@ -173,6 +176,7 @@ class BoxscoreRepository(BaseRepository[BoxScore]):
 
         return (fga or 0) + 0.4 * (fta or 0) - 1.07 * oreb_factor * ((fga or 0) - (fg or 0)) + (tov or 0)
 
+    @coalesce
     def get_four_factors(self, game_id: str) -> list[FourFactors]:
         """Compute four factors for both teams of a game."""
         raw = execute_query_df(
@@ -0,0 +1,71 @@
+"""Catalog of the lookup keys the repositories filter and join on.
+
+Each entry names a serving-table column used in an equality predicate and
+the repository methods that depend on it. scripts/manage_indexes.py reads
+this catalog to create and verify ART indexes, so keep it in step with the
+queries: add an entry when a new repository method filters on a column.
+
+DuckDB only uses single-column ART indexes for point lookups, so keys are
+listed per column rather than as composites.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class LookupKey:
+    """A column the repositories look rows up by."""
+
+    table: str
+    column: str
+    used_by: tuple[str, ...]
+
+    @property
+    def index_name(self) -> str:
+        return f"idx_{self.table}_{self.column}"
+
+
+LOOKUP_KEYS: tuple[LookupKey, ...] = (
+    # Games and box scores
+    LookupKey("games", "season_id", ("GameRepository.get_games", "PlayerRepository.get_gamelog")),
+    LookupKey("games", "home_team_id", ("GameRepository.get_games", "TeamRepository.get_team_schedule")),
+    LookupKey("games", "away_team_id", ("GameRepository.get_games", "TeamRepository.get_team_schedule")),
+    LookupKey("games", "game_date", ("GameRepository.get_games",)),
+    LookupKey(
+        "box_scores",
+        "game_id",
+        ("GameRepository.get_box_scores", "BoxscoreRepository.get_by_game_id", "BoxscoreRepository.get_by_team_and_game"),
+    ),
+    LookupKey("box_scores", "player_id", ("PlayerRepository.get_gamelog", "BoxscoreRepository.get_by_player_and_game")),
+    LookupKey("player_game_logs", "player_id", ("PlayerRepository.get_gamelog",)),
+    LookupKey("team_game_stats", "game_id", ("GameRepository.get_game_stats",)),
+    LookupKey("lineup_stints", "game_id", ("GameRepository.get_lineups",)),
+    LookupKey("player_stints", "game_id", ("GameRepository.get_lineups",)),
+    # Player pages
+    LookupKey("player_season_stats", "player_id", ("PlayerRepository.get_stats", "PlayerRepository.get_seasons")),
+    LookupKey("player_season_stats", "season_id", ("SeasonRepository.get_leaders", "SeasonRepository.get_all_leaders")),
+    LookupKey("player_advanced_stats", "player_id", ("PlayerRepository.get_advanced_stats",)),
+    LookupKey("player_shooting_stats", "player_id", ("PlayerRepository.get_shooting_stats",)),
+    LookupKey("player_play_by_play_stats", "player_id", ("PlayerRepository.get_play_by_play_stats",)),
+    LookupKey("player_adjusted_shooting", "player_id", ("PlayerRepository.get_adjusted_shooting",)),
+    LookupKey("player_splits", "player_id", ("PlayerRepository.get_splits",)),
+    LookupKey("awards", "player_id", ("PlayerRepository.get_awards",)),
+    LookupKey("awards", "season_id", ("SeasonRepository.get_awards",)),
+    LookupKey("player_contracts", "player_id", ("ContractRepository.get_by_player", "PlayerRepository.get_contracts")),
+    LookupKey("player_contracts", "team_id", ("ContractRepository.get_by_team",)),
+    LookupKey("draft_picks", "draft_year", ("DraftRepository.get_by_year",)),
+    LookupKey("draft_picks", "team_id", ("DraftRepository.get_by_team",)),
+    LookupKey("draft_picks", "player_id", ("DraftRepository.get_by_player",)),
+    # Team and season pages
+    LookupKey("team_season_stats", "team_id", ("TeamRepository.get_stats",)),
+    LookupKey("team_season_stats", "season_id", ("SeasonRepository.get_standings", "SeasonRepository.get_team_stats")),
+    LookupKey("franchises", "current_team_id", ("FranchiseRepository.get_by_current_team",)),
+    LookupKey("playoff_series", "season_id", ("SeasonRepository.get_playoffs",)),
+    LookupKey("team_ratings", "team_id", ("TeamRepository.get_ratings",)),
+    LookupKey("team_ratings", "season_id", ("SeasonRepository.get_power_rankings",)),
+    # Raw source tables still read directly by the API
+    LookupKey("game", "game_id", ("BoxscoreRepository.get_four_factors",)),
+    LookupKey("game", "team_id_home", ("TeamRepository.get_team_game_log",)),
+    LookupKey("line_score", "game_id", ("BoxscoreRepository.get_line_score",)),
+    LookupKey("common_player_info", "team_id", ("TeamRepository.get_roster",)),
+)
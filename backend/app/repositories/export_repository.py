@@ -0,0 +1,237 @@
+"""Export repository: filtered bulk reads of serving tables.
+
+Unlike the other repositories this one never builds models or DataFrames.
+It hands out DuckDB cursors that callers drain in chunks (``fetchmany`` or
+Arrow record batches), or has DuckDB write Parquet itself, so memory use
+stays constant however many rows are exported.
+"""
+
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import duckdb
+
+from app.core.config import settings
+from app.core.database import execute_query, get_data_version, get_db_connection
+from app.core.exceptions import DatabaseOverloadedError, EntityNotFoundError, ValidationError
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# Tables without season_id filter on it through their game
+_SEASON_VIA_GAME = "game_id IN (SELECT game_id FROM games WHERE season_id = ?)"
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """An exportable serving table and the filters it accepts."""
+
+    name: str
+    # Filter name -> SQL predicate; each placeholder is bound to the filter value
+    filters: dict[str, str] = field(default_factory=dict)
+
+
+EXPORT_TABLES: dict[str, ExportTable] = {
+    table.name: table
+    for table in (
+        ExportTable(
+            "box_scores",
+            {
+                "player_id": "player_id = ?",
+                "team_id": "team_id = ?",
+                "game_id": "game_id = ?",
+                "season_id": _SEASON_VIA_GAME,
+            },
+        ),
+        ExportTable(
+            "player_season_stats",
+            {
+                "player_id": "player_id = ?",
+                "team_id": "team_id = ?",
+                "season_id": "season_id = ?",
+                "season_type": "season_type = ?",
+            },
+        ),
+        ExportTable(
+            "team_game_stats",
+            {
+                "team_id": "team_id = ?",
+                "game_id": "game_id = ?",
+                "season_id": _SEASON_VIA_GAME,
+            },
+        ),
+        ExportTable(
+            "games",
+            {
+                "team_id": "(home_team_id = ? OR away_team_id = ?)",
+                "game_id": "game_id = ?",
+                "season_id": "season_id = ?",
+                "game_type": "game_type = ?",
+            },
+        ),
+    )
+}
+
+
+@dataclass(frozen=True)
+class ExportQuery:
+    sql: str
+    params: list[Any]
+    columns: list[str]
+
+
+class ExportRepository:
+    """Builds export queries and runs them on dedicated cursors."""
+
+    def __init__(self) -> None:
+        self._columns: dict[tuple[str, str], list[str]] = {}
+        # Exports hold a cursor for their whole duration, outside the read pool
+        self._slots = threading.BoundedSemaphore(settings.EXPORT_MAX_CONCURRENT)
+
+    def table_columns(self, table: str) -> list[str]:
+        key = (table, get_data_version())
+        columns = self._columns.get(key)
+        if columns is None:
+            rows = execute_query(
+                "SELECT column_name FROM duckdb_columns() WHERE table_name = ? ORDER BY column_index",
+                [table],
+            )
+            columns = [str(row[0]) for row in rows]
+            self._columns = {k: v for k, v in self._columns.items() if k[1] == key[1]}
+            self._columns[key] = columns
+        return columns
+
+    def build_query(
+        self,
+        table: str,
+        columns: list[str] | None = None,
+        filters: dict[str, Any] | None = None,
+    ) -> ExportQuery:
+        """Validate an export request and build its parameterized query.
+
+        Args:
+            table: Name of an exportable table
+            columns: Columns to include (default: all, in table order)
+            filters: Filter name to value; None values are ignored
+
+        Returns:
+            The query, its parameters and output column names
+
+        """
+        spec = EXPORT_TABLES.get(table)
+        if spec is None:
+            raise EntityNotFoundError("Export table", table)
+
+        available = self.table_columns(table)
+        if columns:
+            unknown = [c for c in columns if c not in available]
+            if unknown:
+                raise ValidationError("columns", f"unknown columns for {table}: {', '.join(unknown)}")
+        else:
+            columns = available
+
+        conditions: list[str] = []
+        params: list[Any] = []
+        for name, value in (filters or {}).items():
+            if value is None:
+                continue
+            predicate = spec.filters.get(name)
+            if predicate is None:
+                raise ValidationError(name, f"{table} cannot be filtered by {name}")
+            conditions.append(predicate)
+            params.extend([value] * predicate.count("?"))
+
+        select_list = ", ".join(f'"{c}"' for c in columns)
+        sql = f'SELECT {select_list} FROM "{table}"'  # noqa: S608 - table and columns are checked against the schema
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return ExportQuery(sql, params, list(columns))
+
+    def open_export(self, query: ExportQuery) -> "ExportCursor":
+        """Execute ``query`` on a dedicated cursor for chunked reading.
+
+        Exports hold their cursor for the whole transfer, outside the read
+        pool, so at most EXPORT_MAX_CONCURRENT run at once.
+
+        Raises:
+            DatabaseOverloadedError: If all export slots are taken
+
+        """
+        if not self._slots.acquire(blocking=False):
+            raise DatabaseOverloadedError(settings.EXPORT_MAX_CONCURRENT)
+        try:
+            cursor = get_db_connection(read_only=True).cursor()
+        except Exception:
+            self._slots.release()
+            raise
+        export = ExportCursor(cursor, query.columns, self._slots.release)
+        try:
+            cursor.execute(query.sql, query.params)
+        except Exception:
+            export.close()
+            raise
+        return export
+
+    def copy_parquet(self, query: ExportQuery, path: str) -> None:
+        """Have DuckDB write the query result to a Parquet file at ``path``."""
+        if not self._slots.acquire(blocking=False):
+            raise DatabaseOverloadedError(settings.EXPORT_MAX_CONCURRENT)
+        try:
+            cursor = get_db_connection(read_only=True).cursor()
+            try:
+                escaped = path.replace("'", "''")
+                cursor.execute(f"COPY ({query.sql}) TO '{escaped}' (FORMAT PARQUET, COMPRESSION ZSTD)", query.params)
+            finally:
+                cursor.close()
+        finally:
+            self._slots.release()
+
+
+class ExportCursor:
+    """A cursor being drained by one export.
+
+    Fetches run on worker threads while the response may be torn down from
+    the event loop, so fetching and closing are serialized; close is
+    idempotent and frees the export slot.
+    """
+
+    def __init__(self, cursor: duckdb.DuckDBPyConnection, columns: list[str], on_close: Callable[[], Any]) -> None:
+        self.columns = columns
+        self._cursor: duckdb.DuckDBPyConnection | None = cursor
+        self._on_close = on_close
+        self._lock = threading.Lock()
+        self._batches: Any = None
+
+    def fetch(self, rows: int) -> list[tuple[Any, ...]]:
+        """Next chunk of up to ``rows`` rows; empty once exhausted or closed."""
+        with self._lock:
+            if self._cursor is None:
+                return []
+            return self._cursor.fetchmany(rows)
+
+    def arrow_schema(self, rows: int) -> "pa.Schema":
+        """Start reading Arrow record batches of up to ``rows`` rows (needs pyarrow)."""
+        with self._lock:
+            if self._batches is None and self._cursor is not None:
+                self._batches = self._cursor.fetch_record_batch(rows)
+            return self._batches.schema
+
+    def fetch_batch(self) -> "pa.RecordBatch | None":
+        """Next Arrow record batch, or None when done; call arrow_schema first."""
+        with self._lock:
+            if self._cursor is None or self._batches is None:
+                return None
+            try:
+                return self._batches.read_next_batch()
+            except StopIteration:
+                return None
+
+    def close(self) -> None:
+        with self._lock:
+            cursor, self._cursor = self._cursor, None
+            self._batches = None
+        if cursor is not None:
+            cursor.close()
+            self._on_close()
@@ -0,0 +1,160 @@
+"""In-process cache of per-player and per-team game arrays.
+
+Rolling averages and streaks need an entity's games in order, one column per
+stat. Rather than running window functions over the games table on every
+request, each entity's games are read once into NumPy arrays (see
+app/utils/streaks.py for the computations) and kept in an LRU of
+GAME_ARRAY_CACHE_ENTITIES entries. The cache is cleared when the data
+version changes, i.e. after the ETL rewrites the database.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.database import get_data_version
+from app.core.metrics import record_cache
+from app.models import RollingGame, RollingStats, Streak
+from app.utils.streaks import current_run, form, longest_run, rolling_mean
+
+
+@dataclass(frozen=True)
+class GameArrays:
+    """One entity's games in date order, as parallel arrays."""
+
+    game_ids: np.ndarray  # object
+    dates: np.ndarray  # datetime64[D], NaT when unknown
+    season_ids: np.ndarray  # object
+    columns: dict[str, np.ndarray]  # float64, NaN when missing
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: list[str]) -> "GameArrays":
+        """Build from a frame with game_id, game_date, season_id and ``columns``, already sorted."""
+        return cls(
+            game_ids=df["game_id"].astype(str).to_numpy(dtype=object),
+            dates=pd.to_datetime(df["game_date"]).to_numpy(dtype="datetime64[D]"),
+            season_ids=df["season_id"].to_numpy(dtype=object),
+            columns={
+                name: pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+                for name in columns
+            },
+        )
+
+    def __len__(self) -> int:
+        return int(self.game_ids.size)
+
+    def select(self, mask: np.ndarray) -> "GameArrays":
+        return GameArrays(
+            game_ids=self.game_ids[mask],
+            dates=self.dates[mask],
+            season_ids=self.season_ids[mask],
+            columns={name: values[mask] for name, values in self.columns.items()},
+        )
+
+    def season(self, season_id: str | None) -> "GameArrays":
+        """Only ``season_id``'s games (all of them for None)."""
+        if season_id is None:
+            return self
+        return self.select(self.season_ids == season_id)
+
+
+class GameArrayCache:
+    """LRU of GameArrays keyed by (kind, entity id), reset per data version."""
+
+    def __init__(self, max_entities: int) -> None:
+        self.max_entities = max_entities
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], GameArrays] = OrderedDict()
+        self._version: str | None = None
+
+    def get(self, kind: str, entity_id: str, load: Callable[[str], GameArrays]) -> GameArrays:
+        """Return the cached arrays for ``entity_id``, calling ``load(entity_id)`` on a miss."""
+        key = (kind, entity_id)
+        version = get_data_version()
+        with self._lock:
+            if self._version != version:
+                self._entries.clear()
+                self._version = version
+            arrays = self._entries.get(key)
+            if arrays is not None:
+                self._entries.move_to_end(key)
+                record_cache("game_arrays", hit=True)
+                return arrays
+
+        record_cache("game_arrays", hit=False)
+        arrays = load(entity_id)
+        if self.max_entities > 0:
+            with self._lock:
+                if self._version == version:
+                    self._entries[key] = arrays
+                    while len(self._entries) > self.max_entities:
+                        self._entries.popitem(last=False)
+        return arrays
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _date(value: np.datetime64) -> date | None:
+    return None if np.isnat(value) else value.astype(date)
+
+
+def _float(value: float) -> float | None:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def streak(kind: str, arrays: GameArrays, mask: np.ndarray) -> Streak:
+    """Return the current and longest run of games in ``arrays`` where ``mask`` holds."""
+    length, start = longest_run(mask)
+    if not length:
+        return Streak(kind=kind, current=0, longest=0)
+    end = start + length - 1
+    return Streak(
+        kind=kind,
+        current=current_run(mask),
+        longest=length,
+        longest_start_game_id=arrays.game_ids[start],
+        longest_start_date=_date(arrays.dates[start]),
+        longest_end_game_id=arrays.game_ids[end],
+        longest_end_date=_date(arrays.dates[end]),
+    )
+
+
+def rolling_stats(
+    entity_id: str, stat: str, column: str, window: int, season_id: str | None, arrays: GameArrays,
+) -> RollingStats:
+    """Compute the rolling ``window``-game average of ``column`` over ``arrays``, with hot/cold form."""
+    values = arrays.columns[column]
+    rolling = rolling_mean(values, window)
+    label, z = form(values, window)
+    present = values[~np.isnan(values)]
+    return RollingStats(
+        entity_id=entity_id,
+        stat=stat,
+        window=window,
+        season_id=season_id,
+        games=len(arrays),
+        average=_float(present.mean()) if present.size else None,
+        form=label,
+        z_score=_float(z) if z is not None else None,
+        values=[
+            RollingGame(
+                game_id=arrays.game_ids[i],
+                game_date=_date(arrays.dates[i]),
+                season_id=arrays.season_ids[i],
+                value=_float(values[i]),
+                rolling=_float(rolling[i]),
+            )
+            for i in range(len(arrays))
+        ],
+    )
+
+
+game_arrays = GameArrayCache(settings.GAME_ARRAY_CACHE_ENTITIES)
@@ -5,8 +5,11 @@ from typing import Any
 import pandas as pd
 
 from app.core.database import execute_query_df
-from app.models import BoxScore, Game, TeamGameStats
+from app.core.singleflight import coalesce
+from app.models import BoxScore, Game, GameLineups, LineupStats, PlayerOnOff, TeamGameStats
 from app.repositories.base import BaseRepository
+from app.repositories.team_aliases import team_aliases
+from app.utils.dataframe import df_to_records
 
 
 class GameRepository(BaseRepository[Game]):
@@ -55,7 +58,7 @@ class GameRepository(BaseRepository[Game]):
 
         if team_id:
             # Resolve abbreviation to ID if needed
-            resolved_id = self._resolve_team_id(team_id)
+            resolved_id = self._resolve_team_id(team_id, season_id)
             conditions.append("(home_team_id = ? OR away_team_id = ?)")
             params.extend([resolved_id, resolved_id])
 
@@ -73,6 +76,7 @@ class GameRepository(BaseRepository[Game]):
         df = execute_query_df(query, params)
         return self._to_models(df)
 
+    @coalesce
     def get_by_id(self, game_id: str) -> Game | None:
         """Get a single game by ID.
 
@@ -96,6 +100,7 @@ class GameRepository(BaseRepository[Game]):
         df = execute_query_df(query, [game_id])
         return self._to_model(df)
 
+    @coalesce
     def get_game_stats(self, game_id: str) -> list[TeamGameStats]:
         """Get team stats for a specific game.
 
@@ -126,6 +131,7 @@ class GameRepository(BaseRepository[Game]):
         records: list[dict[str, Any]] = df.to_dict(orient="records")  # type: ignore[assignment]
         return [TeamGameStats(**record) for record in records]
 
+    @coalesce
     def get_box_scores(self, game_id: str) -> list[BoxScore]:
         """Get player box scores for a specific game.
 
@@ -157,6 +163,93 @@ class GameRepository(BaseRepository[Game]):
         records: list[dict[str, Any]] = df.to_dict(orient="records")  # type: ignore[assignment]
         return [BoxScore(**record) for record in records]
 
+    @coalesce
+    def get_lineups(self, game_id: str) -> GameLineups | None:
+        """Get five-man lineups and player on/off totals for a game.
+
+        Args:
+            game_id: The game identifier
+
+        Returns:
+            GameLineups built from lineup_stints and player_stints, or None
+            if the game doesn't exist
+
+        """
+        players_query = """
+            WITH team_totals AS (
+                SELECT
+                    team_id,
+                    SUM(possessions) AS possessions,
+                    SUM(points_for) AS points_for,
+                    SUM(points_against) AS points_against
+                FROM lineup_stints
+                WHERE game_id = ?
+                GROUP BY team_id
+            ),
+            on_court AS (
+                SELECT
+                    team_id,
+                    nba_person_id,
+                    ANY_VALUE(player_id) AS player_id,
+                    SUM(seconds) AS seconds,
+                    SUM(possessions) AS possessions,
+                    SUM(points_for) AS points_for,
+                    SUM(points_against) AS points_against
+                FROM player_stints
+                WHERE game_id = ?
+                GROUP BY team_id, nba_person_id
+            )
+            SELECT
+                o.team_id,
+                o.nba_person_id,
+                o.player_id,
+                p.full_name,
+                o.seconds AS seconds_on,
+                ROUND(o.seconds / 60.0, 1) AS minutes_on,
+                o.possessions AS possessions_on,
+                o.points_for - o.points_against AS plus_minus_on,
+                (t.points_for - o.points_for) - (t.points_against - o.points_against) AS plus_minus_off,
+                100.0 * (o.points_for - o.points_against) / NULLIF(o.possessions, 0) AS net_rating_on,
+                100.0 * ((t.points_for - o.points_for) - (t.points_against - o.points_against))
+                    / NULLIF(t.possessions - o.possessions, 0) AS net_rating_off
+            FROM on_court o
+            JOIN team_totals t ON t.team_id = o.team_id
+            LEFT JOIN players p ON p.player_id = o.player_id
+            ORDER BY o.team_id, o.seconds DESC
+        """
+        players_df = execute_query_df(players_query, [game_id, game_id])
+        players = [PlayerOnOff(**record) for record in df_to_records(players_df)]
+        if not players and self.get_by_id(game_id) is None:
+            return None
+        by_person = {p.nba_person_id: p for p in players}
+
+        lineups_query = """
+            SELECT
+                team_id,
+                lineup_key,
+                COUNT(*) AS stints,
+                SUM(seconds) AS seconds,
+                ROUND(SUM(seconds) / 60.0, 1) AS minutes,
+                SUM(possessions) AS possessions,
+                SUM(points_for) AS points_for,
+                SUM(points_against) AS points_against,
+                SUM(points_for - points_against) AS plus_minus,
+                100.0 * SUM(points_for - points_against) / NULLIF(SUM(possessions), 0) AS net_rating
+            FROM lineup_stints
+            WHERE game_id = ? AND num_players = 5
+            GROUP BY team_id, lineup_key
+            ORDER BY team_id, seconds DESC
+        """
+        lineups_df = execute_query_df(lineups_query, [game_id])
+        lineups: list[LineupStats] = []
+        for record in df_to_records(lineups_df):
+            members = [by_person.get(person_id) for person_id in record["lineup_key"].split("-")]
+            record["player_ids"] = [m.player_id if m else None for m in members]
+            record["player_names"] = [m.full_name if m else None for m in members]
+            lineups.append(LineupStats(**record))
+
+        return GameLineups(game_id=game_id, lineups=lineups, players=players)
+
     def get_recent_games(self, limit: int = 10) -> list[Game]:
         """Get the most recent games.
 
@@ -182,20 +275,15 @@ class GameRepository(BaseRepository[Game]):
         df = execute_query_df(query, [limit])
         return self._to_models(df)
 
-    def _resolve_team_id(self, team_id: str) -> str:
+    def _resolve_team_id(self, team_id: str, season_id: str | None = None) -> str:
         """Resolve team abbreviation to team ID if needed.
 
         Args:
             team_id: Team ID or abbreviation
+            season_id: Optional season, to resolve reused abbreviations
 
         Returns:
             Resolved team ID
 
         """
-        team_lookup = execute_query_df(
-            "SELECT team_id FROM teams WHERE team_id = ? OR abbreviation = ?",
-            [team_id, team_id],
-        )
-        if not team_lookup.empty:
-            return str(team_lookup.iloc[0]["team_id"])
-        return team_id
+        return team_aliases.resolve(team_id, season_id) or team_id
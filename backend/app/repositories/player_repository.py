@@ -3,7 +3,8 @@ from typing import Any
 import numpy as np
 import pandas as pd
 
-from app.core.database import execute_query_df
+from app.core.database import execute_query_df, get_data_version
+from app.core.exceptions import EntityNotFoundError, ValidationError
 from app.models import (
     Award,
     Contract,
@@ -15,13 +16,37 @@ from app.models import (
     PlayerSeasonStats,
     PlayerShootingStats,
     PlayerSplits,
+    RollingStats,
+    SimilarPlayer,
+    SimilarPlayers,
+    StreakSummary,
 )
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, ListQuery
+from app.repositories.game_arrays import GameArrays, game_arrays, rolling_stats, streak
+from app.repositories.similarity import similarity_index
+
+# Stats available to /rolling: short name -> box score column
+ROLLING_STATS = {
+    "pts": "points",
+    "reb": "total_rebounds",
+    "ast": "assists",
+    "stl": "steals",
+    "blk": "blocks",
+    "tov": "turnovers",
+    "fg3m": "three_pointers_made",
+    "min": "minutes_played",
+    "pm": "plus_minus",
+    "gmsc": "game_score",
+}
+# Counted towards double- and triple-doubles
+DOUBLE_DIGIT_STATS = ("points", "total_rebounds", "assists", "steals", "blocks")
 
 
 class PlayerRepository(BaseRepository[Player]):
     def __init__(self) -> None:
         super().__init__(Player)
+        self._game_logs = False
+        self._game_logs_version: str | None = None
 
     def _table_exists(self, table_name: str) -> bool:
         """Return True if a DuckDB table/view exists."""
@@ -77,22 +102,41 @@ class PlayerRepository(BaseRepository[Player]):
         df = execute_query_df(query, [player_id])
         return self._to_model(df)
 
-    def get_stats(self, player_id: str) -> list[PlayerSeasonStats]:
+    def stats_query(self, player_id: str) -> ListQuery:
         query = """
             SELECT *
             FROM player_season_stats
             WHERE player_id = ?
             ORDER BY season_id DESC
         """
-        df: pd.DataFrame = execute_query_df(query, [player_id])
+        return query, [player_id]
+
+    def get_stats(self, player_id: str) -> list[PlayerSeasonStats]:
+        df: pd.DataFrame = execute_query_df(*self.stats_query(player_id))
         if df.empty:
             return []
         df = df.fillna(value=None).replace({np.inf: None, -np.inf: None})  # type: ignore[call-overload]
         records: list[dict[str, Any]] = df.to_dict(orient="records")  # type: ignore[assignment]
         return [PlayerSeasonStats(**record) for record in records]
 
-    def get_gamelog(self, player_id: str, season_id: str | None = None) -> list[PlayerGameLog]:
+    def _has_game_logs(self) -> bool:
+        """Whether the post-ETL player_game_logs table exists, checked once per data version."""
+        version = get_data_version()
+        if self._game_logs_version != version:
+            self._game_logs = self._table_exists("player_game_logs")
+            self._game_logs_version = version
+        return self._game_logs
+
+    def gamelog_query(self, player_id: str, season_id: str | None = None) -> ListQuery:
         params = [player_id]
+        if self._has_game_logs():
+            # Built by scripts/etl/build_player_game_logs.py, clustered by player and date
+            query = "SELECT * FROM player_game_logs WHERE player_id = ?"
+            if season_id:
+                query += " AND season_id = ?"
+                params.append(season_id)
+            return query + " ORDER BY game_date DESC, game_id DESC", params
+
         query = """
             SELECT
                 b.*,
@@ -109,15 +153,133 @@ class PlayerRepository(BaseRepository[Player]):
             params.append(season_id)
 
         query += " ORDER BY g.game_date DESC"
+        return query, params
 
-        df = execute_query_df(query, params)
+    def get_gamelog(self, player_id: str, season_id: str | None = None) -> list[PlayerGameLog]:
+        df = execute_query_df(*self.gamelog_query(player_id, season_id))
         if df.empty:
             return []
         df = df.where(pd.notnull(df), None)
         records: list[dict[str, Any]] = df.to_dict(orient="records")  # type: ignore[assignment]
         return [PlayerGameLog(**record) for record in records]
 
-    def get_splits(self, player_id: str, season_id: str | None = None) -> list[PlayerSplits]:
+    def _load_game_arrays(self, player_id: str) -> GameArrays:
+        """Every game the player appeared in, oldest first."""
+        stats = list(ROLLING_STATS.values())
+        if self._has_game_logs():
+            query = f"""
+                SELECT game_id, game_date, season_id, {", ".join(stats)}, CAST(is_win AS DOUBLE) AS is_win
+                FROM player_game_logs
+                WHERE player_id = ? AND NOT COALESCE(did_not_play, FALSE)
+                ORDER BY game_date, game_id
+            """  # noqa: S608 - only ROLLING_STATS columns are interpolated
+        else:
+            query = f"""
+                SELECT
+                    b.game_id, g.game_date, g.season_id, {", ".join(f"b.{c}" for c in stats)},
+                    CASE WHEN g.winner_team_id IS NULL THEN NULL WHEN b.team_id = g.winner_team_id THEN 1.0 ELSE 0.0 END AS is_win
+                FROM box_scores b
+                JOIN games g ON b.game_id = g.game_id
+                WHERE b.player_id = ? AND NOT COALESCE(b.did_not_play, FALSE)
+                ORDER BY g.game_date, b.game_id
+            """  # noqa: S608 - only ROLLING_STATS columns are interpolated
+        df = execute_query_df(query, [player_id])
+        return GameArrays.from_frame(df, [*stats, "is_win"])
+
+    def _player_game_arrays(self, player_id: str) -> GameArrays | None:
+        """Return the player's cached per-game arrays; None for an unknown player."""
+        arrays = game_arrays.get("player", player_id, self._load_game_arrays)
+        # Only a player without a single game needs the existence check
+        if not len(arrays) and self.get_by_id(player_id) is None:
+            return None
+        return arrays
+
+    def get_rolling(
+        self, player_id: str, stat: str, window: int, season_id: str | None = None,
+    ) -> RollingStats | None:
+        """Compute the rolling ``window``-game average of ``stat`` (a ROLLING_STATS key or column).
+
+        None for an unknown player.
+        """
+        column = ROLLING_STATS.get(stat.lower(), stat.lower())
+        if column not in ROLLING_STATS.values():
+            raise ValidationError("stat", f"must be one of {', '.join(ROLLING_STATS)}")
+        career = self._player_game_arrays(player_id)
+        if career is None:
+            return None
+        return rolling_stats(player_id, stat.lower(), column, window, season_id, career.season(season_id))
+
+    def get_streaks(self, player_id: str, season_id: str | None = None) -> StreakSummary | None:
+        """Return current and longest team-win, 20-point, double- and triple-double streaks.
+
+        None for an unknown player.
+        """
+        career = self._player_game_arrays(player_id)
+        if career is None:
+            return None
+        arrays = career.season(season_id)
+        columns = arrays.columns
+        double_digits = (np.stack([columns[c] for c in DOUBLE_DIGIT_STATS]) >= 10).sum(axis=0)
+        return StreakSummary(
+            entity_id=player_id,
+            season_id=season_id,
+            games=len(arrays),
+            streaks=[
+                streak("wins", arrays, columns["is_win"] == 1),
+                streak("20_point_games", arrays, columns["points"] >= 20),
+                streak("double_doubles", arrays, double_digits >= 2),
+                streak("triple_doubles", arrays, double_digits >= 3),
+            ],
+        )
+
+    def get_similar(
+        self,
+        player_id: str,
+        season_id: str | None = None,
+        k: int = 10,
+        metric: str = "cosine",
+        era_from: int | None = None,
+        era_to: int | None = None,
+    ) -> SimilarPlayers | None:
+        """Closest careers (or, with ``season_id``, player seasons) to the player's.
+
+        Returns None when the similarity vectors haven't been built.
+        """
+        if not similarity_index.available:
+            return None
+        matches = similarity_index.search(player_id, season_id, k, metric, era_from, era_to)
+        if matches is None:
+            if season_id:
+                raise EntityNotFoundError("Player season", f"{player_id}/{season_id}")
+            raise EntityNotFoundError("Player", player_id)
+
+        names: dict[str, str] = {}
+        ids = list({m.player_id for m in matches})
+        if ids:
+            placeholders = ", ".join("?" * len(ids))
+            df = execute_query_df(
+                f"SELECT player_id, full_name FROM players WHERE player_id IN ({placeholders})", ids,  # noqa: S608
+            )
+            names = dict(zip(df["player_id"], df["full_name"], strict=True))
+        return SimilarPlayers(
+            player_id=player_id,
+            season_id=season_id,
+            metric=metric,
+            features=similarity_index.features,
+            results=[
+                SimilarPlayer(
+                    player_id=m.player_id,
+                    player_name=names.get(m.player_id),
+                    season_id=m.season_id,
+                    first_season=m.first_season,
+                    last_season=m.last_season,
+                    score=round(m.score, 4),
+                )
+                for m in matches
+            ],
+        )
+
+    def splits_query(self, player_id: str, season_id: str | None = None) -> ListQuery:
         params = [player_id]
         query = """
             SELECT *
@@ -129,17 +291,17 @@ class PlayerRepository(BaseRepository[Player]):
             params.append(season_id)
 
         query += " ORDER BY season_id DESC, split_type, split_value"
+        return query, params
 
-        df = execute_query_df(query, params)
+    def get_splits(self, player_id: str, season_id: str | None = None) -> list[PlayerSplits]:
+        df = execute_query_df(*self.splits_query(player_id, season_id))
         if df.empty:
             return []
         df = df.where(pd.notnull(df), None)
         records: list[dict[str, Any]] = df.to_dict(orient="records")  # type: ignore[assignment]
         return [PlayerSplits(**record) for record in records]
 
-    def get_advanced_stats(
-        self, player_id: str, season_id: str | None = None,
-    ) -> list[PlayerAdvancedStats]:
+    def advanced_stats_query(self, player_id: str, season_id: str | None = None) -> ListQuery:
         params = [player_id]
         query = """
             SELECT *
@@ -151,8 +313,12 @@ class PlayerRepository(BaseRepository[Player]):
             params.append(season_id)
 
         query += " ORDER BY season_id DESC"
+        return query, params
 
-        df = execute_query_df(query, params)
+    def get_advanced_stats(
+        self, player_id: str, season_id: str | None = None,
+    ) -> list[PlayerAdvancedStats]:
+        df = execute_query_df(*self.advanced_stats_query(player_id, season_id))
         if df.empty:
             return []
         df = df.where(pd.notnull(df), None)
@@ -0,0 +1,226 @@
+"""Process-pool runner and per-data-version cache for playoff odds.
+
+app/utils/playoff_odds.py simulates a season in NumPy; this module decides
+where that runs and keeps the answers. Simulations are split into one
+chunk per worker of a spawn-context process pool (ODDS_WORKERS), each
+with its own stream from one SeedSequence, and the chunk counts are added
+up. Only the database reads take a DB executor thread; the pool is
+awaited from the event loop. Simulation counts are rounded up to whole
+batches of BATCH_SIMULATIONS, and seeds derive from the season, that count
+and the data version, so every web worker computes the same odds for the
+same data. Results are kept in an LRU of ODDS_CACHE_ENTRIES, cleared when
+the data version changes, i.e. after the ETL rewrites the database or
+loads new games.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.database import get_data_version, run_db
+from app.core.metrics import record_cache
+from app.core.singleflight import SingleFlight
+from app.models import PlayoffOdds, TeamOdds
+from app.utils.playoff_odds import BATCH_SIMULATIONS, OddsCounts, SeasonState, simulate
+
+
+def season_state(
+    team_ids: list[str],
+    conferences: list[str | None],
+    wins: np.ndarray,
+    losses: np.ndarray,
+    elo: np.ndarray,
+    home: np.ndarray,
+    away: np.ndarray,
+    playoff_teams: int,
+) -> SeasonState:
+    """Build a SeasonState, seeding league-wide unless the conferences split evenly.
+
+    Conferences are used when every team has one and their count is a power
+    of two; each gets an equal share of ``playoff_teams``, cut to a power of
+    two that its smallest conference can fill.
+    """
+    names = sorted({c for c in conferences if c})
+    labels = [c or "" for c in conferences]
+    if "" in labels or len(names) & (len(names) - 1):
+        names, labels = [""], [""] * len(team_ids)
+    codes = np.array([names.index(c) for c in labels], dtype=np.int64)
+    smallest = int(np.bincount(codes).min())
+    per_conference = max(1, min(playoff_teams // len(names), smallest))
+    per_conference = 1 << (per_conference.bit_length() - 1)
+    return SeasonState(
+        team_ids=tuple(team_ids),
+        conferences=codes,
+        wins=np.asarray(wins, dtype=np.float32),
+        losses=np.asarray(losses, dtype=np.float32),
+        elo=np.asarray(elo, dtype=np.float64),
+        home=np.asarray(home, dtype=np.int64),
+        away=np.asarray(away, dtype=np.int64),
+        playoff_teams=per_conference,
+    )
+
+
+def summarize(
+    season_id: str,
+    state: SeasonState,
+    counts: OddsCounts,
+    team_names: dict[str, str | None],
+    conferences: list[str | None],
+) -> PlayoffOdds:
+    """Turn simulation counts into per-team probabilities, title favourites first."""
+    n = counts.simulations
+    teams = [
+        TeamOdds(
+            team_id=team_id,
+            team_name=team_names.get(team_id),
+            conference=conferences[i],
+            wins=int(state.wins[i]),
+            losses=int(state.losses[i]),
+            projected_wins=round(float(counts.wins[i]) / n, 1),
+            seed_probabilities=[round(float(c) / n, 4) for c in counts.seeds[i]],
+            round_probabilities=[round(float(c) / n, 4) for c in counts.rounds[i]],
+            playoffs=round(float(counts.rounds[i, 0]) / n, 4),
+            finals=round(float(counts.rounds[i, -2]) / n, 4),
+            champion=round(float(counts.rounds[i, -1]) / n, 4),
+        )
+        for i, team_id in enumerate(state.team_ids)
+    ]
+    teams.sort(key=lambda t: (-t.champion, -t.playoffs, -t.projected_wins))
+    return PlayoffOdds(
+        season_id=season_id,
+        simulations=n,
+        remaining_games=int(state.home.size),
+        playoff_teams=state.playoff_teams,
+        teams=teams,
+    )
+
+
+@dataclass(frozen=True)
+class OddsInputs:
+    """What a simulation reads from the database."""
+
+    state: SeasonState
+    team_names: dict[str, str | None]
+    conferences: list[str | None]
+
+
+def round_simulations(simulations: int) -> int:
+    """Round up to whole batches, so nearby requests share a cache entry."""
+    return -(-simulations // BATCH_SIMULATIONS) * BATCH_SIMULATIONS
+
+
+class OddsSimulator:
+    """Runs simulations across a process pool and caches the results."""
+
+    def __init__(self, workers: int, max_entries: int) -> None:
+        self.workers = workers
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self._entries: OrderedDict[tuple[Any, ...], PlayoffOdds] = OrderedDict()
+        self._version: str | None = None
+        self._flight = SingleFlight()
+        # Keeps computations alive if the request that started them is cancelled
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Spawned, not forked: the server holds DuckDB handles and threads
+                context = multiprocessing.get_context("spawn")
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._pool
+
+    async def simulate(self, state: SeasonState, simulations: int, seed: int) -> OddsCounts:
+        """Run ``simulations`` in up to ``workers`` processes and add up their counts."""
+        chunks = max(1, min(self.workers, -(-simulations // BATCH_SIMULATIONS)))
+        seeds = np.random.SeedSequence(seed).spawn(chunks)
+        sizes = [simulations // chunks + (i < simulations % chunks) for i in range(chunks)]
+        pool = self._executor()
+        results = await asyncio.gather(
+            *(asyncio.wrap_future(pool.submit(simulate, state, size, s)) for size, s in zip(sizes, seeds, strict=True)),
+        )
+        counts = results[0]
+        for result in results[1:]:
+            counts += result
+        return counts
+
+    async def get(
+        self, season_id: str, simulations: int, load: Callable[[str], OddsInputs | None],
+    ) -> PlayoffOdds | None:
+        """Return cached odds for ``simulations`` rounded up to whole batches.
+
+        On a miss ``load(season_id)`` runs on the DB executor and the
+        simulation is awaited in the process pool, so no executor thread
+        waits on it. Concurrent misses for the same odds share one run.
+        """
+        key = (season_id, round_simulations(simulations))
+        version = get_data_version()
+        with self._lock:
+            if self._version != version:
+                self._entries.clear()
+                self._version = version
+            odds = self._entries.get(key)
+            if odds is not None:
+                self._entries.move_to_end(key)
+                record_cache("playoff_odds", hit=True)
+                return odds
+
+        record_cache("playoff_odds", hit=False)
+        future, leader = self._flight.join((key, version))
+        if leader:
+            task = asyncio.ensure_future(self._compute(key, version, future, load))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.wrap_future(future)
+
+    async def _compute(
+        self,
+        key: tuple[str, int],
+        version: str,
+        future: "Future[Any]",
+        load: Callable[[str], OddsInputs | None],
+    ) -> None:
+        season_id, simulations = key
+        try:
+            odds = None
+            inputs = await run_db(load, season_id)
+            if inputs is not None:
+                seed = zlib.crc32(f"{season_id}:{simulations}:{version}".encode())
+                counts = await self.simulate(inputs.state, simulations, seed)
+                odds = summarize(season_id, inputs.state, counts, inputs.team_names, inputs.conferences)
+        except BaseException as exc:
+            self._flight.fail((key, version), future, exc)
+            return
+
+        if odds is not None and self.max_entries > 0:
+            with self._lock:
+                if self._version == version:
+                    self._entries[key] = odds
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        self._flight.finish((key, version), future, odds)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _default_workers() -> int:
+    """One process per core, split between web workers."""
+    return max(1, (os.cpu_count() or 1) // max(settings.WEB_WORKERS, 1))
+
+
+odds_simulator = OddsSimulator(settings.ODDS_WORKERS or _default_workers(), settings.ODDS_CACHE_ENTRIES)
@@ -0,0 +1,370 @@
+"""Query repository: constrained multi-criteria queries over stat tables.
+
+Answers questions like "seasons with at least 25 ppg and 8 apg since 1990"
+or "games with 40 points and 10 assists" without accepting SQL. A request
+names a dataset, typed comparison filters, output fields, a sort and a page;
+every field must be a column of the dataset's Pydantic model (or one of a
+few joined fields such as ``player_name``) and every value is bound as a
+parameter, so the compiled SQL only ever contains whitelisted identifiers.
+
+Each query gets at most QUERY_MAX_ROWS rows and QUERY_TIMEOUT_MS before its
+connection is interrupted. Results are cached in an LRU of
+QUERY_CACHE_ENTRIES, keyed by the compiled SQL and parameters and cleared
+when the data version changes.
+"""
+
+import threading
+import types
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+import duckdb
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.database import execute_query, execute_query_rows, get_data_version
+from app.core.exceptions import EntityNotFoundError, QueryTimeoutError, ValidationError
+from app.core.metrics import record_cache
+from app.models import (
+    BoxScore,
+    PlayerAdvancedStats,
+    PlayerSeasonStats,
+    QueryDataset,
+    QueryField,
+    QueryFilter,
+    QueryRequest,
+    QueryResult,
+)
+
+# Comparison operator -> SQL
+COMPARISONS = {"eq": "=", "ne": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+# Operators allowed per field type
+TYPE_OPERATORS = {
+    "number": ["eq", "ne", "gt", "gte", "lt", "lte", "in", "between"],
+    "string": ["eq", "ne", "gt", "gte", "lt", "lte", "in", "between"],
+    "date": ["eq", "ne", "gt", "gte", "lt", "lte", "in", "between"],
+    "boolean": ["eq", "ne"],
+}
+MAX_IN_VALUES = 100
+
+# Tables joined in when a joined field is used; the queried table is ``t``
+JOINS = {
+    "players": "LEFT JOIN players p ON p.player_id = t.player_id",
+    "games": "JOIN games g ON g.game_id = t.game_id",
+}
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """A queryable field: its type, SQL expression and the join it needs."""
+
+    type: str
+    expression: str
+    join: str | None  # key of JOINS
+
+
+@dataclass(frozen=True)
+class QuerySource:
+    """A queryable table: its model, joined fields and defaults."""
+
+    name: str
+    description: str
+    table: str
+    model: type[BaseModel]
+    key: str  # unique column, the final sort key so pages are stable
+    summary: tuple[str, ...]  # fields returned when the request names none
+    default_sort: tuple[str, ...]
+    joined: dict[str, FieldSpec] = field(default_factory=dict)  # fields from JOINS
+
+
+_PLAYER_NAME = FieldSpec("string", "p.full_name", "players")
+
+QUERY_SOURCES: dict[str, QuerySource] = {
+    source.name: source
+    for source in (
+        QuerySource(
+            "player_seasons",
+            "Per-season player totals, per-game, per-36 and per-100 averages",
+            "player_season_stats",
+            PlayerSeasonStats,
+            key="stat_id",
+            summary=(
+                "player_id", "player_name", "season_id", "team_id", "games_played",
+                "points_per_game", "rebounds_per_game", "assists_per_game", "field_goal_pct",
+            ),
+            default_sort=("-points_per_game",),
+            joined={"player_name": _PLAYER_NAME},
+        ),
+        QuerySource(
+            "player_advanced",
+            "Per-season advanced player metrics (PER, win shares, BPM, VORP)",
+            "player_advanced_stats",
+            PlayerAdvancedStats,
+            key="stat_id",
+            summary=(
+                "player_id", "player_name", "season_id", "team_id", "player_efficiency_rating",
+                "true_shooting_pct", "win_shares", "box_plus_minus", "value_over_replacement",
+            ),
+            default_sort=("-win_shares",),
+            joined={"player_name": _PLAYER_NAME},
+        ),
+        QuerySource(
+            "player_games",
+            "Single-game player box scores",
+            "box_scores",
+            BoxScore,
+            key="box_score_id",
+            summary=(
+                "game_id", "game_date", "player_id", "player_name", "team_id",
+                "minutes_played", "points", "total_rebounds", "assists",
+            ),
+            default_sort=("-points",),
+            joined={
+                "player_name": _PLAYER_NAME,
+                "season_id": FieldSpec("string", "g.season_id", "games"),
+                "game_date": FieldSpec("date", "g.game_date", "games"),
+                "game_type": FieldSpec("string", "g.game_type", "games"),
+            },
+        ),
+    )
+}
+
+
+def _field_type(annotation: object) -> str | None:
+    """Query type of a model field annotation (``int | None`` -> "number")."""
+    if isinstance(annotation, types.UnionType) or typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        annotation = args[0] if len(args) == 1 else None
+    if annotation is bool:
+        return "boolean"
+    if annotation in (int, float, Decimal):
+        return "number"
+    if annotation in (date, datetime):
+        return "date"
+    if annotation is str:
+        return "string"
+    return None
+
+
+def _coerce(field_type: str, name: str, value: object) -> object:
+    """Validate one filter value against its field's type."""
+    if field_type == "number":
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValidationError(name, "expected a number")
+        return value
+    if field_type == "boolean":
+        if not isinstance(value, bool):
+            raise ValidationError(name, "expected true or false")
+        return value
+    if field_type == "date":
+        try:
+            return date.fromisoformat(str(value))
+        except ValueError:
+            raise ValidationError(name, "expected a YYYY-MM-DD date") from None
+    if isinstance(value, (str, int)) and not isinstance(value, bool):
+        return str(value)
+    raise ValidationError(name, "expected a string")
+
+
+def _json_value(value: object) -> object:
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    sql: str
+    params: list[Any]
+    fields: list[str]
+    # Every query on a dataset is recorded under one fingerprint, however it's shaped
+    fingerprint: str
+
+
+class QueryRepository:
+    """Compiles, runs and caches constrained queries."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._fields: dict[str, dict[str, FieldSpec]] = {}
+        self._results: OrderedDict[tuple[str, tuple[Any, ...]], QueryResult] = OrderedDict()
+        self._version: str | None = None
+
+    def _check_version(self) -> None:
+        version = get_data_version()
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    self._fields = {}
+                    self._results.clear()
+                    self._version = version
+
+    def fields(self, dataset: str) -> dict[str, FieldSpec]:
+        """Queryable fields of ``dataset``: name -> type, SQL expression and join.
+
+        Model fields are offered only when the table has the column, so a
+        model field the ETL doesn't populate is never referenced.
+        """
+        source = QUERY_SOURCES.get(dataset)
+        if source is None:
+            raise EntityNotFoundError("Query dataset", dataset)
+        self._check_version()
+        fields = self._fields.get(dataset)
+        if fields is None:
+            rows = execute_query(
+                "SELECT column_name FROM duckdb_columns() WHERE table_name = ? AND schema_name = 'main'",
+                [source.table],
+            )
+            columns = {str(row[0]) for row in rows}
+            fields = {}
+            for name, info in source.model.model_fields.items():
+                field_type = _field_type(info.annotation)
+                if name in columns and field_type is not None:
+                    fields[name] = FieldSpec(field_type, f't."{name}"', None)
+            for name, joined in source.joined.items():
+                fields.setdefault(name, joined)
+            self._fields[dataset] = fields
+        return fields
+
+    def describe(self) -> list[QueryDataset]:
+        """Every dataset with its fields and their operators."""
+        return [
+            QueryDataset(
+                name=source.name,
+                description=source.description,
+                fields=[
+                    QueryField(name=name, type=spec.type, operators=TYPE_OPERATORS[spec.type])
+                    for name, spec in self.fields(source.name).items()
+                ],
+            )
+            for source in QUERY_SOURCES.values()
+        ]
+
+    def compile(self, dataset: str, request: QueryRequest) -> CompiledQuery:
+        """Validate ``request`` against ``dataset`` and build its parameterized SQL.
+
+        Raises:
+            EntityNotFoundError: For an unknown dataset
+            ValidationError: For unknown fields, unsupported operators,
+                mistyped values or a limit over QUERY_MAX_ROWS
+
+        """
+        fields = self.fields(dataset)
+        source = QUERY_SOURCES[dataset]
+
+        if request.limit > settings.QUERY_MAX_ROWS:
+            raise ValidationError("limit", f"at most {settings.QUERY_MAX_ROWS} rows per query")
+
+        joins: set[str] = set()
+
+        def expression(name: str, what: str) -> str:
+            spec = fields.get(name)
+            if spec is None:
+                raise ValidationError(what, f"unknown field '{name}' for {dataset}")
+            if spec.join is not None:
+                joins.add(spec.join)
+            return spec.expression
+
+        conditions: list[str] = []
+        params: list[Any] = []
+        for condition in request.filters:
+            expr = expression(condition.field, "filters")
+            conditions.append(self._condition(condition, fields[condition.field].type, expr, params))
+
+        sort = request.sort or list(source.default_sort)
+        order: list[str] = []
+        for item in sort:
+            expr = expression(item.lstrip("-"), "sort")
+            order.append(f"{expr} {'DESC' if item.startswith('-') else 'ASC'} NULLS LAST")
+        order.append(f't."{source.key}"')
+
+        output = self._output_fields(request, source, fields, sort)
+        select = [f'{expression(name, "fields")} AS "{name}"' for name in output]
+
+        # Every identifier comes from QUERY_SOURCES or the dataset's fields; values are bound
+        sql = f'SELECT {", ".join(select)} FROM "{source.table}" t'  # noqa: S608
+        for join in sorted(joins):
+            sql += f" {JOINS[join]}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY " + ", ".join(order) + " LIMIT ? OFFSET ?"
+        # One extra row tells whether there is another page
+        params += [request.limit + 1, request.offset]
+        return CompiledQuery(sql, params, output, f"query:{dataset}")
+
+    @staticmethod
+    def _output_fields(
+        request: QueryRequest, source: QuerySource, fields: dict[str, FieldSpec], sort: list[str],
+    ) -> list[str]:
+        """Return the requested fields, or the dataset summary plus the filtered and sorted fields."""
+        if request.fields:
+            return list(request.fields)
+        output = [name for name in source.summary if name in fields]
+        # Show what the query was about next to the summary
+        for name in [condition.field for condition in request.filters] + [item.lstrip("-") for item in sort]:
+            if name not in output:
+                output.append(name)
+        return output
+
+    @staticmethod
+    def _condition(condition: QueryFilter, field_type: str, expr: str, params: list[Any]) -> str:
+        if condition.op not in TYPE_OPERATORS[field_type]:
+            raise ValidationError("filters", f"'{condition.op}' is not supported for {field_type} field '{condition.field}'")
+
+        if condition.op == "in":
+            values = condition.value
+            if not isinstance(values, list) or not 0 < len(values) <= MAX_IN_VALUES:
+                raise ValidationError(condition.field, f"'in' takes a list of 1 to {MAX_IN_VALUES} values")
+            params.extend(_coerce(field_type, condition.field, value) for value in values)
+            return f"{expr} IN ({', '.join('?' for _ in values)})"
+        if condition.op == "between":
+            bounds = condition.value
+            if not isinstance(bounds, list) or len(bounds) != 2:
+                raise ValidationError(condition.field, "'between' takes [low, high]")
+            params.extend(_coerce(field_type, condition.field, value) for value in bounds)
+            return f"{expr} BETWEEN ? AND ?"
+        params.append(_coerce(field_type, condition.field, condition.value))
+        return f"{expr} {COMPARISONS[condition.op]} ?"
+
+    def run(self, dataset: str, request: QueryRequest) -> QueryResult:
+        """Run ``request`` against ``dataset``, from the cache when possible.
+
+        Raises:
+            QueryTimeoutError: If the query outlives QUERY_TIMEOUT_MS
+
+        """
+        compiled = self.compile(dataset, request)
+        key = (compiled.sql, tuple(compiled.params))
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+        record_cache("query_results", hit=cached is not None)
+        if cached is not None:
+            return cached
+
+        try:
+            _, rows = execute_query_rows(
+                compiled.sql, compiled.params, timeout=settings.QUERY_TIMEOUT_MS / 1000, fingerprint=compiled.fingerprint,
+            )
+        except duckdb.InterruptException:
+            raise QueryTimeoutError(settings.QUERY_TIMEOUT_MS) from None
+
+        page = rows[:request.limit]
+        result = QueryResult(
+            dataset=dataset,
+            fields=compiled.fields,
+            rows=[{name: _json_value(value) for name, value in zip(compiled.fields, row, strict=True)} for row in page],
+            count=len(page),
+            has_more=len(rows) > request.limit,
+        )
+        if settings.QUERY_CACHE_ENTRIES > 0:
+            with self._lock:
+                self._results[key] = result
+                while len(self._results) > settings.QUERY_CACHE_ENTRIES:
+                    self._results.popitem(last=False)
+        return result
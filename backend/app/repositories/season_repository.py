@@ -1,14 +1,20 @@
 """Season repository for data access layer."""
 import math
 
+from datetime import date
 from typing import Any
 
+import duckdb
+import numpy as np
 import pandas as pd
 
+from app.core.config import settings
 from app.core.database import execute_query_df
-from app.models import Season, TeamSeasonStats, StandingsItem
+from app.models import PlayoffOdds, PowerRanking, Season, TeamSeasonStats, StandingsItem
 from app.repositories.base import BaseRepository
+from app.repositories.playoff_odds import OddsInputs, odds_simulator, season_state
 from app.utils.dataframe import clean_nan
+from app.utils.ratings import ELO_MEAN, ELO_SEASON_CARRYOVER, PLAYOFF_GAME_SQL, RatingEngine
 
 
 class SeasonRepository(BaseRepository[Season]):
@@ -164,6 +170,154 @@ class SeasonRepository(BaseRepository[Season]):
         records: list[dict[str, Any]] = df.to_dict(orient="records")  # type: ignore[assignment]
         return [TeamSeasonStats(**record) for record in records]
 
+    def get_power_rankings(
+        self,
+        season_id: str,
+        as_of: date | None = None,
+        by: str = "elo",
+    ) -> list[PowerRanking]:
+        """Rank teams by their latest Elo (or SRS) in a season.
+
+        Args:
+            season_id: The season identifier
+            as_of: Use ratings through this date instead of the latest
+            by: "elo" or "srs"
+
+        Returns:
+            List of PowerRanking objects, best first; empty until
+            scripts/etl/build_team_ratings.py has built team_ratings
+
+        """
+        params: list[Any] = [season_id]
+        as_of_filter = ""
+        if as_of:
+            as_of_filter = "AND game_date <= ?"
+            params.append(as_of)
+        order = "srs DESC NULLS LAST, elo DESC" if by == "srs" else "elo DESC"
+        query = f"""
+            WITH latest AS (
+                SELECT team_id, elo, srs, game_date, COUNT(*) OVER (PARTITION BY team_id) AS games
+                FROM team_ratings
+                WHERE season_id = ? {as_of_filter}
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY team_id ORDER BY game_date DESC, game_id DESC) = 1
+            )
+            SELECT
+                ROW_NUMBER() OVER (ORDER BY {order}) AS rank,
+                l.team_id,
+                t.full_name AS team_name,
+                t.abbreviation,
+                ROUND(l.elo, 1) AS elo,
+                ROUND(l.srs, 2) AS srs,
+                RANK() OVER (ORDER BY l.elo DESC) AS elo_rank,
+                CASE WHEN l.srs IS NOT NULL THEN RANK() OVER (ORDER BY l.srs DESC NULLS LAST) END AS srs_rank,
+                l.games,
+                l.game_date AS last_game_date
+            FROM latest l
+            LEFT JOIN teams t ON t.team_id = l.team_id
+            ORDER BY rank
+        """  # noqa: S608 - as_of_filter and order are fixed strings
+        try:
+            df = execute_query_df(query, params)
+        except duckdb.CatalogException:
+            return []
+        return [PowerRanking.model_validate(record) for record in clean_nan(df).to_dict(orient="records")]
+
+    async def get_odds(self, season_id: str, simulations: int = settings.ODDS_SIMULATIONS) -> PlayoffOdds | None:
+        """Return simulated seeding, playoff and title odds from the games left to play.
+
+        Awaited directly rather than through run_db: the reads run on the DB
+        executor, the simulation in odds_simulator's process pool.
+
+        Args:
+            season_id: The season identifier
+            simulations: Seasons to simulate, rounded up to whole batches
+
+        Returns:
+            PlayoffOdds, cached until the data changes, or None if the
+            season has no regular-season games
+
+        """
+        return await odds_simulator.get(season_id, simulations, self._odds_inputs)
+
+    def _odds_inputs(self, season_id: str) -> OddsInputs | None:
+        games = execute_query_df(
+            f"""
+            SELECT game_id, game_date, home_team_id, away_team_id, home_team_score, away_team_score
+            FROM games
+            WHERE season_id = ? AND NOT {PLAYOFF_GAME_SQL}
+              AND home_team_id IS NOT NULL AND away_team_id IS NOT NULL
+            ORDER BY game_date, game_id
+            """,  # noqa: S608 - PLAYOFF_GAME_SQL is a constant
+            [season_id],
+        )
+        if games.empty:
+            return None
+
+        team_ids = sorted(set(games["home_team_id"]) | set(games["away_team_id"]))
+        index = {team_id: i for i, team_id in enumerate(team_ids)}
+        home = games["home_team_id"].map(index).to_numpy(dtype=np.int64)
+        away = games["away_team_id"].map(index).to_numpy(dtype=np.int64)
+        finished = (games["home_team_score"].notna() & games["away_team_score"].notna()).to_numpy(dtype=bool)
+        home_won = finished & (games["home_team_score"] > games["away_team_score"]).fillna(False).to_numpy(dtype=bool)
+        away_won = finished & ~home_won
+        size = len(team_ids)
+        wins = np.bincount(home[home_won], minlength=size) + np.bincount(away[away_won], minlength=size)
+        losses = np.bincount(home[away_won], minlength=size) + np.bincount(away[home_won], minlength=size)
+
+        placeholders = ", ".join("?" * size)
+        teams = execute_query_df(
+            f"SELECT team_id, full_name, conference FROM teams WHERE team_id IN ({placeholders})",  # noqa: S608
+            team_ids,
+        )
+        names = dict(zip(teams["team_id"], teams["full_name"], strict=True))
+        conference_of = dict(zip(teams["team_id"], teams["conference"], strict=True))
+        conferences = [conference_of.get(t) if pd.notna(conference_of.get(t)) else None for t in team_ids]
+
+        elo = self._current_elo(season_id, team_ids, games[finished])
+        state = season_state(
+            team_ids, conferences, wins, losses, elo, home[~finished], away[~finished], settings.ODDS_PLAYOFF_TEAMS,
+        )
+        return OddsInputs(state, names, conferences)
+
+    def _current_elo(self, season_id: str, team_ids: list[str], finished: pd.DataFrame) -> np.ndarray:
+        """Each team's Elo after its latest finished game of the season.
+
+        Read from team_ratings when it has been built (with the between-season
+        regression for teams yet to play); otherwise rated from this season's
+        results alone, starting every team at the mean.
+        """
+        as_of = finished["game_date"].max() if not finished.empty else None
+        placeholders = ", ".join("?" * len(team_ids))
+        try:
+            ratings = execute_query_df(
+                f"""
+                SELECT
+                    team_id,
+                    elo,
+                    COUNT(*) FILTER (WHERE season_id = ? AND NOT is_playoff) OVER (PARTITION BY team_id) AS played
+                FROM team_ratings
+                WHERE team_id IN ({placeholders}) {"AND game_date <= ?" if as_of is not None else ""}
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY team_id ORDER BY game_date DESC, game_id DESC) = 1
+                """,  # noqa: S608 - only placeholders are interpolated
+                [season_id, *team_ids, *([as_of] if as_of is not None else [])],
+            )
+        except duckdb.CatalogException:
+            engine = RatingEngine()
+            engine.process(
+                (row.game_id, season_id, row.game_date, row.home_team_id, row.away_team_id,
+                 row.home_team_score, row.away_team_score, False)
+                for row in finished.itertuples()
+            )
+            return np.array([engine.teams[t].elo if t in engine.teams else ELO_MEAN for t in team_ids])
+
+        current = {}
+        for team_id, elo, played in ratings.itertuples(index=False):
+            if not played:
+                # Still on last season's rating: regress it as its first game will
+                elo = ELO_SEASON_CARRYOVER * elo + (1 - ELO_SEASON_CARRYOVER) * ELO_MEAN
+            current[team_id] = elo
+        return np.array([current.get(t, ELO_MEAN) for t in team_ids])
+
     def get_leaders(
         self,
         season_id: str,
@@ -0,0 +1,306 @@
+"""Memory-mapped player similarity vectors and exact top-k search.
+
+scripts/etl/build_similarity_vectors.py writes, into SIMILARITY_DIR, one
+float32 row per qualifying player season (each stat z-scored within its
+season, so players are compared against their own league) and one per
+career (the minutes-weighted mean of its seasons):
+
+    manifest.json           features, row counts, build time
+    players.npy             player ids, sorted; a player's code is its index
+    season_vectors.npy      (seasons, features) float32, ordered by season
+    season_norms.npy        L2 norm of each season row
+    season_players.npy      player code of each season row
+    season_ids.npy          season id of each row
+    season_years.npy        first year of each row's season, for era filters
+    career_vectors.npy      (players, features) float32, one row per code
+    career_norms.npy
+    career_first.npy        first and last season year of each career
+    career_last.npy
+
+The arrays are opened with ``np.load(mmap_mode="r")``, so every worker
+shares the page cache instead of holding its own copy, and are reopened
+when the manifest changes. A search is one pass of matrix-vector products
+over blocks of BLOCK_ROWS rows with ``np.argpartition`` per block, exact
+for both cosine similarity and Euclidean distance. Season rows are sorted
+by year, so an era filter is a contiguous slice rather than a copy.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from app.core.config import settings
+
+MANIFEST_NAME = "manifest.json"
+BLOCK_ROWS = 65_536
+METRICS = ("cosine", "euclidean")
+
+
+def season_year(season_id: str) -> int:
+    """Leading year of a season id ("2016" or "2015-16" -> 2016 / 2015)."""
+    return int(str(season_id)[:4])
+
+
+def write_index(
+    directory: str,
+    features: list[str],
+    season_player_ids: np.ndarray,
+    season_ids: np.ndarray,
+    season_vectors: np.ndarray,
+    career_player_ids: np.ndarray,
+    career_vectors: np.ndarray,
+    career_first: np.ndarray,
+    career_last: np.ndarray,
+    extra: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Write an index into ``directory``, replacing any previous one atomically.
+
+    Season rows may come in any order; careers must have one row per player.
+    """
+    players, career_order = np.unique(np.asarray(career_player_ids, dtype=str), return_index=True)
+    season_codes = np.searchsorted(players, np.asarray(season_player_ids, dtype=str))
+    years = np.array([season_year(s) for s in season_ids], dtype=np.int16)
+    order = np.lexsort((season_codes, years))
+
+    seasons = np.ascontiguousarray(np.asarray(season_vectors, dtype=np.float32)[order])
+    careers = np.ascontiguousarray(np.asarray(career_vectors, dtype=np.float32)[career_order])
+    arrays = {
+        "players": players,
+        "season_vectors": seasons,
+        "season_norms": np.linalg.norm(seasons, axis=1).astype(np.float32),
+        "season_players": season_codes[order].astype(np.int32),
+        "season_ids": np.asarray(season_ids, dtype=str)[order],
+        "season_years": years[order],
+        "career_vectors": careers,
+        "career_norms": np.linalg.norm(careers, axis=1).astype(np.float32),
+        "career_first": np.asarray(career_first, dtype=np.int16)[career_order],
+        "career_last": np.asarray(career_last, dtype=np.int16)[career_order],
+    }
+
+    staging = f"{directory.rstrip(os.sep)}.staging"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f"{name}.npy"), array)
+    manifest = {
+        "features": features,
+        "seasons": int(seasons.shape[0]),
+        "careers": int(careers.shape[0]),
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        **(extra or {}),
+    }
+    with open(os.path.join(staging, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    previous = f"{directory.rstrip(os.sep)}.previous"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(directory):
+        os.rename(directory, previous)
+    os.rename(staging, directory)
+    shutil.rmtree(previous, ignore_errors=True)
+    return manifest
+
+
+def top_k(
+    vectors: np.ndarray,
+    norms: np.ndarray,
+    query: np.ndarray,
+    k: int,
+    metric: str = "cosine",
+    codes: np.ndarray | None = None,
+    exclude_code: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Exact top ``k`` rows of ``vectors`` for ``query``.
+
+    Args:
+        vectors: (rows, features) matrix, e.g. a memory-mapped slice
+        norms: L2 norm of each row
+        query: (features,) vector
+        k: Rows to return
+        metric: "cosine" (similarity, higher is closer) or "euclidean"
+            (distance, lower is closer)
+        codes: Player code of each row
+        exclude_code: Code in ``codes`` whose rows are skipped (the query
+            player's own)
+
+    Returns:
+        Row indices and their scores, closest first
+
+    """
+    query = np.asarray(query, dtype=np.float32)
+    query_norm = float(np.linalg.norm(query))
+    candidates: list[np.ndarray] = []
+    scores: list[np.ndarray] = []
+    for start in range(0, vectors.shape[0], BLOCK_ROWS):
+        end = min(start + BLOCK_ROWS, vectors.shape[0])
+        dots = vectors[start:end] @ query
+        block_norms = norms[start:end]
+        if metric == "cosine":
+            block = dots / np.maximum(block_norms * query_norm, 1e-12)
+        else:
+            # Negated squared distance, so that higher is closer for both metrics
+            block = 2 * dots - block_norms * block_norms - query_norm * query_norm
+        if exclude_code is not None and codes is not None:
+            block[codes[start:end] == exclude_code] = -np.inf
+        best = np.argpartition(block, -k)[-k:] if block.size > k else np.arange(block.size)
+        candidates.append(best + start)
+        scores.append(block[best])
+    if not candidates:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    rows = np.concatenate(candidates)
+    found = np.concatenate(scores)
+    keep = np.isfinite(found)
+    rows, found = rows[keep], found[keep]
+    order = np.argsort(-found, kind="stable")[:k]
+    rows, found = rows[order], found[order]
+    if metric == "euclidean":
+        found = np.sqrt(np.maximum(-found, 0))
+    return rows, found
+
+
+@dataclass(frozen=True)
+class SimilarityMatch:
+    player_id: str
+    score: float
+    season_id: str | None = None
+    first_season: int | None = None
+    last_season: int | None = None
+
+
+class SimilarityIndex:
+    """The memory-mapped arrays in ``directory``, reopened when they are rebuilt."""
+
+    def __init__(self, directory: str, check_interval: float = 1.0) -> None:
+        self.directory = directory
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._arrays: dict[str, np.ndarray] | None = None
+        self._manifest: dict[str, Any] = {}
+        self._stamp: int | None = None
+        self._checked_at = float("-inf")
+
+    def _load(self) -> dict[str, np.ndarray] | None:
+        """Return the current arrays, or None when no index has been built."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._arrays
+        with self._lock:
+            self._checked_at = now
+            path = os.path.join(self.directory, MANIFEST_NAME)
+            try:
+                stamp = os.stat(path).st_mtime_ns
+            except OSError:
+                self._arrays, self._stamp = None, None
+                return None
+            if stamp != self._stamp:
+                with open(path) as f:
+                    self._manifest = json.load(f)
+                self._arrays = {
+                    name[: -len(".npy")]: np.load(os.path.join(self.directory, name), mmap_mode="r")
+                    for name in os.listdir(self.directory)
+                    if name.endswith(".npy")
+                }
+                self._stamp = stamp
+            return self._arrays
+
+    @property
+    def available(self) -> bool:
+        return self._load() is not None
+
+    @property
+    def features(self) -> list[str]:
+        self._load()
+        return list(self._manifest.get("features", []))
+
+    def search(
+        self,
+        player_id: str,
+        season_id: str | None = None,
+        k: int = 10,
+        metric: str = "cosine",
+        era_from: int | None = None,
+        era_to: int | None = None,
+    ) -> list[SimilarityMatch] | None:
+        """Players (or player seasons, with ``season_id``) closest to ``player_id``'s.
+
+        ``era_from``/``era_to`` keep only seasons starting in that range of
+        years, or careers overlapping it. Returns None when the index or the
+        player (season) isn't in it.
+        """
+        arrays = self._load()
+        if arrays is None:
+            return None
+        players = arrays["players"]
+        code = int(np.searchsorted(players, player_id))
+        if code >= players.size or players[code] != player_id:
+            return None
+
+        if season_id is None:
+            query = arrays["career_vectors"][code]
+            candidates = np.arange(players.size)
+            if era_from is not None or era_to is not None:
+                overlap = np.ones(players.size, dtype=bool)
+                if era_from is not None:
+                    overlap &= arrays["career_last"] >= era_from
+                if era_to is not None:
+                    overlap &= arrays["career_first"] <= era_to
+                candidates = np.flatnonzero(overlap)
+            rows, scores = top_k(
+                arrays["career_vectors"][candidates],
+                arrays["career_norms"][candidates],
+                query,
+                k,
+                metric,
+                candidates.astype(np.int32),
+                code,
+            )
+            return [
+                SimilarityMatch(
+                    player_id=str(players[candidates[row]]),
+                    score=float(score),
+                    first_season=int(arrays["career_first"][candidates[row]]),
+                    last_season=int(arrays["career_last"][candidates[row]]),
+                )
+                for row, score in zip(rows, scores, strict=True)
+            ]
+
+        years = arrays["season_years"]
+        year = season_year(season_id)
+        lo, hi = int(np.searchsorted(years, year, side="left")), int(np.searchsorted(years, year, side="right"))
+        own = np.flatnonzero(
+            (arrays["season_players"][lo:hi] == code) & (arrays["season_ids"][lo:hi] == str(season_id)),
+        )
+        if not own.size:
+            return None
+        query = arrays["season_vectors"][lo + own[0]]
+
+        start = int(np.searchsorted(years, era_from, side="left")) if era_from is not None else 0
+        end = int(np.searchsorted(years, era_to, side="right")) if era_to is not None else years.size
+        rows, scores = top_k(
+            arrays["season_vectors"][start:end],
+            arrays["season_norms"][start:end],
+            query,
+            k,
+            metric,
+            arrays["season_players"][start:end],
+            code,
+        )
+        return [
+            SimilarityMatch(
+                player_id=str(players[arrays["season_players"][start + row]]),
+                score=float(score),
+                season_id=str(arrays["season_ids"][start + row]),
+            )
+            for row, score in zip(rows, scores, strict=True)
+        ]
+
+
+similarity_index = SimilarityIndex(settings.SIMILARITY_DIR)
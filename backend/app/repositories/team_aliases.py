@@ -0,0 +1,120 @@
+"""In-process team ID / abbreviation registry.
+
+Team-filtered endpoints accept either a team ID or an abbreviation. Rather
+than querying `teams` on every request, the `team_aliases` table (built by
+scripts/etl/build_team_aliases.py) and the team ids are loaded once into
+dicts, so resolution costs no queries. They are reloaded when the data
+version changes, i.e. after the ETL rewrites the database.
+"""
+
+import threading
+from dataclasses import dataclass
+
+import duckdb
+
+from app.core.database import execute_query, get_data_version
+from app.core.metrics import record_cache
+
+
+@dataclass(frozen=True)
+class TeamAlias:
+    """An abbreviation's mapping over an inclusive range of season end years."""
+
+    team_id: str
+    franchise_id: str | None
+    first_season: int | None
+    last_season: int | None
+
+    def covers(self, season: int) -> bool:
+        return (self.first_season is None or self.first_season <= season) and (
+            self.last_season is None or season <= self.last_season
+        )
+
+
+class TeamAliasRegistry:
+    """Lazily loaded map of team ids and season-aware abbreviations."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._team_ids: set[str] | None = None
+        self._aliases: dict[str, list[TeamAlias]] = {}
+        self._version: str | None = None
+
+    def _load(self) -> None:
+        team_rows = execute_query("SELECT team_id, abbreviation, franchise_id FROM teams")
+        aliases: dict[str, list[TeamAlias]] = {}
+        try:
+            alias_rows = execute_query(
+                "SELECT abbreviation, team_id, franchise_id, first_season, last_season FROM team_aliases",
+            )
+        except duckdb.Error:
+            # Databases built before team_aliases existed: fall back to current abbreviations
+            alias_rows = [(abbr, team_id, franchise_id, None, None) for team_id, abbr, franchise_id in team_rows]
+
+        for abbr, team_id, franchise_id, first_season, last_season in alias_rows:
+            if not abbr:
+                continue
+            aliases.setdefault(str(abbr).upper(), []).append(
+                TeamAlias(
+                    team_id=str(team_id),
+                    franchise_id=franchise_id,
+                    first_season=int(first_season) if first_season is not None else None,
+                    last_season=int(last_season) if last_season is not None else None,
+                ),
+            )
+        # Open-ended (current) mappings first, then most recent
+        for entries in aliases.values():
+            entries.sort(key=lambda a: (a.last_season is not None, -(a.last_season or 0)))
+
+        self._aliases = aliases
+        self._team_ids = {str(row[0]) for row in team_rows}
+
+    def _ensure_loaded(self) -> None:
+        version = get_data_version()
+        if self._team_ids is None or self._version != version:
+            with self._lock:
+                if self._team_ids is None or self._version != version:
+                    record_cache("team_aliases", hit=False)
+                    self._load()
+                    self._version = version
+                    return
+        record_cache("team_aliases", hit=True)
+
+    def reload(self) -> None:
+        """Discard the cached maps; they are reloaded on next use."""
+        with self._lock:
+            self._team_ids = None
+            self._aliases = {}
+
+    def resolve(self, team_id_or_abbr: str, season: int | str | None = None) -> str | None:
+        """Resolve a team ID or abbreviation to a team ID.
+
+        Args:
+            team_id_or_abbr: Team ID or abbreviation (case-insensitive)
+            season: Optional season end year; picks the team that used the
+                abbreviation that season instead of its current holder
+
+        Returns:
+            Team ID, or None if unknown
+
+        """
+        self._ensure_loaded()
+        if self._team_ids is not None and team_id_or_abbr in self._team_ids:
+            return team_id_or_abbr
+
+        entries = self._aliases.get(team_id_or_abbr.upper())
+        if not entries:
+            return None
+        if season is not None:
+            try:
+                season_year = int(season)
+            except (TypeError, ValueError):
+                season_year = None
+            if season_year is not None:
+                for entry in entries:
+                    if entry.covers(season_year):
+                        return entry.team_id
+        return entries[0].team_id
+
+
+team_aliases = TeamAliasRegistry()
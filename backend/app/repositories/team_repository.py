@@ -1,15 +1,20 @@
 from typing import Any
 
+import duckdb
 
 from app.core.database import execute_query_df
 from app.models import (
     RosterRow,
+    StreakSummary,
     Team,
+    TeamRating,
     TeamGameLogRow,
     TeamScheduleRow,
     TeamSeasonStats,
 )
-from app.repositories.base import BaseRepository
+from app.repositories.base import BaseRepository, ListQuery
+from app.repositories.game_arrays import GameArrays, game_arrays, streak
+from app.repositories.team_aliases import team_aliases
 from app.utils.dataframe import clean_nan, df_to_records
 
 
@@ -30,35 +35,35 @@ class TeamRepository(BaseRepository[Team]):
         return self._to_models(df)
 
     def get_by_id(self, team_id: str) -> Team | None:
-        # Try by ID first
-        query = "SELECT * FROM teams WHERE team_id = ?"
-        df = execute_query_df(query, [team_id])
-
-        if df.empty:
-            # Try by abbreviation
-            query = "SELECT * FROM teams WHERE abbreviation = ?"
-            df = execute_query_df(query, [team_id])
+        # Accepts an ID or abbreviation; resolved in-process
+        resolved_id = self.resolve_team_id(team_id)
+        if not resolved_id:
+            return None
 
+        query = "SELECT * FROM teams WHERE team_id = ?"
+        df = execute_query_df(query, [resolved_id])
         return self._to_model(df)
 
-    def resolve_team_id(self, team_id_or_abbr: str) -> str | None:
-        """Resolve a team ID from an ID or abbreviation."""
-        team = self.get_by_id(team_id_or_abbr)
-        return team.team_id if team else None
-
-    def get_stats(self, team_id: str) -> list[TeamSeasonStats]:
-        # Resolve ID first
-        resolved_id = self.resolve_team_id(team_id)
-        if not resolved_id:
-            return []
+    def resolve_team_id(self, team_id_or_abbr: str, season: int | str | None = None) -> str | None:
+        """Resolve a team ID from an ID or abbreviation without querying."""
+        return team_aliases.resolve(team_id_or_abbr, season)
 
+    def stats_query(self, team_id: str) -> ListQuery:
+        # An unknown team binds NULL, which matches no rows
         query = """
             SELECT *
             FROM team_season_stats
             WHERE team_id = ?
             ORDER BY season_id DESC
         """
-        df = execute_query_df(query, [resolved_id])
+        return query, [self.resolve_team_id(team_id)]
+
+    def get_stats(self, team_id: str) -> list[TeamSeasonStats]:
+        # Resolve ID first
+        if not self.resolve_team_id(team_id):
+            return []
+
+        df = execute_query_df(*self.stats_query(team_id))
         if df.empty:
             return []
 
@@ -66,12 +71,8 @@ class TeamRepository(BaseRepository[Team]):
         records = df_to_records(df)
         return [TeamSeasonStats(**record) for record in records]
 
-    def get_team_game_log(self, team_id: str) -> list[TeamGameLogRow]:
-        """Return team game log (tgl_basic) rows with source-of-truth columns."""
-        resolved_id = self.resolve_team_id(team_id)
-        if not resolved_id:
-            return []
-
+    def game_log_query(self, team_id: str) -> ListQuery:
+        """Build the team game log query; an unknown team binds NULL and matches nothing."""
         query = """
             WITH team_games AS (
                 SELECT
@@ -180,16 +181,27 @@ class TeamRepository(BaseRepository[Team]):
                 ON gs.game_id = tg.game_id
             ORDER BY tg.date, tg.game_id
         """
-        df = execute_query_df(query, [resolved_id])
+        return query, [self.resolve_team_id(team_id)]
+
+    def get_team_game_log(self, team_id: str) -> list[TeamGameLogRow]:
+        """Return team game log (tgl_basic) rows with source-of-truth columns."""
+        if not self.resolve_team_id(team_id):
+            return []
+
+        df = execute_query_df(*self.game_log_query(team_id))
         if df.empty:
             return []
         df = clean_nan(df)
         records = df_to_records(df)
         return [TeamGameLogRow(**record) for record in records]
 
-    def get_team_schedule(self, team_id: str) -> list[TeamScheduleRow]:
-        """Return team schedule/results (games table) with source-of-truth columns."""
-        resolved_id = self.resolve_team_id(team_id)
+    def get_team_schedule(self, team_id: str, season_id: str | None = None) -> list[TeamScheduleRow]:
+        """Return team schedule/results (games table) with source-of-truth columns.
+
+        With ``season_id`` only that season's games are returned, and game
+        numbers, records and streaks restart with it.
+        """
+        resolved_id = self.resolve_team_id(team_id, season_id)
         if not resolved_id:
             return []
 
@@ -221,7 +233,7 @@ class TeamRepository(BaseRepository[Team]):
                     END AS ot
                 FROM games g
                 LEFT JOIN teams opp ON opp.team_id = CASE WHEN g.home_team_id = ? THEN g.away_team_id ELSE g.home_team_id END
-                WHERE g.home_team_id = ? OR g.away_team_id = ?
+                WHERE (g.home_team_id = ? OR g.away_team_id = ?) {season_filter}
             ),
             numbered AS (
                 SELECT
@@ -271,7 +283,10 @@ class TeamRepository(BaseRepository[Team]):
             FROM streaked
             ORDER BY date, start_et, game_id
         """
-        params = [resolved_id] * 11
+        params: list[Any] = [resolved_id] * 11
+        if season_id:
+            params.append(season_id)
+        query = query.format(season_filter="AND g.season_id = ?" if season_id else "")
         df = execute_query_df(query, params)
         if df.empty:
             return []
@@ -279,6 +294,70 @@ class TeamRepository(BaseRepository[Team]):
         records = df_to_records(df)
         return [TeamScheduleRow(**record) for record in records]
 
+    def _load_game_arrays(self, team_id: str) -> GameArrays:
+        """Every finished game the team played, oldest first."""
+        query = """
+            SELECT
+                game_id,
+                game_date,
+                season_id,
+                CASE WHEN home_team_id = ? THEN 1.0 ELSE 0.0 END AS is_home,
+                CASE WHEN home_team_id = ? THEN home_team_score ELSE away_team_score END AS points,
+                CASE WHEN home_team_id = ? THEN away_team_score ELSE home_team_score END AS opp_points
+            FROM games
+            WHERE (home_team_id = ? OR away_team_id = ?)
+              AND home_team_score IS NOT NULL AND away_team_score IS NOT NULL
+            ORDER BY game_date, game_time, game_id
+        """
+        df = execute_query_df(query, [team_id] * 5)
+        return GameArrays.from_frame(df, ["is_home", "points", "opp_points"])
+
+    def get_streaks(self, team_id: str, season_id: str | None = None) -> StreakSummary | None:
+        """Return current and longest win, loss, home-win and road-win streaks.
+
+        Home and road streaks count consecutive home (road) games, skipping
+        the games in between. None for an unknown team.
+        """
+        resolved_id = self.resolve_team_id(team_id, season_id)
+        if not resolved_id:
+            return None
+
+        arrays = game_arrays.get("team", resolved_id, self._load_game_arrays).season(season_id)
+        wins = arrays.columns["points"] > arrays.columns["opp_points"]
+        home = arrays.columns["is_home"] == 1
+        return StreakSummary(
+            entity_id=resolved_id,
+            season_id=season_id,
+            games=len(arrays),
+            streaks=[
+                streak("wins", arrays, wins),
+                streak("losses", arrays, ~wins),
+                streak("home_wins", arrays.select(home), wins[home]),
+                streak("road_wins", arrays.select(~home), wins[~home]),
+            ],
+        )
+
+    def get_ratings(self, team_id: str, season_id: str | None = None) -> list[TeamRating] | None:
+        """Elo and SRS after each game, oldest first. None for an unknown team.
+
+        Empty until scripts/etl/build_team_ratings.py has built team_ratings.
+        """
+        resolved_id = self.resolve_team_id(team_id, season_id)
+        if not resolved_id:
+            return None
+
+        query = "SELECT * FROM team_ratings WHERE team_id = ?"
+        params = [resolved_id]
+        if season_id:
+            query += " AND season_id = ?"
+            params.append(season_id)
+        query += " ORDER BY game_date, game_id"
+        try:
+            df = execute_query_df(query, params)
+        except duckdb.CatalogException:
+            return []
+        return [TeamRating(**record) for record in df_to_records(df)]
+
     def get_roster(self, team_id: str) -> list[RosterRow]:
         """Return team roster matching Basketball-Reference roster table columns."""
         resolved_id = self.resolve_team_id(team_id)
@@ -8,6 +8,8 @@ from typing import Any
 
 import pandas as pd
 
+from app.core.profiling import span
+
 
 def clean_nan(df: pd.DataFrame) -> pd.DataFrame:
     """Replace NaN values with None for Pydantic compatibility.
@@ -43,8 +45,9 @@ def df_to_records(df: pd.DataFrame) -> list[dict[str, Any]]:
     """
     if df.empty:
         return []
-    cleaned = clean_nan(df)
-    return cleaned.to_dict(orient="records")  # type: ignore[return-value]
+    with span("df_cleanup"):
+        cleaned = clean_nan(df)
+        return cleaned.to_dict(orient="records")  # type: ignore[return-value]
 
 
 def df_to_single_record(df: pd.DataFrame) -> dict[str, Any] | None:
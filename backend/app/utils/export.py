@@ -0,0 +1,75 @@
+"""Chunk encoders for streaming exports.
+
+Each encoder turns one chunk of rows into bytes that can be written straight
+to the response, so an export never holds more than one chunk in memory.
+Arrow IPC needs pyarrow, which is optional (``pip install -e ".[arrow]"``).
+"""
+
+import csv
+import io
+import json
+import math
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+def arrow_available() -> bool:
+    try:
+        import pyarrow as pa  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def csv_header(columns: Sequence[str]) -> bytes:
+    return csv_rows([tuple(columns)])
+
+
+def csv_rows(rows: Sequence[Sequence[Any]]) -> bytes:
+    """Encode rows as CSV; None becomes an empty field."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _json_value(value: object) -> object:
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def ndjson_rows(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    """Encode rows as newline-delimited JSON objects; dates become ISO strings."""
+    lines = [
+        json.dumps({column: _json_value(value) for column, value in zip(columns, row, strict=True)}, default=str)
+        for row in rows
+    ]
+    return ("\n".join(lines) + "\n").encode() if lines else b""
+
+
+class ArrowStreamEncoder:
+    """Arrow IPC stream format, emitted one record batch at a time."""
+
+    def __init__(self, schema: "pa.Schema") -> None:
+        import pyarrow as pa
+
+        self._buffer = io.BytesIO()
+        self._writer = pa.ipc.new_stream(self._buffer, schema)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def write(self, batch: "pa.RecordBatch") -> bytes:
+        self._writer.write_batch(batch)
+        return self._drain()
+
+    def close(self) -> bytes:
+        """Remaining bytes, including the end-of-stream marker."""
+        self._writer.close()
+        return self._drain()
@@ -0,0 +1,157 @@
+"""Vectorized Monte Carlo simulation of a season's remainder and playoffs.
+
+Every step runs over a batch of simulations at once; there is no Python
+loop per game or per series:
+
+- Remaining games: one uniform draw per (simulation, game) against the
+  home side's Elo win probability; final wins are the current wins plus
+  the drawn results, summed per team with a matrix product against the
+  schedule's one-hot team matrix.
+- Seeding: teams sort within their conference by wins, with ties broken
+  at random.
+- Bracket: seeds 1 v N, 2 v N-1, ... in the usual bracket order, every
+  round drawn as best-of-seven series. A series goes to whoever wins four
+  of all seven games drawn, which is the same outcome as stopping at
+  four. The team with more wins has home court (2-2-1-1-1). Conference
+  champions then meet in the finals.
+
+Ratings stay fixed during a simulation, and playoff results already
+played are not conditioned on. ``simulate`` returns counts, so chunks run
+in separate processes can simply be added together.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.utils.ratings import ELO_HOME_ADVANTAGE
+
+BATCH_SIMULATIONS = 2000
+# Games of a best-of-seven played at the home-court team's arena
+SERIES_HOME_GAMES = np.array([True, True, False, False, True, False, True])
+
+
+@dataclass(frozen=True)
+class SeasonState:
+    """A season as it stands, indexed by team position in ``team_ids``."""
+
+    team_ids: tuple[str, ...]
+    conferences: np.ndarray  # conference code per team, 0..C-1
+    wins: np.ndarray
+    losses: np.ndarray
+    elo: np.ndarray
+    home: np.ndarray  # team index per remaining game
+    away: np.ndarray
+    playoff_teams: int  # per conference, a power of two
+
+    @property
+    def rounds(self) -> int:
+        """Rounds of series, including the finals between conferences."""
+        conferences = int(self.conferences.max()) + 1 if self.conferences.size else 1
+        return int(np.log2(self.playoff_teams * conferences))
+
+
+@dataclass
+class OddsCounts:
+    """Outcome counts over ``simulations`` runs, per team."""
+
+    simulations: int
+    wins: np.ndarray  # summed final wins
+    seeds: np.ndarray  # (teams, playoff_teams): times finishing with each seed
+    rounds: np.ndarray  # (teams, rounds + 1): times reaching each round, last = title
+
+    def __add__(self, other: "OddsCounts") -> "OddsCounts":
+        return OddsCounts(
+            self.simulations + other.simulations,
+            self.wins + other.wins,
+            self.seeds + other.seeds,
+            self.rounds + other.rounds,
+        )
+
+
+def bracket_order(size: int) -> np.ndarray:
+    """Seed positions (0-based) in bracket order: 1, 8, 4, 5, 2, 7, 3, 6 for 8."""
+    order = np.array([0])
+    while order.size < size:
+        order = np.column_stack((order, 2 * order.size - 1 - order)).ravel()
+    return order
+
+
+def win_probability(elo: np.ndarray, opponent_elo: np.ndarray, at_home: bool | np.ndarray) -> np.ndarray:
+    """Elo win probability, with home advantage when ``at_home``."""
+    diff = elo - opponent_elo + np.where(at_home, ELO_HOME_ADVANTAGE, -ELO_HOME_ADVANTAGE)
+    probability: np.ndarray = 1.0 / (1.0 + 10.0 ** (-diff / 400.0))
+    return probability
+
+
+def _final_wins(state: SeasonState, rng: np.random.Generator, n: int) -> np.ndarray:
+    teams = len(state.team_ids)
+    if not state.home.size:
+        return np.array(np.broadcast_to(state.wins.astype(np.float32), (n, teams)))
+    games = np.arange(state.home.size)
+    home_matrix = np.zeros((state.home.size, teams), dtype=np.float32)
+    away_matrix = np.zeros((state.home.size, teams), dtype=np.float32)
+    home_matrix[games, state.home] = 1
+    away_matrix[games, state.away] = 1
+    p_home = win_probability(state.elo[state.home], state.elo[state.away], True)
+    home_won = (rng.random((n, state.home.size)) < p_home).astype(np.float32)
+    final_wins: np.ndarray = state.wins + home_won @ home_matrix + (1 - home_won) @ away_matrix
+    return final_wins
+
+
+def _play_series(
+    high: np.ndarray, low: np.ndarray, elo: np.ndarray, rng: np.random.Generator,
+) -> np.ndarray:
+    """Winners of best-of-seven series, ``high`` holding home court."""
+    p_home = win_probability(elo[high], elo[low], True)[..., None]
+    p_road = win_probability(elo[high], elo[low], False)[..., None]
+    p = np.where(SERIES_HOME_GAMES, p_home, p_road)
+    high_won = (rng.random(p.shape) < p).sum(axis=-1) >= 4
+    return np.where(high_won, high, low)
+
+
+def _simulate_batch(state: SeasonState, rng: np.random.Generator, n: int, counts: OddsCounts) -> None:
+    teams = len(state.team_ids)
+    seeds = state.playoff_teams
+    wins = _final_wins(state, rng, n)
+    # Wins are whole numbers, so noise below 1 only reorders ties
+    standing = wins + rng.random((n, teams)) * 0.5
+
+    brackets = []
+    order = bracket_order(seeds)
+    for conference in range(int(state.conferences.max()) + 1):
+        members = np.flatnonzero(state.conferences == conference)
+        seeded = members[np.argsort(-standing[:, members], axis=1)[:, :seeds]]  # (n, seeds)
+        counts.seeds += np.bincount(
+            (seeded * seeds + np.arange(seeds)).ravel(), minlength=teams * seeds,
+        ).reshape(teams, seeds)
+        brackets.append(seeded[:, order])
+    slots = np.concatenate(brackets, axis=1)  # conference brackets side by side
+
+    rows = np.arange(n)[:, None]
+    for level in range(state.rounds + 1):
+        counts.rounds[:, level] += np.bincount(slots.ravel(), minlength=teams)
+        if level == state.rounds:
+            break
+        a, b = slots[:, 0::2], slots[:, 1::2]
+        a_home = standing[rows, a] >= standing[rows, b]
+        slots = _play_series(np.where(a_home, a, b), np.where(a_home, b, a), state.elo, rng)
+
+    counts.wins += wins.sum(axis=0)
+
+
+def simulate(state: SeasonState, simulations: int, seed: int | np.random.SeedSequence | None = None) -> OddsCounts:
+    """Run ``simulations`` seasons in batches of BATCH_SIMULATIONS."""
+    teams = len(state.team_ids)
+    rng = np.random.default_rng(seed)
+    counts = OddsCounts(
+        0,
+        np.zeros(teams),
+        np.zeros((teams, state.playoff_teams), dtype=np.int64),
+        np.zeros((teams, state.rounds + 1), dtype=np.int64),
+    )
+    for start in range(0, simulations, BATCH_SIMULATIONS):
+        n = min(BATCH_SIMULATIONS, simulations - start)
+        _simulate_batch(state, rng, n, counts)
+        counts.simulations += n
+    return counts
@@ -0,0 +1,229 @@
+"""Incremental Elo and rolling SRS team ratings.
+
+``RatingEngine`` consumes finished games in date order and emits one rating
+row per team per game. It keeps only what the next game needs, so a run can
+resume from a saved state instead of replaying history
+(scripts/etl/build_team_ratings.py stores the rows and a watermark).
+
+Elo follows the usual NBA setup: K = 20 scaled by a margin-of-victory
+multiplier that damps blowouts by favourites, 100 points of home advantage,
+and a quarter of each rating regressed to the mean between seasons.
+
+SRS is the least-squares fit of ``margin = rating[home] - rating[away]``
+over a season's regular-season games so far, with ratings summing to zero.
+Each game adds a rank-one update to the normal equations, so refitting
+after a game date is one small dense solve over the season's teams rather
+than a pass over its games. Playoff games update Elo but not SRS.
+"""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, NamedTuple
+
+import numpy as np
+
+ELO_MEAN = 1500.0
+ELO_K = 20.0
+ELO_HOME_ADVANTAGE = 100.0
+ELO_SEASON_CARRYOVER = 0.75
+
+# SQL predicate over `games` telling playoff games from regular-season ones
+PLAYOFF_GAME_SQL = "(COALESCE(game_type ILIKE '%playoff%', FALSE) OR playoff_round IS NOT NULL)"
+
+RATING_COLUMNS = [
+    "team_id",
+    "season_id",
+    "game_date",
+    "game_id",
+    "opponent_team_id",
+    "is_home",
+    "is_playoff",
+    "win_probability",
+    "elo_pre",
+    "elo",
+    "srs",
+]
+
+
+def elo_expected(rating_diff: float) -> float:
+    """Win probability for the side ``rating_diff`` Elo points ahead."""
+    return float(1.0 / (1.0 + 10.0 ** (-rating_diff / 400.0)))
+
+
+def margin_multiplier(margin: float, winner_diff: float) -> float:
+    """Scale for K by the winning margin and how favoured the winner was."""
+    return float((abs(margin) + 3.0) ** 0.8 / (7.5 + 0.006 * winner_diff))
+
+
+@dataclass
+class TeamState:
+    """A team's ratings after its latest game."""
+
+    elo: float = ELO_MEAN
+    season_id: str | None = None  # season of its latest regular-season game
+    srs: float | None = None
+
+
+@dataclass
+class SeasonFit:
+    """Normal equations for one season's SRS, grown as teams appear."""
+
+    season_id: str
+    teams: dict[str, int] = field(default_factory=dict)
+    normal: np.ndarray = field(default_factory=lambda: np.zeros((32, 32)))
+    rhs: np.ndarray = field(default_factory=lambda: np.zeros(32))
+    parents: list[int] = field(default_factory=list)  # union-find over who has played whom
+    components: int = 0
+
+    def _root(self, index: int) -> int:
+        while self.parents[index] != index:
+            self.parents[index] = self.parents[self.parents[index]]
+            index = self.parents[index]
+        return index
+
+    def _index(self, team_id: str) -> int:
+        index = self.teams.setdefault(team_id, len(self.teams))
+        if index == len(self.parents):
+            self.parents.append(index)
+            self.components += 1
+        if index >= self.rhs.size:
+            size = self.rhs.size * 2
+            self.normal = np.pad(self.normal, (0, size - self.rhs.size))
+            self.rhs = np.pad(self.rhs, (0, size - self.rhs.size))
+        return index
+
+    def add(self, home_id: str, away_id: str, margin: float) -> None:
+        """Add one game: row +1 for home, -1 for away, target ``margin``."""
+        home, away = self._index(home_id), self._index(away_id)
+        self.normal[home, home] += 1
+        self.normal[away, away] += 1
+        self.normal[home, away] -= 1
+        self.normal[away, home] -= 1
+        self.rhs[home] += margin
+        self.rhs[away] -= margin
+        home_root, away_root = self._root(home), self._root(away)
+        if home_root != away_root:
+            self.parents[home_root] = away_root
+            self.components -= 1
+
+    def solve(self) -> dict[str, float]:
+        """Ratings summing to zero that best fit the margins so far."""
+        n = len(self.teams)
+        if not n:
+            return {}
+        # Adding 11^T pins the free constant to sum(r) = 0. That makes the
+        # system nonsingular once every team is linked through games played;
+        # until then lstsq gives the minimum-norm fit
+        system = self.normal[:n, :n] + 1.0
+        if self.components == 1:
+            ratings = np.linalg.solve(system, self.rhs[:n])
+        else:
+            ratings = np.linalg.lstsq(system, self.rhs[:n], rcond=None)[0]
+        return {team_id: float(ratings[i]) for team_id, i in self.teams.items()}
+
+
+class _PlayedGame(NamedTuple):
+    """A game whose Elo update is done, waiting for its date's SRS refit."""
+
+    game_id: str
+    season_id: str
+    game_date: date
+    home_id: str
+    away_id: str
+    is_playoff: bool
+    expected: float
+    elo_pre: tuple[float, float]
+
+
+class RatingEngine:
+    """Elo and SRS state, advanced one game date at a time."""
+
+    def __init__(self, teams: dict[str, TeamState] | None = None) -> None:
+        self.teams: dict[str, TeamState] = teams or {}
+        self.fits: dict[str, SeasonFit] = {}
+
+    def prime(
+        self, season_id: str, home_ids: Iterable[str], away_ids: Iterable[str], margins: Iterable[float],
+    ) -> None:
+        """Load a season's already-rated regular-season games into its SRS fit."""
+        fit = self.fits.setdefault(season_id, SeasonFit(season_id))
+        for home_id, away_id, margin in zip(home_ids, away_ids, margins, strict=True):
+            fit.add(home_id, away_id, float(margin))
+
+    def _team(self, team_id: str, season_id: str, is_playoff: bool) -> TeamState:
+        state = self.teams.setdefault(team_id, TeamState())
+        if not is_playoff and state.season_id != season_id:
+            if state.season_id is not None:
+                state.elo = ELO_SEASON_CARRYOVER * state.elo + (1 - ELO_SEASON_CARRYOVER) * ELO_MEAN
+            state.season_id = season_id
+            state.srs = None
+        return state
+
+    def process(self, games: Iterable[Sequence[Any]]) -> list[tuple[Any, ...]]:
+        """Rate ``games`` and return one RATING_COLUMNS row per team per game.
+
+        Args:
+            games: Iterable of (game_id, season_id, game_date, home_team_id,
+                away_team_id, home_score, away_score, is_playoff) in
+                (game_date, game_id) order
+
+        """
+        rows: list[tuple[Any, ...]] = []
+        day: list[_PlayedGame] = []
+        current_date = None
+        for game in games:
+            if game[2] != current_date and day:
+                rows.extend(self._finish_day(day))
+                day = []
+            current_date = game[2]
+            day.append(self._play(*game))
+        if day:
+            rows.extend(self._finish_day(day))
+        return rows
+
+    def _play(
+        self,
+        game_id: str,
+        season_id: str,
+        game_date: date,
+        home_id: str,
+        away_id: str,
+        home_score: float,
+        away_score: float,
+        is_playoff: bool,
+    ) -> _PlayedGame:
+        home = self._team(home_id, season_id, is_playoff)
+        away = self._team(away_id, season_id, is_playoff)
+        margin = float(home_score) - float(away_score)
+        diff = home.elo + ELO_HOME_ADVANTAGE - away.elo
+        expected = elo_expected(diff)
+        winner_diff = diff if margin > 0 else -diff
+        shift = ELO_K * margin_multiplier(margin, winner_diff) * ((margin > 0) - expected)
+        elo_pre = (home.elo, away.elo)
+        home.elo += shift
+        away.elo -= shift
+        if not is_playoff:
+            self.fits.setdefault(season_id, SeasonFit(season_id)).add(home_id, away_id, margin)
+        return _PlayedGame(game_id, season_id, game_date, home_id, away_id, bool(is_playoff), expected, elo_pre)
+
+    def _finish_day(self, day: list[_PlayedGame]) -> list[tuple[Any, ...]]:
+        """Refit SRS for the seasons played today and emit the day's rows."""
+        for season_id in {g.season_id for g in day if not g.is_playoff}:
+            for team_id, srs in self.fits[season_id].solve().items():
+                state = self.teams.get(team_id)
+                if state is not None and state.season_id == season_id:
+                    state.srs = srs
+
+        rows: list[tuple[Any, ...]] = []
+        for game_id, season_id, game_date, home_id, away_id, is_playoff, expected, elo_pre in day:
+            home, away = self.teams[home_id], self.teams[away_id]
+            rows.append(
+                (home_id, season_id, game_date, game_id, away_id, True, is_playoff,
+                 expected, elo_pre[0], home.elo, home.srs),
+            )
+            rows.append(
+                (away_id, season_id, game_date, game_id, home_id, False, is_playoff,
+                 1 - expected, elo_pre[1], away.elo, away.srs),
+            )
+        return rows
@@ -0,0 +1,101 @@
+"""Vectorized rolling windows, streaks and form over per-game arrays.
+
+Everything here takes 1-D NumPy arrays in game order (one element per game)
+and does no I/O; app/repositories/game_arrays.py supplies cached per-player
+and per-team arrays. Missing values are NaN: rolling means skip them, and
+comparisons against NaN are False, so a missing stat breaks a streak.
+"""
+
+import numpy as np
+
+# |z| at which a stretch of games counts as hot or cold
+FORM_THRESHOLD = 1.0
+
+
+def rolling_mean(values: np.ndarray, window: int, min_periods: int | None = None) -> np.ndarray:
+    """Mean of each trailing ``window`` games.
+
+    Args:
+        values: Per-game values, NaN where missing
+        window: Games per window
+        min_periods: Non-missing values a window needs (default ``window``);
+            windows with fewer are NaN
+
+    Returns:
+        Array the length of ``values``
+
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    values = np.asarray(values, dtype=np.float64)
+    present = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(present)))
+
+    end = np.arange(1, values.size + 1)
+    start = np.maximum(end - window, 0)
+    window_sums = sums[end] - sums[start]
+    window_counts = counts[end] - counts[start]
+
+    needed = window if min_periods is None else min_periods
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means: np.ndarray = window_sums / window_counts
+    means[window_counts < max(needed, 1)] = np.nan
+    return means
+
+
+def runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Start indices and lengths of every run of True in ``mask``."""
+    flags = np.asarray(mask, dtype=bool).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], flags, [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return starts, ends - starts
+
+
+def longest_run(mask: np.ndarray) -> tuple[int, int]:
+    """(length, start index) of the longest run of True.
+
+    Ties go to the earliest run; ``(0, -1)`` when ``mask`` has no True.
+    """
+    starts, lengths = runs(mask)
+    if not lengths.size:
+        return 0, -1
+    best = int(np.argmax(lengths))
+    return int(lengths[best]), int(starts[best])
+
+
+def current_run(mask: np.ndarray) -> int:
+    """Length of the run of True ending with the last game."""
+    flags = np.asarray(mask, dtype=bool)
+    if not flags.size or not flags[-1]:
+        return 0
+    breaks = np.flatnonzero(~flags)
+    return int(flags.size - (breaks[-1] + 1 if breaks.size else 0))
+
+
+def form(values: np.ndarray, window: int, threshold: float = FORM_THRESHOLD) -> tuple[str, float | None]:
+    """Whether the last ``window`` games run hot or cold against the whole sample.
+
+    The z-score compares the last window's mean with the mean of all games,
+    in units of the standard error of a ``window``-game mean.
+
+    Returns:
+        ("hot" | "cold" | "neutral", z-score or None when there are fewer
+        than two windows of games or no variation)
+
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if window < 1 or values.size < 2 * window:
+        return "neutral", None
+    spread = float(values.std(ddof=1))
+    if spread == 0.0:
+        return "neutral", None
+
+    z = float((values[-window:].mean() - values.mean()) / (spread / np.sqrt(window)))
+    if z >= threshold:
+        return "hot", z
+    if z <= -threshold:
+        return "cold", z
+    return "neutral", z
@@ -952,3 +952,67 @@ CREATE TABLE league_season_averages (
     
     FOREIGN KEY (season_id) REFERENCES seasons(season_id)
 );
+
+-- 10. Lineup Tables (derived from play_by_play by scripts/etl/build_stints.py)
+
+CREATE TABLE lineup_stints (
+    game_id VARCHAR(20),
+    team_id VARCHAR(10),
+    period INTEGER,
+    stint_number INTEGER,
+    lineup_key VARCHAR(100), -- Sorted NBA person ids joined by '-'
+    num_players INTEGER,
+
+    -- Game clock, in elapsed game seconds
+    start_seconds INTEGER,
+    end_seconds INTEGER,
+    seconds INTEGER,
+
+    possessions DECIMAL(6,2),
+    points_for INTEGER,
+    points_against INTEGER,
+
+    PRIMARY KEY (game_id, team_id, stint_number)
+);
+
+CREATE TABLE player_stints (
+    game_id VARCHAR(20),
+    team_id VARCHAR(10),
+    period INTEGER,
+    stint_number INTEGER,
+    nba_person_id VARCHAR(20),
+    player_id VARCHAR(20),
+
+    start_seconds INTEGER,
+    end_seconds INTEGER,
+    seconds INTEGER,
+
+    possessions DECIMAL(6,2),
+    points_for INTEGER,
+    points_against INTEGER,
+
+    PRIMARY KEY (game_id, team_id, stint_number, nba_person_id)
+);
+
+-- 11. Identity Resolution (built by scripts/etl/build_player_xref.py)
+
+CREATE TABLE player_xref (
+    source VARCHAR(10) NOT NULL, -- 'nba' (stats.nba.com person_id) or 'bref' (player_stats_totals.player_id)
+    source_id VARCHAR(20) NOT NULL,
+    player_id VARCHAR(20), -- Basketball-Reference slug; NULL when unresolved
+    name VARCHAR(100),
+    birth_date DATE,
+    match_rule VARCHAR(20) NOT NULL, -- name_birthdate, name_birth_year, unique_name, team_season, career_span, ambiguous, unmatched
+    candidate_count INTEGER, -- Directory entries sharing the normalized name
+
+    PRIMARY KEY (source, source_id)
+);
+
+CREATE TABLE team_aliases (
+    abbreviation VARCHAR(5) NOT NULL,
+    first_season INTEGER, -- Season end year; NULL = no lower bound
+    last_season INTEGER, -- Season end year; NULL = still in use
+    team_id VARCHAR(10) NOT NULL,
+    franchise_id VARCHAR(10),
+    source VARCHAR(20) -- historical, game, teams (built by scripts/etl/build_team_aliases.py)
+);
@@ -0,0 +1,48 @@
+"""Gunicorn configuration for multi-worker serving.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+(or ``python scripts/serve.py``). The app is imported once in the master
+and forked into WEB_WORKERS Uvicorn workers, so code and static data are
+shared copy-on-write. DuckDB handles are never inherited: the master closes
+any it opened before each fork and every worker opens its own read-only
+connection (and query threads) on first use, sized by
+app.core.database.duckdb_config.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import TYPE_CHECKING
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from gunicorn.arbiter import Arbiter
+    from gunicorn.workers.base import Worker
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = settings.WEB_WORKERS or os.cpu_count() or 1
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+# The access log is written by AccessLogMiddleware when ACCESS_LOG is set
+accesslog = None
+
+
+def on_starting(server: Arbiter) -> None:
+    # Workers size DuckDB from WEB_WORKERS; make sure they see the resolved count
+    os.environ["WEB_WORKERS"] = str(server.cfg.workers)
+    settings.WEB_WORKERS = server.cfg.workers
+
+
+def pre_fork(server: Arbiter, worker: Worker) -> None:
+    from app.core.database import close_connections, db_executor
+
+    close_connections()
+    db_executor.shutdown()
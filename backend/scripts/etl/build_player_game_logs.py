@@ -0,0 +1,106 @@
+"""Build the denormalized player game log table (`player_game_logs`).
+
+The gamelog endpoint used to join box_scores to games on every request and
+work out the opponent, venue and result with CASE expressions. This stage
+does that once per ETL run and adds per-game context that is awkward to
+compute at request time:
+
+- ``game_number``: games played so far this season (NULL when DNP),
+  counted separately for regular season and playoffs
+- ``days_rest``: days since the player last played this season, minus one
+  (0 on a back-to-back; NULL for the first game and when DNP)
+- ``game_result``: e.g. ``W (+10)``
+- ``avg_points``, ``avg_rebounds``, ``avg_assists``, ``avg_minutes``:
+  season-to-date averages over games played, through this game (NULL when
+  DNP)
+
+Rows are written sorted by (player_id, game_date, game_id), so one player's
+log sits in a few row groups and min/max statistics skip the rest. The
+pipeline runs it after build_stints.py (which fills minutes and plus/minus)
+and load_splits.py; the API falls back to the join when the table is
+missing.
+"""
+
+import os
+import time
+
+import duckdb
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+)
+DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
+
+TABLE = "player_game_logs"
+
+PLAYER_GAME_LOGS_SQL = f"""
+    CREATE OR REPLACE TABLE {TABLE} AS
+    WITH logs AS (
+        SELECT
+            b.*,
+            g.season_id,
+            g.game_type,
+            g.game_date,
+            CASE WHEN b.team_id = g.home_team_id THEN g.away_team_id ELSE g.home_team_id END AS opponent_team_id,
+            b.team_id = g.home_team_id AS is_home,
+            COALESCE(b.team_id = g.winner_team_id, FALSE) AS is_win,
+            CASE WHEN b.team_id = g.home_team_id THEN g.home_team_score - g.away_team_score
+                 ELSE g.away_team_score - g.home_team_score END AS margin,
+            NOT COALESCE(b.did_not_play, FALSE) AS played
+        FROM box_scores b
+        JOIN games g ON b.game_id = g.game_id
+        WHERE b.player_id IS NOT NULL
+    )
+    SELECT
+        * EXCLUDE (margin, played),
+        CASE WHEN played THEN
+            SUM(played::INTEGER) OVER (
+                PARTITION BY player_id, season_id, game_type ORDER BY game_date, game_id
+                ROWS UNBOUNDED PRECEDING
+            )
+        END AS game_number,
+        CASE WHEN played THEN
+            date_diff(
+                'day',
+                LAG(game_date) OVER (PARTITION BY player_id, season_id, played ORDER BY game_date, game_id),
+                game_date
+            ) - 1
+        END AS days_rest,
+        CASE WHEN margin IS NOT NULL THEN
+            (CASE WHEN margin > 0 THEN 'W' ELSE 'L' END)
+            || ' (' || (CASE WHEN margin > 0 THEN '+' ELSE '' END) || margin || ')'
+        END AS game_result,
+        CASE WHEN played THEN ROUND(AVG(points) OVER season_to_date, 1) END AS avg_points,
+        CASE WHEN played THEN ROUND(AVG(total_rebounds) OVER season_to_date, 1) END AS avg_rebounds,
+        CASE WHEN played THEN ROUND(AVG(assists) OVER season_to_date, 1) END AS avg_assists,
+        CASE WHEN played THEN ROUND(AVG(minutes_played) OVER season_to_date, 1) END AS avg_minutes
+    FROM logs
+    -- Partitioned on played so DNP rows never count towards a played game's figures
+    WINDOW season_to_date AS (
+        PARTITION BY player_id, season_id, game_type, played ORDER BY game_date, game_id
+        ROWS UNBOUNDED PRECEDING
+    )
+    ORDER BY player_id, game_date, game_id
+"""  # noqa: S608
+
+
+def build_player_game_logs(con: duckdb.DuckDBPyConnection) -> int:
+    """(Re)create the table; returns its row count."""
+    con.execute(PLAYER_GAME_LOGS_SQL)
+    result = con.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()  # noqa: S608
+    return int(result[0]) if result else 0
+
+
+def main() -> None:
+    print(f"Connecting to {DB_PATH}...")
+    con = duckdb.connect(DB_PATH)
+    try:
+        started = time.perf_counter()
+        rows = build_player_game_logs(con)
+        print(f"Built {TABLE}: {rows} rows in {time.perf_counter() - started:.1f}s")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
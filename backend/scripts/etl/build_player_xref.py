@@ -0,0 +1,281 @@
+"""Build the persisted player identity cross-reference (`player_xref`).
+
+Every external player identity is resolved once to a Basketball-Reference
+slug (`players.player_id`) and stored with the rule that matched it:
+
+- ``bref``: `player_stats_totals.player_id` (one id per career)
+- ``nba``: stats.nba.com person ids from `play_by_play` and `common_player_info`
+
+Rules are tried in order and a rule only applies when it leaves exactly one
+candidate, so ambiguous names are never silently attributed:
+
+1. name_birthdate  - normalized name and exact birth date (NBA ids with bio data)
+2. name_birth_year - normalized name and birth year (BR age is as of Feb 1,
+                     so season - age gives two possible birth years)
+3. unique_name     - only one directory entry carries the name
+4. team_season     - NBA id's (season, team) pairs overlap exactly one
+                     candidate's already-resolved BR stat lines
+5. career_span     - exactly one candidate was active in every observed season
+
+Identities left over are stored with a NULL player_id and match_rule
+``ambiguous`` or ``unmatched`` so they can be reviewed. Loaders join through
+this table instead of rebuilding name maps. BR team abbreviations (BRK, PHO,
+SEA, ...) resolve to team ids through `team_aliases`, so run it after
+load_players.py and build_team_aliases.py.
+"""
+
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+
+import duckdb
+import pandas as pd
+
+from build_team_aliases import TOTAL_TEAM_ID, alias_join
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+)
+DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
+
+XREF_COLUMNS = ["source", "source_id", "player_id", "name", "birth_date", "match_rule", "candidate_count"]
+
+# Season end year of an NBA game date: games from August on belong to next year's season
+SEASON_OF_DATE_SQL = "CAST(YEAR(g.game_date) + CASE WHEN MONTH(g.game_date) >= 8 THEN 1 ELSE 0 END AS INTEGER)"
+
+
+@dataclass
+class DirectoryEntry:
+    slug: str
+    birth_date: date | None
+    first_season: int | None
+    last_season: int | None
+
+
+@dataclass
+class Identity:
+    source: str
+    source_id: str
+    name: str
+    birth_date: date | None = None
+    birth_years: set[int] = field(default_factory=set)
+    seasons: set[int] = field(default_factory=set)
+    team_seasons: set[tuple[int, str]] = field(default_factory=set)
+
+
+def normalize_name(name: str | None) -> str:
+    """Normalize a display name for matching (accents, case, punctuation, HOF marker)."""
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", name.replace("*", ""))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = re.sub(r"[.'`\-]", "", text)
+    return " ".join(text.split())
+
+
+def resolve(  # noqa: C901
+    identity: Identity,
+    candidates: list[DirectoryEntry],
+    slug_team_seasons: dict[str, set[tuple[int, str]]],
+) -> tuple[str | None, str]:
+    """Apply the matching rules in order; return (slug, rule)."""
+    if not candidates:
+        return None, "unmatched"
+
+    if identity.birth_date:
+        exact = [c for c in candidates if c.birth_date == identity.birth_date]
+        if len(exact) == 1:
+            return exact[0].slug, "name_birthdate"
+
+    birth_years = identity.birth_years or ({identity.birth_date.year} if identity.birth_date else set())
+    if birth_years:
+        by_year = [c for c in candidates if c.birth_date and c.birth_date.year in birth_years]
+        if len(by_year) == 1:
+            return by_year[0].slug, "name_birth_year"
+
+    if len(candidates) == 1:
+        return candidates[0].slug, "unique_name"
+
+    if identity.team_seasons:
+        overlapping = [c for c in candidates if slug_team_seasons.get(c.slug, set()) & identity.team_seasons]
+        if len(overlapping) == 1:
+            return overlapping[0].slug, "team_season"
+
+    if identity.seasons:
+        first, last = min(identity.seasons), max(identity.seasons)
+        active = [
+            c
+            for c in candidates
+            if c.first_season is not None
+            and c.last_season is not None
+            and c.first_season <= first
+            and last <= c.last_season
+        ]
+        if len(active) == 1:
+            return active[0].slug, "career_span"
+
+    return None, "ambiguous"
+
+
+def table_exists(con: duckdb.DuckDBPyConnection, table: str) -> bool:
+    result = con.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+        [table],
+    ).fetchone()
+    return bool(result and result[0])
+
+
+def load_directory(con: duckdb.DuckDBPyConnection) -> dict[str, list[DirectoryEntry]]:
+    directory: dict[str, list[DirectoryEntry]] = defaultdict(list)
+    rows = con.execute("SELECT slug, player, birth_date, _from, _to FROM player_directory ORDER BY slug").fetchall()
+    for slug, name, birth_date, first_season, last_season in rows:
+        directory[normalize_name(name)].append(
+            DirectoryEntry(
+                slug=str(slug),
+                birth_date=birth_date,
+                first_season=int(first_season) if first_season else None,
+                last_season=int(last_season) if last_season else None,
+            ),
+        )
+    return directory
+
+
+def load_bref_identities(con: duckdb.DuckDBPyConnection) -> list[Identity]:
+    """Collect BR stat-line identities and the (season, team id) pairs they played for."""
+    identities: dict[str, Identity] = {}
+    rows = con.execute(
+        f"""
+        SELECT t.player_id, t.player, t.season, t.age, ta.team_id
+        FROM player_stats_totals t
+        {alias_join("t.tm", "t.season")}
+        WHERE t.player_id IS NOT NULL
+        """,  # noqa: S608 - the alias join is fixed SQL
+    ).fetchall()
+    for source_id, name, season, age, team_id in rows:
+        key = str(source_id)
+        identity = identities.get(key)
+        if identity is None:
+            identity = identities[key] = Identity("bref", key, name)
+        if season is not None:
+            season = int(season)
+            identity.seasons.add(season)
+            if team_id is not None and team_id != TOTAL_TEAM_ID:
+                identity.team_seasons.add((season, str(team_id)))
+            if age is not None:
+                # Narrow to the birth years consistent with every season's age
+                years = {season - int(age), season - int(age) - 1}
+                identity.birth_years = identity.birth_years & years if identity.birth_years else years
+    return list(identities.values())
+
+
+def load_nba_identities(con: duckdb.DuckDBPyConnection) -> list[Identity]:
+    """Collect NBA person ids with bio data and the (season, team) pairs they appeared in."""
+    identities: dict[str, Identity] = {}
+
+    if table_exists(con, "common_player_info"):
+        rows = con.execute(
+            "SELECT CAST(person_id AS VARCHAR), display_first_last, TRY_CAST(birthdate AS DATE) FROM common_player_info",
+        ).fetchall()
+        for source_id, name, birth_date in rows:
+            identities[source_id] = Identity("nba", source_id, name, birth_date=birth_date)
+
+    if table_exists(con, "play_by_play") and table_exists(con, "game"):
+        rows = con.execute(
+            f"""
+            WITH appearances AS (
+                SELECT game_id, player1_id AS person_id, player1_name AS name, player1_team_id AS team_id FROM play_by_play
+                UNION ALL
+                SELECT game_id, player2_id, player2_name, player2_team_id FROM play_by_play
+                UNION ALL
+                SELECT game_id, player3_id, player3_name, player3_team_id FROM play_by_play
+            )
+            SELECT DISTINCT
+                a.person_id,
+                a.name,
+                {SEASON_OF_DATE_SQL} AS season,
+                CAST(CAST(a.team_id AS DECIMAL) AS BIGINT)::VARCHAR AS team_id
+            FROM appearances a
+            JOIN (
+                SELECT game_id, MIN(CAST(game_date AS DATE)) AS game_date FROM game GROUP BY game_id
+            ) g ON a.game_id = g.game_id
+            WHERE a.person_id IS NOT NULL AND a.person_id != '0' AND a.team_id IS NOT NULL
+            """,  # noqa: S608 - SEASON_OF_DATE_SQL is a constant
+        ).fetchall()
+        for source_id, name, season, team_id in rows:
+            identity = identities.get(source_id)
+            if identity is None:
+                identity = identities[source_id] = Identity("nba", source_id, name)
+            if season is not None:
+                identity.seasons.add(int(season))
+                identity.team_seasons.add((int(season), team_id))
+
+    return list(identities.values())
+
+
+def build_player_xref() -> None:
+    print(f"Connecting to {DB_PATH}...")
+    con = duckdb.connect(DB_PATH)
+
+    print("Loading player directory...")
+    directory = load_directory(con)
+    print(f"Indexed {sum(len(v) for v in directory.values())} directory entries under {len(directory)} names.")
+
+    rows: list[tuple] = []
+    rule_counts: dict[tuple[str, str], int] = defaultdict(int)
+
+    def add(identity: Identity, slug: str | None, rule: str, candidate_count: int) -> None:
+        rows.append(
+            (identity.source, identity.source_id, slug, identity.name, identity.birth_date, rule, candidate_count),
+        )
+        rule_counts[(identity.source, rule)] += 1
+
+    # BR stat lines first: their resolved (season, team) pairs disambiguate NBA ids
+    slug_team_seasons: dict[str, set[tuple[int, str]]] = defaultdict(set)
+    if table_exists(con, "player_stats_totals"):
+        print("Resolving player_stats_totals identities...")
+        for identity in load_bref_identities(con):
+            candidates = directory.get(normalize_name(identity.name), [])
+            slug, rule = resolve(identity, candidates, {})
+            add(identity, slug, rule, len(candidates))
+            if slug:
+                slug_team_seasons[slug] |= identity.team_seasons
+
+    print("Resolving NBA person ids...")
+    for identity in load_nba_identities(con):
+        candidates = directory.get(normalize_name(identity.name), [])
+        slug, rule = resolve(identity, candidates, slug_team_seasons)
+        add(identity, slug, rule, len(candidates))
+
+    xref_df = pd.DataFrame(rows, columns=XREF_COLUMNS)
+    con.register("xref_df", xref_df)
+    con.execute("BEGIN TRANSACTION")
+    con.execute("DELETE FROM player_xref")
+    con.execute(f"INSERT INTO player_xref ({', '.join(XREF_COLUMNS)}) SELECT * FROM xref_df")  # noqa: S608
+    con.execute("COMMIT")
+
+    print(f"Stored {len(rows)} identities in player_xref.")
+    for (source, rule), count in sorted(rule_counts.items()):
+        print(f"  {source:<5} {rule:<16} {count}")
+
+    unresolved = con.execute(
+        """
+        SELECT source, source_id, name, match_rule, candidate_count
+        FROM player_xref
+        WHERE player_id IS NULL
+        ORDER BY match_rule, name
+        LIMIT 25
+        """,
+    ).fetchall()
+    if unresolved:
+        print("Unresolved identities (first 25; query player_xref WHERE player_id IS NULL for all):")
+        for source, source_id, name, rule, candidate_count in unresolved:
+            print(f"  {source}:{source_id} {name!r} -> {rule} ({candidate_count} candidates)")
+
+    con.close()
+
+
+if __name__ == "__main__":
+    build_player_xref()
@@ -0,0 +1,156 @@
+"""Build the player similarity vectors served by /players/{id}/similar.
+
+Each regular season a player logged at least MIN_MINUTES becomes one row of
+FEATURES: per-game box score rates and shooting percentages from
+player_season_stats plus rate stats from player_advanced_stats (when
+loaded). Traded players contribute their combined ('TOT') line. Every
+feature is z-scored within its season, so a 1960s centre is compared with
+that era's league rather than with today's, and missing values sit at the
+season mean. A career vector is the minutes-weighted mean of its seasons.
+
+The vectors are written as float32 .npy files to settings.SIMILARITY_DIR
+(default data/similarity; layout in app/repositories/similarity.py), which the API
+memory-maps. Run after load_stats.py.
+"""
+
+import os
+import sys
+import time
+
+import duckdb
+import numpy as np
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+)
+DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
+
+sys.path.insert(0, os.path.join(BASE_DIR, "backend"))
+
+from app.core.config import settings  # noqa: E402
+from app.repositories.similarity import season_year, write_index  # noqa: E402
+
+SIMILARITY_DIR = settings.SIMILARITY_DIR
+
+MIN_MINUTES = 500
+
+SEASON_FEATURES = [
+    "points_per_game",
+    "rebounds_per_game",
+    "assists_per_game",
+    "steals_per_game",
+    "blocks_per_game",
+    "turnovers_per_game",
+    "minutes_per_game",
+    "field_goal_pct",
+    "three_point_pct",
+    "free_throw_pct",
+    "effective_fg_pct",
+]
+ADVANCED_FEATURES = [
+    "true_shooting_pct",
+    "usage_pct",
+    "assist_pct",
+    "total_rebound_pct",
+    "steal_pct",
+    "block_pct",
+    "turnover_pct",
+    "three_point_attempt_rate",
+    "free_throw_rate",
+    "box_plus_minus",
+    "win_shares_per_48",
+    "player_efficiency_rating",
+]
+
+
+def has_table(con: duckdb.DuckDBPyConnection, table: str) -> bool:
+    result = con.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = ?", [table],
+    ).fetchone()
+    return bool(result and result[0])
+
+
+def season_rows_sql(features: list[str], advanced: bool) -> str:
+    """One row per qualifying (player, season): z-scored features and minutes."""
+    zscores = ",\n".join(
+        f"COALESCE(({f} - AVG({f}) OVER league) / NULLIF(STDDEV_POP({f}) OVER league, 0), 0) AS {f}"
+        for f in features
+    )
+    join = """
+        LEFT JOIN player_advanced_stats a
+            ON a.player_id = s.player_id AND a.season_id = s.season_id
+            AND a.team_id = s.team_id AND a.season_type = s.season_type
+    """ if advanced else ""
+    selected = ", ".join(
+        f"{'a' if f in ADVANCED_FEATURES else 's'}.{f}" for f in features
+    )
+    return f"""
+        WITH seasons AS (
+            SELECT s.player_id, s.season_id, s.minutes_played, {selected}
+            FROM player_season_stats s
+            {join}
+            WHERE s.season_type = 'Regular' AND s.player_id IS NOT NULL
+            QUALIFY ROW_NUMBER() OVER (
+                PARTITION BY s.player_id, s.season_id
+                ORDER BY s.team_id = 'TOT' DESC, s.games_played DESC NULLS LAST
+            ) = 1
+        )
+        SELECT player_id, season_id, minutes_played, {zscores}
+        FROM seasons
+        WHERE minutes_played >= {MIN_MINUTES}
+        WINDOW league AS (PARTITION BY season_id)
+    """  # noqa: S608 - built from the feature constants
+
+
+def build_similarity_vectors(con: duckdb.DuckDBPyConnection, directory: str = SIMILARITY_DIR) -> dict:
+    """Compute the vectors and write them to ``directory``; returns the manifest."""
+    advanced = has_table(con, "player_advanced_stats")
+    features = SEASON_FEATURES + (ADVANCED_FEATURES if advanced else [])
+    columns = con.execute(season_rows_sql(features, advanced)).fetchnumpy()
+
+    player_ids = np.asarray(columns["player_id"], dtype=str)
+    season_ids = np.asarray(columns["season_id"], dtype=str)
+    vectors = np.column_stack([np.asarray(columns[f], dtype=np.float64) for f in features])
+    minutes = np.asarray(columns["minutes_played"], dtype=np.float64)
+    years = np.array([season_year(s) for s in season_ids], dtype=np.int16)
+
+    careers, codes = np.unique(player_ids, return_inverse=True)
+    weights = np.bincount(codes, weights=minutes, minlength=careers.size)
+    career_vectors = np.zeros((careers.size, len(features)))
+    np.add.at(career_vectors, codes, vectors * minutes[:, None])
+    career_vectors /= np.maximum(weights, 1)[:, None]
+    first = np.full(careers.size, np.iinfo(np.int16).max, dtype=np.int16)
+    last = np.full(careers.size, np.iinfo(np.int16).min, dtype=np.int16)
+    np.minimum.at(first, codes, years)
+    np.maximum.at(last, codes, years)
+
+    return write_index(
+        directory,
+        features,
+        player_ids,
+        season_ids,
+        vectors,
+        careers,
+        career_vectors,
+        first,
+        last,
+        extra={"min_minutes": MIN_MINUTES},
+    )
+
+
+def main() -> None:
+    print(f"Connecting to {DB_PATH}...")
+    con = duckdb.connect(DB_PATH, read_only=True)
+    try:
+        started = time.perf_counter()
+        manifest = build_similarity_vectors(con)
+        print(
+            f"Wrote {manifest['seasons']} season and {manifest['careers']} career vectors "
+            f"({len(manifest['features'])} features) to {SIMILARITY_DIR} in {time.perf_counter() - started:.1f}s",
+        )
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
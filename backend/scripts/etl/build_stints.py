@@ -0,0 +1,433 @@
+"""Reconstruct on-court lineups and player stints from play_by_play.
+
+Each game is replayed event by event in a single streaming pass. Substitution
+events (EVENTMSGTYPE 8) close the current stint of the substituting team; the
+five players on the floor at the start of every period are inferred from the
+players who appear in that period before being subbed in.
+
+Games are partitioned across worker processes. Workers open the database
+read-only and write each chunk's rows to Parquet files in a staging
+directory as the chunk finishes, so no process holds more than one chunk of
+stints in memory. The parent then bulk-inserts the files into
+`lineup_stints` and `player_stints` and feeds minutes, plus/minus and
+starters into `box_scores`.
+
+Usage:
+    python scripts/etl/build_stints.py [--workers N]
+"""
+
+import argparse
+import glob
+import os
+import re
+import shutil
+import tempfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+import duckdb
+import pandas as pd
+
+from populate_boxscores import PLAYER_MAP_SQL
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+)
+DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
+
+# EVENTMSGTYPE codes used by stats.nba.com play-by-play
+MADE_SHOT = 1
+MISSED_SHOT = 2
+FREE_THROW = 3
+REBOUND = 4
+TURNOVER = 5
+SUBSTITUTION = 8
+
+REGULATION_PERIOD_SECONDS = 12 * 60
+OVERTIME_PERIOD_SECONDS = 5 * 60
+GAMES_PER_CHUNK = 250
+
+EVENTS_QUERY = """
+    SELECT
+        pbp.game_id,
+        CAST(pbp.period AS INTEGER) AS period,
+        CAST(pbp.eventnum AS INTEGER) AS eventnum,
+        CAST(pbp.eventmsgtype AS INTEGER) AS eventmsgtype,
+        pbp.pctimestring,
+        COALESCE(pbp.homedescription, '') || ' ' || COALESCE(pbp.visitordescription, '') AS description,
+        NULLIF(pbp.player1_id, '0') AS player1_id,
+        CAST(CAST(pbp.player1_team_id AS DECIMAL) AS BIGINT)::VARCHAR AS player1_team_id,
+        NULLIF(pbp.player2_id, '0') AS player2_id,
+        CAST(CAST(pbp.player2_team_id AS DECIMAL) AS BIGINT)::VARCHAR AS player2_team_id,
+        NULLIF(pbp.player3_id, '0') AS player3_id,
+        CAST(CAST(pbp.player3_team_id AS DECIMAL) AS BIGINT)::VARCHAR AS player3_team_id,
+        g.home_team_id,
+        g.away_team_id
+    FROM play_by_play pbp
+    JOIN games g ON g.game_id = pbp.game_id
+    WHERE pbp.game_id IN (SELECT UNNEST(?::VARCHAR[]))
+    ORDER BY pbp.game_id, period, eventnum
+"""
+
+LINEUP_COLUMNS = [
+    "game_id", "team_id", "period", "stint_number", "lineup_key", "num_players",
+    "start_seconds", "end_seconds", "seconds", "possessions", "points_for", "points_against",
+]
+PLAYER_COLUMNS = [
+    "game_id", "team_id", "period", "stint_number", "nba_person_id",
+    "start_seconds", "end_seconds", "seconds", "possessions", "points_for", "points_against",
+]
+
+
+@dataclass
+class _Counts:
+    """Per-team counting stats accumulated over a stint."""
+
+    points: int = 0
+    fga: int = 0
+    fta: int = 0
+    orb: int = 0
+    tov: int = 0
+
+    def possessions(self) -> float:
+        return self.fga + 0.44 * self.fta - self.orb + self.tov
+
+
+@dataclass
+class _Stint:
+    team_id: str
+    period: int
+    stint_number: int
+    players: frozenset[str]
+    start_seconds: int
+    own: _Counts = field(default_factory=_Counts)
+    opp: _Counts = field(default_factory=_Counts)
+
+
+def period_start(period: int) -> int:
+    """Return elapsed game seconds at the start of a period."""
+    if period <= 4:
+        return (period - 1) * REGULATION_PERIOD_SECONDS
+    return 4 * REGULATION_PERIOD_SECONDS + (period - 5) * OVERTIME_PERIOD_SECONDS
+
+
+def period_length(period: int) -> int:
+    return REGULATION_PERIOD_SECONDS if period <= 4 else OVERTIME_PERIOD_SECONDS
+
+
+def elapsed_seconds(period: int, clock: str | None) -> int:
+    """Convert a period and a MM:SS game clock into elapsed game seconds."""
+    remaining = 0
+    if clock:
+        match = re.match(r"^(\d+):(\d+)", clock)
+        if match:
+            remaining = int(match.group(1)) * 60 + int(match.group(2))
+    return period_start(period) + period_length(period) - remaining
+
+
+def _event_players(event: dict[str, Any]) -> Iterator[tuple[str, str]]:
+    """Yield (player_id, team_id) pairs credited on an event."""
+    for slot in ("player1", "player2", "player3"):
+        player_id = event[f"{slot}_id"]
+        team_id = event[f"{slot}_team_id"]
+        if player_id and team_id:
+            yield player_id, team_id
+
+
+def infer_period_starters(events: list[dict[str, Any]]) -> dict[str, list[str]]:
+    """Infer the five players per team on the floor when a period begins.
+
+    A player is a starter of the period if they show up in an event, or are
+    subbed out, before being subbed in.
+    """
+    starters: dict[str, list[str]] = {}
+    subbed_in: set[str] = set()
+    for event in events:
+        if event["eventmsgtype"] == SUBSTITUTION:
+            out_id, out_team = event["player1_id"], event["player1_team_id"]
+            if out_id and out_team and out_id not in subbed_in:
+                team_starters = starters.setdefault(out_team, [])
+                if out_id not in team_starters:
+                    team_starters.append(out_id)
+            if event["player2_id"]:
+                subbed_in.add(event["player2_id"])
+            continue
+        for player_id, team_id in _event_players(event):
+            if player_id in subbed_in:
+                continue
+            team_starters = starters.setdefault(team_id, [])
+            if player_id not in team_starters:
+                team_starters.append(player_id)
+    return {team_id: players[:5] for team_id, players in starters.items()}
+
+
+def _substitute(players: frozenset[str], leaving: str | None, entering: str | None) -> frozenset[str]:
+    on_court = set(players) - {leaving}
+    if entering:
+        on_court.add(entering)
+    return frozenset(on_court)
+
+
+def _credit(counts: tuple[_Counts, ...], attr: str, amount: int = 1) -> None:
+    for count in counts:
+        setattr(count, attr, getattr(count, attr) + amount)
+
+
+def _score_event(
+    msg_type: int, description: str, team_id: str, last_miss_team: str | None, counts: tuple[_Counts, ...],
+) -> str | None:
+    """Credit one event to ``counts``; return the team that missed the last shot, if still live."""
+    if msg_type == MADE_SHOT:
+        _credit(counts, "fga")
+        _credit(counts, "points", 3 if "3PT" in description else 2)
+        return None
+    if msg_type == MISSED_SHOT:
+        _credit(counts, "fga")
+        return team_id
+    if msg_type == FREE_THROW:
+        _credit(counts, "fta")
+        if "MISS" in description:
+            return team_id
+        _credit(counts, "points")
+        return None
+    if msg_type == REBOUND:
+        if last_miss_team == team_id:
+            _credit(counts, "orb")
+        return None
+    if msg_type == TURNOVER:
+        _credit(counts, "tov")
+    return last_miss_team
+
+
+def reconstruct_game(  # noqa: C901
+    events: list[dict[str, Any]],
+) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]]]:
+    """Replay one game's events and return (lineup rows, player rows)."""
+    if not events:
+        return [], []
+
+    game_id = events[0]["game_id"]
+    teams = [t for t in (events[0]["home_team_id"], events[0]["away_team_id"]) if t]
+    lineup_rows: list[tuple[Any, ...]] = []
+    player_rows: list[tuple[Any, ...]] = []
+    stint_numbers: dict[str, int] = dict.fromkeys(teams, 0)
+
+    def close(stint: _Stint, end_seconds: int) -> None:
+        seconds = max(end_seconds - stint.start_seconds, 0)
+        possessions = round((stint.own.possessions() + stint.opp.possessions()) / 2, 2)
+        lineup_rows.append(
+            (
+                game_id, stint.team_id, stint.period, stint.stint_number,
+                "-".join(sorted(stint.players)), len(stint.players),
+                stint.start_seconds, end_seconds, seconds, possessions,
+                stint.own.points, stint.opp.points,
+            ),
+        )
+        for player_id in sorted(stint.players):
+            player_rows.append(
+                (
+                    game_id, stint.team_id, stint.period, stint.stint_number, player_id,
+                    stint.start_seconds, end_seconds, seconds, possessions,
+                    stint.own.points, stint.opp.points,
+                ),
+            )
+
+    def open_stint(team_id: str, period: int, players: frozenset[str], start: int) -> _Stint:
+        stint_numbers[team_id] = stint_numbers.get(team_id, 0) + 1
+        return _Stint(team_id, period, stint_numbers[team_id], players, start)
+
+    by_period: dict[int, list[dict[str, Any]]] = {}
+    for event in events:
+        by_period.setdefault(event["period"], []).append(event)
+
+    for period in sorted(by_period):
+        period_events = by_period[period]
+        starters = infer_period_starters(period_events)
+        start = period_start(period)
+        stints = {
+            team_id: open_stint(team_id, period, frozenset(starters.get(team_id, [])), start)
+            for team_id in teams
+        }
+        last_miss_team: str | None = None
+
+        for event in period_events:
+            msg_type = event["eventmsgtype"]
+            team_id = event["player1_team_id"]
+            description = event["description"].upper()
+            now = elapsed_seconds(period, event["pctimestring"])
+
+            if msg_type == SUBSTITUTION and team_id in stints:
+                stint = stints[team_id]
+                players = _substitute(stint.players, event["player1_id"], event["player2_id"])
+                if players != stint.players:
+                    close(stint, now)
+                    stints[team_id] = open_stint(team_id, period, players, now)
+                continue
+
+            if team_id not in stints:
+                # Team rebounds/turnovers carry the team in the player slot
+                team_id = event["player1_id"] if event["player1_id"] in stints else None
+            if team_id is None:
+                continue
+            opp_id = next((t for t in teams if t != team_id), None)
+            own = stints[team_id].own
+            opp_view = stints[opp_id].opp if opp_id else _Counts()
+
+            last_miss_team = _score_event(msg_type, description, team_id, last_miss_team, (own, opp_view))
+
+        end = period_start(period) + period_length(period)
+        for stint in stints.values():
+            close(stint, end)
+
+    return lineup_rows, player_rows
+
+
+def _iter_games(cursor: duckdb.DuckDBPyConnection, batch_size: int = 10_000) -> Iterator[list[dict[str, Any]]]:
+    """Stream events from an ordered cursor, yielding one game at a time."""
+    columns = [desc[0] for desc in cursor.description or []]
+    current: list[dict[str, Any]] = []
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        for row in rows:
+            event = dict(zip(columns, row, strict=True))
+            if current and event["game_id"] != current[0]["game_id"]:
+                yield current
+                current = []
+            current.append(event)
+    if current:
+        yield current
+
+
+def _write_parquet(
+    con: duckdb.DuckDBPyConnection, rows: list[tuple[Any, ...]], columns: list[str], path: str,
+) -> None:
+    frame = pd.DataFrame(rows, columns=columns)
+    con.register("stint_rows", frame)
+    try:
+        con.execute(f"COPY stint_rows TO '{path}' (FORMAT PARQUET)")
+    finally:
+        con.unregister("stint_rows")
+
+
+def process_games(game_ids: list[str], out_prefix: str) -> tuple[int, int]:
+    """Worker entry point: reconstruct a chunk of games and write its stints to Parquet.
+
+    Writes ``<out_prefix>_lineups.parquet`` and ``<out_prefix>_players.parquet``
+    (skipped when the chunk has no stints) and returns the row counts.
+    """
+    con = duckdb.connect(DB_PATH, read_only=True)
+    lineup_rows: list[tuple[Any, ...]] = []
+    player_rows: list[tuple[Any, ...]] = []
+    try:
+        cursor = con.execute(EVENTS_QUERY, [game_ids])
+        for game_events in _iter_games(cursor):
+            lineups, players = reconstruct_game(game_events)
+            lineup_rows.extend(lineups)
+            player_rows.extend(players)
+        if lineup_rows:
+            _write_parquet(con, lineup_rows, LINEUP_COLUMNS, f"{out_prefix}_lineups.parquet")
+        if player_rows:
+            _write_parquet(con, player_rows, PLAYER_COLUMNS, f"{out_prefix}_players.parquet")
+    finally:
+        con.close()
+    return len(lineup_rows), len(player_rows)
+
+
+def _chunks(items: list[str], size: int) -> Iterable[list[str]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def build_stints(workers: int | None = None) -> None:
+    print(f"Connecting to {DB_PATH}...")
+    con = duckdb.connect(DB_PATH, read_only=True)
+    game_ids = [
+        row[0]
+        for row in con.execute(
+            "SELECT DISTINCT game_id FROM play_by_play WHERE game_id IN (SELECT game_id FROM games) ORDER BY game_id",
+        ).fetchall()
+    ]
+    con.close()
+    print(f"Reconstructing stints for {len(game_ids)} games...")
+
+    staging_dir = tempfile.mkdtemp(prefix="stints_")
+    try:
+        chunks = list(_chunks(game_ids, GAMES_PER_CHUNK))
+        prefixes = [os.path.join(staging_dir, f"{i:05d}") for i in range(len(chunks))]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for done, _ in enumerate(pool.map(process_games, chunks, prefixes), start=1):
+                if done % 20 == 0:
+                    print(f"Processed {min(done * GAMES_PER_CHUNK, len(game_ids))} games...")
+        _merge_stints(staging_dir)
+    finally:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+
+def _merge_stints(staging_dir: str) -> None:
+    """Bulk-insert the staged Parquet files and update box_scores from them."""
+    con = duckdb.connect(DB_PATH)
+    try:
+        print("Writing lineup_stints and player_stints...")
+        con.execute("DELETE FROM lineup_stints")
+        con.execute("DELETE FROM player_stints")
+        for table, columns, suffix in (
+            ("lineup_stints", LINEUP_COLUMNS, "lineups"),
+            ("player_stints", PLAYER_COLUMNS, "players"),
+        ):
+            pattern = os.path.join(staging_dir, f"*_{suffix}.parquet")
+            if not glob.glob(pattern):
+                continue
+            # Table and column names are this module's constants
+            columns_sql = ", ".join(columns)
+            con.execute(
+                f"INSERT INTO {table} ({columns_sql}) SELECT {columns_sql} FROM read_parquet('{pattern}')",  # noqa: S608
+            )
+
+        print("Resolving player ids...")
+        con.execute(f"""
+            UPDATE player_stints
+            SET player_id = pm.br_id
+            FROM ({PLAYER_MAP_SQL}) pm
+            WHERE player_stints.nba_person_id = pm.nba_id
+        """)  # noqa: S608
+
+        print("Feeding minutes, plus/minus and starters into box_scores...")
+        con.execute("""
+            UPDATE box_scores
+            SET
+                minutes_played = CAST(ROUND(s.seconds / 60.0) AS INTEGER),
+                plus_minus = s.plus_minus,
+                is_starter = s.is_starter
+            FROM (
+                SELECT
+                    game_id,
+                    player_id,
+                    SUM(seconds) AS seconds,
+                    SUM(points_for - points_against) AS plus_minus,
+                    BOOL_OR(period = 1 AND start_seconds = 0) AS is_starter
+                FROM player_stints
+                WHERE player_id IS NOT NULL
+                GROUP BY game_id, player_id
+            ) s
+            WHERE box_scores.game_id = s.game_id AND box_scores.player_id = s.player_id
+        """)
+
+        lineup_count = con.execute("SELECT COUNT(*) FROM lineup_stints").fetchone()
+        player_count = con.execute("SELECT COUNT(*) FROM player_stints").fetchone()
+        print(
+            f"Inserted {lineup_count[0] if lineup_count else 0} lineup stints and "
+            f"{player_count[0] if player_count else 0} player stints.",
+        )
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    build_stints(workers=args.workers)
@@ -0,0 +1,178 @@
+"""Build the season-aware team abbreviation table (`team_aliases`).
+
+Source datasets disagree on abbreviations (Basketball-Reference writes BRK,
+PHO and CHO; stats.nba.com writes BKN, PHX and CHA) and relocated franchises
+reuse or retire them over time. Each row maps an abbreviation over an
+inclusive range of season end years to a team and franchise; a NULL bound is
+open-ended. Rows come from, in priority order:
+
+1. HISTORICAL_ALIASES below (known relocations and spelling differences)
+2. the abbreviations each team id used in the raw `game` table
+3. the current `teams.abbreviation`
+
+Ranges for the same abbreviation and team are merged; an overlapping range
+for a different team is reported and dropped, so every (abbreviation,
+season) resolves to at most one team. Run after load_teams.py.
+"""
+
+import os
+from dataclasses import dataclass
+
+import duckdb
+import pandas as pd
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+)
+DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
+
+ALIAS_COLUMNS = ["abbreviation", "first_season", "last_season", "team_id", "franchise_id", "source"]
+
+# (abbreviation, first season, last season, current abbreviation); seasons are end years
+HISTORICAL_ALIASES = [
+    ("BRK", 2013, None, "BKN"),
+    ("NJN", 1978, 2012, "BKN"),
+    ("PHO", None, None, "PHX"),
+    ("CHO", 2015, None, "CHA"),
+    ("CHH", 1989, 2002, "CHA"),
+    ("NOH", 2003, 2013, "NOP"),
+    ("NOK", 2006, 2007, "NOP"),
+    ("SEA", 1968, 2008, "OKC"),
+    ("VAN", 1996, 2001, "MEM"),
+    ("WSB", 1975, 1997, "WAS"),
+    ("KCK", 1976, 1985, "SAC"),
+    ("SDC", 1979, 1984, "LAC"),
+]
+
+# Placeholder team load_stats.py uses for multi-team season totals
+TOTAL_TEAM_ID = "TOT"
+
+
+def alias_join(abbr_expr: str, season_expr: str, alias: str = "ta") -> str:
+    """LEFT JOIN clause resolving `abbr_expr` in season `season_expr` through team_aliases."""
+    return f"""
+        LEFT JOIN team_aliases {alias}
+          ON {alias}.abbreviation = {abbr_expr}
+          AND CAST({season_expr} AS INTEGER) BETWEEN COALESCE({alias}.first_season, 0)
+                                                 AND COALESCE({alias}.last_season, 9999)
+    """
+
+
+@dataclass
+class Alias:
+    abbreviation: str
+    first_season: int | None
+    last_season: int | None
+    team_id: str
+    franchise_id: str | None
+    source: str
+
+    def overlaps(self, other: "Alias") -> bool:
+        return (self.first_season or 0) <= (other.last_season or 9999) and (other.first_season or 0) <= (
+            self.last_season or 9999
+        )
+
+    def merge(self, other: "Alias") -> None:
+        self.first_season = None if None in (self.first_season, other.first_season) else min(
+            self.first_season or 0, other.first_season or 0,
+        )
+        self.last_season = None if None in (self.last_season, other.last_season) else max(
+            self.last_season or 0, other.last_season or 0,
+        )
+
+
+def table_exists(con: duckdb.DuckDBPyConnection, table: str) -> bool:
+    result = con.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = ?",
+        [table],
+    ).fetchone()
+    return bool(result and result[0])
+
+
+def merge_aliases(candidates: list[Alias]) -> tuple[dict[str, list[Alias]], int]:
+    """Group candidates by abbreviation, merging each team's ranges; return (kept, conflicts dropped)."""
+    kept: dict[str, list[Alias]] = {}
+    conflicts = 0
+    for alias in candidates:
+        existing = kept.setdefault(alias.abbreviation, [])
+        same_team = next((a for a in existing if a.team_id == alias.team_id), None)
+        if any(a.team_id != alias.team_id and a.overlaps(alias) for a in existing):
+            conflicts += 1
+            print(
+                f"Conflict: {alias.abbreviation} -> {alias.team_id} ({alias.source}, "
+                f"{alias.first_season}-{alias.last_season}) overlaps another team; dropped",
+            )
+        elif same_team is not None and alias.source == "teams":
+            # The current abbreviation extends the team's observed range to the present
+            same_team.last_season = None
+        elif same_team is not None and same_team.overlaps(alias):
+            same_team.merge(alias)
+        else:
+            existing.append(alias)
+    return kept, conflicts
+
+
+def build_team_aliases() -> None:
+    print(f"Connecting to {DB_PATH}...")
+    con = duckdb.connect(DB_PATH)
+
+    teams = con.execute("SELECT team_id, abbreviation, franchise_id FROM teams").fetchall()
+    by_abbr = {abbr: (str(team_id), franchise_id) for team_id, abbr, franchise_id in teams if abbr}
+    franchise_of = {str(team_id): franchise_id for team_id, _, franchise_id in teams}
+
+    candidates: list[Alias] = []
+    for abbr, first, last, current in HISTORICAL_ALIASES:
+        if current not in by_abbr:
+            print(f"Skipping {abbr}: no team with abbreviation {current}")
+            continue
+        team_id, franchise_id = by_abbr[current]
+        candidates.append(Alias(abbr, first, last, team_id, franchise_id, "historical"))
+
+    if table_exists(con, "game"):
+        print("Collecting abbreviations used in game...")
+        rows = con.execute("""
+            SELECT abbr, team_id, MIN(season), MAX(season)
+            FROM (
+                SELECT
+                    abbr,
+                    team_id,
+                    YEAR(game_date) + CASE WHEN MONTH(game_date) >= 8 THEN 1 ELSE 0 END AS season
+                FROM (
+                    SELECT team_abbreviation_home AS abbr, CAST(team_id_home AS VARCHAR) AS team_id,
+                           CAST(game_date AS DATE) AS game_date
+                    FROM game
+                    UNION ALL
+                    SELECT team_abbreviation_away, CAST(team_id_away AS VARCHAR), CAST(game_date AS DATE)
+                    FROM game
+                )
+                WHERE abbr IS NOT NULL AND team_id IS NOT NULL AND game_date IS NOT NULL
+            )
+            GROUP BY abbr, team_id
+        """).fetchall()
+        for abbr, team_id, first, last in rows:
+            candidates.append(Alias(abbr, int(first), int(last), team_id, franchise_of.get(team_id), "game"))
+
+    for abbr, (team_id, franchise_id) in by_abbr.items():
+        candidates.append(Alias(abbr, None, None, team_id, franchise_id, "teams"))
+    if TOTAL_TEAM_ID not in by_abbr:
+        candidates.append(Alias(TOTAL_TEAM_ID, None, None, TOTAL_TEAM_ID, None, "teams"))
+
+    kept, conflicts = merge_aliases(candidates)
+
+    aliases = [a for group in kept.values() for a in group]
+    alias_df = pd.DataFrame(
+        [(a.abbreviation, a.first_season, a.last_season, a.team_id, a.franchise_id, a.source) for a in aliases],
+        columns=ALIAS_COLUMNS,
+    )
+    con.register("alias_df", alias_df)
+    con.execute("BEGIN TRANSACTION")
+    con.execute("DELETE FROM team_aliases")
+    con.execute(f"INSERT INTO team_aliases ({', '.join(ALIAS_COLUMNS)}) SELECT * FROM alias_df")  # noqa: S608
+    con.execute("COMMIT")
+
+    print(f"Stored {len(aliases)} aliases for {len(kept)} abbreviations ({conflicts} conflicts dropped).")
+    con.close()
+
+
+if __name__ == "__main__":
+    build_team_aliases()
@@ -0,0 +1,183 @@
+"""Build per-game Elo and rolling SRS team ratings (`team_ratings`).
+
+`team_season_stats.simple_rating_system` is a single end-of-season number.
+This stage rates every finished game in `games` in date order with
+app/utils/ratings.py, storing one row per team per game: pre-game win
+probability, Elo before and after, and SRS fitted to the season's
+regular-season games through that date.
+
+The first run (or ``--full``) rates all of history. Later runs start from
+the watermark in `team_ratings_watermark`: rows from the last rated game
+date onwards are dropped, the engine is restored from the rows before it
+(Elo per team, and the season's earlier games for SRS), and only the new
+games are rated. A daily update therefore touches one night of games.
+Score corrections to older games need ``--full``, which run_pipeline.py
+always passes since it reloads `games`.
+
+    python scripts/etl/build_team_ratings.py          # incremental
+    python scripts/etl/build_team_ratings.py --full   # recompute everything
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import duckdb
+import pandas as pd
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+)
+DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
+
+sys.path.insert(0, os.path.join(BASE_DIR, "backend"))
+
+from app.utils.ratings import PLAYOFF_GAME_SQL, RATING_COLUMNS, RatingEngine, TeamState  # noqa: E402
+
+TABLE = "team_ratings"
+WATERMARK_TABLE = "team_ratings_watermark"
+
+FINISHED = """
+    game_date IS NOT NULL AND home_team_id IS NOT NULL AND away_team_id IS NOT NULL
+    AND home_team_score IS NOT NULL AND away_team_score IS NOT NULL
+"""
+
+CREATE_SQL = f"""
+    CREATE OR REPLACE TABLE {TABLE} (
+        team_id VARCHAR,
+        season_id VARCHAR,
+        game_date DATE,
+        game_id VARCHAR,
+        opponent_team_id VARCHAR,
+        is_home BOOLEAN,
+        is_playoff BOOLEAN,
+        win_probability DOUBLE,
+        elo_pre DOUBLE,
+        elo DOUBLE,
+        srs DOUBLE
+    );
+    CREATE OR REPLACE TABLE {WATERMARK_TABLE} (
+        last_game_date DATE,
+        games INTEGER,
+        updated_at TIMESTAMP
+    );
+"""
+
+
+def read_watermark(con: duckdb.DuckDBPyConnection) -> object | None:
+    """Return the last rated game date, or None when ratings haven't been built."""
+    try:
+        row = con.execute(f"SELECT MAX(last_game_date) FROM {WATERMARK_TABLE}").fetchone()  # noqa: S608 - table names and predicates are module constants
+    except duckdb.CatalogException:
+        return None
+    return row[0] if row else None
+
+
+def restore_engine(con: duckdb.DuckDBPyConnection, since: object) -> RatingEngine:
+    """Engine state as of just before ``since``, read back from stored rows."""
+    teams = {
+        team_id: TeamState(elo=elo, season_id=season_id, srs=srs)
+        for team_id, elo, srs, season_id in con.execute(
+            f"""
+            WITH latest AS (
+                SELECT team_id, elo, srs
+                FROM {TABLE}
+                WHERE game_date < ?
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY team_id ORDER BY game_date DESC, game_id DESC) = 1
+            ),
+            seasons AS (
+                SELECT team_id, arg_max(season_id, game_date) AS season_id
+                FROM {TABLE}
+                WHERE game_date < ? AND NOT is_playoff
+                GROUP BY team_id
+            )
+            SELECT l.team_id, l.elo, l.srs, s.season_id
+            FROM latest l LEFT JOIN seasons s USING (team_id)
+            """,  # noqa: S608 - table names and predicates are module constants
+            [since, since],
+        ).fetchall()
+    }
+    engine = RatingEngine(teams)
+
+    # SRS refits from the whole season, so replay the earlier regular-season
+    # games of any season that continues past the watermark
+    primed = con.execute(
+        f"""
+        SELECT season_id, home_team_id, away_team_id, home_team_score - away_team_score
+        FROM games
+        WHERE {FINISHED} AND NOT {PLAYOFF_GAME_SQL} AND game_date < ?
+          AND season_id IN (
+              SELECT DISTINCT season_id FROM games
+              WHERE {FINISHED} AND NOT {PLAYOFF_GAME_SQL} AND game_date >= ?
+          )
+        ORDER BY game_date, game_id
+        """,  # noqa: S608 - table names and predicates are module constants
+        [since, since],
+    ).df()
+    for season_id, season in primed.groupby("season_id"):
+        engine.prime(str(season_id), season["home_team_id"], season["away_team_id"], season.iloc[:, 3])
+    return engine
+
+
+def build_team_ratings(con: duckdb.DuckDBPyConnection, full: bool = False) -> tuple[int, object | None]:
+    """Rate new games (all of them with ``full``); returns (games rated, watermark)."""
+    since = None if full else read_watermark(con)
+    engine = RatingEngine() if since is None else restore_engine(con, since)
+
+    games = con.execute(
+        f"""
+        SELECT game_id, season_id, game_date, home_team_id, away_team_id,
+               home_team_score, away_team_score, {PLAYOFF_GAME_SQL} AS is_playoff
+        FROM games
+        WHERE {FINISHED} {"AND game_date >= ?" if since is not None else ""}
+        ORDER BY game_date, game_id
+        """,  # noqa: S608 - table names and predicates are module constants
+        [since] if since is not None else [],
+    ).fetchall()
+    if not games and since is not None:
+        return 0, since
+
+    ratings = pd.DataFrame(engine.process(games), columns=RATING_COLUMNS)
+    watermark = games[-1][2] if games else None
+    # The rebuild replaces the tables in the same transaction as the insert,
+    # so a failed --full run leaves the previous ratings readable
+    con.execute("BEGIN TRANSACTION")
+    try:
+        if since is None:
+            con.execute(CREATE_SQL)
+        else:
+            con.execute(f"DELETE FROM {TABLE} WHERE game_date >= ?", [since])  # noqa: S608
+        con.register("new_ratings", ratings)
+        con.execute(f"INSERT INTO {TABLE} SELECT {', '.join(RATING_COLUMNS)} FROM new_ratings")  # noqa: S608
+        con.unregister("new_ratings")
+        con.execute(f"DELETE FROM {WATERMARK_TABLE}")  # noqa: S608
+        if games:
+            con.execute(
+                f"INSERT INTO {WATERMARK_TABLE} VALUES (?, ?, current_timestamp)",  # noqa: S608
+                [watermark, len(games)],
+            )
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    return len(games), watermark
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build per-game Elo and SRS team ratings.")
+    parser.add_argument("--full", action="store_true", help="Recompute from the first game instead of the watermark")
+    args = parser.parse_args()
+
+    print(f"Connecting to {DB_PATH}...")
+    con = duckdb.connect(DB_PATH)
+    try:
+        started = time.perf_counter()
+        games, watermark = build_team_ratings(con, full=args.full)
+        print(f"Rated {games} games through {watermark} in {time.perf_counter() - started:.2f}s")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""Rewrite the hot serving tables in lookup-key order.
+
+DuckDB keeps min/max statistics per row group and skips row groups whose
+range cannot match a filter, but the loads insert rows in source order, so a
+single player's box scores end up spread over every row group. Rewriting a
+table sorted by its dominant filter key packs each key into a few row groups:
+
+    python scripts/etl/cluster_tables.py                      # all tables in CLUSTER_KEYS
+    python scripts/etl/cluster_tables.py games box_scores     # a subset
+    python scripts/etl/cluster_tables.py --key games=game_date,game_id
+    python scripts/etl/cluster_tables.py --benchmark          # measure before and after
+
+A DELETE leaves the old row groups on disk, so tables are rebuilt instead:
+sorted copies are taken into a ``cluster_staging`` schema, then each table is
+dropped and recreated from its original DDL (constraints, defaults and
+indexes included) and refilled. Tables referencing a clustered table by
+foreign key have to be dropped first and are rewritten along with it, in
+their current order unless they have keys of their own. DuckDB cannot do the
+drop/recreate in one transaction, so the staged copies are kept until every
+table has been restored; rerunning after an interruption finishes the restore
+from them before doing anything else.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import time
+
+import duckdb
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+)
+DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
+
+STAGING_SCHEMA = "cluster_staging"
+PLAN_TABLE = f"{STAGING_SCHEMA}._plan"
+
+# Sort keys per table, leading column first: the column the API filters on most
+CLUSTER_KEYS: dict[str, tuple[str, ...]] = {
+    "box_scores": ("player_id", "game_id"),
+    "player_season_stats": ("player_id", "season_id"),
+    "player_splits": ("player_id", "season_id"),
+    "games": ("season_id", "game_date"),
+}
+
+BENCHMARK_SAMPLES = 20
+BENCHMARK_REPEATS = 3
+STATS_RANGE = re.compile(r"Min: (.*?), Max: (.*?)[,\]]")
+
+
+def existing_tables(con: duckdb.DuckDBPyConnection) -> set[str]:
+    rows = con.execute("SELECT table_name FROM duckdb_tables() WHERE schema_name = 'main'").fetchall()
+    return {row[0] for row in rows}
+
+
+def foreign_keys(con: duckdb.DuckDBPyConnection) -> list[tuple[str, str]]:
+    """(referencing table, referenced table) pairs in the main schema."""
+    rows = con.execute(
+        """
+        SELECT DISTINCT table_name, referenced_table
+        FROM duckdb_constraints()
+        WHERE constraint_type = 'FOREIGN KEY' AND schema_name = 'main'
+        """,
+    ).fetchall()
+    return [(child, parent) for child, parent in rows if child != parent]
+
+
+def rewrite_order(con: duckdb.DuckDBPyConnection, tables: list[str]) -> list[str]:
+    """Tables to rebuild (targets plus FK dependents), referenced tables first."""
+    fks = foreign_keys(con)
+    members = set(tables)
+    changed = True
+    while changed:
+        dependents = {child for child, parent in fks if parent in members}
+        changed = not dependents <= members
+        members |= dependents
+
+    ordered: list[str] = []
+    remaining = set(members)
+    while remaining:
+        ready = sorted(
+            t for t in remaining if not any(child == t and parent in remaining for child, parent in fks)
+        )
+        if not ready:
+            msg = f"Foreign key cycle among {sorted(remaining)}"
+            raise RuntimeError(msg)
+        ordered.extend(ready)
+        remaining -= set(ready)
+    return ordered
+
+
+def stage(con: duckdb.DuckDBPyConnection, tables: list[str], keys: dict[str, tuple[str, ...]]) -> None:
+    """Copy each table, sorted, into the staging schema along with its DDL.
+
+    Table and key names come from the operator's command line, the
+    catalog and CLUSTER_KEYS, never from requests, hence the S608 noqas.
+    """
+    con.execute("BEGIN TRANSACTION")
+    con.execute(f"CREATE SCHEMA {STAGING_SCHEMA}")
+    con.execute(
+        f"CREATE TABLE {PLAN_TABLE} (ordinal INTEGER, table_name VARCHAR, table_sql VARCHAR, "
+        "index_sql VARCHAR[], row_count BIGINT)",
+    )
+    for ordinal, table in enumerate(tables):
+        order_by = f" ORDER BY {', '.join(keys[table])}" if table in keys else ""
+        started = time.time()
+        con.execute(f"CREATE TABLE {STAGING_SCHEMA}.{table} AS SELECT * FROM {table}{order_by}")  # noqa: S608
+        print(f"  Staged {table}{order_by or ' (current order)'} in {time.time() - started:.1f}s")
+        con.execute(
+            f"""
+            INSERT INTO {PLAN_TABLE}
+            SELECT
+                ?,
+                ?,
+                (SELECT sql FROM duckdb_tables() WHERE schema_name = 'main' AND table_name = ?),
+                (SELECT COALESCE(list(sql), []) FROM duckdb_indexes()
+                 WHERE schema_name = 'main' AND table_name = ? AND sql IS NOT NULL),
+                (SELECT COUNT(*) FROM {STAGING_SCHEMA}.{table})
+            """,  # noqa: S608
+            [ordinal, table, table, table],
+        )
+    con.execute("COMMIT")
+
+
+def restore(con: duckdb.DuckDBPyConnection) -> None:
+    """Rebuild every staged table from its copy, then drop the staging schema.
+
+    Idempotent: safe to rerun after an interruption at any point.
+    """
+    plan = con.execute(
+        f"SELECT table_name, table_sql, index_sql, row_count FROM {PLAN_TABLE} ORDER BY ordinal",  # noqa: S608
+    ).fetchall()
+
+    # Referencing tables must go before the tables they reference
+    for table, _, _, _ in reversed(plan):
+        con.execute(f"DROP TABLE IF EXISTS main.{table}")
+
+    for table, table_sql, index_sql, row_count in plan:
+        started = time.time()
+        con.execute(table_sql)
+        con.execute(f"INSERT INTO {table} SELECT * FROM {STAGING_SCHEMA}.{table}")  # noqa: S608
+        for sql in index_sql:
+            con.execute(sql)
+        result = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()  # noqa: S608
+        restored = result[0] if result else 0
+        if restored != row_count:
+            msg = f"{table}: restored {restored} rows, staged {row_count}; staging schema kept"
+            raise RuntimeError(msg)
+        print(f"  Rebuilt {table} ({restored} rows) in {time.time() - started:.1f}s")
+
+    con.execute(f"DROP SCHEMA {STAGING_SCHEMA} CASCADE")
+    con.execute("CHECKPOINT")
+
+
+def staging_exists(con: duckdb.DuckDBPyConnection) -> bool:
+    row = con.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE schema_name = ? AND table_name = '_plan'",
+        [STAGING_SCHEMA],
+    ).fetchone()
+    return bool(row and row[0])
+
+
+def _in_range(value: object, low: str, high: str) -> bool:
+    """Whether a segment's min/max statistics admit the value.
+
+    VARCHAR statistics are truncated prefixes, so a value extending the
+    stored max still counts as a possible match.
+    """
+    if isinstance(value, int | float):
+        try:
+            return float(low) <= value <= float(high)
+        except ValueError:
+            return True
+    text = str(value)
+    return low <= text and (text <= high or text.startswith(high))
+
+
+def benchmark(con: duckdb.DuckDBPyConnection, table: str, column: str) -> tuple[float, float, int]:
+    """Measure point lookups on a table's leading cluster key.
+
+    Returns (average fraction of row groups whose zone map admits a sampled
+    key, median lookup time in ms, number of row groups).
+    """
+    segments: dict[int, list[tuple[str, str]]] = {}
+    for row_group, stats in con.execute(
+        "SELECT row_group_id, stats FROM pragma_storage_info(?) WHERE column_name = ?",
+        [table, column],
+    ).fetchall():
+        match = STATS_RANGE.search(stats or "")
+        segments.setdefault(row_group, [])
+        if match:
+            segments[row_group].append((match.group(1), match.group(2)))
+
+    samples = [
+        row[0]
+        for row in con.execute(
+            f"""
+            SELECT v FROM (SELECT DISTINCT {column} AS v FROM {table} WHERE {column} IS NOT NULL)
+            ORDER BY hash(v) LIMIT {BENCHMARK_SAMPLES}
+            """,  # noqa: S608
+        ).fetchall()
+    ]
+    if not samples or not segments:
+        return 0.0, 0.0, len(segments)
+
+    fractions = []
+    timings = []
+    for value in samples:
+        touched = sum(
+            1
+            for ranges in segments.values()
+            # Segments without statistics can't be skipped
+            if not ranges or any(_in_range(value, low, high) for low, high in ranges)
+        )
+        fractions.append(touched / len(segments))
+        for _ in range(BENCHMARK_REPEATS):
+            started = time.perf_counter()
+            con.execute(f"SELECT * FROM {table} WHERE {column} = ?", [value]).fetchall()  # noqa: S608
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.mean(fractions), statistics.median(timings), len(segments)
+
+
+def run_benchmarks(
+    con: duckdb.DuckDBPyConnection,
+    keys: dict[str, tuple[str, ...]],
+) -> dict[str, tuple[float, float, int]]:
+    return {table: benchmark(con, table, columns[0]) for table, columns in keys.items()}
+
+
+def print_benchmarks(
+    before: dict[str, tuple[float, float, int]],
+    after: dict[str, tuple[float, float, int]],
+    keys: dict[str, tuple[str, ...]],
+) -> None:
+    print("Point lookups on the leading key (row groups admitted by zone maps, median time):")
+    for table, (fraction, ms, groups) in after.items():
+        old_fraction, old_ms, old_groups = before[table]
+        print(
+            f"  {table}.{keys[table][0]}: "
+            f"{old_fraction:.1%} of {old_groups} -> {fraction:.1%} of {groups} row groups, "
+            f"{old_ms:.2f}ms -> {ms:.2f}ms",
+        )
+
+
+def parse_key_overrides(values: list[str]) -> dict[str, tuple[str, ...]]:
+    overrides = {}
+    for value in values:
+        table, sep, columns = value.partition("=")
+        if not sep or not columns:
+            msg = f"Expected TABLE=COL[,COL...], got {value!r}"
+            raise SystemExit(msg)
+        overrides[table.strip()] = tuple(c.strip() for c in columns.split(",") if c.strip())
+    return overrides
+
+
+def cluster_tables(
+    tables: list[str] | None = None,
+    key_overrides: dict[str, tuple[str, ...]] | None = None,
+    run_benchmark: bool = False,
+) -> None:
+    keys = {**CLUSTER_KEYS, **(key_overrides or {})}
+    con = duckdb.connect(DB_PATH)
+    try:
+        if staging_exists(con):
+            print(f"Found {STAGING_SCHEMA} from an interrupted run, restoring it first...")
+            restore(con)
+            # Recreating the schema in the session that dropped it fails to commit
+            con.close()
+            con = duckdb.connect(DB_PATH)
+
+        available = existing_tables(con)
+        targets = [t for t in (tables or keys) if t in available]
+        for table in sorted(set(tables or keys) - available):
+            print(f"Skipping {table}: table not found")
+        for table in targets:
+            if table not in keys:
+                msg = f"No cluster key for {table}; pass --key {table}=COL[,COL...]"
+                raise SystemExit(msg)
+        if not targets:
+            print("Nothing to cluster.")
+            return
+        target_keys = {t: keys[t] for t in targets}
+
+        before = run_benchmarks(con, target_keys) if run_benchmark else {}
+
+        order = rewrite_order(con, targets)
+        dependents = [t for t in order if t not in target_keys]
+        print(f"Clustering {', '.join(targets)}")
+        if dependents:
+            print(f"  (also rebuilding referencing tables: {', '.join(dependents)})")
+
+        started = time.time()
+        stage(con, order, target_keys)
+        restore(con)
+        print(f"Clustered {len(order)} tables in {time.time() - started:.1f}s")
+
+        if run_benchmark:
+            print_benchmarks(before, run_benchmarks(con, target_keys), target_keys)
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rewrite hot tables sorted by their lookup keys.")
+    parser.add_argument("tables", nargs="*", help=f"Tables to cluster (default: {', '.join(CLUSTER_KEYS)})")
+    parser.add_argument(
+        "--key",
+        action="append",
+        default=[],
+        metavar="TABLE=COL[,COL...]",
+        help="Override or add a table's sort key",
+    )
+    parser.add_argument("--benchmark", action="store_true", help="Measure point lookups before and after")
+    args = parser.parse_args()
+    cluster_tables(args.tables or None, parse_key_overrides(args.key), args.benchmark)
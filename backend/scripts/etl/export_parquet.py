@@ -0,0 +1,176 @@
+"""Export the serving schema to season-partitioned Parquet.
+
+Each table the API reads is written under ``<out>/<table>/`` with zstd
+compression and row-group statistics. Tables carrying a ``season_id`` are
+hive-partitioned on it (``season_id=2023/data_0.parquet``). Game-level tables
+without one (box_scores, the stint tables, ...) are written as one file
+sorted by ``game_id``, so row-group statistics skip all but the row groups
+holding a requested game. They are not partitioned on a season borrowed
+from ``games``: the views could not expose that column without it clashing
+with ``games.season_id`` in the API's joins, so nothing would ever prune on
+it.
+A ``manifest.json`` records each table's column order and types so the API
+(``DATA_BACKEND=parquet``) can recreate faithful views over the files.
+
+The tree is built in a sibling staging directory and swapped in at the end,
+so readers never observe a half-written export.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+
+import duckdb
+
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+)
+DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
+OUT_DIR = os.path.join(BASE_DIR, "data", "parquet")
+
+MANIFEST_NAME = "manifest.json"
+PARTITION_COLUMN = "season_id"
+DEFAULT_ROW_GROUP_SIZE = 122_880
+
+# Serving tables plus the raw source tables the API still queries directly
+EXPORT_TABLES = [
+    "seasons",
+    "franchises",
+    "teams",
+    "team_aliases",
+    "players",
+    "games",
+    "box_scores",
+    "player_game_logs",
+    "team_game_stats",
+    "team_season_stats",
+    "team_ratings",
+    "player_season_stats",
+    "player_advanced_stats",
+    "player_shooting_stats",
+    "player_play_by_play_stats",
+    "player_adjusted_shooting",
+    "player_splits",
+    "draft_picks",
+    "player_contracts",
+    "awards",
+    "playoff_series",
+    "lineup_stints",
+    "player_stints",
+    "game",
+    "line_score",
+    "common_player_info",
+]
+
+SORT_COLUMN = "game_id"
+
+
+def table_columns(con: duckdb.DuckDBPyConnection, table: str) -> list[tuple[str, str]]:
+    """Return (name, type) for each column of a table, in declaration order."""
+    rows = con.execute(
+        """
+        SELECT column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = 'main' AND table_name = ?
+        ORDER BY ordinal_position
+        """,
+        [table],
+    ).fetchall()
+    return [(str(name), str(dtype)) for name, dtype in rows]
+
+
+def export_select(table: str, columns: list[tuple[str, str]]) -> tuple[str, bool]:
+    """Build the SELECT for one table and report whether it is season-partitioned."""
+    # Table names come from the database's own catalog
+    names = [name for name, _ in columns]
+    if PARTITION_COLUMN in names:
+        return f"SELECT * FROM {table}", True  # noqa: S608
+    if SORT_COLUMN in names:
+        return f"SELECT * FROM {table} ORDER BY {SORT_COLUMN}", False  # noqa: S608
+    return f"SELECT * FROM {table}", False  # noqa: S608
+
+
+def export_parquet(
+    out_dir: str = OUT_DIR,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> None:
+    print(f"Connecting to {DB_PATH}...")
+    con = duckdb.connect(DB_PATH, read_only=True)
+
+    staging_dir = f"{out_dir}.staging"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    existing = {
+        str(row[0])
+        for row in con.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = 'main'",
+        ).fetchall()
+    }
+    manifest: dict = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "source": DB_PATH,
+        "partition_column": PARTITION_COLUMN,
+        "tables": {},
+    }
+
+    try:
+        for table in EXPORT_TABLES:
+            if table not in existing:
+                print(f"Skipping {table}: not present in database")
+                continue
+
+            started = time.perf_counter()
+            columns = table_columns(con, table)
+            select_sql, partitioned = export_select(table, columns)
+            options = f"FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE {int(row_group_size)}"
+            if partitioned:
+                target = os.path.join(staging_dir, table)
+                options += f", PARTITION_BY ({PARTITION_COLUMN})"
+            else:
+                os.makedirs(os.path.join(staging_dir, table))
+                target = os.path.join(staging_dir, table, "data_0.parquet")
+            con.execute(f"COPY ({select_sql}) TO '{target}' ({options})")
+
+            result = con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()  # noqa: S608
+            rows = int(result[0]) if result else 0
+            manifest["tables"][table] = {
+                "columns": [[name, dtype] for name, dtype in columns],
+                "partitioned": partitioned,
+                "rows": rows,
+            }
+            layout = f"partitioned by {PARTITION_COLUMN}" if partitioned else "single file"
+            print(f"Exported {table}: {rows} rows ({layout}) in {time.perf_counter() - started:.1f}s")
+
+        with open(os.path.join(staging_dir, MANIFEST_NAME), "w") as f:
+            json.dump(manifest, f, indent=2)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    finally:
+        con.close()
+
+    # Swap the finished tree into place
+    previous_dir = f"{out_dir}.previous"
+    shutil.rmtree(previous_dir, ignore_errors=True)
+    if os.path.exists(out_dir):
+        os.rename(out_dir, previous_dir)
+    os.rename(staging_dir, out_dir)
+    shutil.rmtree(previous_dir, ignore_errors=True)
+    print(f"Exported {len(manifest['tables'])} tables to {out_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export serving tables to season-partitioned Parquet.")
+    parser.add_argument("--out", default=OUT_DIR, help="Output directory")
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=DEFAULT_ROW_GROUP_SIZE,
+        help="Rows per Parquet row group",
+    )
+    args = parser.parse_args()
+    export_parquet(out_dir=args.out, row_group_size=args.row_group_size)
@@ -1,12 +1,93 @@
+import argparse
 import os
 
 import duckdb
 
+from partitioned import Partition, list_seasons, run_partitioned
+
 BASE_DIR = os.path.dirname(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
 )
 DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
 
+SPLIT_COLUMNS = [
+    "player_id", "season_id", "split_type", "split_value",
+    "games", "minutes",
+    "field_goals_made", "field_goals_attempted", "field_goal_pct",
+    "three_pointers_made", "three_pointers_attempted", "three_point_pct",
+    "free_throws_made", "free_throws_attempted", "free_throw_pct",
+    "rebounds", "assists", "steals", "blocks", "turnovers", "points",
+    "points_per_game",
+    "true_shooting_pct", "effective_fg_pct",
+]
+
+# Aggregates shared by every split type
+SPLIT_AGGREGATES = """
+    COUNT(DISTINCT b.game_id) as games,
+    SUM(COALESCE(b.minutes_played, 0)) as minutes,
+    SUM(b.field_goals_made) as fgm,
+    SUM(b.field_goals_attempted) as fga,
+    CASE WHEN SUM(b.field_goals_attempted) > 0 THEN CAST(SUM(b.field_goals_made) AS DOUBLE) / SUM(b.field_goals_attempted) ELSE 0 END as fg_pct,
+    SUM(b.three_pointers_made) as fg3m,
+    SUM(b.three_pointers_attempted) as fg3a,
+    CASE WHEN SUM(b.three_pointers_attempted) > 0 THEN CAST(SUM(b.three_pointers_made) AS DOUBLE) / SUM(b.three_pointers_attempted) ELSE 0 END as fg3_pct,
+    SUM(b.free_throws_made) as ftm,
+    SUM(b.free_throws_attempted) as fta,
+    CASE WHEN SUM(b.free_throws_attempted) > 0 THEN CAST(SUM(b.free_throws_made) AS DOUBLE) / SUM(b.free_throws_attempted) ELSE 0 END as ft_pct,
+    SUM(b.total_rebounds) as trb,
+    SUM(b.assists) as ast,
+    SUM(b.steals) as stl,
+    SUM(b.blocks) as blk,
+    SUM(b.turnovers) as tov,
+    SUM(b.points) as pts,
+    CASE WHEN COUNT(DISTINCT b.game_id) > 0 THEN CAST(SUM(b.points) AS DOUBLE) / COUNT(DISTINCT b.game_id) ELSE 0 END as ppg,
+
+    -- TS%: PTS / (2 * (FGA + 0.44 * FTA))
+    CASE WHEN (2 * (SUM(b.field_goals_attempted) + 0.44 * SUM(b.free_throws_attempted))) > 0
+         THEN CAST(SUM(b.points) AS DOUBLE) / (2 * (SUM(b.field_goals_attempted) + 0.44 * SUM(b.free_throws_attempted)))
+         ELSE 0 END as ts_pct,
+
+    -- eFG%: (FGM + 0.5 * 3PM) / FGA
+    CASE WHEN SUM(b.field_goals_attempted) > 0
+         THEN (CAST(SUM(b.field_goals_made) AS DOUBLE) + 0.5 * CAST(SUM(b.three_pointers_made) AS DOUBLE)) / SUM(b.field_goals_attempted)
+         ELSE 0 END as efg_pct
+"""
+
+# (label, split_type, split_value expression, extra WHERE condition)
+SPLITS = [
+    ("Total", "'Total'", "'Season'", None),
+    (
+        "Location (Home/Away)",
+        "'Location'",
+        "CASE WHEN b.team_id = g.home_team_id THEN 'Home' ELSE 'Away' END",
+        "b.team_id IS NOT NULL AND (b.team_id = g.home_team_id OR b.team_id = g.away_team_id)",
+    ),
+    (
+        "Result (Win/Loss)",
+        "'Result'",
+        "CASE WHEN b.team_id = g.winner_team_id THEN 'Win' ELSE 'Loss' END",
+        "b.team_id IS NOT NULL AND g.winner_team_id IS NOT NULL",
+    ),
+]
+
+
+def split_select(split_type: str, split_value: str, condition: str | None, by_season: bool) -> str:
+    """Build the SELECT for one split type, optionally restricted to one season."""
+    conditions = [c for c in (condition, "g.season_id = ?" if by_season else None) if c]
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"""
+        SELECT
+            b.player_id,
+            g.season_id,
+            {split_type},
+            {split_value} as split_value,
+            {SPLIT_AGGREGATES}
+        FROM box_scores b
+        JOIN games g ON b.game_id = g.game_id
+        {where}
+        GROUP BY b.player_id, g.season_id, split_value
+    """  # noqa: S608 - fragments are the SPLITS constants
+
 
 def load_splits() -> None:
     print(f"Connecting to {DB_PATH}...")
@@ -15,159 +96,12 @@ def load_splits() -> None:
     print("Clearing existing splits...")
     con.execute("DELETE FROM player_splits")
 
-    print("Calculating Total splits...")
-    # 1. Total (Season)
-    con.execute("""
-        INSERT INTO player_splits (
-            player_id, season_id, split_type, split_value,
-            games, minutes,
-            field_goals_made, field_goals_attempted, field_goal_pct,
-            three_pointers_made, three_pointers_attempted, three_point_pct,
-            free_throws_made, free_throws_attempted, free_throw_pct,
-            rebounds, assists, steals, blocks, turnovers, points,
-            points_per_game,
-            true_shooting_pct, effective_fg_pct
-        )
-        SELECT
-            b.player_id,
-            g.season_id,
-            'Total',
-            'Season',
-            COUNT(DISTINCT b.game_id) as games,
-            SUM(COALESCE(b.minutes_played, 0)) as minutes,
-            SUM(b.field_goals_made) as fgm,
-            SUM(b.field_goals_attempted) as fga,
-            CASE WHEN SUM(b.field_goals_attempted) > 0 THEN CAST(SUM(b.field_goals_made) AS DOUBLE) / SUM(b.field_goals_attempted) ELSE 0 END as fg_pct,
-            SUM(b.three_pointers_made) as fg3m,
-            SUM(b.three_pointers_attempted) as fg3a,
-            CASE WHEN SUM(b.three_pointers_attempted) > 0 THEN CAST(SUM(b.three_pointers_made) AS DOUBLE) / SUM(b.three_pointers_attempted) ELSE 0 END as fg3_pct,
-            SUM(b.free_throws_made) as ftm,
-            SUM(b.free_throws_attempted) as fta,
-            CASE WHEN SUM(b.free_throws_attempted) > 0 THEN CAST(SUM(b.free_throws_made) AS DOUBLE) / SUM(b.free_throws_attempted) ELSE 0 END as ft_pct,
-            SUM(b.total_rebounds) as trb,
-            SUM(b.assists) as ast,
-            SUM(b.steals) as stl,
-            SUM(b.blocks) as blk,
-            SUM(b.turnovers) as tov,
-            SUM(b.points) as pts,
-            CASE WHEN COUNT(DISTINCT b.game_id) > 0 THEN CAST(SUM(b.points) AS DOUBLE) / COUNT(DISTINCT b.game_id) ELSE 0 END as ppg,
-
-            -- TS%: PTS / (2 * (FGA + 0.44 * FTA))
-            CASE WHEN (2 * (SUM(b.field_goals_attempted) + 0.44 * SUM(b.free_throws_attempted))) > 0
-                 THEN CAST(SUM(b.points) AS DOUBLE) / (2 * (SUM(b.field_goals_attempted) + 0.44 * SUM(b.free_throws_attempted)))
-                 ELSE 0 END as ts_pct,
-
-            -- eFG%: (FGM + 0.5 * 3PM) / FGA
-            CASE WHEN SUM(b.field_goals_attempted) > 0
-                 THEN (CAST(SUM(b.field_goals_made) AS DOUBLE) + 0.5 * CAST(SUM(b.three_pointers_made) AS DOUBLE)) / SUM(b.field_goals_attempted)
-                 ELSE 0 END as efg_pct
-
-        FROM box_scores b
-        JOIN games g ON b.game_id = g.game_id
-        GROUP BY b.player_id, g.season_id
-    """)
-
-    print("Calculating Location splits (Home/Away)...")
-    # 2. Location
-    con.execute("""
-        INSERT INTO player_splits (
-            player_id, season_id, split_type, split_value,
-            games, minutes,
-            field_goals_made, field_goals_attempted, field_goal_pct,
-            three_pointers_made, three_pointers_attempted, three_point_pct,
-            free_throws_made, free_throws_attempted, free_throw_pct,
-            rebounds, assists, steals, blocks, turnovers, points,
-            points_per_game,
-            true_shooting_pct, effective_fg_pct
-        )
-        SELECT
-            b.player_id,
-            g.season_id,
-            'Location',
-            CASE WHEN b.team_id = g.home_team_id THEN 'Home' ELSE 'Away' END as split_value,
-            COUNT(DISTINCT b.game_id) as games,
-            SUM(COALESCE(b.minutes_played, 0)) as minutes,
-            SUM(b.field_goals_made) as fgm,
-            SUM(b.field_goals_attempted) as fga,
-            CASE WHEN SUM(b.field_goals_attempted) > 0 THEN CAST(SUM(b.field_goals_made) AS DOUBLE) / SUM(b.field_goals_attempted) ELSE 0 END as fg_pct,
-            SUM(b.three_pointers_made) as fg3m,
-            SUM(b.three_pointers_attempted) as fg3a,
-            CASE WHEN SUM(b.three_pointers_attempted) > 0 THEN CAST(SUM(b.three_pointers_made) AS DOUBLE) / SUM(b.three_pointers_attempted) ELSE 0 END as fg3_pct,
-            SUM(b.free_throws_made) as ftm,
-            SUM(b.free_throws_attempted) as fta,
-            CASE WHEN SUM(b.free_throws_attempted) > 0 THEN CAST(SUM(b.free_throws_made) AS DOUBLE) / SUM(b.free_throws_attempted) ELSE 0 END as ft_pct,
-            SUM(b.total_rebounds) as trb,
-            SUM(b.assists) as ast,
-            SUM(b.steals) as stl,
-            SUM(b.blocks) as blk,
-            SUM(b.turnovers) as tov,
-            SUM(b.points) as pts,
-            CASE WHEN COUNT(DISTINCT b.game_id) > 0 THEN CAST(SUM(b.points) AS DOUBLE) / COUNT(DISTINCT b.game_id) ELSE 0 END as ppg,
-
-            CASE WHEN (2 * (SUM(b.field_goals_attempted) + 0.44 * SUM(b.free_throws_attempted))) > 0
-                 THEN CAST(SUM(b.points) AS DOUBLE) / (2 * (SUM(b.field_goals_attempted) + 0.44 * SUM(b.free_throws_attempted)))
-                 ELSE 0 END as ts_pct,
-
-            CASE WHEN SUM(b.field_goals_attempted) > 0
-                 THEN (CAST(SUM(b.field_goals_made) AS DOUBLE) + 0.5 * CAST(SUM(b.three_pointers_made) AS DOUBLE)) / SUM(b.field_goals_attempted)
-                 ELSE 0 END as efg_pct
-
-        FROM box_scores b
-        JOIN games g ON b.game_id = g.game_id
-        WHERE b.team_id IS NOT NULL AND (b.team_id = g.home_team_id OR b.team_id = g.away_team_id)
-        GROUP BY b.player_id, g.season_id, CASE WHEN b.team_id = g.home_team_id THEN 'Home' ELSE 'Away' END
-    """)
-
-    print("Calculating Result splits (Win/Loss)...")
-    # 3. Result
-    con.execute("""
-        INSERT INTO player_splits (
-            player_id, season_id, split_type, split_value,
-            games, minutes,
-            field_goals_made, field_goals_attempted, field_goal_pct,
-            three_pointers_made, three_pointers_attempted, three_point_pct,
-            free_throws_made, free_throws_attempted, free_throw_pct,
-            rebounds, assists, steals, blocks, turnovers, points,
-            points_per_game,
-            true_shooting_pct, effective_fg_pct
+    for label, split_type, split_value, condition in SPLITS:
+        print(f"Calculating {label} splits...")
+        con.execute(
+            f"INSERT INTO player_splits ({', '.join(SPLIT_COLUMNS)}) "
+            + split_select(split_type, split_value, condition, by_season=False),
         )
-        SELECT
-            b.player_id,
-            g.season_id,
-            'Result',
-            CASE WHEN b.team_id = g.winner_team_id THEN 'Win' ELSE 'Loss' END as split_value,
-            COUNT(DISTINCT b.game_id) as games,
-            SUM(COALESCE(b.minutes_played, 0)) as minutes,
-            SUM(b.field_goals_made) as fgm,
-            SUM(b.field_goals_attempted) as fga,
-            CASE WHEN SUM(b.field_goals_attempted) > 0 THEN CAST(SUM(b.field_goals_made) AS DOUBLE) / SUM(b.field_goals_attempted) ELSE 0 END as fg_pct,
-            SUM(b.three_pointers_made) as fg3m,
-            SUM(b.three_pointers_attempted) as fg3a,
-            CASE WHEN SUM(b.three_pointers_attempted) > 0 THEN CAST(SUM(b.three_pointers_made) AS DOUBLE) / SUM(b.three_pointers_attempted) ELSE 0 END as fg3_pct,
-            SUM(b.free_throws_made) as ftm,
-            SUM(b.free_throws_attempted) as fta,
-            CASE WHEN SUM(b.free_throws_attempted) > 0 THEN CAST(SUM(b.free_throws_made) AS DOUBLE) / SUM(b.free_throws_attempted) ELSE 0 END as ft_pct,
-            SUM(b.total_rebounds) as trb,
-            SUM(b.assists) as ast,
-            SUM(b.steals) as stl,
-            SUM(b.blocks) as blk,
-            SUM(b.turnovers) as tov,
-            SUM(b.points) as pts,
-            CASE WHEN COUNT(DISTINCT b.game_id) > 0 THEN CAST(SUM(b.points) AS DOUBLE) / COUNT(DISTINCT b.game_id) ELSE 0 END as ppg,
-
-            CASE WHEN (2 * (SUM(b.field_goals_attempted) + 0.44 * SUM(b.free_throws_attempted))) > 0
-                 THEN CAST(SUM(b.points) AS DOUBLE) / (2 * (SUM(b.field_goals_attempted) + 0.44 * SUM(b.free_throws_attempted)))
-                 ELSE 0 END as ts_pct,
-
-            CASE WHEN SUM(b.field_goals_attempted) > 0
-                 THEN (CAST(SUM(b.field_goals_made) AS DOUBLE) + 0.5 * CAST(SUM(b.three_pointers_made) AS DOUBLE)) / SUM(b.field_goals_attempted)
-                 ELSE 0 END as efg_pct
-
-        FROM box_scores b
-        JOIN games g ON b.game_id = g.game_id
-        WHERE b.team_id IS NOT NULL AND g.winner_team_id IS NOT NULL
-        GROUP BY b.player_id, g.season_id, CASE WHEN b.team_id = g.winner_team_id THEN 'Win' ELSE 'Loss' END
-    """)
 
     result = con.execute("SELECT COUNT(*) FROM player_splits").fetchone()
     count = result[0] if result else 0
@@ -175,5 +109,30 @@ def load_splits() -> None:
     con.close()
 
 
+def load_splits_partitioned(workers: int | None = None, retries: int = 2) -> None:
+    """Compute every season's splits in a process pool and merge them."""
+    seasons = list_seasons(DB_PATH)
+    print(f"Calculating splits for {len(seasons)} seasons in parallel...")
+    season_sql = " UNION ALL ".join(
+        split_select(split_type, split_value, condition, by_season=True)
+        for _, split_type, split_value, condition in SPLITS
+    )
+    partitions = [Partition(season, season_sql, (season,) * len(SPLITS)) for season in seasons]
+    count = run_partitioned(DB_PATH, "player_splits", SPLIT_COLUMNS, partitions, workers, retries)
+    print(f"Successfully loaded {count} split records.")
+
+
 if __name__ == "__main__":
-    load_splits()
+    parser = argparse.ArgumentParser(description="Aggregate box_scores into player_splits.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Compute seasons in parallel with N worker processes",
+    )
+    parser.add_argument("--retries", type=int, default=2, help="Retries per failed season partition")
+    args = parser.parse_args()
+    if args.workers:
+        load_splits_partitioned(workers=args.workers, retries=args.retries)
+    else:
+        load_splits()
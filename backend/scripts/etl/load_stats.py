@@ -3,74 +3,40 @@ from typing import Any
 
 import duckdb
 
+from build_team_aliases import alias_join
+
 BASE_DIR = os.path.dirname(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
 )
 DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
 
-# Manual Mapping for Stats Abbreviations to Team IDs
-ABBR_MAP = {
-    "BRK": "BKN",
-    "PHO": "PHX",
-    "CHO": "CHA",
-    "CHH": "CHA",
-    "NOH": "NOP",
-    "NOK": "NOP",
-    "NJN": "BKN",  # History
-    "SEA": "OKC",  # History
-    "VAN": "MEM",  # History
-    "WSB": "WAS",  # Washington Bullets
-    "KCK": "SAC",  # Kansas City Kings
-    "SDC": "LAC",  # San Diego Clippers
-}
-
 
 def load_stats() -> None:  # noqa: C901
     print(f"Connecting to {DB_PATH}...")
     con = duckdb.connect(DB_PATH)
 
-    # 1. Build Team Map (Abbr -> ID)
-    print("Building Team Map...")
-    teams = con.execute("SELECT team_id, abbreviation FROM teams").fetchall()
-
-    # Primary map from DB
-    team_map = {t[1]: t[0] for t in teams}
-
-    # Add manual mappings
-    for stats_abbr, db_abbr in ABBR_MAP.items():
-        if db_abbr in team_map:
-            team_map[stats_abbr] = team_map[db_abbr]
+    # 1. Ensure the multi-team totals placeholder exists; abbreviations are
+    # resolved per season through team_aliases (build_team_aliases.py)
+    teams = {t[0] for t in con.execute("SELECT team_id FROM teams").fetchall()}
 
-    if "TOT" not in team_map:
+    if "TOT" not in teams:
         print("Adding TOT team placeholder...")
         try:
             con.execute("""
                 INSERT INTO teams (team_id, full_name, abbreviation, nickname, city, is_active)
                 VALUES ('TOT', 'Total', 'TOT', 'Total', 'N/A', FALSE)
             """)
-            team_map["TOT"] = "TOT"
         except Exception as e:
             print(f"Could not add TOT team: {e}")
 
-    # 2. Build Player Map (Name -> ID)
-    print("Building Player Map...")
-    players = con.execute("SELECT full_name, player_id FROM players").fetchall()
-    player_map: dict[str, list[str]] = {}
-    for name, pid in players:
-        if name not in player_map:
-            player_map[name] = []
-        player_map[name].append(pid)
-
-    print(f"Mapped {len(player_map)} unique player names.")
-
-    # 3. Load Basic Season Stats (Existing Logic)
+    # 2. Load Basic Season Stats (Existing Logic)
     print("Extracting basic stats data...")
 
-    query = """
+    query = f"""
         SELECT
-            t.player, -- Use Name to lookup ID
+            x.player_id, -- Resolved once by build_player_xref.py; NULL when unresolved
             t.season,
-            t.tm,
+            ta.team_id,
             t.age,
             t.g, t.gs, t.mp,
             pg.mp_per_game,
@@ -89,10 +55,12 @@ def load_stats() -> None:  # noqa: C901
             p36.pts_per_36_min, p36.trb_per_36_min, p36.ast_per_36_min,
             p100.pts_per_100_poss, p100.trb_per_100_poss, p100.ast_per_100_poss
         FROM player_stats_totals t
+        LEFT JOIN player_xref x ON x.source = 'bref' AND x.source_id = CAST(t.player_id AS VARCHAR)
         LEFT JOIN player_stats_per_game pg ON t.player_id = pg.player_id AND t.season = pg.season AND t.tm = pg.tm
         LEFT JOIN player_stats_per_36 p36 ON t.player_id = p36.player_id AND t.season = p36.season AND t.tm = p36.tm
         LEFT JOIN player_stats_per_100_poss p100 ON t.player_id = p100.player_id AND t.season = p100.season AND t.tm = p100.tm
-    """
+        {alias_join("t.tm", "t.season")}
+    """  # noqa: S608 - fragments are module constants
 
     print("Executing extraction query...")
     all_stats = con.execute(query).fetchall()
@@ -120,8 +88,7 @@ def load_stats() -> None:  # noqa: C901
     """
 
     processed = 0
-    skipped_names = 0
-    ambiguous_names = 0
+    skipped_players = 0
     skipped_teams = 0
 
     batch_data: list[Any] = []
@@ -133,9 +100,9 @@ def load_stats() -> None:  # noqa: C901
 
     for row in all_stats:
         (
-            pname,
+            pid,
             season,
-            abbr,
+            team_id,
             age,
             g,
             gs,
@@ -178,23 +145,11 @@ def load_stats() -> None:  # noqa: C901
             ast100,
         ) = row
 
-        if not pname:
-            continue
-
-        pname_clean = pname.replace("*", "")
-        candidates = player_map.get(pname_clean)
-        if not candidates:
-            skipped_names += 1
+        if not pid:
+            skipped_players += 1
             continue
 
-        if len(candidates) > 1:
-            ambiguous_names += 1
-            pid = candidates[0]
-        else:
-            pid = candidates[0]
-
         season_id = str(season)
-        team_id = team_map.get(abbr)
         if not team_id:
             skipped_teams += 1
             continue
@@ -258,8 +213,9 @@ def load_stats() -> None:  # noqa: C901
         processed += len(batch_data)
 
     print(f"Basic Stats load completed. Processed {processed} rows.")
+    print(f"Skipped {skipped_players} rows with unresolved players and {skipped_teams} with unknown teams.")
 
-    # 4. Load Advanced Stats
+    # 3. Load Advanced Stats
     print("Extracting advanced stats data...")
 
     # We'll use player_stats_advanced table from DuckDB which typically matches basketball-reference advanced table
@@ -268,11 +224,11 @@ def load_stats() -> None:  # noqa: C901
     # ast_percent, stl_percent, blk_percent, tov_percent, usg_percent, ows, dws, ws, ws_48, obpm, dbpm, bpm, vorp
 
     # Corrected ftr column name based on schema (f_tr)
-    adv_query = """
+    adv_query = f"""
         SELECT
-            player,
-            season,
-            tm,
+            x.player_id,
+            a.season,
+            ta.team_id,
             per,
             ts_percent,
             x3p_ar,
@@ -293,8 +249,10 @@ def load_stats() -> None:  # noqa: C901
             dbpm,
             bpm,
             vorp
-        FROM player_stats_advanced
-    """
+        FROM player_stats_advanced a
+        LEFT JOIN player_xref x ON x.source = 'bref' AND x.source_id = CAST(a.player_id AS VARCHAR)
+        {alias_join("a.tm", "a.season")}
+    """  # noqa: S608 - fragments are module constants
 
     try:
         print("Executing advanced stats query...")
@@ -320,9 +278,9 @@ def load_stats() -> None:  # noqa: C901
 
         for row in all_adv_stats:
             (
-                pname,
+                pid,
                 season,
-                abbr,
+                team_id,
                 per,
                 ts_pct,
                 x3p_ar,
@@ -345,17 +303,10 @@ def load_stats() -> None:  # noqa: C901
                 vorp,
             ) = row
 
-            if not pname:
-                continue
-
-            pname_clean = pname.replace("*", "")
-            candidates = player_map.get(pname_clean)
-            if not candidates:
+            if not pid:
                 continue
-            pid = candidates[0]  # Use first match for now
 
             season_id = str(season)
-            team_id = team_map.get(abbr)
             if not team_id:
                 continue
 
@@ -3,47 +3,28 @@ from typing import Any
 
 import duckdb
 
+from build_team_aliases import alias_join
+
 BASE_DIR = os.path.dirname(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
 )
 DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
 
-ABBR_MAP = {
-    "BRK": "BKN",
-    "PHO": "PHX",
-    "CHO": "CHA",
-    "CHH": "CHA",
-    "NOH": "NOP",
-    "NOK": "NOP",
-    "NJN": "BKN",
-    "SEA": "OKC",
-    "VAN": "MEM",
-    "WSB": "WAS",
-    "KCK": "SAC",
-    "SDC": "LAC",
-}
-
 
 def load_team_stats() -> None:
     print(f"Connecting to {DB_PATH}...")
     con = duckdb.connect(DB_PATH)
 
-    # Build Team Map
-    print("Building Team Map...")
-    teams = con.execute("SELECT team_id, abbreviation FROM teams").fetchall()
-    team_map = {t[1]: t[0] for t in teams}
-    for stats_abbr, db_abbr in ABBR_MAP.items():
-        if db_abbr in team_map:
-            team_map[stats_abbr] = team_map[db_abbr]
-
     print("Extracting team stats...")
     # Join summaries, per_game, and opp_per_game
     # We filter for non-playoff (Regular season) entries in team_summaries if needed,
     # usually team_summaries has playoffs=FALSE for regular season totals.
-    query = """
+    # Abbreviations are resolved per season through team_aliases (build_team_aliases.py)
+    query = f"""
         SELECT
             s.season,
             s.abbreviation,
+            ta.team_id,
             s.w,
             s.l,
             s.srs,
@@ -56,8 +37,9 @@ def load_team_stats() -> None:
         FROM team_summaries s
         LEFT JOIN team_stats_per_game pg ON s.season = pg.season AND s.abbreviation = pg.abbreviation
         LEFT JOIN opp_team_stats_per_game opp ON s.season = opp.season AND s.abbreviation = opp.abbreviation
+        {alias_join("s.abbreviation", "s.season")}
         WHERE s.playoffs = FALSE
-    """
+    """  # noqa: S608 - the alias join is fixed SQL
 
     rows = con.execute(query).fetchall()
     print(f"Extracted {len(rows)} team stats rows.")
@@ -80,15 +62,13 @@ def load_team_stats() -> None:
     con.execute("DELETE FROM team_season_stats")
 
     for row in rows:
-        (season, abbr, w, losses, srs, pace, ortg, drtg, nrtg, ppg, opp_ppg) = row
+        (season, abbr, team_id, w, losses, srs, pace, ortg, drtg, nrtg, ppg, opp_ppg) = row
 
         if not abbr:
             continue
 
-        team_id = team_map.get(abbr)
         if not team_id:
-            # Try cleaning abbreviation or mapping
-            # Some abbreviations might mismatch (e.g. NOP vs NOK)
+            print(f"No team alias for {abbr} in {season}; skipping")
             continue
 
         # Handle None values
@@ -38,6 +38,10 @@ def migrate() -> None:
 
             # List of tables in reverse dependency order
             tables_to_drop = [
+                "team_aliases",
+                "player_xref",
+                "player_stints",
+                "lineup_stints",
                 "coach_seasons",
                 "coaches",
                 "playoff_series",
@@ -0,0 +1,163 @@
+"""Partitioned (per-season) execution helpers for ETL stages.
+
+A stage describes its output as one parameterized SELECT per partition. Each
+partition is computed in its own worker process against a read-only
+connection and written to a Parquet file in a staging directory. Once every
+partition has succeeded, the parent replaces the target table with a single
+bulk ``INSERT ... SELECT FROM read_parquet(...)`` inside one transaction.
+
+DuckDB allows many read-only processes or a single writer, so callers must
+not hold a read-write connection while `run_partitioned` is running.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+import duckdb
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One unit of partitioned work: a SELECT and its parameters."""
+
+    key: str
+    sql: str
+    params: tuple[Any, ...] = ()
+
+
+def list_seasons(db_path: str) -> list[str]:
+    """Return the season ids present in `games`, oldest first."""
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        rows = con.execute(
+            "SELECT DISTINCT season_id FROM games WHERE season_id IS NOT NULL ORDER BY season_id",
+        ).fetchall()
+    finally:
+        con.close()
+    return [str(row[0]) for row in rows]
+
+
+def _compute_partition(db_path: str, sql: str, params: tuple[Any, ...], out_path: str) -> int:
+    """Worker entry point: write one partition's rows to Parquet."""
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        con.execute(f"COPY ({sql}) TO '{out_path}' (FORMAT PARQUET)", list(params))
+        result = con.execute(f"SELECT COUNT(*) FROM read_parquet('{out_path}')").fetchone()  # noqa: S608
+        return int(result[0]) if result else 0
+    finally:
+        con.close()
+
+
+def _merge(db_path: str, target_table: str, columns: Sequence[str], paths: list[str], replace: bool) -> int:
+    """Load the partition files into ``target_table`` in one transaction."""
+    file_list = ", ".join(f"'{path}'" for path in paths)
+    column_list = ", ".join(columns)
+    con = duckdb.connect(db_path)
+    try:
+        con.execute("BEGIN TRANSACTION")
+        if replace:
+            con.execute(f"DELETE FROM {target_table}")  # noqa: S608
+        inserted = 0
+        if paths:
+            # target_table and columns come from the calling ETL script, not user input
+            result = con.execute(
+                f"INSERT INTO {target_table} ({column_list}) SELECT * FROM read_parquet([{file_list}])",  # noqa: S608
+            ).fetchone()
+            inserted = int(result[0]) if result else 0
+        con.execute("COMMIT")
+        return inserted
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    finally:
+        con.close()
+
+
+def run_partitioned(
+    db_path: str,
+    target_table: str,
+    columns: Sequence[str],
+    partitions: Sequence[Partition],
+    workers: int | None = None,
+    retries: int = 2,
+    replace: bool = True,
+) -> int:
+    """Compute partitions in a process pool and bulk-merge them into a table.
+
+    Args:
+        db_path: Path to the DuckDB database
+        target_table: Table receiving the merged rows
+        columns: Target columns, matched by position to each partition's SELECT list
+        partitions: Work items; each SELECT must return `columns`
+        workers: Worker processes (default: CPU count)
+        retries: Extra attempts per failed partition before giving up
+        replace: Delete existing rows of `target_table` in the merge transaction
+
+    Returns:
+        Number of rows inserted
+
+    A worker that dies (e.g. out of memory) breaks the whole pool and every
+    partition in flight on it; those are counted as failed attempts and
+    retried on a fresh pool.
+
+    """
+    staging_dir = tempfile.mkdtemp(prefix=f"{target_table}_")
+    paths = {p.key: os.path.join(staging_dir, f"{i:05d}.parquet") for i, p in enumerate(partitions)}
+    attempts = dict.fromkeys(paths, 0)
+    started = time.perf_counter()
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending: dict[Future[int], Partition] = {}
+
+        def submit(partition: Partition) -> None:
+            attempts[partition.key] += 1
+            future = pool.submit(
+                _compute_partition, db_path, partition.sql, partition.params, paths[partition.key],
+            )
+            pending[future] = partition
+
+        for partition in partitions:
+            submit(partition)
+
+        done_count = 0
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            failed: list[tuple[Partition, BaseException]] = []
+            for future in done:
+                partition = pending.pop(future)
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    failed.append((partition, e))
+                    continue
+                done_count += 1
+                print(f"[{done_count}/{len(partitions)}] {target_table} partition {partition.key}: {rows} rows")
+
+            broken = next((e for _, e in failed if isinstance(e, BrokenProcessPool)), None)
+            if broken is not None:
+                failed.extend((partition, broken) for partition in pending.values())
+                pending.clear()
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = ProcessPoolExecutor(max_workers=workers)
+            for partition, error in failed:
+                if attempts[partition.key] > retries:
+                    msg = f"Partition {partition.key} failed after {attempts[partition.key]} attempts"
+                    raise RuntimeError(msg) from error
+                print(f"Partition {partition.key} failed ({error}); retrying...")
+                submit(partition)
+        pool.shutdown()
+
+        print(f"Computed {len(partitions)} partitions in {time.perf_counter() - started:.1f}s. Merging...")
+        return _merge(db_path, target_table, columns, list(paths.values()), replace)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
@@ -1,134 +1,45 @@
+import argparse
 import os
 
 import duckdb
 
+from partitioned import Partition, list_seasons, run_partitioned
+
 BASE_DIR = os.path.dirname(
     os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
 )
 DB_PATH = os.path.join(BASE_DIR, "data", "nba.duckdb")
 
 
-def populate_boxscores() -> None:
-    print(f"Connecting to {DB_PATH}...")
-    con = duckdb.connect(DB_PATH)
-
-    # 1. Populate Seasons
-    print("Ensuring seasons table is populated...")
-    con.execute("""
-        INSERT INTO seasons (season_id)
-        SELECT DISTINCT season_id
-        FROM game
-        WHERE season_id IS NOT NULL
-        ON CONFLICT (season_id) DO NOTHING
-    """)
-
-    # 2. Populate Teams
-    print("Ensuring teams table is populated...")
-    con.execute("""
-        INSERT INTO teams (team_id, full_name, abbreviation, city, is_active)
-        SELECT id, MIN(name), MIN(abbr), NULL, TRUE
-        FROM (
-            SELECT team_id_home as id, team_name_home as name, team_abbreviation_home as abbr
-            FROM game
-            WHERE team_id_home IS NOT NULL
-
-            UNION ALL
-
-            SELECT team_id_away as id, team_name_away as name, team_abbreviation_away as abbr
-            FROM game
-            WHERE team_id_away IS NOT NULL
-        ) combined_teams
-        GROUP BY id
-        ON CONFLICT (team_id) DO NOTHING
-    """)
+# NBA person_id -> Basketball-Reference slug, resolved once by build_player_xref.py.
+# Shared with build_stints.py.
+PLAYER_MAP_SQL = """
+    SELECT source_id AS nba_id, player_id AS br_id
+    FROM player_xref
+    WHERE source = 'nba' AND player_id IS NOT NULL
+"""
 
-    # 3. Populate Players (Critical for FKs)
-    print("Ensuring players table is populated from player_directory...")
-    con.execute("""
-        INSERT INTO players (
-            player_id, full_name, first_name, last_name, birth_date,
-            height_inches, weight_lbs, position, college
-        )
-        SELECT
-            slug,
-            player,
-            NULL, -- split later if needed
-            NULL,
-            birth_date,
-            ht_in_in,
-            wt,
-            pos,
-            colleges
-        FROM player_directory
-        ON CONFLICT (player_id) DO NOTHING
-    """)
 
-    # 4. Populate Games
-    print("Populating games table...")
-    con.execute("DELETE FROM games")
-    games_insert_query = """
-        INSERT INTO games (
-            game_id, season_id, game_date,
-            home_team_id, away_team_id,
-            home_team_score, away_team_score,
-            game_type
-        )
-        SELECT
-            game_id,
-            MIN(season_id),
-            MIN(CAST(game_date AS DATE)),
-            MIN(team_id_home),
-            MIN(team_id_away),
-            MIN(CAST(pts_home AS INTEGER)),
-            MIN(CAST(pts_away AS INTEGER)),
-            MIN(season_type)
-        FROM game
-        WHERE game_id IS NOT NULL
-        GROUP BY game_id
-    """
-    con.execute(games_insert_query)
-    result = con.execute("SELECT COUNT(*) FROM games").fetchone()
-    games_count = result[0] if result else 0
-    print(f"Populated games table with {games_count} rows.")
+BOX_SCORE_COLUMNS = [
+    "game_id", "player_id", "team_id",
+    "field_goals_made", "field_goals_attempted",
+    "three_pointers_made", "three_pointers_attempted",
+    "free_throws_made", "free_throws_attempted",
+    "offensive_rebounds", "defensive_rebounds", "total_rebounds",
+    "assists", "steals", "blocks", "turnovers", "personal_fouls", "points",
+    "plus_minus",
+]
 
-    # 5. Populate Box Scores
-    print("Aggregating play-by-play data into box_scores...")
-    con.execute("DELETE FROM box_scores")
 
-    # We use a flexible mapping strategy:
-    # 1. NBA ID -> Common Player Info -> Player Directory (Dob + Name)
-    # 2. NBA Name -> Player Directory (Name)
-    query = """
-        INSERT INTO box_scores (
-            game_id, player_id, team_id,
-            field_goals_made, field_goals_attempted,
-            three_pointers_made, three_pointers_attempted,
-            free_throws_made, free_throws_attempted,
-            offensive_rebounds, defensive_rebounds, total_rebounds,
-            assists, steals, blocks, turnovers, personal_fouls, points,
-            plus_minus
-        )
-        WITH player_map_base AS (
-            -- Get all distinct players from PBP
-            SELECT DISTINCT player1_id, player1_name FROM play_by_play
-            WHERE player1_id IS NOT NULL AND player1_id != '0'
-        ),
-        player_map AS (
-            SELECT
-                pmb.player1_id as nba_id,
-                COALESCE(pd1.slug, pd2.slug) as br_id
-            FROM player_map_base pmb
-            -- Try matching via ID -> CPI -> Directory
-            LEFT JOIN common_player_info cpi ON pmb.player1_id = CAST(cpi.person_id AS VARCHAR)
-            LEFT JOIN player_directory pd1
-              ON cpi.display_first_last = pd1.player
-              AND CAST(cpi.birthdate AS DATE) = pd1.birth_date
-            -- Try matching via Name -> Directory
-            LEFT JOIN player_directory pd2 ON pmb.player1_name = pd2.player
-            WHERE COALESCE(pd1.slug, pd2.slug) IS NOT NULL
+def box_score_select(by_season: bool = False) -> str:
+    """Build the play-by-play aggregation, optionally restricted to one season."""
+    season_filter = "WHERE season_id = ?" if by_season else ""
+    return f"""
+        WITH player_map AS (
+            {PLAYER_MAP_SQL}
         ),
         valid_games AS (
-            SELECT game_id FROM games
+            SELECT game_id FROM games {season_filter}
         ),
         pbp_stats AS (
             SELECT
@@ -232,7 +143,107 @@ def populate_boxscores() -> None:
         FROM merged_stats
         WHERE team_id IS NOT NULL
           AND player_id IN (SELECT player_id FROM players)
+    """  # noqa: S608 - only fixed fragments are interpolated
+
+
+def populate_boxscores(workers: int | None = None, retries: int = 2) -> None:
+    print(f"Connecting to {DB_PATH}...")
+    con = duckdb.connect(DB_PATH)
+
+    # 1. Populate Seasons
+    print("Ensuring seasons table is populated...")
+    con.execute("""
+        INSERT INTO seasons (season_id)
+        SELECT DISTINCT season_id
+        FROM game
+        WHERE season_id IS NOT NULL
+        ON CONFLICT (season_id) DO NOTHING
+    """)
+
+    # 2. Populate Teams
+    print("Ensuring teams table is populated...")
+    con.execute("""
+        INSERT INTO teams (team_id, full_name, abbreviation, city, is_active)
+        SELECT id, MIN(name), MIN(abbr), NULL, TRUE
+        FROM (
+            SELECT team_id_home as id, team_name_home as name, team_abbreviation_home as abbr
+            FROM game
+            WHERE team_id_home IS NOT NULL
+
+            UNION ALL
+
+            SELECT team_id_away as id, team_name_away as name, team_abbreviation_away as abbr
+            FROM game
+            WHERE team_id_away IS NOT NULL
+        ) combined_teams
+        GROUP BY id
+        ON CONFLICT (team_id) DO NOTHING
+    """)
+
+    # 3. Populate Players (Critical for FKs)
+    print("Ensuring players table is populated from player_directory...")
+    con.execute("""
+        INSERT INTO players (
+            player_id, full_name, first_name, last_name, birth_date,
+            height_inches, weight_lbs, position, college
+        )
+        SELECT
+            slug,
+            player,
+            NULL, -- split later if needed
+            NULL,
+            birth_date,
+            ht_in_in,
+            wt,
+            pos,
+            colleges
+        FROM player_directory
+        ON CONFLICT (player_id) DO NOTHING
+    """)
+
+    # 4. Populate Games
+    print("Populating games table...")
+    con.execute("DELETE FROM games")
+    games_insert_query = """
+        INSERT INTO games (
+            game_id, season_id, game_date,
+            home_team_id, away_team_id,
+            home_team_score, away_team_score,
+            game_type
+        )
+        SELECT
+            game_id,
+            MIN(season_id),
+            MIN(CAST(game_date AS DATE)),
+            MIN(team_id_home),
+            MIN(team_id_away),
+            MIN(CAST(pts_home AS INTEGER)),
+            MIN(CAST(pts_away AS INTEGER)),
+            MIN(season_type)
+        FROM game
+        WHERE game_id IS NOT NULL
+        GROUP BY game_id
     """
+    con.execute(games_insert_query)
+    result = con.execute("SELECT COUNT(*) FROM games").fetchone()
+    games_count = result[0] if result else 0
+    print(f"Populated games table with {games_count} rows.")
+
+    # 5. Populate Box Scores
+    if workers:
+        # Workers need read-only access, so release the write connection first
+        con.close()
+        seasons = list_seasons(DB_PATH)
+        print(f"Aggregating play-by-play data into box_scores for {len(seasons)} seasons in parallel...")
+        partitions = [Partition(season, box_score_select(by_season=True), (season,)) for season in seasons]
+        count = run_partitioned(DB_PATH, "box_scores", BOX_SCORE_COLUMNS, partitions, workers, retries)
+        print(f"Inserted {count} rows into box_scores.")
+        return
+
+    print("Aggregating play-by-play data into box_scores...")
+    con.execute("DELETE FROM box_scores")
+
+    query = f"INSERT INTO box_scores ({', '.join(BOX_SCORE_COLUMNS)}) " + box_score_select()
 
     try:
         con.execute(query)
@@ -247,4 +258,13 @@ def populate_boxscores() -> None:
 
 
 if __name__ == "__main__":
-    populate_boxscores()
+    parser = argparse.ArgumentParser(description="Populate games and box_scores from source tables.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Aggregate box scores per season in parallel with N worker processes",
+    )
+    parser.add_argument("--retries", type=int, default=2, help="Retries per failed season partition")
+    args = parser.parse_args()
+    populate_boxscores(workers=args.workers, retries=args.retries)
@@ -0,0 +1,120 @@
+"""Run the ETL stages in dependency order.
+
+Each stage is an existing standalone script run in its own process, so a
+stage sees exactly the database state the previous one committed and a
+failure stops the pipeline at that stage:
+
+    python scripts/etl/run_pipeline.py                    # full rebuild
+    python scripts/etl/run_pipeline.py --workers 8        # parallel stages use 8 processes
+    python scripts/etl/run_pipeline.py --from load_stats  # resume after a failure
+    python scripts/etl/run_pipeline.py --only indexes     # re-apply indexes only
+    python scripts/etl/run_pipeline.py --list
+
+Catalog-managed indexes are dropped before the loads and recreated as the
+last stage (scripts/manage_indexes.py), since bulk DELETE/INSERT is much
+faster against unindexed tables. Before that, cluster_tables rewrites the hot
+tables sorted by their lookup keys so row-group statistics can skip most of
+each table. Schema migration is not a stage: run
+migrate_schema.py explicitly when the schema changes.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+
+ETL_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(ETL_DIR)
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    script: str
+    args: tuple[str, ...] = ()
+    parallel: bool = False  # Accepts --workers
+    optional: bool = False  # Only runs when requested with --export
+
+
+STAGES = [
+    Stage("drop_indexes", os.path.join(SCRIPTS_DIR, "manage_indexes.py"), ("drop",)),
+    Stage("load_seasons", "load_seasons.py"),
+    Stage("load_teams", "load_teams.py"),
+    Stage("load_players", "load_players.py"),
+    Stage("build_team_aliases", "build_team_aliases.py"),
+    Stage("build_player_xref", "build_player_xref.py"),
+    Stage("load_stats", "load_stats.py"),
+    Stage("load_team_stats", "load_team_stats.py"),
+    Stage("populate_boxscores", "populate_boxscores.py", parallel=True),
+    Stage("update_games_linescore", "update_games_linescore.py"),
+    Stage("build_stints", "build_stints.py", parallel=True),
+    Stage("load_splits", "load_splits.py", parallel=True),
+    Stage("build_player_game_logs", "build_player_game_logs.py"),
+    Stage("build_similarity_vectors", "build_similarity_vectors.py"),
+    Stage("build_team_ratings", "build_team_ratings.py", ("--full",)),
+    Stage("cluster_tables", "cluster_tables.py"),
+    Stage("indexes", os.path.join(SCRIPTS_DIR, "manage_indexes.py"), ("apply",)),
+    Stage("export_parquet", "export_parquet.py", optional=True),
+]
+
+
+def select_stages(
+    start: str | None = None,
+    only: list[str] | None = None,
+    skip: list[str] | None = None,
+    export: bool = False,
+) -> list[Stage]:
+    names = [stage.name for stage in STAGES]
+    for name in [start, *(only or []), *(skip or [])]:
+        if name is not None and name not in names:
+            msg = f"Unknown stage {name!r}; expected one of: {', '.join(names)}"
+            raise SystemExit(msg)
+
+    stages = STAGES[names.index(start) :] if start else STAGES
+    if only:
+        return [stage for stage in stages if stage.name in only]
+    return [
+        stage
+        for stage in stages
+        if stage.name not in (skip or []) and (export or not stage.optional)
+    ]
+
+
+def run_pipeline(stages: list[Stage], workers: int | None = None) -> None:
+    started = time.perf_counter()
+    for i, stage in enumerate(stages, 1):
+        command = [sys.executable, os.path.join(ETL_DIR, stage.script), *stage.args]
+        if stage.parallel and workers:
+            command += ["--workers", str(workers)]
+
+        print(f"=== [{i}/{len(stages)}] {stage.name} ===", flush=True)
+        stage_started = time.perf_counter()
+        result = subprocess.run(command, cwd=ETL_DIR, check=False)  # noqa: S603 - our own stage scripts
+        elapsed = time.perf_counter() - stage_started
+        if result.returncode != 0:
+            print(f"Stage {stage.name} failed (exit {result.returncode}) after {elapsed:.1f}s.")
+            print(f"Resume with: --from {stage.name}")
+            raise SystemExit(result.returncode)
+        print(f"=== {stage.name} finished in {elapsed:.1f}s ===", flush=True)
+
+    print(f"Pipeline finished {len(stages)} stages in {time.perf_counter() - started:.1f}s.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the ETL stages in order.")
+    parser.add_argument("--from", dest="start", default=None, help="Start at this stage")
+    parser.add_argument("--only", nargs="+", default=None, help="Run only these stages")
+    parser.add_argument("--skip", nargs="+", default=None, help="Skip these stages")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for parallel stages")
+    parser.add_argument("--export", action="store_true", help="Also export the serving tables to Parquet")
+    parser.add_argument("--list", action="store_true", help="List stages and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for stage in STAGES:
+            flags = [f for f, on in (("parallel", stage.parallel), ("optional", stage.optional)) if on]
+            print(f"{stage.name}{' (' + ', '.join(flags) + ')' if flags else ''}")
+    else:
+        run_pipeline(select_stages(args.start, args.only, args.skip, args.export), args.workers)
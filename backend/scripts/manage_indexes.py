@@ -0,0 +1,161 @@
+"""Create and verify ART indexes on the serving schema.
+
+Indexes are derived from the repository lookup catalog
+(app/repositories/catalog.py) rather than maintained by hand:
+
+    python scripts/manage_indexes.py apply    # create missing, drop stale, then report
+    python scripts/manage_indexes.py plan     # show what apply would do
+    python scripts/manage_indexes.py report   # EXPLAIN ANALYZE a sample lookup per key
+    python scripts/manage_indexes.py drop     # drop all catalog-managed indexes
+
+Managed indexes are named ``idx_<table>_<column>``. Columns already covered by
+a single-column PRIMARY KEY or UNIQUE constraint are skipped, as are tables
+missing from the database. Bulk reloads are faster without indexes, so the
+ETL pipeline drops them first and applies them again as its last stage.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import get_db_connection
+from app.core.logging import configure_logging, get_logger
+from app.repositories.catalog import LOOKUP_KEYS, LookupKey
+
+configure_logging("INFO")
+logger = get_logger(__name__)
+
+
+def existing_tables(conn: duckdb.DuckDBPyConnection) -> set[str]:
+    rows = conn.execute("SELECT table_name FROM duckdb_tables() WHERE schema_name = 'main'").fetchall()
+    return {str(row[0]) for row in rows}
+
+
+def existing_indexes(conn: duckdb.DuckDBPyConnection) -> set[str]:
+    rows = conn.execute("SELECT index_name FROM duckdb_indexes() WHERE schema_name = 'main'").fetchall()
+    return {str(row[0]) for row in rows}
+
+
+def constrained_columns(conn: duckdb.DuckDBPyConnection) -> set[tuple[str, str]]:
+    """(table, column) pairs already indexed by a single-column PK or UNIQUE constraint."""
+    rows = conn.execute(
+        """
+        SELECT table_name, constraint_column_names
+        FROM duckdb_constraints()
+        WHERE constraint_type IN ('PRIMARY KEY', 'UNIQUE') AND len(constraint_column_names) = 1
+        """,
+    ).fetchall()
+    return {(str(table), str(columns[0])) for table, columns in rows}
+
+
+def plan(conn: duckdb.DuckDBPyConnection) -> tuple[list[LookupKey], list[str]]:
+    """Return (keys to index, stale managed index names to drop)."""
+    tables = existing_tables(conn)
+    indexes = existing_indexes(conn)
+    constrained = constrained_columns(conn)
+
+    wanted = {key.index_name for key in LOOKUP_KEYS}
+    to_create = [
+        key
+        for key in LOOKUP_KEYS
+        if key.table in tables and (key.table, key.column) not in constrained and key.index_name not in indexes
+    ]
+    # Only indexes following our naming scheme on known tables are considered ours
+    managed_prefixes = tuple(f"idx_{table}_" for table in {key.table for key in LOOKUP_KEYS})
+    to_drop = sorted(name for name in indexes if name.startswith(managed_prefixes) and name not in wanted)
+    return to_create, to_drop
+
+
+def apply(conn: duckdb.DuckDBPyConnection) -> None:
+    to_create, to_drop = plan(conn)
+    for name in to_drop:
+        logger.info(f"Dropping stale index {name}")
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    for key in to_create:
+        started = time.perf_counter()
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {key.index_name} ON {key.table}({key.column})")
+        logger.info(f"Created {key.index_name} in {time.perf_counter() - started:.2f}s")
+    logger.info(f"Created {len(to_create)} and dropped {len(to_drop)} indexes")
+
+
+def drop(conn: duckdb.DuckDBPyConnection) -> None:
+    indexes = existing_indexes(conn)
+    for key in LOOKUP_KEYS:
+        if key.index_name in indexes:
+            conn.execute(f"DROP INDEX IF EXISTS {key.index_name}")
+            logger.info(f"Dropped {key.index_name}")
+
+
+def report(conn: duckdb.DuckDBPyConnection) -> None:
+    """Run a representative point lookup per catalog key and show the chosen scan.
+
+    The scan type is only decided at execution time, so this uses EXPLAIN
+    ANALYZE rather than EXPLAIN. DuckDB falls back to a sequential scan when a
+    lookup matches too many rows (see the index_scan_max_count setting).
+    """
+    tables = existing_tables(conn)
+    for key in LOOKUP_KEYS:
+        if key.table not in tables:
+            logger.info(f"{key.table}.{key.column}: table missing")
+            continue
+        # Tables and columns come from the LOOKUP_KEYS catalog, not user input
+        sample = conn.execute(
+            f"SELECT {key.column} FROM {key.table} WHERE {key.column} IS NOT NULL LIMIT 1",  # noqa: S608
+        ).fetchone()
+        if sample is None:
+            logger.info(f"{key.table}.{key.column}: no rows")
+            continue
+
+        lookup = f"SELECT * FROM {key.table} WHERE {key.column} = ?"  # noqa: S608
+        started = time.perf_counter()
+        plan_text = str(conn.execute(f"EXPLAIN ANALYZE {lookup}", [sample[0]]).fetchall()[0][1])
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        matches = conn.execute(
+            f"SELECT COUNT(*) FROM {key.table} WHERE {key.column} = ?", [sample[0]],  # noqa: S608
+        ).fetchone()
+
+        scan = "index scan" if "Index Scan" in plan_text else "sequential scan"
+        logger.info(
+            f"{key.table}.{key.column} = {sample[0]!r}: {scan}, "
+            f"{matches[0] if matches else 0} rows, {elapsed_ms:.1f}ms (used by {', '.join(key.used_by)})",
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage serving-schema indexes from the repository catalog.")
+    parser.add_argument("action", nargs="?", default="apply", choices=["apply", "plan", "report", "drop"])
+    args = parser.parse_args()
+
+    conn = get_db_connection(read_only=args.action in ("plan", "report"))
+    try:
+        if args.action == "plan":
+            to_create, to_drop = plan(conn)
+            for key in to_create:
+                logger.info(f"CREATE INDEX {key.index_name} ON {key.table}({key.column})")
+            for name in to_drop:
+                logger.info(f"DROP INDEX {name}")
+            if not to_create and not to_drop:
+                logger.info("Indexes match the catalog")
+        elif args.action == "apply":
+            apply(conn)
+            report(conn)
+        elif args.action == "report":
+            report(conn)
+        else:
+            drop(conn)
+    except Exception as e:
+        logger.error(f"Index management failed: {e}")
+        raise
+    finally:
+        if args.action not in ("plan", "report"):
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
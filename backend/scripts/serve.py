@@ -0,0 +1,69 @@
+"""Run the API with multiple worker processes.
+
+    python scripts/serve.py                    # WEB_WORKERS workers on 0.0.0.0:8000
+    python scripts/serve.py --workers 8 --bind 127.0.0.1:9000
+
+Uses Gunicorn with gunicorn.conf.py when it is installed (``pip install -e
+".[serve]"``): the app is loaded once and forked, and each worker opens its
+own read-only DuckDB connection. Without Gunicorn it falls back to Uvicorn's
+``--workers``, which starts each worker as a fresh interpreter instead of
+forking a preloaded app.
+
+Each worker's DuckDB threads and memory limit default to an even share of
+the host (see DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT).
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Add parent directory to path
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, help="worker processes (default: WEB_WORKERS; 0: one per core)")
+    parser.add_argument("--bind", default=os.environ.get("BIND", "0.0.0.0:8000"), help="host:port to listen on")
+    args = parser.parse_args()
+
+    if args.workers is not None:
+        # Set before settings are loaded so workers size DuckDB for this count
+        os.environ["WEB_WORKERS"] = str(args.workers)
+
+    from app.core.config import settings
+
+    workers = settings.WEB_WORKERS or os.cpu_count() or 1
+    os.environ["WEB_WORKERS"] = str(workers)
+    os.chdir(BACKEND_DIR)
+
+    if importlib.util.find_spec("gunicorn") is not None:
+        print(f"Starting Gunicorn with {workers} workers on {args.bind}")
+        command = [
+            sys.executable, "-m", "gunicorn",
+            "-c", str(BACKEND_DIR / "gunicorn.conf.py"),
+            "--workers", str(workers),
+            "--bind", args.bind,
+            "app.main:app",
+        ]
+        os.execv(sys.executable, command)  # noqa: S606 - replaces this process with gunicorn
+
+    import uvicorn
+
+    host, _, port = args.bind.rpartition(":")
+    print(f"Gunicorn not installed; starting Uvicorn with {workers} workers on {args.bind}")
+    uvicorn.run(
+        "app.main:app",
+        host=host or "0.0.0.0",  # noqa: S104 - same default as gunicorn.conf.py
+        port=int(port),
+        workers=workers,
+        access_log=not settings.ACCESS_LOG,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""Pre-render v1 JSON for finished seasons into a static, compressed tree.
+
+    python scripts/snapshot.py                       # every finished season into SNAPSHOT_DIR
+    python scripts/snapshot.py --season 2023 --workers 8 --out /srv/snapshot
+
+Renders, for every season before the current one:
+
+- ``/api/v1/seasons/{season}`` and its standings, leaders, awards and playoffs
+- ``/api/v1/teams/{team}/schedule/{season}`` for every team that played
+- ``/api/v1/games/{game}`` (+ ``/stats``, ``/lineups``) and
+  ``/api/v1/boxscores/{game}`` (+ ``/linescore``, ``/fourfactors``)
+
+Routes are split across worker processes; each imports the app and calls its
+router directly (no HTTP, no middleware), then writes the JSON next to gzip,
+brotli and zstd variants (the latter two when installed). Responses that
+aren't 200 are skipped. A ``manifest.json`` stamps the tree with the data
+version so StaticSnapshotMiddleware stops serving it once the database
+changes; re-run this after each ETL.
+
+The tree is built in a sibling staging directory and swapped in at the end,
+so readers never observe a half-written snapshot. With ``--season`` the
+staging tree starts as a copy of the existing snapshot, so other seasons
+are kept; that needs the existing tree to be for the current data version
+(and encodings), since the merged tree is stamped as current. Otherwise
+rebuild everything, or write the seasons to a separate ``--out``.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+    from starlette.types import ASGIApp
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Add parent directory to path
+sys.path.insert(0, str(BACKEND_DIR))
+
+SEASON_ROUTES = ["", "/standings", "/leaders", "/awards", "/playoffs"]
+GAME_ROUTES = [
+    "/api/v1/games/{game}",
+    "/api/v1/games/{game}/stats",
+    "/api/v1/games/{game}/lineups",
+    "/api/v1/boxscores/{game}",
+    "/api/v1/boxscores/{game}/linescore",
+    "/api/v1/boxscores/{game}/fourfactors",
+]
+BATCH_SIZE = 200
+
+# Offline, so compress as hard as each format allows
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+ZSTD_LEVEL = 19
+
+
+def historical_routes(seasons: list[str] | None = None) -> list[str]:
+    """URL paths to render for finished seasons (or just ``seasons``)."""
+    from app.core.database import execute_query
+    from app.utils.dates import get_current_season
+
+    if seasons is None:
+        rows = execute_query(
+            "SELECT season_id FROM seasons WHERE season_id < ? ORDER BY season_id", [get_current_season()],
+        )
+        seasons = [str(row[0]) for row in rows]
+    if not seasons:
+        return []
+
+    placeholders = ", ".join("?" for _ in seasons)
+    teams = execute_query(
+        f"""
+            SELECT DISTINCT season_id, team_id FROM (
+                SELECT season_id, home_team_id AS team_id FROM games WHERE season_id IN ({placeholders})
+                UNION ALL
+                SELECT season_id, away_team_id FROM games WHERE season_id IN ({placeholders})
+            ) WHERE team_id IS NOT NULL
+            ORDER BY season_id, team_id
+        """,  # noqa: S608 - only placeholders are interpolated
+        seasons * 2,
+    )
+    games = execute_query(
+        f"SELECT game_id FROM games WHERE season_id IN ({placeholders}) ORDER BY game_id",  # noqa: S608
+        seasons,
+    )
+
+    routes = [f"/api/v1/seasons/{season}{suffix}" for season in seasons for suffix in SEASON_ROUTES]
+    routes += [f"/api/v1/teams/{team}/schedule/{season}" for season, team in teams]
+    routes += [template.format(game=game) for (game,) in games for template in GAME_ROUTES]
+    return routes
+
+
+def _compressors() -> dict[str, Any]:
+    from app.core.snapshot import ENCODING_SUFFIXES
+
+    compressors: dict[str, Any] = {"gzip": lambda data: gzip.compress(data, GZIP_LEVEL, mtime=0)}
+    try:
+        import brotli
+
+        compressors["br"] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        compressors["zstd"] = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+    except ImportError:
+        pass
+    return {encoding: compressors[encoding] for encoding in ENCODING_SUFFIXES if encoding in compressors}
+
+
+async def _get(app: "FastAPI", router: "ASGIApp", path: str) -> tuple[int, bytes]:
+    """Send a bare GET straight to ``router``, bypassing the app's middleware."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"snapshot"), (b"accept", b"application/json")],
+        "client": ("127.0.0.1", 0),
+        "server": ("snapshot", 80),
+        "app": app,
+    }
+    status = 500
+    body = bytearray()
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            body.extend(message.get("body", b""))
+
+    await router(scope, receive, send)
+    return status, bytes(body)
+
+
+def _write(file: str, body: bytes, compressors: dict[str, Any]) -> None:
+    """Write one response and its precompressed variants."""
+    from app.core.snapshot import ENCODING_SUFFIXES
+
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    with open(file, "wb") as f:
+        f.write(body)
+    for encoding, compress in compressors.items():
+        with open(file + ENCODING_SUFFIXES[encoding], "wb") as f:
+            f.write(compress(body))
+
+
+def render_batch(out_dir: str, paths: list[str]) -> tuple[int, list[str]]:
+    """Render ``paths`` into ``out_dir``; returns the count written and the paths skipped."""
+    from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+
+    from app.core.snapshot import snapshot_path
+    from app.main import app
+
+    compressors = _compressors()
+    # FastAPI's dependency cleanup needs this; rate limiting, compression etc. don't apply
+    router = AsyncExitStackMiddleware(app.router)
+
+    async def render() -> tuple[int, list[str]]:
+        written, skipped = 0, []
+        for path in paths:
+            try:
+                status, body = await _get(app, router, path)
+            except Exception:
+                status, body = 500, b""
+            file = snapshot_path(out_dir, path)
+            if status != 200 or file is None:
+                skipped.append(path)
+                continue
+            # Nothing else runs on this loop, so writing inline doesn't hold anyone up
+            _write(file, body, compressors)
+            written += 1
+        return written, skipped
+
+    return asyncio.run(render())
+
+
+def _count_responses(root: str) -> int:
+    from app.core.snapshot import MANIFEST_NAME
+
+    return sum(
+        1
+        for _, _, files in os.walk(root)
+        for name in files
+        if name.endswith(".json") and name != MANIFEST_NAME
+    )
+
+
+def build_snapshot(out_dir: str, routes: list[str], workers: int, merge: bool = False) -> dict[str, Any]:
+    """Render ``routes`` into a staging tree and swap it into ``out_dir``.
+
+    With ``merge`` the existing snapshot's responses are kept (those in
+    ``routes`` are re-rendered); it must match the current data version and
+    encodings, else SystemExit.
+    """
+    from app.core.database import close_connections, get_data_version
+    from app.core.snapshot import MANIFEST_NAME, read_manifest
+
+    data_version = get_data_version()
+    encodings = ["identity", *_compressors()]
+    existing = read_manifest(out_dir) if merge else None
+    if existing is not None and (
+        existing.get("data_version") != data_version or existing.get("encodings") != encodings
+    ):
+        msg = (
+            f"{out_dir} holds a snapshot of data version {existing.get('data_version')} "
+            f"({', '.join(existing.get('encodings', []))}); merging seasons rendered from {data_version} "
+            f"({', '.join(encodings)}) would serve the old responses as current. "
+            "Rebuild every season, or pass a separate --out."
+        )
+        raise SystemExit(msg)
+    # Workers open their own connections; the parent's isn't needed any more
+    close_connections()
+
+    staging = f"{out_dir.rstrip(os.sep)}.staging"
+    shutil.rmtree(staging, ignore_errors=True)
+    if existing is not None:
+        shutil.copytree(out_dir, staging)
+    else:
+        os.makedirs(staging)
+
+    written = 0
+    skipped: list[str] = []
+    # Small enough that every worker gets several batches
+    size = max(1, min(BATCH_SIZE, len(routes) // (workers * 4)))
+    batches = [routes[i:i + size] for i in range(0, len(routes), size)]
+    # Spawned, not forked, so no worker inherits an open DuckDB handle
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(render_batch, staging, batch) for batch in batches]
+        for done, future in enumerate(as_completed(futures), 1):
+            batch_written, batch_skipped = future.result()
+            written += batch_written
+            skipped += batch_skipped
+            print(f"  {done}/{len(batches)} batches, {written} responses written")
+
+    manifest = {
+        "data_version": data_version,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "encodings": encodings,
+        "responses": _count_responses(staging),
+        "skipped": len(skipped),
+    }
+    with open(os.path.join(staging, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    previous = f"{out_dir.rstrip(os.sep)}.previous"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(out_dir):
+        os.rename(out_dir, previous)
+    os.rename(staging, out_dir)
+    shutil.rmtree(previous, ignore_errors=True)
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", help="snapshot directory (default: SNAPSHOT_DIR, else data/snapshot)")
+    parser.add_argument(
+        "--season", action="append", help="only this season (repeatable), merged into the existing snapshot",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="render processes")
+    args = parser.parse_args()
+
+    # Each worker sizes its DuckDB threads and memory for this many processes
+    os.environ["WEB_WORKERS"] = str(args.workers)
+    from app.core.config import settings
+
+    out_dir = os.path.abspath(args.out or settings.SNAPSHOT_DIR or str(BACKEND_DIR.parent / "data" / "snapshot"))
+
+    started = time.perf_counter()
+    routes = historical_routes(args.season)
+    print(f"Rendering {len(routes)} routes with {args.workers} workers into {out_dir}")
+    manifest = build_snapshot(out_dir, routes, args.workers, merge=bool(args.season))
+    print(
+        f"Wrote {manifest['responses']} responses ({manifest['skipped']} skipped) "
+        f"in {time.perf_counter() - started:.1f}s for data version {manifest['data_version']}",
+    )
+
+
+if __name__ == "__main__":
+    main()
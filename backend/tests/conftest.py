@@ -14,6 +14,8 @@ from fastapi.testclient import TestClient
 # Add the backend directory to sys.path
 backend_path = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_path))
+# ETL stages import each other as top-level modules (`from partitioned import ...`)
+sys.path.insert(0, str(backend_path / "scripts" / "etl"))
 
 from app.main import app
 from app.dependencies import (
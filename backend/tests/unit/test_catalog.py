@@ -0,0 +1,21 @@
+"""Unit tests for the repository lookup catalog."""
+
+import app.repositories as repositories
+from app.repositories.catalog import LOOKUP_KEYS
+
+
+class TestLookupCatalog:
+    """Keep the index catalog in step with the repositories."""
+
+    def test_used_by_references_existing_methods(self) -> None:
+        """Test that every used_by entry names a real repository method."""
+        for key in LOOKUP_KEYS:
+            for reference in key.used_by:
+                class_name, method_name = reference.split(".")
+                repository = getattr(repositories, class_name)
+                assert hasattr(repository, method_name), f"{key.index_name}: {reference}"
+
+    def test_index_names_are_unique(self) -> None:
+        """Test that no two keys map to the same index."""
+        names = [key.index_name for key in LOOKUP_KEYS]
+        assert len(names) == len(set(names))
@@ -0,0 +1,89 @@
+"""Unit tests for rewriting tables in cluster-key order."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import duckdb
+import pytest
+
+import cluster_tables
+from cluster_tables import rewrite_order, stage, staging_exists
+
+GAMES = [("g3", "2022", "2022-01-03"), ("g1", "2021", "2021-01-01"), ("g2", "2022", "2022-01-01")]
+BOX_SCORES = [("g2", "p2", 10), ("g1", "p1", 7), ("g3", "p1", 12), ("g1", "p2", 4)]
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    path = str(tmp_path / "nba.duckdb")
+    con = duckdb.connect(path)
+    con.execute("CREATE TABLE games (game_id VARCHAR PRIMARY KEY, season_id VARCHAR NOT NULL, game_date DATE)")
+    con.execute("CREATE INDEX idx_games_date ON games (game_date)")
+    con.execute(
+        "CREATE TABLE box_scores (game_id VARCHAR REFERENCES games (game_id), player_id VARCHAR, "
+        "points INTEGER DEFAULT 0, PRIMARY KEY (game_id, player_id))",
+    )
+    con.executemany("INSERT INTO games VALUES (?, ?, ?)", GAMES)
+    con.executemany("INSERT INTO box_scores VALUES (?, ?, ?)", BOX_SCORES)
+    con.close()
+    return path
+
+
+def _column(con: duckdb.DuckDBPyConnection, table: str, column: str) -> list[object]:
+    return [row[0] for row in con.execute(f"SELECT {column} FROM {table} ORDER BY rowid").fetchall()]  # noqa: S608
+
+
+class TestClusterTables:
+    """Tests for the stage/restore rewrite."""
+
+    def test_dependents_are_rebuilt_after_their_parent(self, db_path: str) -> None:
+        """Test that FK-referencing tables join the rewrite, referenced tables first."""
+        con = duckdb.connect(db_path)
+        try:
+            assert rewrite_order(con, ["games"]) == ["games", "box_scores"]
+        finally:
+            con.close()
+
+    def test_rewrite_sorts_and_keeps_rows_and_constraints(self, db_path: str) -> None:
+        """Test that rows, constraints, defaults and indexes survive and the new order is applied."""
+        with patch.object(cluster_tables, "DB_PATH", db_path):
+            cluster_tables.cluster_tables(["games", "box_scores"])
+
+        con = duckdb.connect(db_path)
+        try:
+            assert _column(con, "games", "game_id") == ["g1", "g2", "g3"]
+            assert _column(con, "box_scores", "player_id") == ["p1", "p1", "p2", "p2"]
+            assert con.execute("SELECT COUNT(*) FROM box_scores").fetchone() == (4,)
+            assert con.execute(
+                "SELECT index_name FROM duckdb_indexes() WHERE table_name = 'games'",
+            ).fetchall() == [("idx_games_date",)]
+            assert not staging_exists(con)
+
+            with pytest.raises(duckdb.ConstraintException):
+                con.execute("INSERT INTO games VALUES ('g1', '2021', NULL)")
+            with pytest.raises(duckdb.ConstraintException):
+                con.execute("INSERT INTO games VALUES ('g9', NULL, NULL)")
+            with pytest.raises(duckdb.ConstraintException):
+                con.execute("INSERT INTO box_scores (game_id, player_id) VALUES ('missing', 'p1')")
+            con.execute("INSERT INTO box_scores (game_id, player_id) VALUES ('g2', 'p3')")
+            assert con.execute("SELECT points FROM box_scores WHERE player_id = 'p3'").fetchone() == (0,)
+        finally:
+            con.close()
+
+    def test_interrupted_run_is_restored_first(self, db_path: str) -> None:
+        """Test that staged copies left by a crash are restored on the next run."""
+        con = duckdb.connect(db_path)
+        stage(con, ["games", "box_scores"], {"games": ("season_id", "game_date")})
+        con.execute("DROP TABLE box_scores")
+        con.close()
+
+        with patch.object(cluster_tables, "DB_PATH", db_path):
+            cluster_tables.cluster_tables(["games"])
+
+        con = duckdb.connect(db_path)
+        try:
+            assert con.execute("SELECT COUNT(*) FROM box_scores").fetchone() == (4,)
+            assert _column(con, "games", "game_id") == ["g1", "g2", "g3"]
+            assert not staging_exists(con)
+        finally:
+            con.close()
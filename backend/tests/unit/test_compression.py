@@ -0,0 +1,98 @@
+"""Unit tests for response compression."""
+
+import gzip
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressedBodyCache, CompressionMiddleware, select_encoding
+
+BIG = "season,pts\n" * 500
+
+
+def _client(cache: CompressedBodyCache | None = None) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/big")
+    async def big() -> Response:
+        return PlainTextResponse(BIG)
+
+    @app.get("/small")
+    async def small() -> Response:
+        return PlainTextResponse("ok")
+
+    @app.get("/parquet")
+    async def parquet() -> Response:
+        return Response(BIG.encode(), media_type="application/vnd.apache.parquet")
+
+    @app.get("/stream")
+    async def stream() -> Response:
+        async def chunks() -> AsyncIterator[bytes]:
+            for _ in range(3):
+                yield BIG.encode()
+
+        return StreamingResponse(chunks(), media_type="text/csv")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=100, cache=cache)
+    return TestClient(app)
+
+
+class TestSelectEncoding:
+    """Tests for Accept-Encoding matching."""
+
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            ("", None),
+            ("gzip, deflate", "gzip"),
+            ("gzip;q=0.5, br", "br"),
+            ("br;q=0, *", "zstd"),
+            ("identity", None),
+        ],
+    )
+    def test_best_quality_wins(self, accept: str, expected: str | None) -> None:
+        """Test that server preference only breaks ties."""
+        assert select_encoding(accept, ["br", "zstd", "gzip"]) == expected
+
+
+class TestCompressionMiddleware:
+    """Tests for compressing whole and streamed bodies."""
+
+    def test_large_bodies_are_gzipped_and_cached(self) -> None:
+        """Test that a repeated body is compressed once and served from the cache."""
+        cache = CompressedBodyCache(1024 * 1024)
+        client = _client(cache)
+
+        with client.stream("GET", "/big", headers={"Accept-Encoding": "gzip"}) as first:
+            raw = b"".join(first.iter_raw())
+            assert first.headers["content-encoding"] == "gzip"
+            assert first.headers["vary"] == "Accept-Encoding"
+            assert int(first.headers["content-length"]) == len(raw)
+        assert gzip.decompress(raw).decode() == BIG
+        size = cache.size
+
+        assert client.get("/big").text == BIG
+        assert cache.size == size
+
+    def test_small_and_incompressible_bodies_pass_through(self) -> None:
+        """Test that tiny bodies and Parquet are sent unencoded."""
+        client = _client()
+
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        parquet = client.get("/parquet", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in small.headers
+        assert small.headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in parquet.headers
+
+    def test_streaming_bodies_are_compressed_incrementally(self) -> None:
+        """Test that a streamed response decodes to every chunk."""
+        with _client().stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+            assert response.headers["content-encoding"] == "gzip"
+            assert "content-length" not in response.headers
+
+        assert gzip.decompress(raw).decode() == BIG * 3
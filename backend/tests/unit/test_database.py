@@ -1,11 +1,26 @@
 """Unit tests for database utilities."""
 
+import asyncio
+import contextvars
+import json
+import threading
+from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
 
+import duckdb
 import pandas as pd
 import pytest
 
-from app.core.database import execute_query, execute_query_df, get_db_connection
+import export_parquet
+from app.core.database import (
+    QueryExecutor,
+    connect_parquet,
+    duckdb_config,
+    execute_query,
+    execute_query_df,
+    get_db_connection,
+)
+from app.core.exceptions import DatabaseOverloadedError
 
 
 class TestDatabaseConnection:
@@ -33,6 +48,78 @@ class TestDatabaseConnection:
         assert args[1]["read_only"] is False
 
 
+class TestQueryExecutor:
+    """Tests for the async database executor."""
+
+    def test_runs_on_executor_thread_with_context(self) -> None:
+        """Test that calls run off the event loop and see the caller's context vars."""
+        request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id")
+        executor = QueryExecutor(workers=2, max_queued=0)
+
+        async def call() -> tuple[str, str]:
+            request_id.set("abc")
+            return await executor.run(lambda: (request_id.get(), threading.current_thread().name))
+
+        try:
+            value, thread_name = asyncio.run(call())
+        finally:
+            executor.shutdown()
+
+        assert value == "abc"
+        assert thread_name.startswith("db")
+        assert executor.pending == 0
+
+    def test_rejects_when_queue_is_full(self) -> None:
+        """Test that calls beyond workers + max_queued fail fast."""
+        executor = QueryExecutor(workers=1, max_queued=1)
+        release = threading.Event()
+
+        async def call() -> list[object]:
+            calls = [executor.run(release.wait) for _ in range(3)]
+            return await asyncio.gather(*calls, return_exceptions=True)
+
+        async def scenario() -> list[object]:
+            task = asyncio.ensure_future(call())
+            await asyncio.sleep(0.05)
+            release.set()
+            return await task
+
+        try:
+            results = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+
+        assert results[:2] == [True, True]
+        assert isinstance(results[2], DatabaseOverloadedError)
+        assert executor.pending == 0
+
+
+class TestDuckDBConfig:
+    """Tests for per-worker DuckDB sizing."""
+
+    @patch("app.core.database._physical_memory", return_value=16 * 2**30)
+    @patch("app.core.database.os.cpu_count", return_value=16)
+    @patch("app.core.database.settings")
+    def test_resources_split_between_workers(self, mock_settings: Mock, *_: Mock) -> None:
+        """Test that cores and memory are divided by the worker count."""
+        mock_settings.DUCKDB_THREADS = 0
+        mock_settings.DUCKDB_MEMORY_LIMIT = ""
+
+        assert duckdb_config(workers=4) == {"threads": "4", "memory_limit": "3072MB"}
+        assert duckdb_config(workers=1) == {}
+
+    @patch("app.core.database.settings")
+    def test_explicit_settings_win(self, mock_settings: Mock) -> None:
+        """Test that DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT override the split."""
+        mock_settings.DUCKDB_THREADS = 2
+        mock_settings.DUCKDB_MEMORY_LIMIT = "1GB"
+
+        config = duckdb_config(workers=8)
+
+        assert config == {"threads": "2", "memory_limit": "1GB"}
+        duckdb.connect(config=config).close()
+
+
 class TestExecuteQuery:
     """Tests for execute_query function."""
 
@@ -105,3 +192,72 @@ class TestExecuteQueryDf:
         assert isinstance(result, pd.DataFrame)
         mock_conn.execute.assert_called_once_with("SELECT * FROM test WHERE id = ?", ["123"])
         mock_conn.close.assert_called_once()
+
+
+class TestConnectParquet:
+    """Tests for serving from a Parquet export."""
+
+    @staticmethod
+    def _write_export(root: Path) -> None:
+        con = duckdb.connect()
+        con.execute(
+            "CREATE TABLE games AS SELECT * FROM (VALUES ('g1', '2023', 101), ('g2', '2024', 99)) "
+            "v(game_id, season_id, home_team_score)",
+        )
+        con.execute(f"COPY games TO '{root / 'games'}' (FORMAT PARQUET, PARTITION_BY (season_id))")
+        (root / "teams").mkdir()
+        con.execute(f"COPY (SELECT '1' AS team_id) TO '{root / 'teams' / 'data_0.parquet'}' (FORMAT PARQUET)")
+        con.close()
+        manifest = {
+            "partition_column": "season_id",
+            "tables": {
+                "games": {
+                    "columns": [["game_id", "VARCHAR"], ["season_id", "VARCHAR"], ["home_team_score", "INTEGER"]],
+                    "partitioned": True,
+                },
+                "teams": {"columns": [["team_id", "VARCHAR"]], "partitioned": False},
+                "awards": {"columns": [["award_id", "INTEGER"], ["season_id", "VARCHAR"]], "partitioned": True},
+            },
+        }
+        (root / "manifest.json").write_text(json.dumps(manifest))
+
+    def test_views_restore_column_order(self, tmp_path: Path) -> None:
+        """Test that views expose the manifest's columns in order."""
+        self._write_export(tmp_path)
+        conn = connect_parquet(str(tmp_path))
+
+        columns = [row[0] for row in conn.execute("DESCRIBE games").fetchall()]
+        rows = conn.execute("SELECT * FROM games WHERE season_id = '2024'").fetchall()
+
+        assert columns == ["game_id", "season_id", "home_team_score"]
+        assert rows == [("g2", "2024", 99)]
+        assert conn.execute("SELECT team_id FROM teams").fetchall() == [("1",)]
+
+    def test_empty_partitioned_table_is_queryable(self, tmp_path: Path) -> None:
+        """Test that a table exported with no rows still has a view."""
+        self._write_export(tmp_path)
+        conn = connect_parquet(str(tmp_path))
+
+        assert conn.execute("SELECT COUNT(*) FROM awards").fetchone() == (0,)
+
+    def test_export_round_trip(self, tmp_path: Path) -> None:
+        """Test that views over an export keep each table's own columns and partition only on them."""
+        db_path = str(tmp_path / "nba.duckdb")
+        con = duckdb.connect(db_path)
+        con.execute("CREATE TABLE games AS SELECT * FROM (VALUES ('g1', '2023'), ('g2', '2024')) v(game_id, season_id)")
+        con.execute(
+            "CREATE TABLE box_scores AS SELECT * FROM (VALUES ('g2', 'p1', 7), ('g1', 'p1', 3)) "
+            "v(game_id, player_id, pts)",
+        )
+        con.close()
+
+        with patch.object(export_parquet, "DB_PATH", db_path):
+            export_parquet.export_parquet(out_dir=str(tmp_path / "parquet"))
+        conn = connect_parquet(str(tmp_path / "parquet"))
+
+        assert (tmp_path / "parquet" / "games" / "season_id=2024").is_dir()
+        assert (tmp_path / "parquet" / "box_scores" / "data_0.parquet").is_file()
+        assert [row[0] for row in conn.execute("DESCRIBE box_scores").fetchall()] == ["game_id", "player_id", "pts"]
+        assert conn.execute(
+            "SELECT g.season_id, b.pts FROM box_scores b JOIN games g ON b.game_id = g.game_id ORDER BY 1",
+        ).fetchall() == [("2023", 3), ("2024", 7)]
@@ -0,0 +1,112 @@
+"""Unit tests for streaming table exports."""
+
+import json
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import db_executor
+from app.core.exceptions import DatabaseOverloadedError, ValidationError
+from app.dependencies import get_export_repository
+from app.main import app
+from app.repositories.export_repository import ExportCursor, ExportQuery, ExportRepository
+
+
+@pytest.fixture
+def export_db(tmp_path: Path) -> Generator[duckdb.DuckDBPyConnection, None, None]:
+    """Serve a small games table through a patched connection."""
+    conn = duckdb.connect(str(tmp_path / "export.duckdb"))
+    conn.execute(
+        "CREATE TABLE games AS SELECT i::VARCHAR AS game_id, (2020 + i % 2)::VARCHAR AS season_id, "
+        "'T' || (i % 3) AS home_team_id, 'T' || ((i + 1) % 3) AS away_team_id, i * 1.5 AS attendance "
+        "FROM range(25) t(i)",
+    )
+
+    def query(sql: str, params: list[Any] | None = None) -> list[Any]:
+        return conn.cursor().execute(sql, params or []).fetchall()
+
+    with (
+        patch("app.repositories.export_repository.get_db_connection", return_value=conn),
+        patch("app.repositories.export_repository.execute_query", side_effect=query),
+    ):
+        yield conn
+    conn.close()
+
+
+class TestExportRepository:
+    """Tests for export query building."""
+
+    def test_filters_and_columns_are_validated(self, export_db: duckdb.DuckDBPyConnection) -> None:
+        """Test that unknown tables, columns and filters are rejected."""
+        repo = ExportRepository()
+
+        query = repo.build_query("games", ["game_id"], {"team_id": "T1", "season_id": None})
+        assert query.params == ["T1", "T1"]
+        assert query.columns == ["game_id"]
+
+        with pytest.raises(ValidationError):
+            repo.build_query("games", ["nope"])
+        with pytest.raises(ValidationError):
+            repo.build_query("games", None, {"player_id": "p1"})
+
+
+class TestExportEndpoint:
+    """Tests for /api/v1/export/{table}."""
+
+    @pytest.fixture
+    def client(self, export_db: duckdb.DuckDBPyConnection) -> Generator[TestClient, None, None]:
+        app.dependency_overrides[get_export_repository] = ExportRepository
+        with patch("app.api.v1.export.settings") as mock_settings:
+            mock_settings.EXPORT_CHUNK_ROWS = 4
+            yield TestClient(app)
+        app.dependency_overrides.clear()
+
+    def test_csv_streams_all_chunks(self, client: TestClient) -> None:
+        """Test that a filtered CSV export has a header and every matching row."""
+        response = client.get("/api/v1/export/games?season_id=2020&columns=game_id,season_id")
+
+        assert response.status_code == 200
+        assert response.headers["content-disposition"] == 'attachment; filename="games.csv"'
+        lines = response.text.splitlines()
+        assert lines[0] == "game_id,season_id"
+        assert len(lines) == 1 + 13
+
+    def test_ndjson_rows_are_objects(self, client: TestClient) -> None:
+        """Test that NDJSON lines are JSON objects keyed by column."""
+        response = client.get("/api/v1/export/games?format=ndjson&team_id=T0")
+
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert rows
+        assert all("T0" in (row["home_team_id"], row["away_team_id"]) for row in rows)
+
+    def test_parquet_is_written_by_duckdb(self, client: TestClient, tmp_path: Path) -> None:
+        """Test that the Parquet download round-trips."""
+        response = client.get("/api/v1/export/games?format=parquet")
+        path = tmp_path / "games.parquet"
+        path.write_bytes(response.content)
+
+        assert duckdb.sql(f"SELECT count(*) FROM '{path}'").fetchone() == (25,)  # noqa: S608
+
+    def test_busy_db_executor_does_not_cut_off_stream(self, client: TestClient) -> None:
+        """Test that chunks are still fetched once the DB executor starts rejecting calls."""
+        overload = patch.object(db_executor, "_submit", side_effect=DatabaseOverloadedError(1))
+        open_export = ExportRepository.open_export
+
+        def open_then_overload(repo: ExportRepository, query: ExportQuery) -> ExportCursor:
+            export = open_export(repo, query)
+            overload.start()
+            return export
+
+        try:
+            with patch.object(ExportRepository, "open_export", open_then_overload):
+                response = client.get("/api/v1/export/games")
+        finally:
+            overload.stop()
+
+        assert response.status_code == 200
+        assert len(response.text.splitlines()) == 1 + 25
@@ -0,0 +1,103 @@
+"""Unit tests for query instrumentation."""
+
+from unittest.mock import Mock, patch
+
+import duckdb
+from fastapi.testclient import TestClient
+
+from app.core.instrumentation import QueryRecorder, fingerprint, normalize_sql, params_hash
+from app.main import app
+
+
+class FakeRepository:
+    def load(self, recorder: QueryRecorder, seconds: float) -> None:
+        recorder.observe("SELECT * FROM games WHERE season_id = ?", ["2024"], 3, seconds, 0.001)
+
+
+class TestFingerprint:
+    """Tests for SQL normalization."""
+
+    def test_literals_and_whitespace_are_normalized(self) -> None:
+        """Test that queries differing only in literals share a fingerprint."""
+        a = "SELECT *\n  FROM games WHERE game_id = '0022300001' AND home_team_score > 100"
+        b = "SELECT * FROM games   WHERE game_id = '0022300002' AND home_team_score > 95"
+
+        assert normalize_sql(a) == "SELECT * FROM games WHERE game_id = ? AND home_team_score > ?"
+        assert fingerprint(a) == fingerprint(b)
+
+    def test_in_lists_collapse(self) -> None:
+        """Test that IN lists of any length normalize the same way."""
+        assert fingerprint("SELECT 1 WHERE x IN (?, ?)") == fingerprint("SELECT 1 WHERE x IN (?, ?, ?)")
+
+    def test_params_hash(self) -> None:
+        """Test that parameters hash stably and empty parameters give None."""
+        assert params_hash(["2024"]) == params_hash(["2024"])
+        assert params_hash(["2024"]) != params_hash(["2023"])
+        assert params_hash(None) is None
+
+
+class TestQueryRecorder:
+    """Tests for per-fingerprint statistics and the slow-query log."""
+
+    def test_snapshot_aggregates_by_fingerprint(self) -> None:
+        """Test counts, percentiles and caller attribution."""
+        recorder = QueryRecorder(sample_size=100)
+        repo = FakeRepository()
+        for ms in range(1, 101):
+            repo.load(recorder, ms / 1000)
+
+        [stats] = recorder.snapshot()
+
+        assert stats["count"] == 100
+        assert stats["rows"] == 300
+        assert stats["caller"] == "FakeRepository.load"
+        assert stats["p50_ms"] == 51.0
+        assert stats["p99_ms"] == 100.0
+        assert stats["max_ms"] == 101.0
+
+    def test_fixed_fingerprint_and_eviction(self) -> None:
+        """Test that a fixed key groups differing SQL and the least recently seen entry is dropped."""
+        recorder = QueryRecorder(max_fingerprints=2)
+        recorder.observe("SELECT a FROM games", None, 1, 0.001, 0.0, key="query:games")
+        recorder.observe("SELECT b FROM games WHERE x = ?", [1], 1, 0.001, 0.0, key="query:games")
+        recorder.observe("SELECT 1", None, 1, 0.001, 0.0)
+        recorder.observe("SELECT a FROM games", None, 1, 0.001, 0.0, key="query:games")
+        recorder.observe("SELECT 2 FROM players", None, 1, 0.001, 0.0)
+
+        entries = {stats["fingerprint"]: stats["count"] for stats in recorder.snapshot()}
+        assert entries == {"query:games": 3, fingerprint("SELECT 2 FROM players"): 1}
+
+    @patch("app.core.instrumentation.settings")
+    def test_slow_queries_are_logged_with_plan(self, mock_settings: object) -> None:
+        """Test that a query over the threshold is logged with its EXPLAIN ANALYZE plan."""
+        mock_settings.SLOW_QUERY_MS = 50  # type: ignore[attr-defined]
+        mock_settings.SLOW_QUERY_EXPLAIN = True  # type: ignore[attr-defined]
+        conn = duckdb.connect()
+        recorder = QueryRecorder()
+
+        with patch("app.core.instrumentation.slow_query_logger") as logger:
+            recorder.observe("SELECT 1", None, 1, 0.010, 0.001, conn)
+            logger.warning.assert_not_called()
+
+            recorder.observe("SELECT 1", None, 1, 0.080, 0.001, conn)
+            record = logger.warning.call_args.kwargs["extra"]
+
+        assert record["total_ms"] == 81.0
+        assert record["fingerprint"] == fingerprint("SELECT 1")
+        assert "PROJECTION" in record["plan"]
+
+
+class TestQueryStatsEndpoint:
+    """Tests for /debug/queries access."""
+
+    @patch("app.core.profiling.settings")
+    def test_requires_debug_or_token(self, mock_settings: Mock) -> None:
+        """Test that the endpoint is hidden unless profiling is allowed, and limit is bounded."""
+        mock_settings.DEBUG = False
+        mock_settings.PROFILE_TOKEN = "secret"
+        client = TestClient(app)
+
+        assert client.get("/debug/queries").status_code == 404
+        assert client.get("/debug/queries", headers={"X-Profile-Token": "x"}).status_code == 404
+        assert client.get("/debug/queries", headers={"X-Profile-Token": "secret"}).status_code == 200
+        assert client.get("/debug/queries?limit=-1", headers={"X-Profile-Token": "secret"}).status_code == 422
@@ -0,0 +1,55 @@
+"""Unit tests for the logging pipeline."""
+
+import logging
+import queue
+
+from app.core.logging import DroppingQueueHandler, SamplingFilter, configure_logging, stop_logging
+
+
+def _record(name: str, level: int = logging.INFO, msg: str = "hello %s", args: tuple = ("world",)) -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+class TestSamplingFilter:
+    """Tests for per-logger sampling."""
+
+    def test_most_specific_prefix_wins(self) -> None:
+        """Test that rates apply by prefix and warnings are always kept."""
+        sampler = SamplingFilter({"app": 1.0, "app.api.graphql": 0.0})
+
+        assert sampler.filter(_record("app.api.graphql.schema")) is False
+        assert sampler.filter(_record("app.api.graphql.schema", logging.WARNING)) is True
+        assert sampler.filter(_record("app.api.v1.teams")) is True
+        assert sampler.filter(_record("uvicorn")) is True
+
+
+class TestDroppingQueueHandler:
+    """Tests for the bounded queue handler."""
+
+    def test_drops_when_full_and_reports_later(self) -> None:
+        """Test that a full queue drops records and the drop is reported once space frees."""
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=1)
+        handler = DroppingQueueHandler(log_queue)
+
+        handler.handle(_record("app"))
+        handler.handle(_record("app"))
+        assert handler.dropped == 1
+
+        first = log_queue.get_nowait()
+        assert first.getMessage() == "hello world"
+        assert first.args is None
+
+        handler.handle(_record("app"))
+        assert "Dropped 1 log records" in log_queue.get_nowait().getMessage()
+
+    def test_configure_is_idempotent(self) -> None:
+        """Test that repeated configuration doesn't stack handlers."""
+        root = logging.getLogger()
+        before = len(root.handlers)
+        try:
+            configure_logging("INFO", async_mode=True)
+            configure_logging("INFO", async_mode=True)
+            assert len(root.handlers) == before + 1
+        finally:
+            configure_logging("INFO", async_mode=False)
+            stop_logging()
@@ -0,0 +1,66 @@
+"""Unit tests for the metrics registry and middleware."""
+
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Counter, Histogram, MetricsMiddleware, http_requests
+
+
+class TestCounters:
+    """Tests for sharded counters and histograms."""
+
+    def test_counter_sums_thread_shards(self) -> None:
+        """Test that increments from many threads are all counted."""
+        counter = Counter("test_total", "Test counter.", ("kind",))
+
+        def work() -> None:
+            for _ in range(1000):
+                counter.inc(("a",))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counter.value(("a",)) == 8000
+        assert list(counter.samples()) == ['test_total{kind="a"} 8000']
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        """Test bucket, sum and count lines."""
+        histogram = Histogram("test_seconds", "Test histogram.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert list(histogram.samples()) == [
+            'test_seconds_bucket{le="0.1"} 1',
+            'test_seconds_bucket{le="1.0"} 3',
+            'test_seconds_bucket{le="+Inf"} 4',
+            "test_seconds_sum 4.05",
+            "test_seconds_count 4",
+        ]
+
+
+class TestMetricsMiddleware:
+    """Tests for per-route request metrics."""
+
+    def test_requests_are_labelled_by_route_template(self) -> None:
+        """Test that path parameters don't create new label values."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/items/{item_id}")
+        def get_item(item_id: str) -> dict[str, str]:
+            return {"item_id": item_id}
+
+        labels = ("GET", "/items/{item_id}", "200")
+        before = http_requests.value(labels)
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+        client.get("/missing")
+
+        assert http_requests.value(labels) - before == 2
+        assert http_requests.value(("GET", "unmatched", "404")) >= 1
@@ -0,0 +1,107 @@
+"""Unit tests for Arrow/msgpack content negotiation."""
+
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import patch
+
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.api.negotiation import ARROW_STREAM, JSON, MSGPACK, select_media_type
+from app.dependencies import get_player_repository
+from app.main import app
+from app.repositories.base import BaseRepository
+
+
+class Row(BaseModel):
+    player_id: str
+    games_played: int | None = None
+
+
+class TestSelectMediaType:
+    """Tests for Accept header matching."""
+
+    available = (JSON, ARROW_STREAM, MSGPACK)
+
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            (None, JSON),
+            ("*/*", JSON),
+            (ARROW_STREAM, ARROW_STREAM),
+            ("application/x-msgpack", MSGPACK),
+            (f"{MSGPACK};q=0.9, {ARROW_STREAM}", ARROW_STREAM),
+            (f"application/*;q=0.5, {JSON};q=0.1", ARROW_STREAM),
+            (f"{MSGPACK};q=0, */*", JSON),
+            ("text/html", None),
+        ],
+    )
+    def test_quality_and_specificity(self, accept: str | None, expected: str | None) -> None:
+        """Test that the best-quality, most specific match wins."""
+        assert select_media_type(accept, self.available) == expected
+
+    def test_unavailable_formats_are_never_chosen(self) -> None:
+        """Test that a format without its library falls back or is refused."""
+        assert select_media_type(f"{ARROW_STREAM}, {JSON};q=0.2", [JSON]) == JSON
+        assert select_media_type(ARROW_STREAM, [JSON]) is None
+
+
+class TestColumnarResponses:
+    """Tests for list endpoints answering with Arrow or msgpack."""
+
+    @pytest.fixture
+    def conn(self) -> duckdb.DuckDBPyConnection:
+        conn = duckdb.connect()
+        conn.execute(
+            "CREATE TABLE stats AS SELECT 'p' || i AS player_id, i * 10 AS games_played, 'x' AS extra "
+            "FROM range(3) t(i)",
+        )
+        return conn
+
+    def _rows(
+        self, conn: duckdb.DuckDBPyConnection,
+    ) -> Callable[[str, list[Any]], tuple[list[str], list[tuple[Any, ...]]]]:
+        def run(sql: str, params: list[Any]) -> tuple[list[str], list[tuple[Any, ...]]]:
+            result = conn.execute(sql, params)
+            return [c[0] for c in result.description], result.fetchall()
+
+        return run
+
+    def test_rows_are_projected_to_model_fields(self, conn: duckdb.DuckDBPyConnection) -> None:
+        """Test that columns the model doesn't declare are dropped and order is kept."""
+        repo = BaseRepository(Row)
+        query = ("SELECT * FROM stats ORDER BY games_played DESC", [])
+        with patch("app.repositories.base.execute_query_rows", side_effect=self._rows(conn)):
+            columns, rows = repo.fetch_rows(query, Row)
+
+        assert columns == ["player_id", "games_played"]
+        assert rows == [("p2", 20), ("p1", 10), ("p0", 0)]
+
+    def test_unavailable_format_is_406(self) -> None:
+        """Test that asking only for a format that can't be produced is refused."""
+        with patch("app.api.negotiation.available_media_types", return_value=[JSON]):
+            response = TestClient(app).get("/api/v1/players/p0/stats", headers={"Accept": MSGPACK})
+
+        assert response.status_code == 406
+        assert response.json()["available"] == [JSON]
+        assert "Accept" in response.headers["vary"].split(", ")
+
+    def test_msgpack_records(self, conn: duckdb.DuckDBPyConnection) -> None:
+        """Test that msgpack responses decode to one map per row."""
+        msgpack = pytest.importorskip("msgpack")
+
+        class Repo(BaseRepository[Row]):
+            def stats_query(self, player_id: str) -> tuple[str, list[Any]]:
+                return "SELECT * FROM stats WHERE player_id = ?", [player_id]
+
+        app.dependency_overrides[get_player_repository] = lambda: Repo(Row)
+        try:
+            with patch("app.repositories.base.execute_query_rows", side_effect=self._rows(conn)):
+                response = TestClient(app).get("/api/v1/players/p1/stats", headers={"Accept": MSGPACK})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.headers["content-type"] == MSGPACK
+        assert msgpack.unpackb(response.content) == [{"player_id": "p1", "games_played": 10}]
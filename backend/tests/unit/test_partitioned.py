@@ -0,0 +1,88 @@
+"""Unit tests for partitioned ETL execution."""
+
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import duckdb
+import pytest
+
+import partitioned
+from partitioned import Partition, list_seasons, run_partitioned
+
+_compute = partitioned._compute_partition
+
+
+def _crash_once(db_path: str, sql: str, params: tuple[Any, ...], out_path: str) -> int:
+    """Kill the worker process the first time each partition runs."""
+    marker = f"{out_path}.crashed"
+    if not os.path.exists(marker):
+        Path(marker).touch()
+        os._exit(1)
+    return _compute(db_path, sql, params, out_path)
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> str:
+    path = str(tmp_path / "nba.duckdb")
+    con = duckdb.connect(path)
+    con.execute("CREATE TABLE games (game_id VARCHAR, season_id VARCHAR, points INTEGER)")
+    con.execute("INSERT INTO games VALUES ('a', '2021', 10), ('b', '2021', 20), ('c', '2022', 30)")
+    con.execute("CREATE TABLE totals (season_id VARCHAR, game_id VARCHAR, points INTEGER)")
+    con.execute("INSERT INTO totals VALUES ('2020', 'old', 5)")
+    con.close()
+    return path
+
+
+def _partitions(seasons: list[str]) -> list[Partition]:
+    sql = "SELECT season_id, game_id, points FROM games WHERE season_id = ?"
+    return [Partition(season, sql, (season,)) for season in seasons]
+
+
+def _rows(db_path: str) -> list[tuple[Any, ...]]:
+    con = duckdb.connect(db_path, read_only=True)
+    try:
+        return con.execute("SELECT * FROM totals ORDER BY game_id").fetchall()
+    finally:
+        con.close()
+
+
+class TestRunPartitioned:
+    """Tests for computing partitions in worker processes and merging them."""
+
+    def test_replace_merges_every_partition(self, db_path: str) -> None:
+        """Test that partitions replace the table's rows and the count is what was inserted."""
+        inserted = run_partitioned(
+            db_path, "totals", ["season_id", "game_id", "points"], _partitions(list_seasons(db_path)), workers=2,
+        )
+
+        assert inserted == 3
+        assert _rows(db_path) == [("2021", "a", 10), ("2021", "b", 20), ("2022", "c", 30)]
+
+    def test_append_returns_inserted_rows(self, db_path: str) -> None:
+        """Test that replace=False keeps existing rows and counts only the new ones."""
+        inserted = run_partitioned(
+            db_path, "totals", ["season_id", "game_id", "points"], _partitions(["2022"]), workers=1, replace=False,
+        )
+
+        assert inserted == 1
+        assert len(_rows(db_path)) == 2
+
+    def test_failing_partition_leaves_table_untouched(self, db_path: str) -> None:
+        """Test that a partition failing every attempt aborts before the merge."""
+        partitions = [*_partitions(["2021"]), Partition("bad", "SELECT * FROM missing_table")]
+
+        with pytest.raises(RuntimeError, match="Partition bad failed after 2 attempts"):
+            run_partitioned(db_path, "totals", ["season_id", "game_id", "points"], partitions, workers=1, retries=1)
+
+        assert _rows(db_path) == [("2020", "old", 5)]
+
+    def test_retries_on_a_fresh_pool_after_a_worker_dies(self, db_path: str) -> None:
+        """Test that a crashed worker's broken pool is replaced and its partitions rerun."""
+        with patch.object(partitioned, "_compute_partition", _crash_once):
+            inserted = run_partitioned(
+                db_path, "totals", ["season_id", "game_id", "points"], _partitions(["2021", "2022"]), workers=1,
+            )
+
+        assert inserted == 3
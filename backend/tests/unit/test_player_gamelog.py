@@ -0,0 +1,82 @@
+"""Unit tests for reading player game logs."""
+
+from unittest.mock import Mock, patch
+
+import duckdb
+
+from app.repositories.player_repository import PlayerRepository
+from build_player_game_logs import build_player_game_logs
+
+
+class TestGamelogQuery:
+    """Tests for choosing between player_game_logs and the box score join."""
+
+    @patch("app.repositories.player_repository.get_data_version", Mock(return_value="v1"))
+    def test_reads_precomputed_table_when_built(self) -> None:
+        """Test that the denormalized table is used, filtered by player and season."""
+        repo = PlayerRepository()
+        with patch.object(repo, "_table_exists", return_value=True):
+            query, params = repo.gamelog_query("p0", "2023")
+
+        assert "FROM player_game_logs" in query
+        assert "JOIN" not in query
+        assert params == ["p0", "2023"]
+
+    @patch("app.repositories.player_repository.get_data_version", Mock(return_value="v1"))
+    def test_falls_back_to_join(self) -> None:
+        """Test that the join over box_scores and games is used before the ETL stage has run."""
+        repo = PlayerRepository()
+        with patch.object(repo, "_table_exists", return_value=False):
+            query, params = repo.gamelog_query("p0")
+
+        assert "FROM box_scores" in query
+        assert params == ["p0"]
+
+    def test_table_check_is_cached_per_data_version(self) -> None:
+        """Test that the catalog is only consulted again after the data changes."""
+        repo = PlayerRepository()
+        version = Mock(return_value="v1")
+        with patch("app.repositories.player_repository.get_data_version", version), \
+                patch.object(repo, "_table_exists", return_value=True) as exists:
+            repo.gamelog_query("p0")
+            repo.gamelog_query("p1")
+            assert exists.call_count == 1
+
+            version.return_value = "v2"
+            repo.gamelog_query("p0")
+            assert exists.call_count == 2
+
+
+class TestBuildPlayerGameLogs:
+    """Tests for the precomputed player_game_logs table."""
+
+    def test_rest_and_averages_skip_dnp_games(self) -> None:
+        """Test that a DNP between two games counts neither as rest nor in the averages."""
+        con = duckdb.connect()
+        con.execute("""
+            CREATE TABLE games AS SELECT * FROM (VALUES
+                ('g1', '2024', 'Regular Season', DATE '2024-01-01', 'T1', 'T2', 'T1', 110, 100),
+                ('g2', '2024', 'Regular Season', DATE '2024-01-05', 'T2', 'T1', 'T2', 105, 99),
+                ('g3', '2024', 'Regular Season', DATE '2024-01-06', 'T1', 'T3', 'T3', 90, 95)
+            ) v(game_id, season_id, game_type, game_date, home_team_id, away_team_id, winner_team_id,
+                home_team_score, away_team_score)
+        """)
+        con.execute("""
+            CREATE TABLE box_scores AS SELECT * FROM (VALUES
+                ('g1', 'p1', 'T1', 10, 4, 2, 30, FALSE),
+                ('g2', 'p1', 'T1', 0, 0, 0, 0, TRUE),
+                ('g3', 'p1', 'T1', 20, 6, 4, 34, FALSE)
+            ) v(game_id, player_id, team_id, points, total_rebounds, assists, minutes_played, did_not_play)
+        """)
+
+        assert build_player_game_logs(con) == 3
+        rows = con.execute(
+            "SELECT game_id, game_number, days_rest, avg_points, avg_minutes, game_result "
+            "FROM player_game_logs ORDER BY game_date",
+        ).fetchall()
+
+        assert rows == [
+            ("g1", 1, None, 10.0, 30.0, "W (+10)"),
+            ("g2", None, None, None, None, "L (-6)"),
+            ("g3", 2, 4, 15.0, 32.0, "L (-5)"),
+        ]
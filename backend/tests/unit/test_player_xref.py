@@ -0,0 +1,108 @@
+"""Unit tests for player identity resolution."""
+
+from datetime import date
+
+import duckdb
+import pytest
+
+from build_player_xref import DirectoryEntry, Identity, load_bref_identities, normalize_name, resolve
+
+SMITH_A = DirectoryEntry("smithjo01", date(1990, 3, 1), 2010, 2020)
+SMITH_B = DirectoryEntry("smithjo02", date(1995, 7, 9), 2016, 2024)
+
+
+class TestNormalizeName:
+    """Tests for display name normalization."""
+
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            ("Nikola Jokić", "nikola jokic"),
+            ("Kareem Abdul-Jabbar*", "kareem abduljabbar"),
+            ("D'Angelo  Russell", "dangelo russell"),
+            ("J.J. Redick", "jj redick"),
+            (None, ""),
+        ],
+    )
+    def test_normalize_name(self, name: str | None, expected: str) -> None:
+        """Test accents, HOF marker, punctuation, case and spacing."""
+        assert normalize_name(name) == expected
+
+
+class TestResolve:
+    """Tests for the ordered matching rules."""
+
+    def test_no_candidates(self) -> None:
+        """Test that an unknown name is unmatched."""
+        assert resolve(Identity("nba", "1", "Nobody"), [], {}) == (None, "unmatched")
+
+    def test_exact_birth_date(self) -> None:
+        """Test that an exact birth date picks one of several namesakes."""
+        identity = Identity("nba", "1", "Jo Smith", birth_date=date(1995, 7, 9))
+
+        assert resolve(identity, [SMITH_A, SMITH_B], {}) == ("smithjo02", "name_birthdate")
+
+    def test_birth_year(self) -> None:
+        """Test that BR's age-derived birth years narrow to one candidate."""
+        identity = Identity("bref", "smithjo01", "Jo Smith", birth_years={1989, 1990})
+
+        assert resolve(identity, [SMITH_A, SMITH_B], {}) == ("smithjo01", "name_birth_year")
+
+    def test_unique_name(self) -> None:
+        """Test that a single namesake matches without bio data."""
+        assert resolve(Identity("nba", "1", "Jo Smith"), [SMITH_A], {}) == ("smithjo01", "unique_name")
+
+    def test_team_season(self) -> None:
+        """Test that overlapping resolved (season, team) pairs pick a candidate."""
+        identity = Identity("nba", "1", "Jo Smith", team_seasons={(2018, "1610612751")})
+        slug_team_seasons = {"smithjo01": {(2018, "1610612760")}, "smithjo02": {(2018, "1610612751")}}
+
+        assert resolve(identity, [SMITH_A, SMITH_B], slug_team_seasons) == ("smithjo02", "team_season")
+
+    def test_career_span(self) -> None:
+        """Test that only one candidate active in every observed season matches."""
+        identity = Identity("nba", "1", "Jo Smith", seasons={2011, 2014})
+
+        assert resolve(identity, [SMITH_A, SMITH_B], {}) == ("smithjo01", "career_span")
+
+    def test_ambiguous(self) -> None:
+        """Test that candidates no rule separates stay unresolved."""
+        identity = Identity("nba", "1", "Jo Smith", seasons={2017})
+
+        assert resolve(identity, [SMITH_A, SMITH_B], {}) == (None, "ambiguous")
+
+
+class TestLoadBrefIdentities:
+    """Tests for collecting BR stat-line identities."""
+
+    def test_team_abbreviations_resolve_through_aliases(self) -> None:
+        """Test that BR-only abbreviations map to team ids and TOT rows are skipped."""
+        con = duckdb.connect()
+        con.execute(
+            "CREATE TABLE team_aliases (abbreviation VARCHAR, first_season INTEGER, last_season INTEGER, "
+            "team_id VARCHAR, franchise_id VARCHAR, source VARCHAR)",
+        )
+        con.execute("""
+            INSERT INTO team_aliases VALUES
+                ('BRK', 2013, NULL, '1610612751', '1610612751', 'historical'),
+                ('NJN', 1978, 2012, '1610612751', '1610612751', 'historical'),
+                ('SEA', 1968, 2008, '1610612760', '1610612760', 'historical'),
+                ('TOT', NULL, NULL, 'TOT', NULL, 'teams')
+        """)
+        con.execute(
+            "CREATE TABLE player_stats_totals (player_id VARCHAR, player VARCHAR, season INTEGER, "
+            "age INTEGER, tm VARCHAR)",
+        )
+        con.execute("""
+            INSERT INTO player_stats_totals VALUES
+                ('smithjo01', 'Jo Smith', 2008, 22, 'SEA'),
+                ('smithjo01', 'Jo Smith', 2012, 26, 'TOT'),
+                ('smithjo01', 'Jo Smith', 2012, 26, 'NJN'),
+                ('smithjo01', 'Jo Smith', 2013, 27, 'BRK')
+        """)
+
+        [identity] = load_bref_identities(con)
+
+        assert identity.seasons == {2008, 2012, 2013}
+        assert identity.team_seasons == {(2008, "1610612760"), (2012, "1610612751"), (2013, "1610612751")}
+        assert identity.birth_years == {1985, 1986}
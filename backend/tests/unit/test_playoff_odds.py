@@ -0,0 +1,181 @@
+"""Unit tests for the Monte Carlo playoff odds simulation."""
+
+import asyncio
+from collections.abc import Callable
+from typing import TypeVar
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+
+from app.models import PlayoffOdds
+from app.repositories.playoff_odds import OddsInputs, OddsSimulator, season_state
+from app.utils.playoff_odds import OddsCounts, SeasonState, bracket_order, simulate
+
+
+T = TypeVar("T")
+
+
+def _state(teams: int = 8, conferences: list[str | None] | None = None, playoff_teams: int = 4) -> SeasonState:
+    """Build a round robin still to play, team 0 rated far above the rest."""
+    pairs = [(i, j) for i in range(teams) for j in range(teams) if i != j]
+    elo = np.full(teams, 1500.0)
+    elo[0] = 1900.0
+    return season_state(
+        [str(i) for i in range(teams)],
+        conferences or ["East"] * (teams // 2) + ["West"] * (teams - teams // 2),
+        np.zeros(teams),
+        np.zeros(teams),
+        elo,
+        np.array([p[0] for p in pairs]),
+        np.array([p[1] for p in pairs]),
+        playoff_teams,
+    )
+
+
+async def _run_inline(fn: Callable[..., T], *args: object) -> T:
+    return fn(*args)
+
+
+def _fake_counts(state: SeasonState, simulations: int, seed: int) -> OddsCounts:
+    teams = len(state.team_ids)
+    return OddsCounts(
+        simulations,
+        np.zeros(teams),
+        np.zeros((teams, state.playoff_teams)),
+        np.zeros((teams, state.rounds + 1)),
+    )
+
+
+class TestBracket:
+    """Tests for bracket construction and seeding."""
+
+    def test_bracket_order(self) -> None:
+        """Test that seeds are laid out so the top two can only meet last."""
+        assert bracket_order(8).tolist() == [0, 7, 3, 4, 1, 6, 2, 5]
+        assert bracket_order(2).tolist() == [0, 1]
+
+    def test_uneven_conferences_fall_back_to_league(self) -> None:
+        """Test that a team without a conference makes the whole league one bracket."""
+        state = _state(6, ["East", "East", "West", "West", "Central", None], playoff_teams=8)
+
+        assert state.conferences.tolist() == [0] * 6
+        assert state.playoff_teams == 4
+        assert state.rounds == 2
+
+    def test_playoff_teams_fit_smallest_conference(self) -> None:
+        """Test that each conference seeds a power of two it can fill."""
+        state = _state(8, ["East"] * 3 + ["West"] * 5, playoff_teams=16)
+
+        assert state.playoff_teams == 2
+        assert state.rounds == 2
+
+
+class TestSimulate:
+    """Tests for the vectorized season and playoff simulation."""
+
+    def test_counts_fill_every_slot(self) -> None:
+        """Test that each simulation fills every seed and one team per bracket slot per round."""
+        state = _state()
+        counts = simulate(state, 3000, seed=1)
+
+        assert counts.simulations == 3000
+        assert counts.seeds.sum(axis=0).tolist() == [2 * 3000] * state.playoff_teams
+        assert counts.rounds.sum(axis=0).tolist() == [4 * 3000, 2 * 3000, 3000]
+        assert counts.wins.sum() == 3000 * state.home.size
+
+    def test_strong_team_is_favoured(self) -> None:
+        """Test that the top-rated team takes the most titles."""
+        counts = simulate(_state(), 2000, seed=2)
+
+        assert int(np.argmax(counts.rounds[:, -1])) == 0
+        assert counts.rounds[0, -1] / 2000 > 0.5
+        assert counts.seeds[0, 0] / 2000 > 0.9
+
+    def test_finished_season_keeps_standings(self) -> None:
+        """Test that with no games left the best record is always the top seed."""
+        state = season_state(
+            ["a", "b", "c", "d"], [None] * 4, np.array([50, 40, 30, 20]), np.array([32, 42, 52, 62]),
+            np.full(4, 1500.0), np.array([], dtype=np.int64), np.array([], dtype=np.int64), 4,
+        )
+        counts = simulate(state, 500, seed=3)
+
+        assert np.diag(counts.seeds).tolist() == [500] * 4
+        assert counts.wins.tolist() == [50 * 500, 40 * 500, 30 * 500, 20 * 500]
+
+
+class TestOddsSimulator:
+    """Tests for the pool runner and cache."""
+
+    def test_same_seed_same_odds(self) -> None:
+        """Test that a seed always gives the same counts."""
+        simulator = OddsSimulator(workers=1, max_entries=4)
+        state = _state()
+
+        try:
+            first = asyncio.run(simulator.simulate(state, 2500, seed=7))
+            second = asyncio.run(simulator.simulate(state, 2500, seed=7))
+        finally:
+            simulator.shutdown()
+
+        assert first.simulations == 2500
+        assert np.array_equal(first.rounds, second.rounds)
+
+    def test_cached_per_rounded_count_and_data_version(self) -> None:
+        """Test that repeat requests, up to a whole batch apart, are served from cache until the data changes."""
+        simulator = OddsSimulator(workers=1, max_entries=4)
+        state = _state()
+        load = Mock(return_value=OddsInputs(state, {}, [None] * 8))
+        version = Mock(return_value="v1")
+        simulate_mock = AsyncMock(side_effect=_fake_counts)
+
+        async def sequence() -> list[PlayoffOdds | None]:
+            return [
+                await simulator.get("2024", 1000, load),
+                await simulator.get("2024", 2000, load),
+                await simulator.get("2024", 2001, load),
+            ]
+
+        with patch("app.repositories.playoff_odds.get_data_version", version), \
+                patch("app.repositories.playoff_odds.run_db", _run_inline), \
+                patch.object(simulator, "simulate", simulate_mock):
+            first, same, larger = asyncio.run(sequence())
+            assert same is first
+            assert (first.simulations, larger.simulations) == (2000, 4000)
+            assert load.call_count == 2
+
+            version.return_value = "v2"
+            asyncio.run(simulator.get("2024", 2000, load))
+            assert load.call_count == 3
+
+        seeds = [c.args[2] for c in simulate_mock.call_args_list]
+        assert len(set(seeds)) == 3
+
+    def test_concurrent_misses_share_one_run(self) -> None:
+        """Test that identical requests arriving together load and simulate once."""
+        simulator = OddsSimulator(workers=1, max_entries=0)
+        load = Mock(return_value=OddsInputs(_state(), {}, [None] * 8))
+
+        async def slow_counts(state: SeasonState, simulations: int, seed: int) -> OddsCounts:
+            await asyncio.sleep(0.05)
+            return _fake_counts(state, simulations, seed)
+
+        async def scenario() -> list[PlayoffOdds | None]:
+            return await asyncio.gather(*(simulator.get("2024", 20_000, load) for _ in range(5)))
+
+        with patch("app.repositories.playoff_odds.run_db", _run_inline), \
+                patch.object(simulator, "simulate", AsyncMock(side_effect=slow_counts)):
+            results = asyncio.run(scenario())
+
+        assert load.call_count == 1
+        assert all(r is results[0] for r in results)
+
+    def test_unknown_season_is_none(self) -> None:
+        """Test that a season without games gives None and isn't simulated."""
+        simulator = OddsSimulator(workers=1, max_entries=4)
+        simulate_mock = AsyncMock()
+
+        with patch("app.repositories.playoff_odds.run_db", _run_inline), \
+                patch.object(simulator, "simulate", simulate_mock):
+            assert asyncio.run(simulator.get("1900", 2000, Mock(return_value=None))) is None
+
+        simulate_mock.assert_not_called()
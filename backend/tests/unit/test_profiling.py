@@ -0,0 +1,81 @@
+"""Unit tests for request profiling."""
+
+import pstats
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.database import QueryExecutor
+from app.core.profiling import ProfilingRoute, span
+
+
+def _client() -> TestClient:
+    router = APIRouter(route_class=ProfilingRoute)
+
+    @router.get("/items/{item_id}")
+    def get_item(item_id: str) -> dict[str, str]:
+        with span("db", "ItemRepository.get"):
+            pass
+        return {"item_id": item_id}
+
+    @router.get("/async-items/{item_id}")
+    async def get_async_item(item_id: str) -> dict[str, str]:
+        return {"item_id": await _executor.run(_load_item, item_id)}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+_executor = QueryExecutor(workers=1, max_queued=4)
+
+
+def _load_item(item_id: str) -> str:
+    return item_id.upper()
+
+
+class TestProfilingRoute:
+    """Tests for ?profile=1 handling."""
+
+    @patch("app.core.profiling.settings")
+    def test_profiled_request_has_server_timing(self, mock_settings: Mock) -> None:
+        """Test that phases and nested spans appear in Server-Timing."""
+        mock_settings.DEBUG = True
+        response = _client().get("/items/7?profile=1")
+
+        assert response.json() == {"item_id": "7"}
+        names = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+        assert names == ["dependencies", "endpoint", "db", "serialization", "total"]
+        assert 'desc="ItemRepository.get"' in response.headers["Server-Timing"]
+
+    @patch("app.core.profiling.settings")
+    def test_requires_debug_or_token(self, mock_settings: Mock) -> None:
+        """Test that profiling is ignored unless allowed."""
+        mock_settings.DEBUG = False
+        mock_settings.PROFILE_TOKEN = "secret"
+        client = _client()
+
+        assert "Server-Timing" not in client.get("/items/7?profile=1").headers
+        assert "Server-Timing" not in client.get("/items/7?profile=1", headers={"X-Profile-Token": "x"}).headers
+        assert "Server-Timing" in client.get("/items/7?profile=1", headers={"X-Profile-Token": "secret"}).headers
+
+    def test_unprofiled_requests_are_untouched(self) -> None:
+        """Test that requests without the flag get no timing header."""
+        response = _client().get("/items/7")
+
+        assert response.status_code == 200
+        assert "Server-Timing" not in response.headers
+
+    @patch("app.core.profiling.settings")
+    def test_cprofile_covers_executor_work(self, mock_settings: Mock, tmp_path: Path) -> None:
+        """Test that an async endpoint's artifact profiles the call it ran on the DB executor."""
+        mock_settings.DEBUG = True
+        mock_settings.PROFILE_DIR = str(tmp_path)
+        response = _client().get("/async-items/a?profile=cprofile")
+
+        assert response.json() == {"item_id": "A"}
+        artifact = response.headers["X-Profile-Artifact"]
+        functions = {name for _, _, name in pstats.Stats(artifact).stats}  # type: ignore[attr-defined]
+        assert "_load_item" in functions
@@ -0,0 +1,152 @@
+"""Unit tests for the constrained multi-criteria query engine."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+from unittest.mock import Mock, patch
+
+import duckdb
+import pytest
+from pydantic import ValidationError as PydanticValidationError
+
+from app.core.database import execute_query_rows
+from app.core.exceptions import QueryTimeoutError, ValidationError
+from app.models import QueryRequest
+from app.repositories.query_repository import QueryRepository
+
+
+@pytest.fixture
+def conn() -> duckdb.DuckDBPyConnection:
+    conn = duckdb.connect()
+    conn.execute(
+        """
+        CREATE TABLE player_season_stats AS
+        SELECT i AS stat_id, 'p' || i AS player_id, CAST(1985 + i AS VARCHAR) AS season_id,
+               20.0 + i AS points_per_game, 5.0 + i AS assists_per_game, 0.45 + i / 100 AS field_goal_pct
+        FROM range(10) t(i)
+        """,
+    )
+    conn.execute("CREATE TABLE players AS SELECT 'p' || i AS player_id, 'Player ' || i AS full_name FROM range(10) t(i)")
+    return conn
+
+
+@pytest.fixture
+def run_query(conn: duckdb.DuckDBPyConnection) -> Iterator[Mock]:
+    def rows(
+        sql: str, params: list[Any] | None = None, timeout: float | None = None, fingerprint: str | None = None,
+    ) -> tuple[list[str], list[tuple[Any, ...]]]:
+        result = conn.execute(sql, params or [])
+        return [c[0] for c in result.description], result.fetchall()
+
+    def query(sql: str, params: list[Any]) -> list[Any]:
+        return conn.execute(sql, params).fetchall()
+
+    with patch("app.repositories.query_repository.execute_query", side_effect=query), \
+            patch("app.repositories.query_repository.execute_query_rows", side_effect=rows) as run, \
+            patch("app.repositories.query_repository.get_data_version", Mock(return_value="v1")):
+        yield run
+
+
+@pytest.fixture
+def repo(run_query: Mock) -> QueryRepository:
+    return QueryRepository()
+
+
+class TestQueryRepository:
+    """Tests for compiling and running queries."""
+
+    def test_filters_sort_and_page(self, repo: QueryRepository) -> None:
+        """Test typed filters ANDed together, descending sort and the has_more flag."""
+        request = QueryRequest.model_validate(
+            {
+                "filters": [
+                    {"field": "points_per_game", "op": "gte", "value": 25},
+                    {"field": "assists_per_game", "op": "gte", "value": 8},
+                    {"field": "season_id", "op": "gte", "value": 1990},
+                ],
+                "fields": ["player_name", "season_id", "points_per_game"],
+                "limit": 2,
+            },
+        )
+
+        result = repo.run("player_seasons", request)
+
+        assert result.fields == ["player_name", "season_id", "points_per_game"]
+        assert [row["player_name"] for row in result.rows] == ["Player 9", "Player 8"]
+        assert result.has_more is True
+
+    def test_values_are_bound_not_inlined(self, repo: QueryRepository) -> None:
+        """Test that filter values only ever appear as parameters."""
+        request = QueryRequest.model_validate(
+            {"filters": [{"field": "player_id", "op": "in", "value": ["p1'; DROP TABLE players; --", "p2"]}]},
+        )
+
+        compiled = repo.compile("player_seasons", request)
+
+        assert "DROP" not in compiled.sql
+        assert "p1'; DROP TABLE players; --" in compiled.params
+        assert compiled.fingerprint == "query:player_seasons"
+        assert [row["player_id"] for row in repo.run("player_seasons", request).rows] == ["p2"]
+
+    def test_joins_only_when_needed(self, repo: QueryRepository) -> None:
+        """Test that joined fields pull in their table and others don't."""
+        plain = repo.compile("player_seasons", QueryRequest(fields=["player_id", "points_per_game"]))
+        named = repo.compile("player_seasons", QueryRequest(fields=["player_name"]))
+
+        assert "JOIN" not in plain.sql
+        assert "JOIN players" in named.sql
+
+    @pytest.mark.parametrize(
+        "request_body",
+        [
+            {"filters": [{"field": "salary", "value": 1}]},
+            {"filters": [{"field": "points_per_game", "value": "25"}]},
+            {"filters": [{"field": "points_per_game", "op": "between", "value": [1]}]},
+            {"sort": ["-not_a_field"]},
+            {"fields": ['player_id" FROM players; --']},
+            {"limit": 100_000},
+        ],
+    )
+    def test_invalid_requests_are_rejected(self, repo: QueryRepository, request_body: dict[str, Any]) -> None:
+        """Test that unknown fields, mistyped values and oversized pages fail validation."""
+        with pytest.raises(ValidationError):
+            repo.compile("player_seasons", QueryRequest.model_validate(request_body))
+
+    def test_offset_is_capped(self) -> None:
+        """Test that deep pages are refused before any SQL is compiled."""
+        with pytest.raises(PydanticValidationError):
+            QueryRequest.model_validate({"offset": 10_001})
+
+    def test_results_are_cached(self, repo: QueryRepository, run_query: Mock) -> None:
+        """Test that an identical query is answered from the cache."""
+        request = QueryRequest(sort=["season_id"])
+
+        first = repo.run("player_seasons", request)
+        second = repo.run("player_seasons", request)
+
+        assert second is first
+        assert run_query.call_count == 1
+
+    def test_timeout_becomes_query_timeout_error(self, repo: QueryRepository, run_query: Mock) -> None:
+        """Test that an interrupted query reports its time budget."""
+        run_query.side_effect = duckdb.InterruptException("Interrupted!")
+
+        with pytest.raises(QueryTimeoutError):
+            repo.run("player_seasons", QueryRequest())
+
+
+class TestQueryTimeout:
+    """Tests for interrupting queries at their time budget."""
+
+    def test_long_query_is_interrupted(self) -> None:
+        """Test that execute_query_rows interrupts a query that outlives its timeout."""
+        conn = duckdb.connect()
+
+        @contextmanager
+        def connection(read_only: bool) -> Iterator[duckdb.DuckDBPyConnection]:
+            yield conn
+
+        with patch("app.core.database._connection", connection), pytest.raises(duckdb.InterruptException):
+            execute_query_rows("SELECT COUNT(*) FROM range(1000000000000) a", timeout=0.05)
+
+        assert conn.execute("SELECT 1").fetchall() == [(1,)]
@@ -0,0 +1,82 @@
+"""Unit tests for the shared token-bucket rate limiter."""
+
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.rate_limit import RateLimitMiddleware, SharedTokenBucket
+
+
+def _bucket(tmp_path: Path, rate: float = 1.0, burst: float = 3, lease: float = 0.0) -> SharedTokenBucket:
+    return SharedTokenBucket(str(tmp_path / "limits.bin"), rate=rate, burst=burst, stripes=4, lease=lease)
+
+
+class TestSharedTokenBucket:
+    """Tests for bucket accounting."""
+
+    def test_burst_then_refill(self, tmp_path: Path) -> None:
+        """Test that a bucket empties at the burst size and refills at the rate."""
+        bucket = _bucket(tmp_path)
+
+        assert [bucket.take("a", now=100.0)[0] for _ in range(4)] == [True, True, True, False]
+        allowed, retry_after = bucket.take("a", cost=2, now=100.5)
+        assert not allowed
+        assert retry_after == 1.5
+        assert bucket.take("a", cost=2, now=102.0)[0]
+        # Other clients have their own buckets
+        assert bucket.take("b", now=100.0)[0]
+
+    def test_processes_share_the_file(self, tmp_path: Path) -> None:
+        """Test that two handles on the same file draw from one bucket."""
+        first = _bucket(tmp_path, rate=0.0)
+        second = _bucket(tmp_path, rate=0.0)
+
+        assert first.take("a", cost=2, now=1.0)[0]
+        assert second.take("a", now=1.0)[0]
+        assert not first.take("a", now=1.0)[0]
+
+    def test_leases_never_exceed_the_limit(self, tmp_path: Path) -> None:
+        """Test that locally leased tokens count against the shared bucket."""
+        first = _bucket(tmp_path, rate=0.0, burst=10, lease=4)
+        second = _bucket(tmp_path, rate=0.0, burst=10, lease=4)
+
+        allowed = sum(handle.take("a", now=1.0)[0] for _ in range(10) for handle in (first, second))
+        assert allowed == 10
+
+    def test_sweep_clears_idle_buckets(self, tmp_path: Path) -> None:
+        """Test that full-again buckets are cleared by the sweep."""
+        bucket = _bucket(tmp_path)
+        later = time.time() + 1000
+        bucket.take("a", now=later)
+
+        assert bucket.sweep(now=later + 100) == 1
+        assert bucket.sweep(now=later + 101) == 0
+
+
+class TestRateLimitMiddleware:
+    """Tests for per-route costs."""
+
+    def test_route_costs(self, tmp_path: Path) -> None:
+        """Test that free routes pass and expensive routes drain the bucket faster."""
+        app = FastAPI()
+
+        @app.get("/health")
+        def health() -> dict[str, str]:
+            return {"status": "healthy"}
+
+        @app.get("/players/{player_id}/gamelog")
+        def gamelog(player_id: str) -> list[str]:
+            return []
+
+        app.add_middleware(
+            RateLimitMiddleware,
+            bucket=_bucket(tmp_path, rate=0.0, burst=5),
+            costs={"/players/{player_id}/gamelog": 2},
+        )
+        client = TestClient(app)
+
+        assert [client.get("/players/1/gamelog").status_code for _ in range(3)] == [200, 200, 429]
+        assert client.get("/players/2/gamelog").headers.get("Retry-After")
+        assert client.get("/health").status_code == 200
@@ -0,0 +1,186 @@
+"""Unit tests for the incremental Elo / SRS rating engine."""
+
+from datetime import date, timedelta
+from typing import Any
+
+import duckdb
+import numpy as np
+import pytest
+
+from app.utils.ratings import (
+    ELO_HOME_ADVANTAGE,
+    ELO_MEAN,
+    RATING_COLUMNS,
+    RatingEngine,
+    SeasonFit,
+    TeamState,
+    elo_expected,
+)
+from build_team_ratings import build_team_ratings, read_watermark
+
+TEAMS = ["A", "B", "C", "D"]
+
+
+def _schedule(season_id: str, start: date, days: int, seed: int = 0) -> list[tuple]:
+    """Two games a day between random pairs, the first team slightly stronger."""
+    rng = np.random.default_rng(seed)
+    games = []
+    for day in range(days):
+        order = rng.permutation(len(TEAMS))
+        for i in range(2):
+            home, away = TEAMS[order[2 * i]], TEAMS[order[2 * i + 1]]
+            home_score = 100 + 4 * (3 - TEAMS.index(home)) + int(rng.integers(-8, 9))
+            away_score = 100 + 4 * (3 - TEAMS.index(away)) + int(rng.integers(-8, 9))
+            if home_score == away_score:
+                home_score += 1
+            games.append(
+                (f"{season_id}-{day}-{i}", season_id, start + timedelta(days=day), home, away, home_score, away_score, False),
+            )
+    return games
+
+
+class TestElo:
+    """Tests for the Elo updates."""
+
+    def test_update_is_zero_sum_and_uses_home_advantage(self) -> None:
+        """Test that one game moves both teams by the same amount from a home-adjusted expectation."""
+        rows = RatingEngine().process([("g1", "2020", date(2020, 1, 1), "A", "B", 110, 100, False)])
+        home, away = (dict(zip(RATING_COLUMNS, row, strict=True)) for row in rows)
+
+        assert home["win_probability"] == pytest.approx(elo_expected(ELO_HOME_ADVANTAGE))
+        assert home["elo"] > ELO_MEAN > away["elo"]
+        assert home["elo"] - ELO_MEAN == pytest.approx(ELO_MEAN - away["elo"])
+
+    def test_ratings_regress_between_seasons_not_before_playoffs(self) -> None:
+        """Test that a new regular season pulls Elo towards the mean and a playoff game doesn't."""
+        engine = RatingEngine({"A": TeamState(elo=1700, season_id="2020"), "B": TeamState(elo=1300, season_id="2020")})
+
+        playoff = engine.process([("p1", "42020", date(2020, 5, 1), "A", "B", 100, 101, True)])
+        regular = engine.process([("g1", "2021", date(2020, 12, 1), "A", "B", 110, 100, False)])
+
+        after_playoffs = playoff[0][9]
+        assert playoff[0][8] == 1700
+        assert regular[0][8] == pytest.approx(0.75 * after_playoffs + 0.25 * ELO_MEAN)
+
+
+class TestSrs:
+    """Tests for the rolling SRS fit."""
+
+    def test_matches_least_squares(self) -> None:
+        """Test that the accumulated normal equations give the least-squares ratings."""
+        games = _schedule("2020", date(2020, 1, 1), 20)
+        fit = SeasonFit("2020")
+        for _, _, _, home, away, home_score, away_score, _ in games:
+            fit.add(home, away, home_score - away_score)
+
+        design = np.zeros((len(games) + 1, len(TEAMS)))
+        target = np.zeros(len(games) + 1)
+        for row, (_, _, _, home, away, home_score, away_score, _) in enumerate(games):
+            design[row, TEAMS.index(home)] = 1
+            design[row, TEAMS.index(away)] = -1
+            target[row] = home_score - away_score
+        design[-1] = 1  # ratings sum to zero
+        expected = np.linalg.lstsq(design, target, rcond=None)[0]
+
+        ratings = fit.solve()
+        assert [ratings[t] for t in TEAMS] == pytest.approx(expected.tolist(), abs=1e-9)
+        assert sum(ratings.values()) == pytest.approx(0, abs=1e-9)
+        assert ratings["A"] > ratings["D"]
+
+    def test_disconnected_schedule_still_solves(self) -> None:
+        """Test that two separate pairs of teams get finite ratings."""
+        fit = SeasonFit("2020")
+        fit.add("A", "B", 10)
+        fit.add("C", "D", 4)
+
+        ratings = fit.solve()
+
+        assert ratings == pytest.approx({"A": 5.0, "B": -5.0, "C": 2.0, "D": -2.0})
+
+
+class TestIncremental:
+    """Tests for resuming from saved state."""
+
+    def test_resumed_run_matches_full_run(self) -> None:
+        """Test that restoring state and priming SRS reproduces one continuous run."""
+        games = _schedule("2020", date(2020, 1, 1), 15) + _schedule("2021", date(2020, 11, 1), 15, seed=1)
+        split = 40  # inside the 2021 season, on a day boundary
+        full = RatingEngine().process(games)
+
+        first = RatingEngine()
+        first.process(games[:split])
+        state = {team_id: TeamState(s.elo, s.season_id, s.srs) for team_id, s in first.teams.items()}
+        resumed = RatingEngine(state)
+        earlier = [g for g in games[:split] if g[1] == "2021"]
+        resumed.prime("2021", [g[3] for g in earlier], [g[4] for g in earlier], [g[5] - g[6] for g in earlier])
+
+        assert resumed.process(games[split:]) == full[2 * split:]
+
+
+class _FailingInsert:
+    """A connection whose ``register`` fails, i.e. mid-way through the write."""
+
+    def __init__(self, con: duckdb.DuckDBPyConnection) -> None:
+        self._con = con
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._con, name)
+
+    def register(self, *args: object) -> None:
+        raise RuntimeError("disk full")
+
+
+class TestBuildTeamRatings:
+    """Tests for the team_ratings ETL stage."""
+
+    @staticmethod
+    def _load(con: duckdb.DuckDBPyConnection, games: list[tuple]) -> None:
+        con.executemany(
+            "INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL)",
+            [(*g[:7], "Regular Season") for g in games],
+        )
+
+    @staticmethod
+    def _ratings(con: duckdb.DuckDBPyConnection) -> list[tuple[Any, ...]]:
+        return con.execute(
+            f"SELECT {', '.join(RATING_COLUMNS)} FROM team_ratings ORDER BY game_date, game_id, team_id",  # noqa: S608
+        ).fetchall()
+
+    def test_incremental_update_matches_full_rebuild(self) -> None:
+        """Test that rating new games from the watermark equals rating everything."""
+        games = _schedule("2020", date(2020, 1, 1), 15) + _schedule("2021", date(2020, 11, 1), 15, seed=1)
+        split = 41  # mid-day inside the 2021 season, so the watermark day is re-rated
+        con = duckdb.connect()
+        con.execute(
+            "CREATE TABLE games (game_id VARCHAR, season_id VARCHAR, game_date DATE, home_team_id VARCHAR, "
+            "away_team_id VARCHAR, home_team_score INTEGER, away_team_score INTEGER, game_type VARCHAR, "
+            "playoff_round INTEGER)",
+        )
+        self._load(con, games[:split])
+        assert build_team_ratings(con) == (split, games[split - 1][2])
+
+        self._load(con, games[split:])
+        rated, watermark = build_team_ratings(con)
+        incremental = self._ratings(con)
+
+        assert rated == len(games) - split + 1
+        assert watermark == read_watermark(con) == games[-1][2]
+        assert build_team_ratings(con, full=True) == (len(games), games[-1][2])
+        assert incremental == pytest.approx(self._ratings(con))
+
+    def test_failed_rebuild_keeps_previous_ratings(self) -> None:
+        """Test that --full replaces the tables inside the write transaction."""
+        con = duckdb.connect()
+        con.execute(
+            "CREATE TABLE games (game_id VARCHAR, season_id VARCHAR, game_date DATE, home_team_id VARCHAR, "
+            "away_team_id VARCHAR, home_team_score INTEGER, away_team_score INTEGER, game_type VARCHAR, "
+            "playoff_round INTEGER)",
+        )
+        self._load(con, _schedule("2020", date(2020, 1, 1), 5))
+        build_team_ratings(con)
+        before = self._ratings(con)
+
+        with pytest.raises(RuntimeError):
+            build_team_ratings(_FailingInsert(con), full=True)
+
+        assert self._ratings(con) == before
@@ -0,0 +1,91 @@
+"""Unit tests for the memory-mapped player similarity index."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.repositories import similarity
+from app.repositories.similarity import SimilarityIndex, top_k, write_index
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> SimilarityIndex:
+    """Four players over three seasons; p1 and p3 share a profile."""
+    write_index(
+        str(tmp_path / "similarity"),
+        ["a", "b"],
+        season_player_ids=np.array(["p3", "p1", "p2", "p1", "p3", "p4"]),
+        season_ids=np.array(["2002", "2000", "2000", "2001", "2001", "2002"]),
+        season_vectors=np.array([[1.0, 0.1], [1.0, 0.0], [0.0, 1.0], [0.9, 0.1], [1.0, 0.0], [-1.0, 0.0]]),
+        career_player_ids=np.array(["p4", "p3", "p2", "p1"]),
+        career_vectors=np.array([[-1.0, 0.0], [1.0, 0.05], [0.0, 1.0], [0.95, 0.05]]),
+        career_first=np.array([2002, 2001, 2000, 2000]),
+        career_last=np.array([2002, 2002, 2000, 2001]),
+    )
+    return SimilarityIndex(str(tmp_path / "similarity"))
+
+
+class TestTopK:
+    """Tests for the blocked exact top-k search."""
+
+    @pytest.mark.parametrize("metric", ["cosine", "euclidean"])
+    def test_matches_brute_force_across_blocks(self, metric: str, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that per-block argpartition merges to the exact global top k."""
+        monkeypatch.setattr(similarity, "BLOCK_ROWS", 64)
+        rng = np.random.default_rng(7)
+        vectors = rng.standard_normal((1000, 12)).astype(np.float32)
+        query = rng.standard_normal(12).astype(np.float32)
+
+        rows, scores = top_k(vectors, np.linalg.norm(vectors, axis=1), query, 10, metric)
+
+        if metric == "cosine":
+            expected = vectors @ query / (np.linalg.norm(vectors, axis=1) * np.linalg.norm(query))
+            order = np.argsort(-expected)[:10]
+        else:
+            expected = np.linalg.norm(vectors - query, axis=1)
+            order = np.argsort(expected)[:10]
+        assert rows.tolist() == order.tolist()
+        np.testing.assert_allclose(scores, expected[order], rtol=1e-4, atol=1e-4)
+
+    def test_excludes_own_rows(self) -> None:
+        """Test that rows with the excluded code never come back."""
+        vectors = np.eye(3, dtype=np.float32)
+
+        rows, _ = top_k(vectors, np.ones(3), vectors[0], 3, codes=np.array([5, 5, 6]), exclude_code=5)
+
+        assert rows.tolist() == [2]
+
+
+class TestSimilarityIndex:
+    """Tests for searching the arrays written by write_index."""
+
+    def test_arrays_are_memory_mapped(self, index: SimilarityIndex) -> None:
+        """Test that the vectors are opened as read-only memory maps sorted by season."""
+        arrays = index._load()
+
+        assert arrays is not None
+        assert isinstance(arrays["season_vectors"], np.memmap)
+        assert arrays["season_vectors"].dtype == np.float32
+        assert arrays["season_years"].tolist() == sorted(arrays["season_years"].tolist())
+
+    def test_career_search(self, index: SimilarityIndex) -> None:
+        """Test that careers rank by similarity and skip the player themselves."""
+        matches = index.search("p1", k=2)
+
+        assert matches is not None
+        assert [m.player_id for m in matches] == ["p3", "p2"]
+        assert (matches[0].first_season, matches[0].last_season) == (2001, 2002)
+
+    def test_season_search_with_era(self, index: SimilarityIndex) -> None:
+        """Test that an era filter limits season matches to those years."""
+        matches = index.search("p1", "2000", k=5, era_from=2002)
+
+        assert matches is not None
+        assert [(m.player_id, m.season_id) for m in matches] == [("p3", "2002"), ("p4", "2002")]
+
+    def test_unknown_player_or_season(self, index: SimilarityIndex, tmp_path: Path) -> None:
+        """Test that unknown players, seasons and a missing index return None."""
+        assert index.search("p9") is None
+        assert index.search("p2", "2001") is None
+        assert SimilarityIndex(str(tmp_path / "missing")).search("p1") is None
@@ -0,0 +1,96 @@
+"""Unit tests for request coalescing."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.core.database import QueryExecutor
+from app.core.singleflight import SingleFlight, coalesce
+
+
+class SlowRepository:
+    """Repository stand-in whose lookups block until released."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    @coalesce
+    def get_by_id(self, item_id: str) -> dict[str, str]:
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return {"item_id": item_id}
+
+
+class TestSingleFlight:
+    """Tests for sync and async coalescing."""
+
+    def test_concurrent_sync_calls_share_one_execution(self) -> None:
+        """Test that threads asking for the same key wait for the first call."""
+        repo = SlowRepository()
+        with ThreadPoolExecutor(8) as pool:
+            leader = pool.submit(repo.get_by_id, "1")
+            repo.started.wait(5)
+            followers = [pool.submit(repo.get_by_id, "1") for _ in range(7)]
+            time.sleep(0.1)
+            repo.release.set()
+            results = [leader.result(), *(f.result() for f in followers)]
+
+        assert repo.calls == 1
+        assert all(result is results[0] for result in results)
+
+    def test_exceptions_are_shared_and_not_remembered(self) -> None:
+        """Test that waiters get the leader's exception and the next call runs again."""
+        flight = SingleFlight()
+        boom = Mock(side_effect=ValueError("boom"))
+
+        with pytest.raises(ValueError, match="boom"):
+            flight.do("key", boom)
+        with pytest.raises(ValueError, match="boom"):
+            flight.do("key", boom)
+
+        assert boom.call_count == 2
+
+    def test_async_callers_share_one_executor_call(self) -> None:
+        """Test that awaiting callers join without occupying executor threads."""
+        repo = SlowRepository()
+        executor = QueryExecutor(workers=1, max_queued=0)
+
+        async def scenario() -> list[dict[str, str]]:
+            coalesced = SlowRepository.get_by_id.__coalesced__  # type: ignore[attr-defined]
+            calls = [coalesced.run_async(repo, ("1",), {}, executor.run) for _ in range(20)]
+            gathered = asyncio.gather(*calls)
+            await asyncio.sleep(0.1)
+            repo.release.set()
+            return await gathered
+
+        try:
+            results = asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+
+        assert repo.calls == 1
+        assert results == [{"item_id": "1"}] * 20
+
+    @patch("app.core.singleflight.get_data_version")
+    def test_new_data_version_starts_a_new_call(self, mock_version: Mock) -> None:
+        """Test that calls made against newer data don't join an older call."""
+        repo = SlowRepository()
+        with ThreadPoolExecutor(2) as pool:
+            mock_version.return_value = "v1"
+            first = pool.submit(repo.get_by_id, "1")
+            repo.started.wait(5)
+            mock_version.return_value = "v2"
+            second = pool.submit(repo.get_by_id, "1")
+            time.sleep(0.1)
+            repo.release.set()
+            first.result()
+            second.result()
+
+        assert repo.calls == 2
@@ -0,0 +1,104 @@
+"""Unit tests for serving pre-rendered snapshots."""
+
+import gzip
+import json
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.core.snapshot import MANIFEST_NAME, StaticSnapshotMiddleware, read_manifest, snapshot_path
+from scripts import snapshot as snapshot_script
+
+BODY = b'[{"g": 1, "wl": "W"}]'
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path: Path) -> Path:
+    file = tmp_path / "api" / "v1" / "seasons" / "2020" / "standings.json"
+    file.parent.mkdir(parents=True)
+    file.write_bytes(BODY)
+    file.with_name("standings.json.gz").write_bytes(gzip.compress(BODY))
+    (tmp_path / MANIFEST_NAME).write_text(json.dumps({"data_version": "v1", "encodings": ["identity", "gzip"]}))
+    return tmp_path
+
+
+def _client(directory: Path) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/api/v1/seasons/{season_id}/standings")
+    async def standings(season_id: str) -> PlainTextResponse:
+        return PlainTextResponse("from app")
+
+    app.add_middleware(StaticSnapshotMiddleware, directory=str(directory), check_interval=0)
+    return TestClient(app)
+
+
+class TestSnapshotPath:
+    """Tests for mapping URLs onto the snapshot tree."""
+
+    def test_paths_cannot_escape_the_tree(self) -> None:
+        """Test that only plain /api/v1 paths map to files."""
+        assert snapshot_path("/snap", "/api/v1/seasons/2020") == "/snap/api/v1/seasons/2020.json"
+        assert snapshot_path("/snap", "/api/v1/seasons/../../etc/passwd") is None
+        assert snapshot_path("/snap", "/api/v1/seasons/") is None
+        assert snapshot_path("/snap", "/metrics") is None
+
+
+class TestStaticSnapshotMiddleware:
+    """Tests for answering requests from the snapshot."""
+
+    @patch("app.core.snapshot.get_data_version", Mock(return_value="v1"))
+    def test_serves_precompressed_file(self, snapshot_dir: Path) -> None:
+        """Test that a matching GET is served from disk, gzipped when accepted."""
+        client = _client(snapshot_dir)
+
+        with client.stream("GET", "/api/v1/seasons/2020/standings", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+            assert response.headers["content-encoding"] == "gzip"
+            assert response.headers["content-type"] == "application/json"
+        assert gzip.decompress(raw) == BODY
+
+        plain = client.get("/api/v1/seasons/2020/standings", headers={"Accept-Encoding": "identity"})
+        assert plain.content == BODY
+
+    @patch("app.core.snapshot.get_data_version", Mock(return_value="v1"))
+    def test_query_strings_and_other_formats_reach_the_app(self, snapshot_dir: Path) -> None:
+        """Test that requests the snapshot can't answer fall through."""
+        client = _client(snapshot_dir)
+
+        assert client.get("/api/v1/seasons/2020/standings?conference=East").text == "from app"
+        assert client.get("/api/v1/seasons/2020/standings", headers={"Accept": "application/msgpack"}).text == "from app"
+        assert client.get("/api/v1/seasons/2021/standings").text == "from app"
+
+    @patch("app.core.snapshot.get_data_version", Mock(return_value="v2"))
+    def test_stale_snapshot_is_ignored(self, snapshot_dir: Path) -> None:
+        """Test that a snapshot of older data is never served."""
+        assert _client(snapshot_dir).get("/api/v1/seasons/2020/standings").text == "from app"
+
+
+@patch("app.core.database.close_connections", Mock())
+@patch.object(snapshot_script, "_compressors", Mock(return_value={"gzip": gzip.compress}))
+class TestBuildSnapshot:
+    """Tests for rebuilding part of a snapshot."""
+
+    @patch("app.core.database.get_data_version", Mock(return_value="v1"))
+    def test_merge_keeps_other_seasons(self, snapshot_dir: Path) -> None:
+        """Test that a season-only run keeps the existing responses of the same data version."""
+        manifest = snapshot_script.build_snapshot(str(snapshot_dir), [], workers=1, merge=True)
+
+        assert (snapshot_dir / "api" / "v1" / "seasons" / "2020" / "standings.json").read_bytes() == BODY
+        assert manifest["responses"] == 1
+        assert read_manifest(str(snapshot_dir))["data_version"] == "v1"
+
+    @patch("app.core.database.get_data_version", Mock(return_value="v2"))
+    def test_merge_refuses_older_snapshot(self, snapshot_dir: Path) -> None:
+        """Test that stale responses are never merged into a tree stamped as current."""
+        with pytest.raises(SystemExit, match="data version v1"):
+            snapshot_script.build_snapshot(str(snapshot_dir), [], workers=1, merge=True)
+
+        assert read_manifest(str(snapshot_dir))["data_version"] == "v1"
+        assert (snapshot_dir / "api" / "v1" / "seasons" / "2020" / "standings.json").exists()
@@ -0,0 +1,223 @@
+"""Unit tests for lineup and player stint reconstruction."""
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import Mock, patch
+
+import duckdb
+import pandas as pd
+import pytest
+
+import build_stints
+from app.repositories.game_repository import GameRepository
+from build_stints import (
+    LINEUP_COLUMNS,
+    MADE_SHOT,
+    MISSED_SHOT,
+    REBOUND,
+    SUBSTITUTION,
+    TURNOVER,
+    _merge_stints,
+    elapsed_seconds,
+    infer_period_starters,
+    process_games,
+    reconstruct_game,
+)
+
+HOME = ["h1", "h2", "h3", "h4", "h5"]
+AWAY = ["a1", "a2", "a3", "a4", "a5"]
+
+
+def _event(
+    eventnum: int,
+    msg_type: int,
+    clock: str,
+    player1: tuple[str, str] | None = None,
+    player2: tuple[str, str] | None = None,
+    description: str = "",
+    period: int = 1,
+) -> dict[str, Any]:
+    return {
+        "game_id": "g1",
+        "period": period,
+        "eventnum": eventnum,
+        "eventmsgtype": msg_type,
+        "pctimestring": clock,
+        "description": description,
+        "player1_id": player1[0] if player1 else None,
+        "player1_team_id": player1[1] if player1 else None,
+        "player2_id": player2[0] if player2 else None,
+        "player2_team_id": player2[1] if player2 else None,
+        "player3_id": None,
+        "player3_team_id": None,
+        "home_team_id": "H",
+        "away_team_id": "A",
+    }
+
+
+# One period: everyone appears, h6 replaces h1 at 6:00 and scores
+EVENTS = [
+    _event(1, MADE_SHOT, "11:40", ("h1", "H"), description="Jump Shot"),
+    _event(2, MISSED_SHOT, "11:00", ("a1", "A"), description="MISS Layup"),
+    _event(3, REBOUND, "10:58", ("a2", "A")),
+    _event(4, MADE_SHOT, "10:30", ("a3", "A"), description="3PT Jump Shot"),
+    _event(5, MADE_SHOT, "10:00", ("h2", "H"), ("h3", "H"), description="Layup"),
+    _event(6, MISSED_SHOT, "9:30", ("h4", "H"), description="MISS Hook"),
+    _event(7, REBOUND, "9:28", ("h5", "H")),
+    _event(8, TURNOVER, "9:00", ("a4", "A")),
+    _event(9, MISSED_SHOT, "8:50", ("a5", "A"), description="MISS Jump Shot"),
+    _event(10, REBOUND, "8:48", ("h1", "H")),
+    _event(11, SUBSTITUTION, "6:00", ("h1", "H"), ("h6", "H")),
+    _event(12, MADE_SHOT, "5:00", ("h6", "H"), description="Dunk"),
+]
+
+
+class TestElapsedSeconds:
+    """Tests for game clock conversion."""
+
+    @pytest.mark.parametrize(
+        ("period", "clock", "expected"),
+        [
+            (1, "12:00", 0),
+            (1, "0:00", 720),
+            (4, "6:30", 3 * 720 + 330),
+            (5, "5:00", 4 * 720),
+            (6, "2:00", 4 * 720 + 300 + 180),
+            (2, None, 2 * 720),
+        ],
+    )
+    def test_elapsed_seconds(self, period: int, clock: str | None, expected: int) -> None:
+        """Test regulation and overtime periods, and a missing clock meaning period end."""
+        assert elapsed_seconds(period, clock) == expected
+
+
+class TestInferPeriodStarters:
+    """Tests for period starter inference."""
+
+    def test_players_seen_before_subbing_in(self) -> None:
+        """Test that starters are the first five seen who weren't subbed in."""
+        assert infer_period_starters(EVENTS) == {"H": HOME, "A": AWAY}
+
+    def test_subbed_out_before_appearing_is_a_starter(self) -> None:
+        """Test that a player first seen leaving the floor started, and the one entering didn't."""
+        events = [
+            _event(1, SUBSTITUTION, "11:00", ("h1", "H"), ("h6", "H")),
+            _event(2, MADE_SHOT, "10:00", ("h6", "H")),
+            _event(3, MADE_SHOT, "9:00", ("h2", "H")),
+        ]
+
+        assert infer_period_starters(events) == {"H": ["h1", "h2"]}
+
+
+class TestReconstructGame:
+    """Tests for replaying a game into stints."""
+
+    def test_substitution_splits_stints(self) -> None:
+        """Test lineups, times and points either side of a substitution."""
+        lineups, players = reconstruct_game(EVENTS)
+        rows = [dict(zip(LINEUP_COLUMNS, row, strict=True)) for row in lineups]
+
+        assert [(r["team_id"], r["stint_number"], r["start_seconds"], r["end_seconds"]) for r in rows] == [
+            ("H", 1, 0, 360),
+            ("H", 2, 360, 720),
+            ("A", 1, 0, 720),
+        ]
+        assert rows[0]["lineup_key"] == "-".join(HOME)
+        assert rows[1]["lineup_key"] == "-".join(["h2", "h3", "h4", "h5", "h6"])
+        assert [(r["points_for"], r["points_against"]) for r in rows] == [(4, 3), (2, 0), (3, 6)]
+        assert len(players) == 15
+
+    def test_possessions_count_both_teams(self) -> None:
+        """Test that possessions average both teams' FGA + 0.44 FTA - ORB + TOV."""
+        lineups, _ = reconstruct_game(EVENTS)
+        first_home = dict(zip(LINEUP_COLUMNS, lineups[0], strict=True))
+
+        # Home: 3 FGA, 1 ORB; away: 3 FGA, 1 ORB, 1 TOV
+        assert first_home["possessions"] == pytest.approx((2 + 3) / 2)
+
+    def test_no_events(self) -> None:
+        """Test that an empty game yields nothing."""
+        assert reconstruct_game([]) == ([], [])
+
+
+class TestStaging:
+    """Tests for writing chunks to Parquet and merging them."""
+
+    def test_chunks_merge_into_tables(self, tmp_path: Path) -> None:
+        """Test that a worker's Parquet files load into the stint tables and box_scores."""
+        db_path = str(tmp_path / "nba.duckdb")
+        con = duckdb.connect(db_path)
+        con.execute("CREATE TABLE games (game_id VARCHAR, home_team_id VARCHAR, away_team_id VARCHAR)")
+        con.execute("INSERT INTO games VALUES ('g1', 'H', 'A')")
+        con.execute("""
+            CREATE TABLE play_by_play (
+                game_id VARCHAR, period VARCHAR, eventnum VARCHAR, eventmsgtype VARCHAR,
+                pctimestring VARCHAR, homedescription VARCHAR, visitordescription VARCHAR,
+                player1_id VARCHAR, player1_team_id VARCHAR, player2_id VARCHAR,
+                player2_team_id VARCHAR, player3_id VARCHAR, player3_team_id VARCHAR
+            )
+        """)
+        teams = {"H": "1", "A": "2", None: None}
+        for e in EVENTS:
+            con.execute(
+                "INSERT INTO play_by_play VALUES (?, ?, ?, ?, ?, ?, NULL, ?, ?, ?, ?, '0', NULL)",
+                [
+                    "g1", str(e["period"]), str(e["eventnum"]), str(e["eventmsgtype"]), e["pctimestring"],
+                    e["description"], e["player1_id"] or "0", teams[e["player1_team_id"]],
+                    e["player2_id"] or "0", teams[e["player2_team_id"]],
+                ],
+            )
+        con.execute("UPDATE games SET home_team_id = '1', away_team_id = '2'")
+        con.execute(
+            "CREATE TABLE lineup_stints (game_id VARCHAR, team_id VARCHAR, period INTEGER, stint_number INTEGER, "
+            "lineup_key VARCHAR, num_players INTEGER, start_seconds INTEGER, end_seconds INTEGER, "
+            "seconds INTEGER, possessions DECIMAL(6,2), points_for INTEGER, points_against INTEGER)",
+        )
+        con.execute(
+            "CREATE TABLE player_stints (game_id VARCHAR, team_id VARCHAR, period INTEGER, stint_number INTEGER, "
+            "nba_person_id VARCHAR, player_id VARCHAR, start_seconds INTEGER, end_seconds INTEGER, "
+            "seconds INTEGER, possessions DECIMAL(6,2), points_for INTEGER, points_against INTEGER)",
+        )
+        con.execute("CREATE TABLE player_xref (source VARCHAR, source_id VARCHAR, player_id VARCHAR)")
+        con.execute("INSERT INTO player_xref VALUES ('nba', 'h6', 'bench01')")
+        con.execute(
+            "CREATE TABLE box_scores (game_id VARCHAR, player_id VARCHAR, minutes_played INTEGER, "
+            "plus_minus INTEGER, is_starter BOOLEAN)",
+        )
+        con.execute("INSERT INTO box_scores VALUES ('g1', 'bench01', NULL, NULL, NULL)")
+        con.close()
+
+        staging = tmp_path / "staging"
+        staging.mkdir()
+        with patch.object(build_stints, "DB_PATH", db_path):
+            assert process_games(["g1"], str(staging / "00000")) == (3, 15)
+            assert process_games(["missing"], str(staging / "00001")) == (0, 0)
+            _merge_stints(str(staging))
+
+        con = duckdb.connect(db_path, read_only=True)
+        try:
+            assert con.execute("SELECT COUNT(*) FROM lineup_stints").fetchone() == (3,)
+            assert con.execute("SELECT COUNT(*) FROM player_stints").fetchone() == (15,)
+            assert con.execute("SELECT minutes_played, plus_minus, is_starter FROM box_scores").fetchone() == (
+                6, 2, False,
+            )
+        finally:
+            con.close()
+
+
+class TestGetLineups:
+    """Tests for the game lineups query."""
+
+    def test_unknown_game_is_none(self) -> None:
+        """Test that a game without stints is checked for and reported missing."""
+        repo = GameRepository()
+        with patch("app.repositories.game_repository.execute_query_df", return_value=pd.DataFrame()), \
+                patch.object(repo, "get_by_id", return_value=None):
+            assert repo.get_lineups("missing") is None
+
+        with patch("app.repositories.game_repository.execute_query_df", return_value=pd.DataFrame()), \
+                patch.object(repo, "get_by_id", return_value=Mock()):
+            lineups = repo.get_lineups("g1")
+
+        assert lineups is not None
+        assert (lineups.lineups, lineups.players) == ([], [])
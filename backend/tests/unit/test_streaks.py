@@ -0,0 +1,140 @@
+"""Unit tests for the rolling-window and streak engine."""
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+
+from app.repositories.game_arrays import GameArrayCache, GameArrays, streak
+from app.repositories.player_repository import PlayerRepository
+from app.utils.streaks import current_run, form, longest_run, rolling_mean, runs
+
+
+def _arrays(**columns: list[float]) -> GameArrays:
+    size = len(next(iter(columns.values())))
+    df = pd.DataFrame(
+        {
+            "game_id": [f"g{i}" for i in range(size)],
+            "game_date": pd.date_range("2024-01-01", periods=size),
+            "season_id": ["2024"] * size,
+            **columns,
+        },
+    )
+    return GameArrays.from_frame(df, list(columns))
+
+
+class TestRollingMean:
+    """Tests for trailing-window means."""
+
+    def test_matches_pandas(self) -> None:
+        """Test that full windows agree with pandas' rolling mean."""
+        values = np.random.default_rng(0).normal(20, 5, 200)
+
+        expected = pd.Series(values).rolling(10).mean().to_numpy()
+
+        np.testing.assert_allclose(rolling_mean(values, 10), expected)
+
+    def test_missing_values_are_skipped(self) -> None:
+        """Test that NaNs don't count towards a window unless min_periods allows it."""
+        values = np.array([10.0, np.nan, 20.0, 30.0])
+
+        assert np.isnan(rolling_mean(values, 2)[2])
+        np.testing.assert_allclose(rolling_mean(values, 2, min_periods=1), [10.0, 10.0, 20.0, 25.0])
+
+
+class TestRuns:
+    """Tests for streak detection."""
+
+    def test_runs_longest_and_current(self) -> None:
+        """Test run boundaries, the earliest longest run and the trailing run."""
+        mask = np.array([1, 1, 0, 1, 1, 0, 0, 1], dtype=bool)
+
+        starts, lengths = runs(mask)
+
+        assert starts.tolist() == [0, 3, 7]
+        assert lengths.tolist() == [2, 2, 1]
+        assert longest_run(mask) == (2, 0)
+        assert current_run(mask) == 1
+        assert longest_run(np.zeros(3, dtype=bool)) == (0, -1)
+        assert current_run(np.ones(4, dtype=bool)) == 4
+
+    def test_streak_reports_game_ids_and_dates(self) -> None:
+        """Test that the longest streak is located on the game arrays."""
+        arrays = _arrays(points=[25, 10, 22, 30, 21, 8])
+
+        result = streak("20_point_games", arrays, arrays.columns["points"] >= 20)
+
+        assert (result.current, result.longest) == (0, 3)
+        assert result.longest_start_game_id == "g2"
+        assert str(result.longest_end_date) == "2024-01-05"
+
+
+class TestForm:
+    """Tests for hot/cold detection."""
+
+    def test_hot_cold_and_neutral(self) -> None:
+        """Test that a last window well above or below the sample mean is flagged."""
+        base = [20.0, 22.0, 18.0, 21.0, 19.0, 20.0] * 3
+
+        assert form(np.array([*base, 30.0, 32.0, 31.0]), 3)[0] == "hot"
+        assert form(np.array([*base, 10.0, 9.0, 11.0]), 3)[0] == "cold"
+        assert form(np.array(base), 3)[0] == "neutral"
+        assert form(np.array([20.0, 30.0]), 3) == ("neutral", None)
+
+
+class TestGameArrayCache:
+    """Tests for the per-entity array cache."""
+
+    def test_loads_once_per_data_version(self) -> None:
+        """Test that arrays are reused until the data version changes, within the entry limit."""
+        cache = GameArrayCache(max_entities=1)
+        load = Mock(side_effect=lambda entity_id: _arrays(points=[1.0]))
+        version = Mock(return_value="v1")
+
+        with patch("app.repositories.game_arrays.get_data_version", version):
+            cache.get("player", "a", load)
+            cache.get("player", "a", load)
+            assert load.call_count == 1
+
+            cache.get("player", "b", load)
+            cache.get("player", "a", load)
+            assert load.call_count == 3
+
+            version.return_value = "v2"
+            cache.get("player", "a", load)
+            assert load.call_count == 4
+
+    def test_season_selection(self) -> None:
+        """Test that a season filter keeps parallel arrays aligned."""
+        arrays = _arrays(points=[1.0, 2.0, 3.0])
+        arrays.season_ids[0] = "2023"
+
+        season = arrays.season("2024")
+
+        assert len(season) == 2
+        assert season.game_ids.tolist() == ["g1", "g2"]
+        assert season.columns["points"].tolist() == [2.0, 3.0]
+
+
+class TestPlayerEndpoints:
+    """Tests for unknown players on the rolling and streak endpoints."""
+
+    def test_unknown_player_is_none(self) -> None:
+        """Test that a player with no games is checked for and reported missing."""
+        repo = PlayerRepository()
+        empty = _arrays(points=[])
+        with patch("app.repositories.player_repository.game_arrays") as cache, \
+                patch.object(repo, "get_by_id", return_value=None) as get_by_id:
+            cache.get.return_value = empty
+
+            assert repo.get_streaks("nobody01") is None
+            assert repo.get_rolling("nobody01", "pts", 5) is None
+
+            get_by_id.return_value = Mock()
+            assert repo.get_rolling("rookie01", "pts", 5).games == 0
+
+        cache.get.return_value = _arrays(points=[30.0, 25.0])
+        with patch("app.repositories.player_repository.game_arrays", cache), \
+                patch.object(repo, "get_by_id") as get_by_id:
+            assert repo.get_rolling("star01", "pts", 1).games == 2
+            get_by_id.assert_not_called()
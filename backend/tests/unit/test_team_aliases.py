@@ -0,0 +1,77 @@
+"""Unit tests for the in-process team alias registry."""
+
+from unittest.mock import Mock, patch
+
+import duckdb
+
+from app.repositories.team_aliases import TeamAliasRegistry
+
+TEAMS = [
+    ("1610612751", "BKN", "1610612751"),
+    ("1610612760", "OKC", "1610612760"),
+]
+ALIASES = [
+    ("BKN", "1610612751", "1610612751", 2013, None),
+    ("NJN", "1610612751", "1610612751", 1978, 2012),
+    ("OKC", "1610612760", "1610612760", 2009, None),
+    ("SEA", "1610612760", "1610612760", 1968, 2008),
+]
+
+
+def _fake_query(query: str, *args: object, **kwargs: object) -> list[tuple]:
+    return ALIASES if "team_aliases" in query else TEAMS
+
+
+class TestTeamAliasRegistry:
+    """Tests for TeamAliasRegistry resolution."""
+
+    @patch("app.repositories.team_aliases.execute_query", side_effect=_fake_query)
+    def test_resolves_ids_and_abbreviations(self, mock_query: Mock) -> None:
+        """Test that IDs pass through and abbreviations map case-insensitively."""
+        registry = TeamAliasRegistry()
+
+        assert registry.resolve("1610612751") == "1610612751"
+        assert registry.resolve("sea") == "1610612760"
+        assert registry.resolve("XYZ") is None
+
+    @patch("app.repositories.team_aliases.execute_query", side_effect=_fake_query)
+    def test_loads_once(self, mock_query: Mock) -> None:
+        """Test that repeated resolution does not query again."""
+        registry = TeamAliasRegistry()
+        registry.resolve("BKN")
+        registry.resolve("OKC")
+
+        assert mock_query.call_count == 2
+
+        registry.reload()
+        registry.resolve("BKN")
+        assert mock_query.call_count == 4
+
+    @patch("app.repositories.team_aliases.execute_query")
+    def test_season_selects_covering_range(self, mock_query: Mock) -> None:
+        """Test that a season picks the team holding the abbreviation then."""
+        mock_query.side_effect = lambda query, *a, **k: (
+            [("CHA", "1610612766", None, 2005, None), ("CHA", "9999", None, 1950, 1960)]
+            if "team_aliases" in query
+            else []
+        )
+        registry = TeamAliasRegistry()
+
+        assert registry.resolve("CHA") == "1610612766"
+        assert registry.resolve("CHA", "1955") == "9999"
+        assert registry.resolve("CHA", 2010) == "1610612766"
+
+    @patch("app.repositories.team_aliases.execute_query")
+    def test_falls_back_to_teams_without_alias_table(self, mock_query: Mock) -> None:
+        """Test resolution against teams when team_aliases does not exist."""
+
+        def query(sql: str, *args: object, **kwargs: object) -> list[tuple]:
+            if "team_aliases" in sql:
+                raise duckdb.CatalogException("Table team_aliases does not exist")
+            return TEAMS
+
+        mock_query.side_effect = query
+        registry = TeamAliasRegistry()
+
+        assert registry.resolve("OKC") == "1610612760"
+        assert registry.resolve("SEA") is None